@@ -0,0 +1,122 @@
+import asyncio
+import time
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Optional, Sequence
+
+from answer_cache import AnswerCache
+from ai_search_stream import AnswerStreamEngine, get_answer_engine
+
+_ANSWER_END = object()
+
+
+async def stream_answer_with_sources(
+    llm: str,
+    answer_prompt: str,
+    retrievers: str,
+    extract_sources: Callable[[], Awaitable[Any]],
+    engine: Optional[AnswerStreamEngine] = None,
+    query: Optional[str] = None,
+    retriever_ids: Optional[Sequence] = None,
+    cache: Optional[AnswerCache] = None,
+) -> AsyncIterator[Dict]:
+    """
+    답변 스트리밍과 출처 생성을 동시에 실행
+
+    두 작업 모두 retrievers 와 query 에만 의존하므로 asyncio.TaskGroup 으로 함께 시작합니다.
+    답변 토큰은 도착하는 즉시 내보내고, 출처는 준비되는 시점에 끼워 넣습니다.
+    전체 완료 시간은 두 작업 시간의 합이 아니라 더 긴 쪽에 가까워집니다.
+
+    Args:
+        llm: 답변 모델 이름
+        answer_prompt: 답변용 system 프롬프트
+        retrievers: 답변 모델에 전달할 검색 결과 문자열
+        extract_sources: 출처(title/snippet) 목록을 돌려주는 코루틴 함수
+        engine: 답변 스트리밍 엔진 (없으면 공유 엔진)
+        query: 사용자 질의 (cache 와 함께 주면 답변 캐시 사용)
+        retriever_ids: 답변에 사용한 검색 결과 ID 목록 (캐시 키)
+        cache: 답변 캐시
+
+    Yields:
+        dict: 답변 청크 {"content", "done": False, "description": "main_content"}
+              출처 {"content": [...], "done": False, "description": "sources"}
+              답변 오류 {"content": "...", "done": False, "description": "error", "error": "..."} (이미 보낸 청크와 출처는 유지)
+              종료 {"content": "", "done": True, "description": "done", "timing": {...}}
+    """
+    engine = engine or get_answer_engine()
+    output: asyncio.Queue = asyncio.Queue()
+    start = time.perf_counter()
+    timing: Dict[str, float] = {}
+
+    def answer_stream():
+        return engine.stream(llm, answer_prompt, retrievers)
+
+    async def run_answer():
+        try:
+            if cache is not None and query is not None:
+                stream = cache.stream(llm, answer_prompt, query, retriever_ids or [], answer_stream)
+            else:
+                stream = answer_stream()
+            async for chunk in stream:
+                timing.setdefault("answer_first_chunk", time.perf_counter() - start)
+                await output.put(chunk)
+        except Exception as e:
+            # 답변 오류가 TaskGroup 밖으로 ExceptionGroup 으로 나가지 않도록 오류 청크로 전달 (출처는 계속 진행)
+            print(f"답변 생성 중 오류 발생: {e}")
+            await output.put({
+                "content": "답변 생성 중 오류가 발생했습니다.", "done": False, "description": "error",
+                "error": f"{type(e).__name__}: {e}",
+            })
+        finally:
+            timing["answer_done"] = time.perf_counter() - start
+            await output.put(_ANSWER_END)
+
+    async def run_sources():
+        try:
+            sources = await extract_sources()
+        except Exception as e:
+            print(f"출처 생성 중 오류 발생: {e}")
+            sources = []
+        timing["sources_done"] = time.perf_counter() - start
+        await output.put({"content": sources, "done": False, "description": "sources"})
+
+    async with asyncio.TaskGroup() as group:
+        group.create_task(run_answer())
+        group.create_task(run_sources())
+
+        # 두 작업이 끝날 때까지 큐에 들어오는 순서대로 전달
+        pending = 2
+        while pending:
+            item = await output.get()
+            if item is _ANSWER_END:
+                pending -= 1
+                continue
+            if item.get("description") == "sources":
+                pending -= 1
+            yield item
+
+    timing["total"] = time.perf_counter() - start
+    yield {"content": "", "done": True, "description": "done", "timing": timing}
+
+
+async def run_timing_check(answer_seconds: float = 1.0, source_seconds: float = 0.8):
+    """가짜 서버/가짜 출처 생성으로 직렬 실행 대비 완료 시간 비교"""
+    from fake_openai_server import FakeOpenAIServer
+
+    tokens = 20
+    async with FakeOpenAIServer(tokens=tokens, delay=answer_seconds / tokens) as server:
+        engine = AnswerStreamEngine(base_url=server.base_url, api_key="test")
+
+        async def fake_sources():
+            await asyncio.sleep(source_seconds)
+            return [{"title": "나라원 연혁", "snippet": "2023년 10월 법인명 변경"}]
+
+        async for item in stream_answer_with_sources("fake-model", "system", "user", fake_sources, engine):
+            if item["done"]:
+                timing = item["timing"]
+        await engine.aclose()
+
+    print(f"답변 첫 청크: {timing['answer_first_chunk']:.2f}초, 출처 준비: {timing['sources_done']:.2f}초")
+    print(f"전체 완료: {timing['total']:.2f}초 (직렬 실행 시 약 {answer_seconds + source_seconds:.2f}초)")
+
+
+if __name__ == "__main__":
+    asyncio.run(run_timing_check())
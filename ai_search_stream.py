@@ -0,0 +1,144 @@
+import asyncio
+import os
+import weakref
+from typing import AsyncIterator, Dict, Optional
+
+import httpx
+import openai
+
+# 스트림 하나당 미리 읽어둘 최대 청크 수 (소비가 느리면 네트워크 읽기도 멈춤)
+MAX_BUFFERED_CHUNKS = 32
+
+_STREAM_END = object()
+
+
+class AnswerStreamEngine:
+    """
+    비동기 답변 스트리밍 엔진
+
+    - 공유 openai.AsyncOpenAI 클라이언트 (httpx 커넥션 풀 재사용)
+    - 스트림 읽기는 별도 Task 에서, 소비자와는 크기 제한 Queue 로 연결 (backpressure)
+    - 이벤트 루프를 막는 동기 호출이 없으므로 여러 스트림이 동시에 진행됨
+    """
+
+    def __init__(
+        self,
+        client: Optional[openai.AsyncOpenAI] = None,
+        base_url: Optional[str] = None,
+        api_key: Optional[str] = None,
+        max_connections: int = 100,
+        max_buffered_chunks: int = MAX_BUFFERED_CHUNKS,
+    ):
+        """
+        Args:
+            client: 직접 만든 AsyncOpenAI 클라이언트 (없으면 풀 설정으로 생성)
+            base_url: OpenAI 호환 서버 주소 (테스트 시 FakeOpenAIServer.base_url)
+            api_key: API 키 (없으면 OPENAI_API_KEY 환경변수)
+            max_connections: 커넥션 풀 최대 연결 수
+            max_buffered_chunks: 스트림당 미리 읽을 최대 청크 수
+        """
+        if client is None:
+            http_client = httpx.AsyncClient(
+                limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections // 5 or 1),
+                timeout=httpx.Timeout(60.0, connect=5.0),
+            )
+            client = openai.AsyncOpenAI(
+                api_key=api_key or os.getenv("OPENAI_API_KEY"),
+                base_url=base_url,
+                http_client=http_client,
+            )
+        self.client = client
+        self.max_buffered_chunks = max_buffered_chunks
+
+    async def stream(self, llm: str, prompt: str, retrievers: str, temperature: float = 0.2) -> AsyncIterator[Dict]:
+        """
+        답변 스트리밍
+
+        Yields:
+            dict: {"content": "...", "done": False, "description": "main_content"}
+        """
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.max_buffered_chunks)
+
+        async def produce():
+            try:
+                response = await self.client.chat.completions.create(
+                    model=llm,
+                    messages=[
+                        {"role": "system", "content": prompt},
+                        {"role": "user", "content": retrievers}
+                    ],
+                    stream=True,
+                    temperature=temperature
+                )
+                async with response:
+                    async for chunk in response:
+                        if not chunk.choices:
+                            continue
+                        delta = chunk.choices[0].delta
+                        if delta and delta.content:
+                            # 큐가 가득 차면 여기서 대기 → 소비 속도에 맞춰 읽기 조절
+                            await queue.put({"content": delta.content, "done": False, "description": "main_content"})
+                await queue.put(_STREAM_END)
+            except Exception as e:
+                await queue.put(e)
+
+        producer = asyncio.create_task(produce())
+        try:
+            while True:
+                item = await queue.get()
+                if item is _STREAM_END:
+                    break
+                if isinstance(item, Exception):
+                    raise item
+                yield item
+        finally:
+            # 소비자가 중간에 멈추면 스트림 읽기도 취소해 연결 반납
+            if not producer.done():
+                producer.cancel()
+                try:
+                    await producer
+                except asyncio.CancelledError:
+                    pass
+
+    async def aclose(self):
+        await self.client.close()
+
+
+# 이벤트 루프 → base_url → 엔진 (httpx 클라이언트는 처음 사용한 루프에 묶이므로 루프마다 따로 만듦, 루프가 사라지면 함께 해제)
+_engines: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[Optional[str], AnswerStreamEngine]]" = weakref.WeakKeyDictionary()
+
+
+def get_answer_engine(base_url: Optional[str] = None) -> AnswerStreamEngine:
+    """현재 이벤트 루프의 base_url 별 공유 엔진 (이벤트 루프 안에서 호출)"""
+    engines = _engines.setdefault(asyncio.get_running_loop(), {})
+    engine = engines.get(base_url)
+    if engine is None:
+        engine = engines[base_url] = AnswerStreamEngine(base_url=base_url)
+    return engine
+
+
+async def run_concurrency_check(stream_count: int = 10, tokens: int = 20, delay: float = 0.05):
+    """가짜 서버로 동시 스트림이 서로를 기다리지 않는지 확인"""
+    import time
+
+    from fake_openai_server import FakeOpenAIServer
+
+    async with FakeOpenAIServer(tokens=tokens, delay=delay) as server:
+        engine = AnswerStreamEngine(base_url=server.base_url, api_key="test")
+
+        async def consume():
+            return [chunk["content"] async for chunk in engine.stream("fake-model", "system", "user")]
+
+        start = time.perf_counter()
+        results = await asyncio.gather(*(consume() for _ in range(stream_count)))
+        elapsed = time.perf_counter() - start
+        await engine.aclose()
+
+    single = tokens * delay
+    print(f"스트림 {stream_count}개 동시 실행: {elapsed:.2f}초 "
+          f"(스트림 1개 {single:.2f}초, 직렬 실행 시 {single * stream_count:.2f}초)")
+    print(f"스트림당 청크 수: {[len(r) for r in results]}")
+
+
+if __name__ == "__main__":
+    asyncio.run(run_concurrency_check())
@@ -1,5 +1,4 @@
 import asyncio
-import json
 import os
 from datetime import datetime
 from dotenv import load_dotenv
@@ -66,83 +65,97 @@ title, snippet은 retrievers에서 직접 추출하지 말고, LLM이 요약/생
     return answer_prompt, logging_prompt
 
 # 답변 생성(스트리밍) 함수 정의 (OpenAI API 필요)
-import openai
-
-async def ai_search_answer_streaming(llm, prompt, retrievers):
-    client = openai.OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
-    loop = asyncio.get_event_loop()
+from ai_search_stream import get_answer_engine
+from ai_search_orchestrator import stream_answer_with_sources
+from source_extractor import extract_sources as extract_sources_locally
+from context_builder import build_context_with_report
+from answer_cache import get_answer_cache
+from retriever_snapshot import load_retrievers
+
+async def ai_search_answer_streaming(llm, prompt, retrievers, query=None, retriever_ids=None):
+    # 공유 AsyncOpenAI 클라이언트로 스트리밍 (이벤트 루프를 막지 않음)
+    engine = get_answer_engine()
     try:
-        def sync_stream():
-            return client.chat.completions.create(
-                model=llm,
-                messages=[
-                    {"role": "system", "content": prompt},
-                    {"role": "user", "content": retrievers}
-                ],
-                stream=True,
-                temperature=0.2
+        if query is None:
+            stream = engine.stream(llm, prompt, retrievers)
+        else:
+            # 같은 질의 + 같은 검색 결과는 캐시된 답변을 같은 청크 형식으로 재생
+            stream = get_answer_cache().stream(
+                llm, prompt, query, retriever_ids or [], lambda: engine.stream(llm, prompt, retrievers)
             )
-        response = await loop.run_in_executor(None, sync_stream)
-        for chunk in response:
-            delta = chunk.choices[0].delta
-            if delta and hasattr(delta, "content"):
-                yield {"content": delta.content, "done": False, "description": "main_content"}
+        async for chunk in stream:
+            yield chunk
     except Exception as e:
         print(f"Error during streaming: {e}")
 
-# retrivers.txt 파일에서 검색 결과 불러오기
+# retrivers.json 검색 결과 불러오기
+# 옆에 만든 .snap 스냅샷을 메모리 맵으로 열고, 파일이 바뀌지 않았으면 프로세스 캐시를 재사용
+# 스냅샷(읽기 전용 시퀀스)을 그대로 돌려줌 → 인덱스/반복 접근한 행만 디코딩
+# json.dumps 나 수정이 필요한 곳에서만 list(...) 로 변환 (스냅샷이 교체되면 이전 스냅샷은 닫힘)
 def load_retrievers_from_txt(filepath="retrivers.json"):
-    with open(filepath, "r", encoding="utf-8") as f:
-        content = f.read().strip()
-        if not content:
-            raise ValueError("retrivers.txt 파일이 비어 있습니다.")
-        try:
-            retrievers = json.loads(content)
-        except json.JSONDecodeError as e:
-            print("retrivers.txt 파일의 JSON 형식이 올바르지 않습니다.")
-            raise e
-    return retrievers
+    return load_retrievers(filepath)
 
 # 테스트 실행 함수
-async def test_answer_and_source():
+async def test_answer_and_source(use_llm_sources=False):
     retrievers = load_retrievers_from_txt()
 
     llm = ChatOpenAI(model_name="gpt-4o-mini", temperature=0, openai_api_key=os.getenv("OPENAI_API_KEY"))
 
     query = "나라원시스템의 연혁을 알려줘"
 
+    # 중복 청크/필드를 정리하고 rank 순으로 토큰 예산만큼만 모델에 전달
+    context, context_report = build_context_with_report(retrievers)
+    print(f"검색 결과 토큰: {context_report['before_tokens']} → {context_report['after_tokens']}")
+
     answer_prompt, logging_prompt = await get_agent_with_rag_ingredient_v3(
         query=query,
     )
 
-    # ReAct agent에서 tool 없이 동작
-    graph_v3 = create_react_agent(
-        llm,
-        tools=[],
-        prompt = logging_prompt.content
-    )
-
     print("\n=== 출처 정보 생성 및 답변 생성 테스트 ===")
-    # LLM이 retrievers를 보고 직접 title, snippet을 생성해서 답변에 포함하도록 유도
-    result = await graph_v3.ainvoke(
-        {
-            "messages": [
-                {"role": "user", "content": str(retrievers) + "의 title과 snippet를 리스트로 생성해줘"}
-            ],
-        }
-    )
-    print(result.get["AIMessage"])
+    if use_llm_sources:
+        # ReAct agent에서 tool 없이 동작
+        graph_v3 = create_react_agent(
+            llm,
+            tools=[],
+            prompt = logging_prompt.content
+        )
+
+        # LLM이 retrievers를 보고 직접 title, snippet을 생성해서 답변에 포함하도록 유도
+        async def extract_sources():
+            result = await graph_v3.ainvoke(
+                {
+                    "messages": [
+                        {"role": "user", "content": context + "의 title과 snippet를 리스트로 생성해줘"}
+                    ],
+                }
+            )
+            return result["messages"][-1].content
+    else:
+        # 기본: 마커 파싱 + 질의 매칭 구간 선택으로 LLM 호출 없이 title, snippet 생성
+        async def extract_sources():
+            return extract_sources_locally(retrievers, query)
 
+    # 답변 스트리밍과 출처 생성을 동시에 실행 (완료 시간 ≈ 둘 중 긴 쪽)
     print("=== 답변 생성(스트리밍) 테스트 ===")
     answer = []
-    # async for chunk in ai_search_answer_streaming(
-    #     llm="gpt-4o-mini",
-    #     prompt=answer_prompt.content,
-    #     retrievers=json.dumps(retrievers, ensure_ascii=False)
-    # ):
-    #     answer.append(chunk.get('content', ''))
-        
-    print(answer)
+    async for chunk in stream_answer_with_sources(
+        llm="gpt-4o-mini",
+        answer_prompt=answer_prompt.content,
+        retrievers=context,
+        extract_sources=extract_sources,
+        query=query,
+        retriever_ids=[retriever["id"] for retriever in retrievers],
+        cache=get_answer_cache(),
+    ):
+        if chunk["description"] == "main_content":
+            answer.append(chunk.get('content', ''))
+            print(chunk["content"], end="", flush=True)
+        elif chunk["description"] == "sources":
+            print(f"\n[출처] {chunk['content']}")
+        elif chunk["description"] == "error":
+            print(f"\n[오류] {chunk['error']}")
+        elif chunk["done"]:
+            print(f"\n소요 시간: {chunk['timing']}")
 
 if __name__ == "__main__":
     asyncio.run(test_answer_and_source())
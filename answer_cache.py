@@ -0,0 +1,234 @@
+import asyncio
+import hashlib
+import re
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from typing import AsyncIterator, Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+_PUNCTUATION = re.compile(r"[^\w\s]")
+_SPACES = re.compile(r"\s+")
+
+CacheKey = Tuple[str, str, Tuple[str, ...], str]  # (llm, 프롬프트 해시, retriever IDs, 정규화 질의)
+GroupKey = Tuple[str, str, Tuple[str, ...]]  # 유사 질의를 찾는 범위 (같은 모델/프롬프트/검색 결과)
+
+
+def normalize_query(query: str) -> str:
+    """캐시 키용 질의 정규화 (NFKC, 소문자, 문장부호 제거, 공백 정리)"""
+    query = unicodedata.normalize("NFKC", query).lower()
+    return _SPACES.sub(" ", _PUNCTUATION.sub(" ", query)).strip()
+
+
+def prompt_hash(prompt: str) -> str:
+    """system 프롬프트(템플릿 포함) 해시 - 프롬프트가 바뀌면 이전 답변을 재사용하지 않음"""
+    return hashlib.sha1(prompt.encode("utf-8")).hexdigest()
+
+
+def _unit(vector: Sequence[float]) -> Optional[np.ndarray]:
+    array = np.asarray(vector, dtype=np.float32)
+    norm = float(np.linalg.norm(array))
+    return array / norm if norm else None
+
+
+class AnswerCache:
+    """
+    AI 검색 답변 캐시
+
+    - 키: (모델, 프롬프트 해시, 검색 결과 ID 집합, 정규화 질의) → 같은 프롬프트 + 같은 질문 + 같은 검색 결과면 재사용
+    - embed 를 주면 같은 모델/프롬프트/검색 결과 안에서 질의 임베딩 유사도가 threshold 이상인 답변도 재사용
+      (그룹별 단위 벡터 행렬을 만들어 두고, 유사도 계산은 lock 밖에서 NumPy 행렬 곱 한 번으로)
+    - LRU + TTL 만료
+    - 저장된 청크를 원래 스트리밍 형식 그대로 다시 내보냄 (클라이언트 입장에서는 응답 속도만 다름)
+    """
+
+    def __init__(
+        self,
+        max_size: int = 1000,
+        ttl: float = 3600,
+        embed: Optional[Callable[[str], Sequence[float]]] = None,
+        similarity_threshold: float = 0.95,
+    ):
+        """
+        Args:
+            max_size: 최대 저장 답변 수
+            ttl: 답변 유지 시간(초)
+            embed: 질의 → 임베딩 벡터 함수 (없으면 정확히 같은 정규화 질의만 재사용)
+            similarity_threshold: 유사 질의로 볼 최소 코사인 유사도
+        """
+        self.max_size = max_size
+        self.ttl = ttl
+        self.embed = embed
+        self.similarity_threshold = similarity_threshold
+        # key → (청크 목록, 만료 시각)
+        self._items: "OrderedDict[CacheKey, Tuple[List[Dict], float]]" = OrderedDict()
+        # 그룹 → {key: 질의 단위 벡터}, 그룹 → (keys, 벡터 행렬) (그룹이 바뀌면 다시 만듦)
+        self._vectors: Dict[GroupKey, Dict[CacheKey, np.ndarray]] = {}
+        self._matrices: Dict[GroupKey, Tuple[List[CacheKey], np.ndarray]] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(llm: str, prompt: str, query: str, retriever_ids: Sequence) -> CacheKey:
+        return llm, prompt_hash(prompt), tuple(sorted(str(i) for i in retriever_ids)), normalize_query(query)
+
+    def _remove(self, key: CacheKey):
+        self._items.pop(key, None)
+        vectors = self._vectors.get(key[:3])
+        if vectors is not None and vectors.pop(key, None) is not None:
+            self._matrices.pop(key[:3], None)
+            if not vectors:
+                del self._vectors[key[:3]]
+
+    def _live(self, key: CacheKey, now: float) -> Optional[Tuple[List[Dict], float]]:
+        item = self._items.get(key)
+        if item is not None and item[1] < now:
+            self._remove(key)
+            return None
+        return item
+
+    def _hit(self, key: CacheKey, item: Tuple[List[Dict], float]) -> List[Dict]:
+        self._items.move_to_end(key)
+        self.hits += 1
+        return item[0]
+
+    def _matrix(self, group: GroupKey) -> Optional[Tuple[List[CacheKey], np.ndarray]]:
+        matrix = self._matrices.get(group)
+        if matrix is None and self._vectors.get(group):
+            keys = list(self._vectors[group])
+            matrix = self._matrices[group] = (keys, np.stack([self._vectors[group][k] for k in keys]))
+        return matrix
+
+    def _get_exact(self, key: CacheKey) -> Optional[List[Dict]]:
+        """정확히 일치하는 답변만 (없어도 misses 는 세지 않음)"""
+        with self._lock:
+            item = self._live(key, time.monotonic())
+            return self._hit(key, item) if item is not None else None
+
+    def get(self, key: CacheKey, query_vector: Optional[Sequence[float]] = None) -> Optional[List[Dict]]:
+        """정확히 일치하는 답변, 없으면 (query_vector 가 있을 때) 같은 그룹에서 가장 유사한 답변"""
+        now = time.monotonic()
+        with self._lock:
+            item = self._live(key, now)
+            if item is not None:
+                return self._hit(key, item)
+            matrix = self._matrix(key[:3]) if query_vector is not None else None
+        query = _unit(query_vector) if matrix is not None else None
+        if query is not None:
+            # 유사도 계산은 lock 밖에서 (행렬은 바뀌면 새로 만들므로 읽는 동안 변경되지 않음)
+            keys, vectors = matrix
+            similarities = vectors @ query
+            order = np.argsort(-similarities, kind="stable")
+            with self._lock:
+                for index in order:
+                    if similarities[index] < self.similarity_threshold:
+                        break
+                    item = self._live(keys[index], now)
+                    if item is not None:
+                        return self._hit(keys[index], item)
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def set(self, key: CacheKey, chunks: List[Dict], query_vector: Optional[Sequence[float]] = None):
+        vector = _unit(query_vector) if query_vector is not None else None
+        with self._lock:
+            self._remove(key)
+            self._items[key] = (chunks, time.monotonic() + self.ttl)
+            if vector is not None:
+                self._vectors.setdefault(key[:3], {})[key] = vector
+                self._matrices.pop(key[:3], None)
+            while len(self._items) > self.max_size:
+                self._remove(next(iter(self._items)))
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    async def stream(
+        self,
+        llm: str,
+        prompt: str,
+        query: str,
+        retriever_ids: Sequence,
+        stream_factory: Callable[[], AsyncIterator[Dict]],
+    ) -> AsyncIterator[Dict]:
+        """
+        캐시된 답변을 재생하거나, 없으면 stream_factory() 로 생성하면서 저장
+
+        스트림이 끝까지 정상 완료된 경우에만 저장합니다 (중간 오류/취소된 답변은 저장하지 않음).
+
+        Args:
+            llm: 답변 모델 이름
+            prompt: 답변용 system 프롬프트 (키에는 해시만 사용)
+            query: 사용자 질의
+            retriever_ids: 답변에 사용한 검색 결과 ID 목록
+            stream_factory: 답변 스트림을 새로 만드는 함수 (예: lambda: engine.stream(...))
+
+        Yields:
+            dict: {"content", "done": False, "description": "main_content"}
+        """
+        key = self.make_key(llm, prompt, query, retriever_ids)
+        # 정확히 일치하면 질의 임베딩을 계산하지 않고 바로 재생
+        query_vector = None
+        cached = self._get_exact(key)
+        if cached is None:
+            query_vector = await asyncio.to_thread(self.embed, key[3]) if self.embed else None
+            cached = self.get(key, query_vector)
+        if cached is not None:
+            for chunk in cached:
+                yield dict(chunk)
+            return
+
+        chunks = []
+        async for chunk in stream_factory():
+            chunks.append(dict(chunk))
+            yield chunk
+        self.set(key, chunks, query_vector)
+
+
+_answer_cache: Optional[AnswerCache] = None
+
+
+def get_answer_cache() -> AnswerCache:
+    """프로세스 공유 답변 캐시"""
+    global _answer_cache
+    if _answer_cache is None:
+        _answer_cache = AnswerCache()
+    return _answer_cache
+
+
+async def run_cache_check():
+    """가짜 서버로 캐시 미스/정확 일치/유사 질의 응답 시간 비교"""
+    from ai_search_stream import AnswerStreamEngine
+    from fake_openai_server import FakeOpenAIServer
+
+    def bigram_embed(text: str) -> List[float]:
+        # 테스트용 글자 bigram 해시 임베딩
+        vector = [0.0] * 256
+        compact = text.replace(" ", "")
+        for i in range(len(compact) - 1):
+            vector[hash(compact[i:i + 2]) % 256] += 1.0
+        return vector
+
+    cache = AnswerCache(embed=bigram_embed, similarity_threshold=0.8)
+    retriever_ids = [17034, 17088, 17029]
+    async with FakeOpenAIServer(tokens=20, delay=0.05) as server:
+        engine = AnswerStreamEngine(base_url=server.base_url, api_key="test")
+        for query in ("나라원시스템의 연혁을 알려줘", "나라원시스템의 연혁을 알려줘?", "나라원시스템 연혁을 알려줘"):
+            start = time.perf_counter()
+            chunks = [
+                chunk async for chunk in cache.stream(
+                    "fake-model", "system", query, retriever_ids,
+                    lambda: engine.stream("fake-model", "system", query),
+                )
+            ]
+            print(f"{query!r}: 청크 {len(chunks)}개, {time.perf_counter() - start:.3f}초")
+        await engine.aclose()
+        print(f"캐시 적중 {cache.hits}회, 미스 {cache.misses}회, 서버 요청 {server.request_count}회")
+
+
+if __name__ == "__main__":
+    asyncio.run(run_cache_check())
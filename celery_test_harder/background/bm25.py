@@ -0,0 +1,258 @@
+import math
+import re
+import threading
+import unicodedata
+from array import array
+from collections import Counter
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+# 한국어 조사/어미 (긴 것부터 검사)
+KOREAN_SUFFIXES = sorted([
+    "은", "는", "이", "가", "을", "를", "의", "에", "에서", "에게", "께서", "한테", "으로", "로",
+    "와", "과", "도", "만", "부터", "까지", "이나", "나", "이랑", "랑", "보다", "처럼", "마다",
+    "이다", "입니다", "이에요", "예요", "인가요", "란", "이란",
+], key=len, reverse=True)
+
+_TOKEN_PATTERN = re.compile(r"[0-9a-z]+|[가-힣]+|[぀-ヿ一-鿿]+")
+_HANGUL_PATTERN = re.compile(r"[가-힣]+")
+
+
+def tokenize_korean(text: str) -> List[str]:
+    """
+    한국어 검색용 토크나이저 (형태소 분석기 없이 동작)
+
+    - NFKC 정규화 + 소문자 변환 (㈜ → (주), 전각 영숫자 → 반각)
+    - 한글 단어는 조사를 떼어낸 원형과 글자 bigram 을 함께 색인
+      ("나라원시스템" 과 "나라원 시스템의" 가 bigram 으로 서로 매칭됨)
+    - 영문/숫자는 단어 단위, 한자/가나는 글자 bigram
+
+    Returns:
+        list[str]: 토큰 리스트 (중복 포함, tf 계산용)
+    """
+    text = unicodedata.normalize("NFKC", text).lower()
+    tokens = []
+    for word in _TOKEN_PATTERN.findall(text):
+        if _HANGUL_PATTERN.fullmatch(word):
+            for suffix in KOREAN_SUFFIXES:
+                if len(word) > len(suffix) + 1 and word.endswith(suffix):
+                    word = word[:-len(suffix)]
+                    break
+            tokens.append(word)
+            if len(word) > 2:
+                tokens.extend(word[i:i + 2] for i in range(len(word) - 1))
+        elif word.isascii():
+            tokens.append(word)
+        else:
+            tokens.append(word)
+            tokens.extend(word[i:i + 2] for i in range(len(word) - 1))
+    return tokens
+
+
+class BM25Index:
+    """
+    증분 BM25 역색인
+
+    문서를 추가할 때 posting 리스트(array)와 문서 길이에 append 만 하므로 전체 재색인이 필요 없습니다.
+    검색은 질의어 posting 에 있는 문서만 NumPy 로 점수를 누적해 top-k 를 뽑습니다
+    (전체 문서 수가 아니라 posting 길이에 비례).
+    """
+
+    def __init__(self, k1: float = 1.5, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self._mutex = threading.RLock()
+        self._ids: List[Any] = []
+        self._metadata: List[Dict[str, Any]] = []
+        self._doc_lengths = array("i")
+        self._total_length = 0
+        self._postings_rows: Dict[str, array] = {}
+        self._postings_tfs: Dict[str, array] = {}
+        self._synced_rows = 0  # sync_from_vector_index() 로 읽은 행 수
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def add(self, doc_id: Any, text: str, metadata: Optional[Dict[str, Any]] = None):
+        """문서 하나 색인"""
+        term_counts = Counter(tokenize_korean(text))
+        with self._mutex:
+            row = len(self._ids)
+            self._ids.append(doc_id)
+            self._metadata.append(metadata or {})
+            length = sum(term_counts.values())
+            self._doc_lengths.append(length)
+            self._total_length += length
+            for term, tf in term_counts.items():
+                rows = self._postings_rows.get(term)
+                if rows is None:
+                    rows = self._postings_rows[term] = array("i")
+                    self._postings_tfs[term] = array("i")
+                rows.append(row)
+                self._postings_tfs[term].append(tf)
+
+    def sync_from_vector_index(self, vector_index) -> int:
+        """
+        VectorIndex 청크 저장소에 새로 추가된 청크만 색인
+
+        Returns:
+            int: 새로 색인한 청크 수
+        """
+        vector_index.refresh()
+        with self._mutex:
+            start = self._synced_rows
+            count = 0
+            for doc_id, metadata in vector_index.iter_documents(start):
+                self.add(doc_id, metadata.get("content", ""), metadata)
+                count += 1
+            self._synced_rows = start + count
+            return count
+
+    def search(self, query: str, k: int = 10) -> List[Dict[str, Any]]:
+        """
+        BM25 top-k 검색
+
+        Returns:
+            list: [{"id", "bm25_score", "rank", "metadata"}, ...]
+        """
+        terms = set(tokenize_korean(query))
+        with self._mutex:
+            total = len(self._ids)
+            if total == 0 or not terms:
+                return []
+            doc_lengths = np.frombuffer(self._doc_lengths, dtype=np.int32)
+            # 길이 정규화 k1 * (1 - b + b * len / avg) = norm_base + norm_scale * len (posting 행에만 적용)
+            norm_base = self.k1 * (1.0 - self.b)
+            norm_scale = self.k1 * self.b * total / self._total_length if self._total_length else 0.0
+            term_rows, term_scores = [], []
+            for term in terms:
+                rows_buffer = self._postings_rows.get(term)
+                if rows_buffer is None:
+                    continue
+                rows = np.frombuffer(rows_buffer, dtype=np.int32)
+                tfs = np.frombuffer(self._postings_tfs[term], dtype=np.int32).astype(np.float32)
+                norm = norm_base + norm_scale * doc_lengths[rows]
+                idf = math.log(1.0 + (total - len(rows) + 0.5) / (len(rows) + 0.5))
+                term_rows.append(rows)
+                term_scores.append(idf * tfs * (self.k1 + 1.0) / (tfs + norm))
+            if not term_rows:
+                return []
+
+            # 질의어별 점수를 문서 단위로 합산 (posting 에 나온 문서만)
+            candidates, inverse = np.unique(np.concatenate(term_rows), return_inverse=True)
+            scores = np.bincount(inverse, weights=np.concatenate(term_scores)).astype(np.float32)
+            order = np.flatnonzero(scores)
+            if len(order) > k:
+                order = order[np.argpartition(-scores[order], k - 1)[:k]]
+            order = order[np.argsort(-scores[order], kind="stable")]
+            return [
+                {
+                    "id": self._ids[candidates[i]],
+                    "bm25_score": float(scores[i]),
+                    "rank": rank,
+                    "metadata": self._metadata[candidates[i]],
+                }
+                for rank, i in enumerate(order, start=1)
+            ]
+
+
+def reciprocal_rank_fusion(
+    result_lists: Sequence[List[Dict[str, Any]]],
+    k: int = 60,
+    weights: Optional[Sequence[float]] = None,
+    top_n: Optional[int] = None,
+) -> List[Dict[str, Any]]:
+    """
+    RRF(Reciprocal Rank Fusion)로 여러 검색 결과 병합
+
+    점수 스케일이 다른 BM25 점수와 벡터 유사도를 순위만으로 합칩니다.
+    score(d) = Σ weight_i / (k + rank_i(d))
+
+    Args:
+        result_lists: 검색기별 결과 리스트 (각 항목은 "id" 필드 필요, 순위 순으로 정렬)
+        k: RRF 상수 (클수록 하위 순위 영향 증가)
+        weights: 검색기별 가중치 (기본값 모두 1.0)
+        top_n: 반환할 최대 결과 수
+
+    Returns:
+        list: 원래 필드(faiss_score, distance, bm25_score 등)를 합친 항목 + rrf_score, rank
+    """
+    weights = weights or [1.0] * len(result_lists)
+    fused: Dict[Any, Dict[str, Any]] = {}
+    for results, weight in zip(result_lists, weights):
+        for position, item in enumerate(results, start=1):
+            entry = fused.get(item["id"])
+            if entry is None:
+                entry = fused[item["id"]] = {**item, "rrf_score": 0.0}
+            else:
+                entry.update({key: value for key, value in item.items() if key not in entry})
+            entry["rrf_score"] += weight / (k + position)
+
+    merged = sorted(fused.values(), key=lambda x: x["rrf_score"], reverse=True)
+    if top_n is not None:
+        merged = merged[:top_n]
+    for rank, entry in enumerate(merged, start=1):
+        entry["rank"] = rank
+    return merged
+
+
+class HybridRetriever:
+    """BM25(정확한 용어, 회사명 등) + 벡터 검색 결과를 RRF 로 병합하는 검색기"""
+
+    def __init__(self, vector_index, bm25_index: Optional[BM25Index] = None, candidates: int = 50,
+                 vector_weight: float = 1.0, bm25_weight: float = 1.0):
+        """
+        Args:
+            vector_index: background.vector_index.VectorIndex
+            bm25_index: 없으면 새로 만들어 vector_index 의 청크로 증분 색인
+            candidates: 검색기별로 가져올 후보 수
+        """
+        self.vector_index = vector_index
+        self.bm25_index = bm25_index if bm25_index is not None else BM25Index()
+        self.candidates = candidates
+        self.weights = [vector_weight, bm25_weight]
+
+    def search(self, query: str, query_vector, k: int = 10) -> List[Dict[str, Any]]:
+        """질의 텍스트 + 질의 임베딩으로 하이브리드 검색"""
+        self.bm25_index.sync_from_vector_index(self.vector_index)
+        vector_results = self.vector_index.search(query_vector, k=self.candidates)[0]
+        bm25_results = self.bm25_index.search(query, k=self.candidates)
+        return reciprocal_rank_fusion([vector_results, bm25_results], weights=self.weights, top_n=k)
+
+
+def run_benchmark(chunk_count: int = 1000000, query_count: int = 200, k: int = 10):
+    """청크 수 chunk_count 규모에서 BM25 질의 지연시간 측정"""
+    import random
+    import time
+
+    rng = random.Random(42)
+    companies = [f"{prefix}{suffix}" for prefix in ["나라원", "아사달", "가온", "한빛", "누리", "다온", "새롬", "미래"]
+                 for suffix in ["시스템", "테크", "솔루션", "소프트", "네트웍스"]]
+    vocabulary = ["연혁", "유지관리", "운영", "홈페이지", "통합", "서비스", "사업", "수행", "법인명", "변경",
+                  "공공사업부문", "구축", "개선", "용역", "교육청", "대학교", "재단", "시스템을", "서비스의",
+                  "플랫폼", "보안", "클라우드", "데이터", "분석", "검색", "AI", "2021년", "2023년", "10월"]
+    vocabulary += [f"단어{i}" for i in range(5000)]
+
+    index = BM25Index()
+    start = time.perf_counter()
+    for i in range(chunk_count):
+        words = rng.choices(vocabulary, k=40)
+        if i % 50 == 0:
+            words.append(rng.choice(companies))
+        index.add(i, " ".join(words))
+    print(f"색인: {chunk_count:,}개 청크, {time.perf_counter() - start:.1f}초")
+
+    queries = [f"{rng.choice(companies)}의 {rng.choice(vocabulary[:29])}" for _ in range(query_count)]
+    latencies = []
+    for query in queries:
+        start = time.perf_counter()
+        index.search(query, k)
+        latencies.append((time.perf_counter() - start) * 1000)
+    latencies.sort()
+    print(f"질의 {query_count}개: p50 {latencies[len(latencies) // 2]:.1f}ms, "
+          f"p95 {latencies[int(len(latencies) * 0.95)]:.1f}ms, max {latencies[-1]:.1f}ms")
+
+
+if __name__ == "__main__":
+    run_benchmark()
@@ -0,0 +1,148 @@
+import hashlib
+import logging
+from typing import Any, Dict, List, Optional, Tuple
+
+from background.codec import default_codec
+
+logger = logging.getLogger(__name__)
+
+# 청크 구간(range) 하나에 포함되는 청크 수
+DEFAULT_RANGE_SIZE = 50
+# 체크포인트 보관 시간 (재제출까지 고려해 24시간)
+CHECKPOINT_TTL = 86400
+
+
+def compute_file_hash(file_path: str, block_size: int = 1024 * 1024) -> str:
+    """
+    파일 내용 기반 SHA-256 해시 계산 (대용량 파일도 블록 단위로 스트리밍)
+
+    Args:
+        file_path: 해시를 계산할 파일 경로
+        block_size: 한 번에 읽을 바이트 수
+
+    Returns:
+        str: 16진수 해시 문자열
+    """
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for block in iter(lambda: f.read(block_size), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class ChunkCheckpoint:
+    """
+    문서 단계별 청크 구간 체크포인트
+
+    작업 ID 대신 범위(scope) + 파일 해시 + 단계 이름으로 키를 만들기 때문에
+    재시도(같은 task_id)뿐 아니라 파이프라인 재제출(새 task_id)에서도
+    이미 끝난 구간은 건너뛰고 남은 구간만 처리할 수 있습니다.
+    scope 는 결과가 유효한 범위입니다 (추출기/임베딩 모델 버전, 벡터 저장소 세대 등).
+    범위가 바뀌면 다른 키를 쓰므로 예를 들어 인덱스를 비운 뒤 재제출하면 저장 단계를 다시 수행합니다.
+    모든 키는 ttl 후 만료됩니다 (구간을 완료할 때마다 갱신).
+
+    Redis 구조:
+        checkpoint:{scope}:{step}:{file_hash}:{total}x{range_size}          → 완료 구간 비트맵
+        checkpoint:{scope}:{step}:{file_hash}:{total}x{range_size}:r{idx}   → 구간별 결과 (codec 인코딩)
+    """
+
+    def __init__(
+        self,
+        client,
+        file_hash: str,
+        step: str,
+        total: int,
+        scope: str,
+        range_size: int = DEFAULT_RANGE_SIZE,
+        ttl: int = CHECKPOINT_TTL,
+    ):
+        """
+        Args:
+            client: decode_responses=False 로 생성한 Redis 클라이언트 (비트맵을 bytes로 읽기 위함)
+            file_hash: compute_file_hash() 결과
+            step: 파이프라인 단계 이름
+            total: 단계에서 처리할 전체 청크 수
+            scope: 체크포인트 결과가 유효한 범위 (예: "text-embedding-3-small", 벡터 저장소 세대, 작업 ID)
+            range_size: 구간 하나당 청크 수
+            ttl: 체크포인트 보관 시간(초)
+        """
+        self.client = client
+        self.total = total
+        self.range_size = max(1, range_size)
+        self.range_count = (total + self.range_size - 1) // self.range_size
+        self.ttl = ttl
+        # 청크 수나 구간 크기가 바뀌면 다른 키를 사용 (이전 비트맵과 섞이지 않도록)
+        self.key = f"checkpoint:{scope}:{step}:{file_hash}:{total}x{self.range_size}"
+
+    def _range_key(self, range_index: int) -> str:
+        return f"{self.key}:r{range_index}"
+
+    def range_bounds(self, range_index: int) -> Tuple[int, int]:
+        """구간 번호 → (시작 청크 인덱스, 끝 청크 인덱스(미포함))"""
+        start = range_index * self.range_size
+        return start, min(start + self.range_size, self.total)
+
+    def completed_ranges(self) -> List[int]:
+        """완료된 구간 번호 목록 (비트맵 한 번 조회)"""
+        bitmap = self.client.get(self.key) or b""
+        completed = []
+        for range_index in range(self.range_count):
+            byte_index = range_index >> 3
+            if byte_index >= len(bitmap):
+                break
+            # Redis SETBIT 은 바이트 내에서 최상위 비트부터 0번
+            if bitmap[byte_index] & (0x80 >> (range_index & 7)):
+                completed.append(range_index)
+        return completed
+
+    def missing_ranges(self) -> List[int]:
+        """아직 처리되지 않은 구간 번호 목록"""
+        completed = set(self.completed_ranges())
+        return [i for i in range(self.range_count) if i not in completed]
+
+    def is_complete(self) -> bool:
+        return not self.missing_ranges()
+
+    def mark_done(self, range_index: int, results: List[Dict[str, Any]]):
+        """구간 결과 저장 후 비트맵에 완료 표시 (원자적으로 함께 반영)"""
+        pipe = self.client.pipeline()
+        pipe.setex(self._range_key(range_index), self.ttl, default_codec.encode(results))
+        pipe.setbit(self.key, range_index, 1)
+        pipe.expire(self.key, self.ttl)
+        pipe.execute()
+        logger.info(f"체크포인트 저장: {self.key} 구간 {range_index + 1}/{self.range_count}")
+
+    def load_results(self, range_indexes: Optional[List[int]] = None) -> Dict[int, List[Dict[str, Any]]]:
+        """
+        저장된 구간 결과 조회
+
+        Returns:
+            dict: {구간 번호: 결과 리스트} (만료 등으로 사라진 구간은 제외)
+        """
+        if range_indexes is None:
+            range_indexes = self.completed_ranges()
+        if not range_indexes:
+            return {}
+        values = self.client.mget([self._range_key(i) for i in range_indexes])
+        return {
+            range_index: default_codec.decode(value)
+            for range_index, value in zip(range_indexes, values)
+            if value is not None
+        }
+
+    def resume(self) -> Tuple[Dict[int, List[Dict[str, Any]]], List[int]]:
+        """
+        재시작 계획 조회
+
+        Returns:
+            tuple: (완료 구간 결과 dict, 처리해야 할 구간 번호 목록)
+                   비트는 켜져 있지만 결과가 사라진 구간은 다시 처리 대상에 포함
+        """
+        done = self.load_results()
+        missing = [i for i in range(self.range_count) if i not in done]
+        return done, missing
+
+    def clear(self):
+        """체크포인트 전체 삭제"""
+        keys = [self.key] + [self._range_key(i) for i in range(self.range_count)]
+        self.client.delete(*keys)
@@ -0,0 +1,183 @@
+import json
+import logging
+import os
+import zlib
+from typing import Any, Callable, Dict, Tuple
+
+logger = logging.getLogger(__name__)
+
+try:
+    import msgpack
+except ImportError:  # 선택 의존성
+    msgpack = None
+
+try:
+    import zstandard
+except ImportError:  # 선택 의존성
+    zstandard = None
+
+# 저장 포맷: MAGIC(3) + 직렬화 ID(1) + 압축 ID(1) + 본문
+# JSON 텍스트는 NUL 바이트로 시작할 수 없으므로, 헤더가 없으면 기존 JSON 문자열로 간주
+MAGIC = b"\x00PC"
+HEADER_SIZE = len(MAGIC) + 2
+
+# 이 크기(bytes) 미만의 payload 는 압축하지 않음 (작은 진행률 데이터는 압축 이득보다 비용이 큼)
+COMPRESS_THRESHOLD = int(os.environ.get("PAYLOAD_COMPRESS_THRESHOLD", "1024"))
+
+# 직렬화기: 이름 → (ID, dumps, loads)
+SERIALIZERS: Dict[str, Tuple[int, Callable[[Any], bytes], Callable[[bytes], Any]]] = {
+    "json": (
+        1,
+        lambda obj: json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8"),
+        json.loads,
+    ),
+}
+if msgpack is not None:
+    SERIALIZERS["msgpack"] = (
+        2,
+        lambda obj: msgpack.packb(obj, use_bin_type=True),
+        lambda data: msgpack.unpackb(data, raw=False),
+    )
+
+# 압축기: 이름 → (ID, compress, decompress)
+COMPRESSORS: Dict[str, Tuple[int, Callable[[bytes], bytes], Callable[[bytes], bytes]]] = {
+    "none": (0, lambda data: data, lambda data: data),
+    "zlib": (1, lambda data: zlib.compress(data, 6), zlib.decompress),
+}
+if zstandard is not None:
+    COMPRESSORS["zstd"] = (
+        2,
+        lambda data: zstandard.ZstdCompressor(level=3).compress(data),
+        lambda data: zstandard.ZstdDecompressor().decompress(data),
+    )
+
+
+def register_serializer(name: str, serializer_id: int, dumps: Callable[[Any], bytes], loads: Callable[[bytes], Any]):
+    """직렬화기 추가 등록 (ID 는 저장 데이터에 기록되므로 한 번 정하면 바꾸지 말 것)"""
+    SERIALIZERS[name] = (serializer_id, dumps, loads)
+
+
+def register_compressor(name: str, compressor_id: int, compress: Callable[[bytes], bytes], decompress: Callable[[bytes], bytes]):
+    """압축기 추가 등록 (ID 는 저장 데이터에 기록되므로 한 번 정하면 바꾸지 말 것)"""
+    COMPRESSORS[name] = (compressor_id, compress, decompress)
+
+
+class PayloadCodec:
+    """
+    Redis 저장용 payload 인코더/디코더
+
+    - 직렬화: json / msgpack
+    - 압축: zstd / zlib (COMPRESS_THRESHOLD 이상일 때만)
+    - 디코딩은 헤더의 ID 를 보고 자동 선택하므로 설정이 바뀌어도 기존 데이터를 읽을 수 있음
+    """
+
+    def __init__(self, serializer: str = "msgpack", compressor: str = "zstd", threshold: int = COMPRESS_THRESHOLD):
+        """
+        Args:
+            serializer: 직렬화기 이름 (설치되지 않았으면 json 사용)
+            compressor: 압축기 이름 (설치되지 않았으면 zlib 사용)
+            threshold: 압축을 적용할 최소 크기(bytes)
+        """
+        if serializer not in SERIALIZERS:
+            logger.warning(f"직렬화기 '{serializer}' 사용 불가, json 사용")
+            serializer = "json"
+        if compressor not in COMPRESSORS:
+            logger.warning(f"압축기 '{compressor}' 사용 불가, zlib 사용")
+            compressor = "zlib"
+        self.serializer = serializer
+        self.compressor = compressor
+        self.threshold = threshold
+
+    def encode(self, obj: Any) -> bytes:
+        """객체 → 헤더 포함 bytes"""
+        serializer_id, dumps, _ = SERIALIZERS[self.serializer]
+        body = dumps(obj)
+        compressor_id = 0
+        if len(body) >= self.threshold:
+            compressor_id, compress, _ = COMPRESSORS[self.compressor]
+            body = compress(body)
+        return MAGIC + bytes((serializer_id, compressor_id)) + body
+
+    @staticmethod
+    def decode(data) -> Any:
+        """bytes → 객체 (헤더가 없는 기존 JSON 문자열도 그대로 읽음)"""
+        if data is None:
+            return None
+        if isinstance(data, str):
+            return json.loads(data)
+        if not data.startswith(MAGIC):
+            return json.loads(data)
+
+        serializer_id, compressor_id = data[len(MAGIC)], data[len(MAGIC) + 1]
+        _, decompress = _lookup(COMPRESSORS, compressor_id, "압축")
+        _, loads = _lookup(SERIALIZERS, serializer_id, "직렬화")
+        return loads(decompress(data[HEADER_SIZE:]))
+
+
+def _lookup(table: Dict[str, Tuple], entry_id: int, kind: str) -> Tuple[Callable, Callable]:
+    """헤더에 기록된 ID 로 직렬화기/압축기 조회"""
+    for registered_id, forward, backward in table.values():
+        if registered_id == entry_id:
+            return forward, backward
+    raise ValueError(f"알 수 없는 {kind} ID: {entry_id}")
+
+
+# 기본 코덱 (환경변수로 변경 가능)
+default_codec = PayloadCodec(
+    serializer=os.environ.get("PAYLOAD_SERIALIZER", "msgpack"),
+    compressor=os.environ.get("PAYLOAD_COMPRESSOR", "zstd"),
+)
+
+
+def _make_chunk_set(chunk_count: int, with_embeddings: bool) -> Dict[str, Any]:
+    """벤치마크용 청크 데이터 (파이프라인 중간 결과와 같은 구조)"""
+    import random
+
+    rng = random.Random(42)
+    words = ["나라원시스템", "연혁", "유지관리", "운영", "홈페이지", "통합", "서비스", "사업", "수행",
+             "2023년", "법인명", "변경", "공공사업부문", "system", "AI", "검색", "문서", "청크"]
+    chunks = []
+    for i in range(chunk_count):
+        content = " ".join(rng.choice(words) for _ in range(90))[:500]
+        chunk = {
+            "chunk_id": i,
+            "content": content,
+            "start_pos": i * 500,
+            "end_pos": (i + 1) * 500,
+            "char_count": len(content),
+        }
+        if with_embeddings:
+            chunk["embedding"] = [rng.uniform(-1, 1) for _ in range(1536)]
+            chunk["embedding_model"] = "text-embedding-3-small"
+        chunks.append(chunk)
+    return {"file_path": "data/uploads/bench/doc.pdf", "chunks": chunks, "total_chunks": chunk_count}
+
+
+def run_benchmark(chunk_count: int = 200, repeat: int = 5):
+    """직렬화/압축 조합별 저장 크기와 인코딩/디코딩 시간 비교"""
+    import time
+
+    for with_embeddings in (False, True):
+        payload = _make_chunk_set(chunk_count, with_embeddings)
+        baseline = len(json.dumps(payload).encode("utf-8"))  # 기존 save_intermediate_result 방식
+        label = "텍스트+임베딩" if with_embeddings else "텍스트 청크"
+        print(f"\n[{label}] 청크 {chunk_count}개, 기존 JSON {baseline / 1024:,.1f} KB")
+        print(f"{'codec':<18}{'size(KB)':>10}{'saved':>8}{'encode(ms)':>12}{'decode(ms)':>12}")
+        for serializer in SERIALIZERS:
+            for compressor in COMPRESSORS:
+                codec = PayloadCodec(serializer, compressor, threshold=0)
+                start = time.perf_counter()
+                for _ in range(repeat):
+                    encoded = codec.encode(payload)
+                encode_ms = (time.perf_counter() - start) / repeat * 1000
+                start = time.perf_counter()
+                for _ in range(repeat):
+                    codec.decode(encoded)
+                decode_ms = (time.perf_counter() - start) / repeat * 1000
+                saved = 1 - len(encoded) / baseline
+                print(f"{serializer + '+' + compressor:<18}{len(encoded) / 1024:>10,.1f}{saved:>8.0%}"
+                      f"{encode_ms:>12.2f}{decode_ms:>12.2f}")
+
+
+if __name__ == "__main__":
+    run_benchmark()
@@ -0,0 +1,270 @@
+import asyncio
+import hashlib
+import logging
+import math
+import threading
+import time
+from collections import OrderedDict, defaultdict
+from typing import Any, Callable, Dict, List, Optional, Sequence, Set, Tuple
+
+from background.bm25 import tokenize_korean
+
+logger = logging.getLogger(__name__)
+
+Pair = Tuple[str, str]  # (query, document text)
+
+
+class RerankScorer:
+    """(query, document) 쌍 점수 계산기 인터페이스"""
+
+    def score_pairs(self, pairs: Sequence[Pair]) -> List[float]:
+        """쌍 목록의 관련도 점수 (높을수록 관련). 동기 함수이며 executor 에서 실행됨"""
+        raise NotImplementedError
+
+
+class CohereScorer(RerankScorer):
+    """Cohere rerank API 점수 (원격)"""
+
+    def __init__(self, client=None, model: str = "rerank-v3.5"):
+        """
+        Args:
+            client: cohere.ClientV2 (없으면 환경변수 CO_API_KEY 로 생성)
+            model: rerank 모델 이름
+        """
+        if client is None:
+            import cohere
+
+            client = cohere.ClientV2()
+        self.client = client
+        self.model = model
+
+    def score_pairs(self, pairs: Sequence[Pair]) -> List[float]:
+        # 같은 query 의 문서들을 모아 query 당 한 번만 호출
+        grouped: Dict[str, List[int]] = defaultdict(list)
+        for i, (query, _) in enumerate(pairs):
+            grouped[query].append(i)
+        scores = [0.0] * len(pairs)
+        for query, indexes in grouped.items():
+            response = self.client.rerank(
+                model=self.model,
+                query=query,
+                documents=[pairs[i][1] for i in indexes],
+                top_n=len(indexes),
+            )
+            for result in response.results:
+                scores[indexes[result.index]] = result.relevance_score
+        return scores
+
+
+class LexicalScorer(RerankScorer):
+    """
+    로컬 어휘 기반 점수 (오프라인/테스트용)
+
+    질의 토큰 중 문서에 포함된 비율(coverage)과 문서 길이 패널티를 조합합니다.
+    """
+
+    def score_pairs(self, pairs: Sequence[Pair]) -> List[float]:
+        token_cache: Dict[str, set] = {}
+        scores = []
+        for query, document in pairs:
+            query_tokens = token_cache.get(query)
+            if query_tokens is None:
+                query_tokens = token_cache[query] = set(tokenize_korean(query))
+            document_tokens = tokenize_korean(document)
+            if not query_tokens or not document_tokens:
+                scores.append(0.0)
+                continue
+            matched = len(query_tokens.intersection(document_tokens))
+            coverage = matched / len(query_tokens)
+            scores.append(coverage / (1.0 + 0.1 * math.log1p(len(document_tokens))))
+        return scores
+
+
+class EmbeddingScorer(RerankScorer):
+    """로컬 임베딩 코사인 유사도 점수"""
+
+    def __init__(self, embed: Callable[[List[str]], List[Sequence[float]]]):
+        """
+        Args:
+            embed: 텍스트 리스트 → 벡터 리스트 함수
+        """
+        self.embed = embed
+
+    def score_pairs(self, pairs: Sequence[Pair]) -> List[float]:
+        texts = list({text for pair in pairs for text in pair})
+        vectors = dict(zip(texts, self.embed(texts)))
+        scores = []
+        for query, document in pairs:
+            q, d = vectors[query], vectors[document]
+            dot = sum(a * b for a, b in zip(q, d))
+            norm = math.sqrt(sum(a * a for a in q)) * math.sqrt(sum(b * b for b in d))
+            scores.append(dot / norm if norm else 0.0)
+        return scores
+
+
+class ScoreCache:
+    """(query 해시, 문서 ID) → 점수 LRU + TTL 캐시"""
+
+    def __init__(self, max_size: int = 100000, ttl: float = 3600):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._items: "OrderedDict[Tuple[str, str], Tuple[float, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Tuple[str, str]) -> Optional[float]:
+        with self._lock:
+            item = self._items.get(key)
+            if item is None:
+                return None
+            score, expires_at = item
+            if expires_at < time.monotonic():
+                del self._items[key]
+                return None
+            self._items.move_to_end(key)
+            return score
+
+    def set(self, key: Tuple[str, str], score: float):
+        with self._lock:
+            self._items[key] = (score, time.monotonic() + self.ttl)
+            self._items.move_to_end(key)
+            while len(self._items) > self.max_size:
+                self._items.popitem(last=False)
+
+
+def query_hash(query: str) -> str:
+    """공백/대소문자 정규화한 질의 해시 (캐시 키용)"""
+    normalized = " ".join(query.lower().split())
+    return hashlib.sha1(normalized.encode("utf-8")).hexdigest()
+
+
+class Reranker:
+    """
+    rerank 서브시스템
+
+    - 요청당 max_candidates 개로 먼저 자른 뒤 점수 계산 (요청당 비용 상한)
+    - (query 해시, 문서 ID) 점수 캐시
+    - 동시에 들어온 요청들의 쌍을 max_wait_ms 동안 모아 scorer 를 한 번에 호출 (micro-batching)
+    """
+
+    def __init__(
+        self,
+        scorer: RerankScorer,
+        max_candidates: int = 20,
+        max_batch_size: int = 64,
+        max_wait_ms: float = 5.0,
+        cache: Optional[ScoreCache] = None,
+    ):
+        self.scorer = scorer
+        self.max_candidates = max_candidates
+        self.max_batch_size = max_batch_size
+        self.max_wait_ms = max_wait_ms
+        self.cache = cache or ScoreCache()
+        self._pending: List[Tuple[Pair, asyncio.Future]] = []
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+        self._tasks: Set[asyncio.Task] = set()  # 진행 중인 배치 (참조를 잡아 두지 않으면 GC 될 수 있음)
+
+    async def rerank(
+        self,
+        query: str,
+        documents: Sequence[Any],
+        top_n: int = 5,
+        text_key: str = "text",
+        id_key: str = "id",
+    ) -> List[Dict[str, Any]]:
+        """
+        문서 재정렬
+
+        Args:
+            query: 질의
+            documents: 문자열 또는 dict (dict 면 text_key 필드를 본문으로, id_key 필드를 캐시 키로 사용)
+            top_n: 반환할 결과 수
+
+        Returns:
+            list: cohere rerank 결과와 같은 구조 [{"index", "relevance_score", "document"}, ...]
+        """
+        candidates = list(documents)[:self.max_candidates]
+        q_hash = query_hash(query)
+        scores: List[Optional[float]] = []
+        waiting = []
+        for index, document in enumerate(candidates):
+            text = document.get(text_key, "") if isinstance(document, dict) else str(document)
+            doc_id = document.get(id_key) if isinstance(document, dict) else None
+            if doc_id is None:
+                doc_id = hashlib.sha1(text.encode("utf-8")).hexdigest()
+            key = (q_hash, str(doc_id))
+            score = self.cache.get(key)
+            scores.append(score)
+            if score is None:
+                waiting.append((index, key, self._enqueue((query, text))))
+
+        if waiting:
+            results = await asyncio.gather(*(future for _, _, future in waiting))
+            for (index, key, _), score in zip(waiting, results):
+                self.cache.set(key, score)
+                scores[index] = score
+
+        ranked = sorted(range(len(candidates)), key=lambda i: scores[i], reverse=True)[:top_n]
+        return [
+            {"index": i, "relevance_score": scores[i], "document": candidates[i]}
+            for i in ranked
+        ]
+
+    def _enqueue(self, pair: Pair) -> asyncio.Future:
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((pair, future))
+        if len(self._pending) >= self.max_batch_size:
+            self._flush()
+        elif self._flush_handle is None:
+            self._flush_handle = loop.call_later(self.max_wait_ms / 1000, self._flush)
+        return future
+
+    def _flush(self):
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        batch, self._pending = self._pending, []
+        if batch:
+            task = asyncio.get_running_loop().create_task(self._score_batch(batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._batch_done)
+
+    def _batch_done(self, task: asyncio.Task):
+        self._tasks.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            logger.error(f"rerank 배치 실패: {task.exception()!r}")
+
+    async def _score_batch(self, batch: List[Tuple[Pair, asyncio.Future]]):
+        # 같은 쌍은 한 번만 계산
+        unique_pairs = list(dict.fromkeys(pair for pair, _ in batch))
+        try:
+            scores = await asyncio.to_thread(self.scorer.score_pairs, unique_pairs)
+            if len(scores) != len(unique_pairs):
+                raise ValueError(f"scorer 가 쌍 {len(unique_pairs)}개에 점수 {len(scores)}개를 반환했습니다")
+        except BaseException as e:
+            # 기다리는 요청이 멈추지 않도록 실패(취소 포함)를 모두 전달한 뒤 다시 발생 (_batch_done 에서 기록)
+            for _, future in batch:
+                if not future.done():
+                    if isinstance(e, asyncio.CancelledError):
+                        future.cancel()
+                    else:
+                        future.set_exception(e)
+            raise
+        score_by_pair = dict(zip(unique_pairs, scores))
+        logger.info(f"rerank 배치: 요청 쌍 {len(batch)}개, 계산 {len(unique_pairs)}개")
+        for pair, future in batch:
+            if not future.done():
+                future.set_result(score_by_pair[pair])
+
+    async def aclose(self):
+        """대기 중인 쌍을 바로 계산하고 진행 중인 배치가 끝날 때까지 기다림"""
+        if self._pending:
+            self._flush()
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.aclose()
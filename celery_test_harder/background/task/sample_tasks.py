@@ -7,7 +7,13 @@ from datetime import datetime, timedelta
 from typing import Dict, Any, Optional
 from celery import chain, current_task
 from celery.exceptions import SoftTimeLimitExceeded
+import numpy as np
 import redis
+from background.checkpoint import ChunkCheckpoint, compute_file_hash
+from background.codec import default_codec
+from background.vectors import VECTOR_DTYPE, VectorBatch, VectorStoreWriter, simulate_embedding, vector_to_json
+from background.vector_index import VectorIndex
+from background.bm25 import HybridRetriever
 
 # Redis 연결 (중간 결과 저장용)
 redis_client = redis.Redis(
@@ -17,10 +23,56 @@ redis_client = redis.Redis(
     decode_responses=True
 )
 
+# 바이너리 값(체크포인트 비트맵, 압축 payload 등)용 Redis 연결
+redis_binary_client = redis.Redis(
+    host=os.environ.get("REDIS_HOST", "localhost"),
+    port=int(os.environ.get("REDIS_PORT", "6379")),
+    db=2,
+    decode_responses=False
+)
+
 # 구조화된 로깅 설정
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# 임베딩 모델/차원
+EMBEDDING_MODEL = "text-embedding-3-small"
+EMBEDDING_DIM = 1536
+
+# 텍스트 추출기 버전 (추출 방식이 바뀌면 올려서 이전 추출 체크포인트를 쓰지 않도록 함)
+TEXT_EXTRACTOR_VERSION = "simulated-v1"
+
+# 벡터 저장소 writer (기본값: 로컬 VectorIndex, 워커 프로세스별로 처음 사용할 때 생성)
+vector_store_writer: Optional[VectorStoreWriter] = None
+
+def get_vector_store_writer() -> VectorStoreWriter:
+    """벡터 저장소 writer 조회"""
+    global vector_store_writer
+    if vector_store_writer is None:
+        vector_store_writer = VectorIndex(
+            os.environ.get("VECTOR_INDEX_DIR", "data/vector_index"),
+            dim=EMBEDDING_DIM
+        )
+    return vector_store_writer
+
+# 하이브리드 검색기 (BM25 + 벡터, 로컬 VectorIndex 청크를 증분 색인)
+hybrid_retriever: Optional[HybridRetriever] = None
+
+def get_hybrid_retriever() -> HybridRetriever:
+    """하이브리드 검색기 조회 (벡터 저장소가 로컬 VectorIndex 일 때만 사용 가능)"""
+    global hybrid_retriever
+    if hybrid_retriever is None:
+        writer = get_vector_store_writer()
+        if not isinstance(writer, VectorIndex):
+            raise RuntimeError(f"하이브리드 검색은 VectorIndex 저장소만 지원합니다: {type(writer).__name__}")
+        hybrid_retriever = HybridRetriever(writer)
+    return hybrid_retriever
+
+def search_chunks(query: str, k: int = 10) -> list:
+    """질의로 저장된 청크 하이브리드 검색 (질의 임베딩은 저장 시와 같은 방식으로 생성)"""
+    query_vector = np.frombuffer(simulate_embedding(query, EMBEDDING_DIM), dtype=VECTOR_DTYPE)
+    return get_hybrid_retriever().search(query, query_vector, k=k)
+
 class DocumentProcessor:
     """문서 처리 상태 관리 클래스"""
     
@@ -35,28 +87,28 @@ class DocumentProcessor:
             "data": data,
             "status": "processing"
         }
-        redis_client.setex(f"progress:{task_id}", 3600, json.dumps(progress_data))
+        redis_binary_client.setex(f"progress:{task_id}", 3600, default_codec.encode(progress_data))
         logger.info(f"진행률 저장: {task_id} - {step} ({progress}%)")
     
     @staticmethod
     def get_progress(task_id: str) -> Optional[Dict]:
         """진행률 조회"""
-        data = redis_client.get(f"progress:{task_id}")
-        return json.loads(data) if data else None
+        data = redis_binary_client.get(f"progress:{task_id}")
+        return default_codec.decode(data) if data else None
     
     @staticmethod
     def save_intermediate_result(task_id: str, step: str, result: Dict[Any, Any]):
         """중간 결과 저장 (재시작 가능하도록)"""
         key = f"intermediate:{task_id}:{step}"
-        redis_client.setex(key, 7200, json.dumps(result))  # 2시간 보관
+        redis_binary_client.setex(key, 7200, default_codec.encode(result))  # 2시간 보관
         logger.info(f"중간 결과 저장: {step} - {task_id}")
     
     @staticmethod
     def get_intermediate_result(task_id: str, step: str) -> Optional[Dict]:
         """중간 결과 조회"""
         key = f"intermediate:{task_id}:{step}"
-        data = redis_client.get(key)
-        return json.loads(data) if data else None
+        data = redis_binary_client.get(key)
+        return default_codec.decode(data) if data else None
 
 def send_notification(task_id: str, step: str, status: str, message: str, data: Dict = None):
     """알림 시스템 (이메일/슬랙)"""
@@ -84,6 +136,15 @@ def send_notification(task_id: str, step: str, status: str, message: str, data:
     redis_client.lpush(f"notifications:{task_id}", json.dumps(notification_data))
     redis_client.expire(f"notifications:{task_id}", 86400)  # 24시간 보관
 
+def resolve_file_hash(result: Dict) -> Optional[str]:
+    """이전 단계 결과에서 파일 해시 조회 (없으면 파일에서 다시 계산)"""
+    if result.get("file_hash"):
+        return result["file_hash"]
+    file_path = result.get("file_path")
+    if file_path and os.path.exists(file_path):
+        return compute_file_hash(file_path)
+    return None
+
 @celery_app.task(
     bind=True,
     soft_time_limit=120,  # 2분 소프트 타임아웃
@@ -123,26 +184,45 @@ def extract_text_advanced(self, file_path: str, resume_data: Dict = None):
         
         # 파일 크기 확인
         file_size = os.path.getsize(file_path)
-        logger.info(f"[{task_id}] 파일 크기: {file_size:,} bytes")
+        file_hash = compute_file_hash(file_path)
+        logger.info(f"[{task_id}] 파일 크기: {file_size:,} bytes, 해시: {file_hash[:12]}")
         
         # 진행률 업데이트
         DocumentProcessor.save_progress(task_id, step_name, {"file_path": file_path, "file_size": file_size}, 25)
         
-        # 실제 텍스트 추출 작업 시뮬레이션
-        extracted_text = f"문서 내용 from {os.path.basename(file_path)} (크기: {file_size} bytes)"
-        
-        # 처리 시간 시뮬레이션 (타임아웃 테스트용)
-        for i in range(10):
+        # 구간 단위 체크포인트: 재제출되어도 이미 추출한 구간은 저장된 텍스트를 재사용
+        total_segments = 10
+        checkpoint = ChunkCheckpoint(
+            redis_binary_client, file_hash, step_name, total_segments,
+            scope=TEXT_EXTRACTOR_VERSION, range_size=1
+        )
+        done_ranges, missing_ranges = checkpoint.resume()
+        if done_ranges:
+            logger.info(f"[{task_id}] 체크포인트 발견: {len(done_ranges)}/{total_segments} 청크 건너뜀")
+        
+        # 실제 텍스트 추출 작업 시뮬레이션 (구간별 추출 결과를 체크포인트에 저장, 타임아웃 테스트용 지연)
+        for processed, i in enumerate(missing_ranges, start=len(done_ranges) + 1):
             time.sleep(0.2)
-            progress = 25 + (i + 1) * 7.5
+            segment = {
+                "segment": i,
+                "text": f"문서 내용 from {os.path.basename(file_path)} 구간 {i+1}/{total_segments} (크기: {file_size} bytes)"
+            }
+            checkpoint.mark_done(i, [segment])
+            done_ranges[i] = [segment]
+            progress = 25 + processed * 7.5
             DocumentProcessor.save_progress(task_id, step_name, {
                 "file_path": file_path,
                 "file_size": file_size,
-                "processing": f"청크 {i+1}/10 처리 중"
+                "processing": f"청크 {i+1}/{total_segments} 처리 중"
             }, int(progress))
         
+        extracted_text = "\n".join(
+            segment["text"] for i in sorted(done_ranges) for segment in done_ranges[i]
+        )
+        
         result = {
             "file_path": file_path,
+            "file_hash": file_hash,
             "text": extracted_text,
             "char_count": len(extracted_text),
             "file_size": file_size,
@@ -288,36 +368,60 @@ def generate_embeddings_advanced(self, chunk_result: Dict):
             DocumentProcessor.save_progress(task_id, step_name, intermediate, 100)
             return intermediate
         
-        # 임베딩 생성 (청크별)
+        # 임베딩 생성 (청크 구간별 체크포인트)
         total_chunks = len(chunks)
-        embedded_chunks = []
-        
-        for i, chunk in enumerate(chunks):
-            # 실제로는 OpenAI API 호출
-            # embedding = openai.embeddings.create(...)
-            
-            chunk_with_embedding = {
-                **chunk,
-                "embedding": f"embedding_vector_{chunk['chunk_id']}_{task_id[:8]}",
-                "embedding_model": "text-embedding-3-small",
-                "embedding_timestamp": datetime.now().isoformat()
-            }
-            embedded_chunks.append(chunk_with_embedding)
-            
-            # 진행률 업데이트
-            progress = int((i + 1) / total_chunks * 80) + 10
-            DocumentProcessor.save_progress(task_id, step_name, {
-                **chunk_result,
-                "processing": f"임베딩 {i+1}/{total_chunks} 생성 중",
-                "embeddings_created": len(embedded_chunks)
-            }, progress)
+        file_hash = resolve_file_hash(chunk_result)
+        checkpoint = ChunkCheckpoint(
+            redis_binary_client, file_hash or task_id, step_name, total_chunks,
+            scope=f"{EMBEDDING_MODEL}:{EMBEDDING_DIM}"
+        )
+        done_ranges, missing_ranges = checkpoint.resume()
+        embedded_count = sum(len(results) for results in done_ranges.values())
+        if done_ranges:
+            logger.info(f"[{task_id}] 체크포인트 발견: {embedded_count}/{total_chunks} 임베딩 재사용")
+        
+        for range_index in missing_ranges:
+            start, end = checkpoint.range_bounds(range_index)
+            range_results = []
             
-            time.sleep(0.3)  # API 호출 시뮬레이션
+            for i in range(start, end):
+                chunk = chunks[i]
+                # 실제로는 OpenAI API 호출
+                # embedding = openai.embeddings.create(...)
+                embedding = simulate_embedding(chunk["content"], EMBEDDING_DIM)
+                
+                chunk_with_embedding = {
+                    **chunk,
+                    # float 리스트 대신 packed float32 + base64 (chain/Redis 전달 크기 축소)
+                    "embedding": vector_to_json(embedding),
+                    "embedding_model": EMBEDDING_MODEL,
+                    "embedding_timestamp": datetime.now().isoformat()
+                }
+                range_results.append(chunk_with_embedding)
+                embedded_count += 1
+                
+                # 진행률 업데이트
+                progress = int(embedded_count / total_chunks * 80) + 10
+                DocumentProcessor.save_progress(task_id, step_name, {
+                    **chunk_result,
+                    "processing": f"임베딩 {i+1}/{total_chunks} 생성 중",
+                    "embeddings_created": embedded_count
+                }, progress)
+                
+                time.sleep(0.3)  # API 호출 시뮬레이션
+                
+                # 경고: 처리 시간이 오래 걸리는 경우
+                if i % 10 == 0 and i > 0:
+                    send_notification(task_id, step_name, "warning", 
+                                    f"임베딩 생성 진행 중: {i}/{total_chunks}")
             
-            # 경고: 처리 시간이 오래 걸리는 경우
-            if i % 10 == 0 and i > 0:
-                send_notification(task_id, step_name, "warning", 
-                                f"임베딩 생성 진행 중: {i}/{total_chunks}")
+            # 구간 완료 시점에 체크포인트 기록 (실패해도 이 구간까지는 보존)
+            checkpoint.mark_done(range_index, range_results)
+            done_ranges[range_index] = range_results
+        
+        embedded_chunks = [
+            chunk for range_index in sorted(done_ranges) for chunk in done_ranges[range_index]
+        ]
         
         result = {
             **chunk_result,
@@ -375,28 +479,61 @@ def save_to_database_advanced(self, embedding_result: Dict):
         # 진행률 초기화
         DocumentProcessor.save_progress(task_id, step_name, embedding_result, 0)
         
-        # 데이터베이스 저장
-        saved_ids = []
+        # 데이터베이스 저장 (청크 구간별 체크포인트)
         total_chunks = len(chunks)
-        
-        for i, chunk in enumerate(chunks):
-            # 실제 벡터 DB 저장 로직
-            doc_id = f"doc_{chunk['chunk_id']}_{task_id[:8]}_{int(time.time())}"
-            
-            # 실제로는 Pinecone, Weaviate, ChromaDB 등에 저장
-            # vector_db.insert(doc_id, chunk['embedding'], chunk['content'])
-            
-            saved_ids.append(doc_id)
+        file_hash = resolve_file_hash(embedding_result)
+        writer = get_vector_store_writer()
+        # 저장 완료 여부는 저장소 세대 범위로 기록 (인덱스를 비우거나 새로 만들면 다시 저장, 세대를 모르면 이 작업 안에서만)
+        checkpoint = ChunkCheckpoint(
+            redis_binary_client, file_hash or task_id, step_name, total_chunks,
+            scope=writer.generation or task_id
+        )
+        done_ranges, missing_ranges = checkpoint.resume()
+        saved_count = sum(len(ids) for ids in done_ranges.values())
+        if done_ranges:
+            logger.info(f"[{task_id}] 체크포인트 발견: {saved_count}/{total_chunks} 저장 건너뜀")
+        
+        for range_index in missing_ranges:
+            start, end = checkpoint.range_bounds(range_index)
+            range_ids = []
+            range_metadata = []
+            # 구간 벡터를 하나의 연속 버퍼로 디코딩 (writer 에는 memoryview 슬라이스로 전달)
+            batch = VectorBatch.from_json_list(chunk["embedding"] for chunk in chunks[start:end])
             
-            # 진행률 업데이트
-            progress = int((i + 1) / total_chunks * 80) + 10
-            DocumentProcessor.save_progress(task_id, step_name, {
-                **embedding_result,
-                "processing": f"저장 {i+1}/{total_chunks}",
-                "saved_count": len(saved_ids)
-            }, progress)
+            for i in range(start, end):
+                chunk = chunks[i]
+                # 문서 ID 는 파일 해시 + 청크 번호로 고정 (재시도/재제출해도 같은 ID → writer 가 중복 저장하지 않음)
+                doc_id = f"doc_{(file_hash or task_id)[:16]}_{chunk['chunk_id']}"
+                range_ids.append(doc_id)
+                range_metadata.append({
+                    "file_path": embedding_result["file_path"],
+                    "chunk_id": chunk["chunk_id"],
+                    "content": chunk["content"]
+                })
+                saved_count += 1
+                
+                # 진행률 업데이트
+                progress = int(saved_count / total_chunks * 80) + 10
+                DocumentProcessor.save_progress(task_id, step_name, {
+                    **embedding_result,
+                    "processing": f"저장 {i+1}/{total_chunks}",
+                    "saved_count": saved_count
+                }, progress)
+                
+                time.sleep(0.1)  # DB 저장 시뮬레이션
             
-            time.sleep(0.1)  # DB 저장 시뮬레이션
+            # 구간 단위로 추가 + 디스크 반영 (Pinecone, ChromaDB 등 다른 writer 로 교체 가능)
+            # 중간에 실패하면 버퍼를 버려서 autoretry 가 같은 워커에서 같은 청크를 다시 쌓아도 중복 저장되지 않음
+            try:
+                writer.add_batch(range_ids, batch, range_metadata)
+                writer.flush()
+            except BaseException:
+                writer.discard_pending()
+                raise
+            checkpoint.mark_done(range_index, range_ids)
+            done_ranges[range_index] = range_ids
+        
+        saved_ids = [doc_id for range_index in sorted(done_ranges) for doc_id in done_ranges[range_index]]
         
         # 최종 결과
         final_result = {
@@ -0,0 +1,446 @@
+import fcntl
+import json
+import logging
+import os
+import threading
+import uuid
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from background.vectors import ITEM_SIZE, VECTOR_DTYPE, VectorStoreWriter
+
+logger = logging.getLogger(__name__)
+
+# 이 개수 이상이면 IVF(역색인) 근사 검색 사용, 미만이면 전수(brute-force) 검색
+IVF_THRESHOLD = 20000
+# 전수 검색 시 한 번에 계산할 행 수 (메모리 사용량 제한)
+SEARCH_BLOCK_ROWS = 65536
+
+
+class VectorIndex(VectorStoreWriter):
+    """
+    로컬 벡터 인덱스 (외부 FAISS 서버 대신 사용)
+
+    - 벡터는 {path}/vectors.f32 에 float32 로 append 하고 memmap 으로 읽음
+    - 문서 ID/메타데이터는 {path}/meta.jsonl 에 한 줄씩 저장
+    - 작은 코퍼스는 NumPy 전수 검색, 큰 코퍼스는 IVF(k-means 클러스터 + nprobe 탐색)
+    - 검색 결과는 retrivers.json 과 같은 faiss_score / distance / rank 필드를 가짐
+      (distance = 제곱 L2 거리, faiss_score = 1 - distance / 2 = 정규화 벡터의 코사인 유사도)
+
+    여러 Celery 워커 프로세스가 같은 디렉토리에 쓸 수 있도록 append 는 파일 락으로 보호하고,
+    다른 프로세스가 추가한 벡터는 검색 전에 refresh() 로 읽어옵니다.
+    IVF 학습은 쓰기 경로(flush/refresh)가 아니라 검색 시점이나 train_ivf() 직접 호출 시에만 합니다.
+    """
+
+    def __init__(self, path: str, dim: int, ivf_threshold: int = IVF_THRESHOLD, nprobe: int = 8):
+        """
+        Args:
+            path: 인덱스 디렉토리
+            dim: 벡터 차원
+            ivf_threshold: IVF 를 학습할 최소 벡터 수
+            nprobe: IVF 검색 시 탐색할 클러스터 수
+        """
+        self.path = path
+        self.dim = dim
+        self.ivf_threshold = ivf_threshold
+        self.nprobe = nprobe
+        os.makedirs(path, exist_ok=True)
+        self._vector_path = os.path.join(path, "vectors.f32")
+        self._meta_path = os.path.join(path, "meta.jsonl")
+        self._centroid_path = os.path.join(path, "centroids.npy")
+        self._lock_path = os.path.join(path, ".lock")
+        self._generation = self._load_generation(os.path.join(path, "generation"))
+
+        self._mutex = threading.RLock()
+        self._pending_vectors = bytearray()
+        self._pending_meta: List[Dict[str, Any]] = []
+
+        self._ids: List[str] = []
+        self._metadata: List[Dict[str, Any]] = []
+        self._row_of: Dict[str, int] = {}  # 문서 ID → 행 번호 (중복 저장 방지)
+        self._meta_offset = 0  # meta.jsonl 에서 읽은 위치
+        self._vectors = np.empty((0, dim), dtype=VECTOR_DTYPE)
+        self._sq_norms = np.empty(0, dtype=np.float32)
+
+        # IVF 상태
+        self._centroids: Optional[np.ndarray] = None
+        self._trained_size = 0
+        self._assign = np.empty(0, dtype=np.int32)
+        self._list_rows: List[List[np.ndarray]] = []
+
+        if os.path.exists(self._centroid_path):
+            # 저장된 클러스터를 재사용 (다시 열 때 재학습하지 않도록 학습 크기는 적재 후 설정)
+            self._set_centroids(np.load(self._centroid_path))
+        self.refresh()
+        if self._centroids is not None:
+            self._trained_size = len(self._ids)
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    @staticmethod
+    def _load_generation(generation_path: str) -> str:
+        """디렉토리를 처음 연 프로세스가 만든 세대 ID 조회 (동시에 열어도 한 값만 남도록 link 로 생성)"""
+        if not os.path.exists(generation_path):
+            temp_path = f"{generation_path}.{os.getpid()}.{uuid.uuid4().hex}"
+            with open(temp_path, "w", encoding="utf-8") as f:
+                f.write(uuid.uuid4().hex)
+            try:
+                os.link(temp_path, generation_path)
+            except FileExistsError:
+                pass
+            finally:
+                os.unlink(temp_path)
+        with open(generation_path, encoding="utf-8") as f:
+            return f.read().strip()
+
+    @property
+    def generation(self) -> str:
+        """인덱스 세대 ID (디렉토리를 지우고 다시 만들면 바뀜, 저장 체크포인트 범위로 사용)"""
+        return self._generation
+
+    def iter_documents(self, start: int = 0) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """
+        start 행부터 (문서 ID, 메타데이터) 순회 (행 순서 = 추가 순서)
+
+        호출 시점의 목록을 순회하므로 순회 중에 refresh() 로 행이 늘어나도 안전합니다.
+        다른 프로세스가 추가한 청크까지 보려면 먼저 refresh() 를 호출하세요.
+        """
+        with self._mutex:
+            documents = list(zip(self._ids[start:], self._metadata[start:]))
+        return iter(documents)
+
+    # ------------------------------------------------------------------ 쓰기
+
+    def add(self, doc_id: str, vector: memoryview, metadata: Optional[Dict[str, Any]] = None):
+        """벡터 하나를 쓰기 버퍼에 추가 (flush() 시 디스크 반영)"""
+        if len(vector) != self.dim * ITEM_SIZE:
+            raise ValueError(f"벡터 크기 불일치: {len(vector)} bytes (기대값 {self.dim * ITEM_SIZE})")
+        with self._mutex:
+            self._pending_vectors += vector
+            self._pending_meta.append({"id": doc_id, "metadata": metadata or {}})
+
+    def discard_pending(self):
+        """flush 하지 않은 벡터 버림 (구간 저장이 중간에 실패했을 때 재시도에서 중복 append 방지)"""
+        with self._mutex:
+            self._pending_vectors = bytearray()
+            self._pending_meta = []
+
+    def flush(self):
+        """
+        버퍼링된 벡터를 파일에 append 하고 인덱스에 반영
+
+        이미 저장된 문서 ID 는 건너뜁니다 (재시도된 작업이 같은 청크를 다시 저장해도 중복되지 않음).
+        """
+        with self._mutex:
+            if not self._pending_meta:
+                return
+            row_bytes = self.dim * ITEM_SIZE
+            with open(self._lock_path, "a") as lock_file:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+                try:
+                    # 락 안에서 다른 프로세스가 추가한 문서까지 읽고, 이전에 중단된 쓰기의 흔적을 정리
+                    self.refresh()
+                    self._truncate_incomplete_tail()
+                    vectors, items = bytearray(), []
+                    seen = set(self._row_of)
+                    for i, item in enumerate(self._pending_meta):
+                        if item["id"] in seen:
+                            continue
+                        seen.add(item["id"])
+                        vectors += self._pending_vectors[i * row_bytes:(i + 1) * row_bytes]
+                        items.append(item)
+                    # 벡터를 먼저 쓰고 메타를 씀: 메타 줄은 항상 벡터 행이 있고,
+                    # 메타를 쓰기 전에 중단돼 남은 벡터 행은 다음 flush 의 _truncate_incomplete_tail 이 잘라냄
+                    if items:
+                        with open(self._vector_path, "ab") as f:
+                            f.write(vectors)
+                        with open(self._meta_path, "a", encoding="utf-8") as f:
+                            for item in items:
+                                f.write(json.dumps(item, ensure_ascii=False) + "\n")
+                finally:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+            skipped = len(self._pending_meta) - len(items)
+            logger.info(f"벡터 인덱스 저장: {len(items)}개 추가" + (f", 중복 {skipped}개 건너뜀" if skipped else ""))
+            self._pending_vectors = bytearray()
+            self._pending_meta = []
+            self.refresh()
+
+    def _truncate_incomplete_tail(self):
+        """
+        메타 줄이 없는 벡터 행과 끝나지 않은 메타 줄 제거 (파일 락 안에서 refresh 직후 호출)
+
+        벡터 append 와 메타 append 사이에 프로세스가 죽으면 벡터 파일에만 행이 남고,
+        그대로 두면 이후 추가되는 벡터가 모두 한 칸씩 다른 메타데이터와 짝지어집니다.
+        """
+        if os.path.exists(self._meta_path) and os.path.getsize(self._meta_path) > self._meta_offset:
+            logger.warning(f"끝나지 않은 메타 줄 제거: {os.path.getsize(self._meta_path) - self._meta_offset} bytes")
+            os.truncate(self._meta_path, self._meta_offset)
+        expected = len(self._ids) * self.dim * ITEM_SIZE
+        actual = os.path.getsize(self._vector_path) if os.path.exists(self._vector_path) else 0
+        if actual > expected:
+            logger.warning(f"메타 없는 벡터 행 제거: {(actual - expected) // (self.dim * ITEM_SIZE)}개")
+            os.truncate(self._vector_path, expected)
+        elif actual < expected:
+            raise RuntimeError(f"벡터 파일이 메타보다 짧습니다: {actual} bytes (기대값 {expected})")
+
+    def refresh(self):
+        """다른 프로세스가 추가한 벡터까지 포함해 인덱스를 최신 상태로 갱신"""
+        with self._mutex:
+            if not os.path.exists(self._meta_path):
+                return
+            with open(self._meta_path, "r", encoding="utf-8") as f:
+                f.seek(self._meta_offset)
+                new_items = []
+                while True:
+                    line = f.readline()
+                    if not line.endswith("\n"):
+                        break  # 다른 프로세스가 쓰는 중인 줄은 다음에 읽음
+                    new_items.append(json.loads(line))
+                    self._meta_offset = f.tell()
+            if not new_items:
+                return
+
+            start = len(self._ids)
+            for row, item in enumerate(new_items, start=start):
+                self._row_of.setdefault(item["id"], row)
+            self._ids.extend(item["id"] for item in new_items)
+            self._metadata.extend(item["metadata"] for item in new_items)
+            self._vectors = np.memmap(self._vector_path, dtype=VECTOR_DTYPE, mode="r", shape=(len(self._ids), self.dim))
+            new_rows = np.asarray(self._vectors[start:], dtype=np.float32)
+            self._sq_norms = np.concatenate([self._sq_norms, np.einsum("ij,ij->i", new_rows, new_rows)])
+
+            if self._centroids is not None:
+                self._assign_rows(start, new_rows)
+
+    def needs_training(self) -> bool:
+        """처음 임계치를 넘었거나 학습 시점 대비 4배 이상 커져서 클러스터 (재)학습이 필요한지"""
+        total = len(self._ids)
+        return total >= self.ivf_threshold and (self._centroids is None or total >= 4 * self._trained_size)
+
+    # ------------------------------------------------------------------ IVF
+
+    def train_ivf(self, nlist: Optional[int] = None, iterations: int = 10, seed: int = 0):
+        """
+        k-means 로 IVF 클러스터 학습 후 모든 벡터를 재배정
+
+        Args:
+            nlist: 클러스터 수 (기본값: 4 * sqrt(N))
+            iterations: Lloyd 반복 횟수
+        """
+        with self._mutex:
+            total = len(self._ids)
+            if total == 0:
+                return
+            nlist = nlist or max(1, min(total, int(4 * np.sqrt(total))))
+            rng = np.random.default_rng(seed)
+            sample_size = min(total, nlist * 64)
+            sample = np.asarray(self._vectors[np.sort(rng.choice(total, sample_size, replace=False))], dtype=np.float32)
+            centroids = sample[rng.choice(sample_size, nlist, replace=False)].copy()
+
+            for _ in range(iterations):
+                labels = _nearest_centroids(sample, centroids, 1)[:, 0]
+                counts = np.bincount(labels, minlength=nlist)
+                non_empty = counts > 0
+                order = np.argsort(labels, kind="stable")
+                starts = np.concatenate([[0], np.cumsum(counts)[:-1]])[non_empty]
+                sums = np.add.reduceat(sample[order], starts, axis=0)
+                centroids[non_empty] = sums / counts[non_empty, None]
+                # 빈 클러스터는 임의 샘플로 다시 시작
+                empty = np.flatnonzero(~non_empty)
+                if len(empty):
+                    centroids[empty] = sample[rng.choice(sample_size, len(empty), replace=False)]
+
+            # 다른 프로세스가 읽는 중에도 완성된 파일만 보이도록 임시 파일에 쓰고 락 안에서 교체
+            with open(self._lock_path, "a") as lock_file:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+                try:
+                    temp_path = f"{self._centroid_path}.{os.getpid()}.tmp"
+                    with open(temp_path, "wb") as f:
+                        np.save(f, centroids)
+                    os.replace(temp_path, self._centroid_path)
+                finally:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+            self._set_centroids(centroids)
+            self._assign_rows(0, self._vectors)
+            self._trained_size = total
+            logger.info(f"IVF 학습 완료: 벡터 {total}개, 클러스터 {nlist}개")
+
+    def _set_centroids(self, centroids: np.ndarray):
+        self._centroids = centroids.astype(np.float32)
+        self._assign = np.empty(0, dtype=np.int32)
+        self._list_rows = [[] for _ in range(len(centroids))]
+
+    def _assign_rows(self, start: int, rows):
+        """start 번째 행부터 가장 가까운 클러스터에 배정"""
+        labels = np.concatenate([
+            _nearest_centroids(np.asarray(rows[i:i + SEARCH_BLOCK_ROWS], dtype=np.float32), self._centroids, 1)[:, 0]
+            for i in range(0, len(rows), SEARCH_BLOCK_ROWS)
+        ]).astype(np.int32)
+        self._assign = np.concatenate([self._assign[:start], labels])
+        order = np.argsort(labels, kind="stable")
+        bounds = np.searchsorted(labels[order], np.arange(len(self._centroids) + 1))
+        for cluster in range(len(self._centroids)):
+            rows_in_cluster = order[bounds[cluster]:bounds[cluster + 1]]
+            if len(rows_in_cluster):
+                self._list_rows[cluster].append(rows_in_cluster.astype(np.int64) + start)
+
+    def _cluster_rows(self, cluster: int) -> np.ndarray:
+        parts = self._list_rows[cluster]
+        if not parts:
+            return np.empty(0, dtype=np.int64)
+        if len(parts) > 1:
+            parts[:] = [np.concatenate(parts)]
+        return parts[0]
+
+    # ------------------------------------------------------------------ 검색
+
+    def search(self, queries, k: int = 10, exact: Optional[bool] = None) -> List[List[Dict[str, Any]]]:
+        """
+        배치 top-k 검색
+
+        Args:
+            queries: (Q, dim) 또는 (dim,) 벡터
+            k: 쿼리별 결과 수
+            exact: True 면 전수 검색 강제, False 면 IVF 강제, None 이면 코퍼스 크기로 결정
+
+        Returns:
+            list: 쿼리별 [{"id", "faiss_score", "distance", "rank", "metadata"}, ...]
+        """
+        self.refresh()
+        queries = np.atleast_2d(np.asarray(queries, dtype=np.float32))
+        with self._mutex:
+            if len(self._ids) == 0:
+                return [[] for _ in range(len(queries))]
+            if exact is None and self.needs_training():
+                # 학습은 저장 작업(soft time limit)이 아니라 검색 쪽에서 (train_ivf 를 주기 작업으로 따로 호출해도 됨)
+                self.train_ivf()
+            use_ivf = self._centroids is not None and len(self._assign) == len(self._ids)
+            if exact is None:
+                use_ivf = use_ivf and len(self._ids) >= self.ivf_threshold
+            elif exact:
+                use_ivf = False
+            elif not use_ivf:
+                self.train_ivf()
+                use_ivf = True
+
+            if use_ivf:
+                rows, distances = self._search_ivf(queries, k)
+            else:
+                rows, distances = self._search_exact(queries, k)
+            return [self._format(row_ids, dists) for row_ids, dists in zip(rows, distances)]
+
+    def _search_exact(self, queries: np.ndarray, k: int):
+        """NumPy 전수 검색 (블록 단위로 top-k 병합)"""
+        q_norms = np.einsum("ij,ij->i", queries, queries)
+        best_rows = np.empty((len(queries), 0), dtype=np.int64)
+        best_dists = np.empty((len(queries), 0), dtype=np.float32)
+        for start in range(0, len(self._ids), SEARCH_BLOCK_ROWS):
+            block = np.asarray(self._vectors[start:start + SEARCH_BLOCK_ROWS], dtype=np.float32)
+            dists = q_norms[:, None] + self._sq_norms[None, start:start + len(block)] - 2.0 * queries @ block.T
+            rows = np.broadcast_to(np.arange(start, start + len(block)), dists.shape)
+            best_rows = np.concatenate([best_rows, rows], axis=1)
+            best_dists = np.concatenate([best_dists, dists], axis=1)
+            best_rows, best_dists = _top_k(best_rows, best_dists, k)
+        return best_rows, best_dists
+
+    def _search_ivf(self, queries: np.ndarray, k: int):
+        """IVF 근사 검색: 가까운 nprobe 개 클러스터의 벡터만 비교"""
+        probes = _nearest_centroids(queries, self._centroids, min(self.nprobe, len(self._centroids)))
+        all_rows, all_dists = [], []
+        for query, clusters in zip(queries, probes):
+            candidates = np.concatenate([self._cluster_rows(c) for c in clusters])
+            if len(candidates) == 0:
+                all_rows.append(np.empty(0, dtype=np.int64))
+                all_dists.append(np.empty(0, dtype=np.float32))
+                continue
+            candidates.sort()  # memmap 순차 접근
+            vectors = np.asarray(self._vectors[candidates], dtype=np.float32)
+            dists = query @ query + self._sq_norms[candidates] - 2.0 * vectors @ query
+            rows, dists = _top_k(candidates[None, :], dists[None, :], k)
+            all_rows.append(rows[0])
+            all_dists.append(dists[0])
+        return all_rows, all_dists
+
+    def _format(self, rows, distances) -> List[Dict[str, Any]]:
+        results = []
+        for rank, (row, distance) in enumerate(zip(rows, distances), start=1):
+            distance = max(float(distance), 0.0)
+            results.append({
+                "id": self._ids[row],
+                "faiss_score": 1.0 - distance / 2.0,
+                "distance": distance,
+                "rank": rank,
+                "metadata": self._metadata[row],
+            })
+        return results
+
+
+def _nearest_centroids(vectors: np.ndarray, centroids: np.ndarray, count: int) -> np.ndarray:
+    """벡터별로 가장 가까운 클러스터 번호 count 개 (가까운 순)"""
+    dists = np.einsum("ij,ij->i", centroids, centroids)[None, :] - 2.0 * vectors @ centroids.T
+    if count == 1:
+        return np.argmin(dists, axis=1)[:, None]
+    if count >= len(centroids):
+        return np.argsort(dists, axis=1)
+    nearest = np.argpartition(dists, count - 1, axis=1)[:, :count]
+    order = np.argsort(np.take_along_axis(dists, nearest, axis=1), axis=1)
+    return np.take_along_axis(nearest, order, axis=1)
+
+
+def _top_k(rows: np.ndarray, dists: np.ndarray, k: int):
+    """행별로 거리가 가장 작은 k 개 (가까운 순)"""
+    if dists.shape[1] > k:
+        keep = np.argpartition(dists, k - 1, axis=1)[:, :k]
+        rows = np.take_along_axis(rows, keep, axis=1)
+        dists = np.take_along_axis(dists, keep, axis=1)
+    order = np.argsort(dists, axis=1)
+    return np.take_along_axis(rows, order, axis=1), np.take_along_axis(dists, order, axis=1)
+
+
+def run_benchmark(total: int = 100000, dim: int = 128, query_count: int = 500, k: int = 10):
+    """전수 검색 대비 IVF 의 recall@k 와 QPS 측정 (클러스터 구조가 있는 합성 데이터)"""
+    import tempfile
+    import time
+
+    from background.vectors import VectorBatch
+
+    rng = np.random.default_rng(42)
+    centers = rng.standard_normal((256, dim)).astype(np.float32)
+    data = centers[rng.integers(0, 256, total)] + 0.35 * rng.standard_normal((total, dim)).astype(np.float32)
+    data /= np.linalg.norm(data, axis=1, keepdims=True)
+    queries = data[rng.choice(total, query_count, replace=False)] + 0.05 * rng.standard_normal((query_count, dim)).astype(np.float32)
+
+    with tempfile.TemporaryDirectory() as path:
+        index = VectorIndex(path, dim, ivf_threshold=total + 1)
+        batch = VectorBatch(bytearray(data.astype(VECTOR_DTYPE).tobytes()), dim)
+        start = time.perf_counter()
+        for offset in range(0, total, 1000):  # 파이프라인처럼 구간 단위로 추가
+            for i in range(offset, min(offset + 1000, total)):
+                index.add(f"doc_{i}", batch.view(i))
+            index.flush()
+        print(f"적재: {total:,}개 x {dim}차원, {time.perf_counter() - start:.2f}초")
+
+        start = time.perf_counter()
+        exact = index.search(queries, k, exact=True)
+        exact_qps = query_count / (time.perf_counter() - start)
+        print(f"전수 검색: {exact_qps:,.0f} QPS")
+
+        start = time.perf_counter()
+        index.train_ivf()
+        print(f"IVF 학습: {time.perf_counter() - start:.2f}초, 클러스터 {len(index._centroids)}개")
+
+        for nprobe in (4, 8, 16, 32):
+            index.nprobe = nprobe
+            start = time.perf_counter()
+            approx = index.search(queries, k, exact=False)
+            qps = query_count / (time.perf_counter() - start)
+            recall = np.mean([
+                len({r["id"] for r in a} & {r["id"] for r in e}) / k for a, e in zip(approx, exact)
+            ])
+            print(f"IVF nprobe={nprobe:<3} recall@{k}={recall:.3f}  {qps:,.0f} QPS")
+
+
+if __name__ == "__main__":
+    run_benchmark()
@@ -0,0 +1,159 @@
+import base64
+import hashlib
+import sys
+from array import array
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+try:
+    import numpy as np
+except ImportError:  # 선택 의존성 (없으면 array 모듈 사용)
+    np = None
+
+# 벡터 저장 형식: little-endian float32 (4 bytes/차원)
+VECTOR_DTYPE = "<f4"
+ITEM_SIZE = 4
+_LITTLE_ENDIAN = sys.byteorder == "little"
+
+
+def pack_vector(values: Sequence[float]) -> bytes:
+    """
+    float 리스트 → little-endian float32 bytes
+
+    Args:
+        values: 벡터 값 (list, tuple, numpy 배열 등)
+
+    Returns:
+        bytes: len(values) * 4 바이트 버퍼
+    """
+    if np is not None:
+        return np.asarray(values, dtype=VECTOR_DTYPE).tobytes()
+    packed = array("f", values)
+    if not _LITTLE_ENDIAN:
+        packed.byteswap()
+    return packed.tobytes()
+
+
+def unpack_vector(buffer) -> Sequence[float]:
+    """
+    float32 버퍼 → 벡터 (가능하면 복사 없이)
+
+    Returns:
+        numpy 배열(읽기 전용 view) 또는 float memoryview
+    """
+    if np is not None:
+        return np.frombuffer(buffer, dtype=VECTOR_DTYPE)
+    if _LITTLE_ENDIAN:
+        return memoryview(buffer).cast("B").cast("f")
+    values = array("f", bytes(buffer))
+    values.byteswap()
+    return values
+
+
+def vector_to_json(values: Sequence[float]) -> Dict[str, Any]:
+    """
+    JSON 경계(Celery chain 결과, API 응답)용 벡터 표현
+
+    float 리스트 대신 base64 문자열을 사용해 크기를 약 1/4 로 줄이고 파싱 비용을 없앱니다.
+    """
+    buffer = values if isinstance(values, (bytes, bytearray, memoryview)) else pack_vector(values)
+    return {
+        "dtype": "float32",
+        "dim": len(buffer) // ITEM_SIZE,
+        "data": base64.b64encode(buffer).decode("ascii"),
+    }
+
+
+def vector_from_json(payload) -> bytes:
+    """vector_to_json() 결과 → float32 bytes (기존 float 리스트 형식도 허용)"""
+    if isinstance(payload, dict):
+        return base64.b64decode(payload["data"])
+    if isinstance(payload, (bytes, bytearray)):
+        return bytes(payload)
+    return pack_vector(payload)
+
+
+def simulate_embedding(text: str, dim: int = 1536) -> bytes:
+    """
+    텍스트 해시 기반의 결정적 임베딩 (실제 API 대신 사용하는 시뮬레이션)
+
+    같은 텍스트는 항상 같은 벡터를 돌려주므로 재시작/재제출 후에도 결과가 일치합니다.
+    """
+    seed = hashlib.sha256(text.encode("utf-8")).digest()
+    if np is not None:
+        rng = np.random.default_rng(int.from_bytes(seed[:8], "little"))
+        vector = rng.standard_normal(dim).astype(VECTOR_DTYPE)
+        vector /= np.linalg.norm(vector) or 1.0
+        return vector.tobytes()
+    import random
+
+    rng = random.Random(seed)
+    values = [rng.gauss(0.0, 1.0) for _ in range(dim)]
+    norm = sum(v * v for v in values) ** 0.5 or 1.0
+    return pack_vector([v / norm for v in values])
+
+
+class VectorBatch:
+    """
+    여러 벡터를 하나의 연속 버퍼에 담은 묶음
+
+    view(i) 는 버퍼의 memoryview 슬라이스를 돌려주므로 벡터 저장소 writer 로
+    넘길 때 벡터별 복사가 일어나지 않습니다.
+    """
+
+    def __init__(self, buffer: bytearray, dim: int):
+        if dim <= 0 or len(buffer) % (dim * ITEM_SIZE):
+            raise ValueError(f"버퍼 크기({len(buffer)})가 차원({dim})과 맞지 않습니다")
+        self.buffer = buffer
+        self.dim = dim
+        self._view = memoryview(buffer)
+
+    @classmethod
+    def from_json_list(cls, payloads: Iterable[Any]) -> "VectorBatch":
+        """vector_to_json() 결과 목록 → 하나의 연속 버퍼"""
+        buffer = bytearray()
+        dim = 0
+        for payload in payloads:
+            packed = vector_from_json(payload)
+            if dim and len(packed) != dim * ITEM_SIZE:
+                raise ValueError("벡터 차원이 일치하지 않습니다")
+            dim = len(packed) // ITEM_SIZE
+            buffer += packed
+        return cls(buffer, dim or 1)
+
+    def __len__(self) -> int:
+        return len(self.buffer) // (self.dim * ITEM_SIZE)
+
+    def view(self, index: int) -> memoryview:
+        """index 번째 벡터의 bytes view (zero-copy)"""
+        row_size = self.dim * ITEM_SIZE
+        return self._view[index * row_size:(index + 1) * row_size]
+
+    def as_matrix(self):
+        """(N, dim) numpy 배열 view (numpy 가 없으면 None)"""
+        if np is None:
+            return None
+        return np.frombuffer(self.buffer, dtype=VECTOR_DTYPE).reshape(len(self), self.dim)
+
+
+class VectorStoreWriter:
+    """벡터 저장소 writer 인터페이스 (Pinecone, ChromaDB, 로컬 인덱스 등)"""
+
+    def add(self, doc_id: str, vector: memoryview, metadata: Optional[Dict[str, Any]] = None):
+        """float32 bytes view 로 벡터 하나 저장"""
+        raise NotImplementedError
+
+    def add_batch(self, doc_ids: List[str], batch: VectorBatch, metadatas: Optional[List[Dict[str, Any]]] = None):
+        """기본 구현: 벡터별 add() 호출 (writer 가 일괄 저장을 지원하면 재정의)"""
+        for i, doc_id in enumerate(doc_ids):
+            self.add(doc_id, batch.view(i), metadatas[i] if metadatas else None)
+
+    def flush(self):
+        """버퍼링된 쓰기 반영 (필요한 writer 만 재정의)"""
+
+    def discard_pending(self):
+        """flush 하지 않은 쓰기 버림 (저장이 중간에 실패했을 때, 버퍼링하는 writer 만 재정의)"""
+
+    @property
+    def generation(self) -> Optional[str]:
+        """저장소 세대 식별자 (저장소를 비우거나 새로 만들면 바뀜, 알 수 없으면 None)"""
+        return None
@@ -1,6 +1,7 @@
 from fastapi import APIRouter, UploadFile, File, Form
 from fastapi.responses import JSONResponse
 
+import asyncio
 import os, aiofiles
 import logging
 
@@ -14,7 +15,8 @@ from background.task.sample_tasks import (
     split_document, 
     process_document_pipeline_advanced, 
     get_pipeline_progress,
-    get_notification_history
+    get_notification_history,
+    search_chunks
 )
 
 
@@ -245,3 +247,25 @@ async def get_comprehensive_status(task_id: str):
         })
     except Exception as e:
         return JSONResponse(content={"error": str(e)}, status_code=500)
+
+@sample_router.get("/search")
+async def search(query: str, k: int = 10):
+    """저장된 청크 하이브리드 검색 (BM25 + 벡터, RRF 병합)"""
+    try:
+        results = await asyncio.to_thread(search_chunks, query, k)
+        return JSONResponse(content={
+            "query": query,
+            "result_count": len(results),
+            "results": [
+                {
+                    "id": item["id"],
+                    "rank": item["rank"],
+                    "rrf_score": item["rrf_score"],
+                    "content": item.get("metadata", {}).get("content", "")
+                }
+                for item in results
+            ]
+        })
+    except Exception as e:
+        logger.error(f"검색 중 오류 발생: {str(e)}")
+        return JSONResponse(content={"error": str(e)}, status_code=500)
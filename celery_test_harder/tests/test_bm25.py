@@ -0,0 +1,135 @@
+import math
+from collections import Counter
+
+import numpy as np
+
+from background.bm25 import BM25Index, HybridRetriever, reciprocal_rank_fusion, tokenize_korean
+from background.vector_index import VectorIndex
+from background.vectors import VECTOR_DTYPE, VectorBatch
+
+DIM = 8
+
+DOCS = [
+    "나라원시스템 연혁 2023년 10월 법인명 변경",
+    "아사달테크 홈페이지 유지관리 사업 수행",
+    "나라원 시스템의 공공사업부문 통합 서비스 구축",
+    "교육청 홈페이지 운영 용역 서비스 개선",
+    "가온솔루션 클라우드 보안 플랫폼 데이터 분석",
+]
+
+
+def _naive_scores(docs, query, k1=1.5, b=0.75):
+    """전체 문서에 대해 BM25 식을 그대로 계산한 기준값"""
+    tokenized = [Counter(tokenize_korean(doc)) for doc in docs]
+    lengths = [sum(counts.values()) for counts in tokenized]
+    avg = sum(lengths) / len(docs)
+    scores = [0.0] * len(docs)
+    for term in set(tokenize_korean(query)):
+        df = sum(1 for counts in tokenized if term in counts)
+        if df == 0:
+            continue
+        idf = math.log(1.0 + (len(docs) - df + 0.5) / (df + 0.5))
+        for row, counts in enumerate(tokenized):
+            tf = counts.get(term, 0)
+            if tf:
+                scores[row] += idf * tf * (k1 + 1.0) / (tf + k1 * (1.0 - b + b * lengths[row] / avg))
+    return scores
+
+
+def _index(docs=DOCS):
+    index = BM25Index()
+    for i, doc in enumerate(docs):
+        index.add(i, doc, {"content": doc})
+    return index
+
+
+def test_tokenizer_strips_particles_and_adds_bigrams():
+    tokens = tokenize_korean("나라원시스템의 ＡＩ 연혁은")
+    assert "나라원시스템" in tokens
+    assert {"나라", "라원", "원시", "시스", "스템"} <= set(tokens)
+    assert "ai" in tokens  # 전각 → 반각 + 소문자
+    assert "연혁" in tokens
+
+
+def test_company_name_hit_ranks_first():
+    results = _index().search("나라원시스템 연혁", k=3)
+    assert results[0]["id"] == 0
+    assert [item["rank"] for item in results] == list(range(1, len(results) + 1))
+    assert results[0]["metadata"]["content"] == DOCS[0]
+
+
+def test_scores_match_full_bm25_formula():
+    index = _index()
+    for query in ["나라원 시스템", "홈페이지 서비스", "클라우드 데이터 연혁"]:
+        expected = _naive_scores(DOCS, query)
+        results = index.search(query, k=len(DOCS))
+        assert {item["id"] for item in results} == {row for row, score in enumerate(expected) if score > 0}
+        for item in results:
+            assert math.isclose(item["bm25_score"], expected[item["id"]], rel_tol=1e-5)
+        assert [item["bm25_score"] for item in results] == sorted((item["bm25_score"] for item in results), reverse=True)
+
+
+def test_incremental_add_updates_statistics():
+    index = _index(DOCS[:2])
+    index.add(2, DOCS[2])
+    results = index.search("통합 구축", k=5)
+    assert [item["id"] for item in results] == [2]
+    assert math.isclose(results[0]["bm25_score"], _naive_scores(DOCS[:3], "통합 구축")[2], rel_tol=1e-5)
+
+
+def test_unknown_terms_return_nothing():
+    assert _index().search("존재하지않는단어", k=5) == []
+    assert BM25Index().search("연혁", k=5) == []
+
+
+def _vector_index(tmp_path, docs):
+    data = np.random.default_rng(0).standard_normal((len(docs), DIM)).astype(VECTOR_DTYPE)
+    batch = VectorBatch(bytearray(data.tobytes()), DIM)
+    index = VectorIndex(str(tmp_path), DIM)
+    index.add_batch([f"doc{i}" for i in range(len(docs))], batch, [{"content": doc} for doc in docs])
+    index.flush()
+    return index, data
+
+
+def test_sync_from_vector_index_only_reads_new_rows(tmp_path):
+    vector_index, _ = _vector_index(tmp_path, DOCS[:3])
+    bm25 = BM25Index()
+    assert bm25.sync_from_vector_index(vector_index) == 3
+    assert bm25.sync_from_vector_index(vector_index) == 0
+
+    extra = np.ones((1, DIM), dtype=VECTOR_DTYPE)
+    vector_index.add_batch(["doc3"], VectorBatch(bytearray(extra.tobytes()), DIM), [{"content": DOCS[3]}])
+    vector_index.flush()
+    assert bm25.sync_from_vector_index(vector_index) == 1
+    assert len(bm25) == 4
+    assert bm25.search("교육청", k=1)[0]["id"] == "doc3"
+
+
+def test_iter_documents_starts_from_row(tmp_path):
+    vector_index, _ = _vector_index(tmp_path, DOCS)
+    assert [doc_id for doc_id, _ in vector_index.iter_documents(3)] == ["doc3", "doc4"]
+    assert next(vector_index.iter_documents())[1] == {"content": DOCS[0]}
+
+
+def test_reciprocal_rank_fusion_merges_by_rank():
+    vector = [{"id": "a", "faiss_score": 0.9}, {"id": "b", "faiss_score": 0.8}]
+    bm25 = [{"id": "b", "bm25_score": 3.0}, {"id": "c", "bm25_score": 1.0}]
+    merged = reciprocal_rank_fusion([vector, bm25], k=60)
+    assert [item["id"] for item in merged] == ["b", "a", "c"]
+    assert merged[0]["faiss_score"] == 0.8 and merged[0]["bm25_score"] == 3.0
+    assert math.isclose(merged[0]["rrf_score"], 1 / 62 + 1 / 61)
+    assert [item["rank"] for item in merged] == [1, 2, 3]
+    assert len(reciprocal_rank_fusion([vector, bm25], top_n=2)) == 2
+
+
+def test_hybrid_retriever_combines_bm25_and_vector(tmp_path):
+    vector_index, data = _vector_index(tmp_path, DOCS)
+    bm25 = BM25Index()
+    retriever = HybridRetriever(vector_index, bm25, candidates=2)
+    assert retriever.bm25_index is bm25  # 비어 있는 색인도 그대로 사용
+
+    # 벡터는 doc4 와 같고, 텍스트는 doc0 과 정확히 일치
+    results = retriever.search("나라원시스템 법인명 변경", data[4], k=3)
+    ids = [item["id"] for item in results]
+    assert {"doc0", "doc4"} <= set(ids)
+    assert len(bm25) == len(DOCS)
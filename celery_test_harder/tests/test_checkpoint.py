@@ -0,0 +1,101 @@
+from background.checkpoint import ChunkCheckpoint, compute_file_hash
+
+
+class FakeRedis:
+    """ChunkCheckpoint 가 쓰는 Redis 명령만 흉내 (값은 bytes, TTL 은 기록만)"""
+
+    def __init__(self):
+        self.data = {}
+        self.ttls = {}
+
+    def get(self, key):
+        return self.data.get(key)
+
+    def mget(self, keys):
+        return [self.data.get(key) for key in keys]
+
+    def setex(self, key, ttl, value):
+        self.data[key] = value
+        self.ttls[key] = ttl
+
+    def setbit(self, key, offset, value):
+        bitmap = bytearray(self.data.get(key, b""))
+        if len(bitmap) <= offset >> 3:
+            bitmap.extend(b"\0" * ((offset >> 3) + 1 - len(bitmap)))
+        mask = 0x80 >> (offset & 7)
+        bitmap[offset >> 3] = bitmap[offset >> 3] | mask if value else bitmap[offset >> 3] & ~mask
+        self.data[key] = bytes(bitmap)
+
+    def expire(self, key, ttl):
+        self.ttls[key] = ttl
+
+    def delete(self, *keys):
+        for key in keys:
+            self.data.pop(key, None)
+            self.ttls.pop(key, None)
+
+    def pipeline(self):
+        return FakePipeline(self)
+
+
+class FakePipeline:
+    def __init__(self, client):
+        self.client = client
+        self.calls = []
+
+    def __getattr__(self, name):
+        return lambda *args: self.calls.append((name, args))
+
+    def execute(self):
+        for name, args in self.calls:
+            getattr(self.client, name)(*args)
+
+
+def test_resume_skips_completed_ranges_and_returns_results():
+    client = FakeRedis()
+    checkpoint = ChunkCheckpoint(client, "hash", "임베딩_생성", 120, scope="model-a", range_size=50)
+    assert checkpoint.range_count == 3
+    checkpoint.mark_done(1, [{"chunk_id": 50}])
+
+    done, missing = ChunkCheckpoint(client, "hash", "임베딩_생성", 120, scope="model-a", range_size=50).resume()
+    assert done == {1: [{"chunk_id": 50}]}
+    assert missing == [0, 2]
+    assert checkpoint.range_bounds(2) == (100, 120)
+
+
+def test_scope_separates_checkpoints():
+    client = FakeRedis()
+    ChunkCheckpoint(client, "hash", "데이터베이스_저장", 10, scope="generation-1").mark_done(0, ["doc_1"])
+
+    # 같은 파일이라도 저장소 세대가 바뀌면 처음부터 다시 처리
+    done, missing = ChunkCheckpoint(client, "hash", "데이터베이스_저장", 10, scope="generation-2").resume()
+    assert done == {}
+    assert missing == [0]
+
+
+def test_all_keys_expire():
+    client = FakeRedis()
+    checkpoint = ChunkCheckpoint(client, "hash", "텍스트_추출", 3, scope="v1", range_size=1, ttl=60)
+    checkpoint.mark_done(2, [{"text": "구간"}])
+    assert set(client.ttls) == set(client.data)
+    assert set(client.ttls.values()) == {60}
+
+
+def test_bit_without_result_is_reprocessed():
+    client = FakeRedis()
+    checkpoint = ChunkCheckpoint(client, "hash", "텍스트_추출", 2, scope="v1", range_size=1)
+    checkpoint.mark_done(0, [{"text": "a"}])
+    checkpoint.mark_done(1, [{"text": "b"}])
+    client.delete(checkpoint._range_key(1))  # 결과만 만료된 상황
+
+    done, missing = checkpoint.resume()
+    assert list(done) == [0]
+    assert missing == [1]
+    checkpoint.clear()
+    assert client.data == {}
+
+
+def test_compute_file_hash_streams_blocks(tmp_path):
+    path = tmp_path / "doc.txt"
+    path.write_bytes(b"a" * 10)
+    assert compute_file_hash(str(path), block_size=3) == compute_file_hash(str(path))
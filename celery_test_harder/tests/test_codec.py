@@ -0,0 +1,40 @@
+import json
+
+import pytest
+
+from background.codec import COMPRESSORS, MAGIC, SERIALIZERS, PayloadCodec
+
+PAYLOAD = {"task_id": "t1", "chunks": [{"chunk_id": i, "content": "나라원시스템 연혁 " * 20} for i in range(20)]}
+
+
+@pytest.mark.parametrize("serializer", sorted(SERIALIZERS))
+@pytest.mark.parametrize("compressor", sorted(COMPRESSORS))
+def test_round_trip(serializer, compressor):
+    codec = PayloadCodec(serializer=serializer, compressor=compressor)
+    encoded = codec.encode(PAYLOAD)
+    assert encoded.startswith(MAGIC)
+    assert PayloadCodec.decode(encoded) == PAYLOAD
+
+
+def test_small_payload_is_not_compressed():
+    codec = PayloadCodec(serializer="json", compressor="zlib", threshold=1024)
+    encoded = codec.encode({"progress": 10})
+    assert encoded[len(MAGIC) + 1] == 0
+    assert codec.encode(PAYLOAD)[len(MAGIC) + 1] == COMPRESSORS["zlib"][0]
+
+
+def test_legacy_json_values_are_still_readable():
+    legacy = json.dumps(PAYLOAD, ensure_ascii=False)
+    assert PayloadCodec.decode(legacy) == PAYLOAD
+    assert PayloadCodec.decode(legacy.encode("utf-8")) == PAYLOAD
+    assert PayloadCodec.decode(None) is None
+
+
+def test_unavailable_codecs_fall_back():
+    codec = PayloadCodec(serializer="missing", compressor="missing")
+    assert (codec.serializer, codec.compressor) == ("json", "zlib")
+
+
+def test_unknown_header_id_raises():
+    with pytest.raises(ValueError):
+        PayloadCodec.decode(MAGIC + bytes((99, 0)) + b"{}")
@@ -0,0 +1,69 @@
+import asyncio
+
+import pytest
+
+from background.rerank import LexicalScorer, Reranker
+
+
+class CountingScorer(LexicalScorer):
+    def __init__(self):
+        self.calls = []
+
+    def score_pairs(self, pairs):
+        self.calls.append(list(pairs))
+        return super().score_pairs(pairs)
+
+
+class FailingScorer(LexicalScorer):
+    def score_pairs(self, pairs):
+        raise RuntimeError("provider down")
+
+
+DOCS = [
+    {"id": 1, "text": "서울은 대한민국의 수도입니다"},
+    {"id": 2, "text": "부산은 항구 도시입니다"},
+    {"id": 3, "text": "대한민국 수도 서울 인구"},
+]
+
+
+def test_concurrent_requests_share_one_batch_and_cache():
+    scorer = CountingScorer()
+
+    async def scenario():
+        async with Reranker(scorer, max_wait_ms=20) as reranker:
+            first, second = await asyncio.gather(
+                reranker.rerank("대한민국 수도", DOCS, top_n=2),
+                reranker.rerank("대한민국 수도", DOCS, top_n=2),
+            )
+            again = await reranker.rerank("대한민국  수도", DOCS, top_n=2)
+            assert not reranker._tasks
+            return first, second, again
+
+    first, second, again = asyncio.run(scenario())
+    assert len(scorer.calls) == 1 and len(scorer.calls[0]) == 3
+    assert first == second == again
+    assert [result["document"]["id"] for result in first] == [1, 3]
+
+
+def test_candidates_are_cut_before_scoring():
+    scorer = CountingScorer()
+
+    async def scenario():
+        async with Reranker(scorer, max_candidates=2) as reranker:
+            return await reranker.rerank("서울", DOCS, top_n=5)
+
+    results = asyncio.run(scenario())
+    assert len(results) == 2
+    assert sum(len(call) for call in scorer.calls) == 2
+
+
+def test_scorer_failure_reaches_callers_and_is_logged(caplog):
+    async def scenario():
+        async with Reranker(FailingScorer()) as reranker:
+            with pytest.raises(RuntimeError, match="provider down"):
+                await reranker.rerank("서울", DOCS)
+            await asyncio.sleep(0)
+            assert not reranker._tasks
+
+    asyncio.run(scenario())
+    assert "rerank 배치 실패" in caplog.text
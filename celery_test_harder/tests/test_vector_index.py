@@ -0,0 +1,105 @@
+import os
+
+import numpy as np
+import pytest
+
+from background.vector_index import VectorIndex
+from background.vectors import VECTOR_DTYPE, VectorBatch
+
+DIM = 8
+
+
+def _vectors(count, seed=0):
+    rng = np.random.default_rng(seed)
+    data = rng.standard_normal((count, DIM)).astype(VECTOR_DTYPE)
+    return VectorBatch(bytearray(data.tobytes()), DIM), data
+
+
+def _add(index, batch, ids):
+    for i, doc_id in enumerate(ids):
+        index.add(doc_id, batch.view(i), {"n": doc_id})
+
+
+def _assert_aligned(index, data, ids):
+    """각 문서 ID 의 벡터로 검색하면 자기 자신이 거리 0 으로 나와야 함 (벡터/메타 짝이 맞음)"""
+    results = index.search(data, k=1, exact=True)
+    assert [hits[0]["id"] for hits in results] == ids
+    assert [hits[0]["metadata"]["n"] for hits in results] == ids
+    assert all(hits[0]["distance"] < 1e-4 for hits in results)
+
+
+def test_orphan_vector_rows_are_truncated_before_append(tmp_path):
+    batch, data = _vectors(6)
+    index = VectorIndex(str(tmp_path), DIM)
+    _add(index, VectorBatch(batch.buffer[:3 * DIM * 4], DIM), ["a", "b", "c"])
+    index.flush()
+
+    # 벡터 append 후 메타를 쓰기 전에 죽은 프로세스 흉내 (메타 없는 벡터 2행 + 끝나지 않은 메타 줄)
+    with open(tmp_path / "vectors.f32", "ab") as f:
+        f.write(np.ones((2, DIM), dtype=VECTOR_DTYPE).tobytes())
+    with open(tmp_path / "meta.jsonl", "a", encoding="utf-8") as f:
+        f.write('{"id": "ghost", "meta')
+
+    writer = VectorIndex(str(tmp_path), DIM)
+    _add(writer, VectorBatch(batch.buffer[3 * DIM * 4:], DIM), ["d", "e", "f"])
+    writer.flush()
+
+    reopened = VectorIndex(str(tmp_path), DIM)
+    assert len(reopened) == 6
+    assert os.path.getsize(tmp_path / "vectors.f32") == 6 * DIM * 4
+    _assert_aligned(reopened, data, ["a", "b", "c", "d", "e", "f"])
+
+
+def test_existing_ids_are_not_appended_again(tmp_path):
+    batch, data = _vectors(4)
+    index = VectorIndex(str(tmp_path), DIM)
+    _add(index, batch, ["a", "b", "c", "d"])
+    index.flush()
+
+    # 재시도된 저장 작업이 같은 청크를 다른 프로세스에서 다시 저장
+    other = VectorIndex(str(tmp_path), DIM)
+    _add(other, batch, ["a", "b", "c", "d"])
+    other.flush()
+
+    assert len(VectorIndex(str(tmp_path), DIM)) == 4
+    _assert_aligned(other, data, ["a", "b", "c", "d"])
+
+
+def test_discard_pending_drops_unflushed_vectors(tmp_path):
+    batch, _ = _vectors(2)
+    index = VectorIndex(str(tmp_path), DIM)
+    _add(index, batch, ["a", "b"])
+    index.discard_pending()
+    index.flush()
+    assert len(index) == 0
+    assert not (tmp_path / "meta.jsonl").exists()
+
+
+def test_training_happens_on_search_not_on_flush(tmp_path):
+    batch, data = _vectors(64)
+    index = VectorIndex(str(tmp_path), DIM, ivf_threshold=32)
+    _add(index, batch, [f"doc_{i}" for i in range(64)])
+    index.flush()
+    assert index._centroids is None
+    assert index.needs_training()
+
+    index.search(data[:1], k=1)
+    assert index._centroids is not None
+    assert not index.needs_training()
+    assert (tmp_path / "centroids.npy").exists()
+    assert not [name for name in os.listdir(tmp_path) if name.endswith(".tmp")]
+
+
+def test_vector_size_mismatch_is_rejected(tmp_path):
+    index = VectorIndex(str(tmp_path), DIM)
+    with pytest.raises(ValueError):
+        index.add("a", memoryview(bytes(DIM * 4 - 4)))
+
+
+def test_generation_is_shared_and_changes_when_directory_is_recreated(tmp_path):
+    first = VectorIndex(str(tmp_path / "index"), DIM)
+    assert VectorIndex(str(tmp_path / "index"), DIM).generation == first.generation
+
+    for name in os.listdir(tmp_path / "index"):
+        os.remove(tmp_path / "index" / name)
+    assert VectorIndex(str(tmp_path / "index"), DIM).generation != first.generation
@@ -0,0 +1,47 @@
+import numpy as np
+import pytest
+
+from background.vectors import (
+    VECTOR_DTYPE,
+    VectorBatch,
+    pack_vector,
+    simulate_embedding,
+    unpack_vector,
+    vector_from_json,
+    vector_to_json,
+)
+
+
+def test_json_round_trip_is_exact():
+    values = [0.1, -2.5, 3.0e-7, 1.0]
+    payload = vector_to_json(values)
+    assert payload["dim"] == 4
+    assert vector_from_json(payload) == pack_vector(values)
+    assert np.array_equal(unpack_vector(vector_from_json(payload)), np.asarray(values, dtype=VECTOR_DTYPE))
+
+
+def test_legacy_float_list_is_accepted():
+    assert vector_from_json([1.0, 2.0]) == pack_vector([1.0, 2.0])
+
+
+def test_simulated_embedding_is_deterministic_and_normalized():
+    first = simulate_embedding("나라원시스템", 16)
+    assert first == simulate_embedding("나라원시스템", 16)
+    assert first != simulate_embedding("아사달", 16)
+    assert np.isclose(np.linalg.norm(unpack_vector(first)), 1.0, atol=1e-5)
+
+
+def test_batch_views_share_the_buffer():
+    payloads = [vector_to_json([float(i), float(i + 1), float(i + 2)]) for i in range(4)]
+    batch = VectorBatch.from_json_list(payloads)
+    assert (len(batch), batch.dim) == (4, 3)
+    assert list(unpack_vector(batch.view(2))) == [2.0, 3.0, 4.0]
+    batch.buffer[:4] = pack_vector([9.0])
+    assert batch.as_matrix()[0, 0] == 9.0
+
+
+def test_batch_rejects_mismatched_dimensions():
+    with pytest.raises(ValueError):
+        VectorBatch.from_json_list([vector_to_json([1.0, 2.0]), vector_to_json([1.0])])
+    with pytest.raises(ValueError):
+        VectorBatch(bytearray(12), 2)
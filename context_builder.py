@@ -0,0 +1,165 @@
+import re
+from typing import Any, Dict, List, Optional, Tuple
+
+from source_extractor import parse_retriever_text
+
+try:
+    import tiktoken
+
+    _ENCODING = tiktoken.get_encoding("o200k_base")
+except Exception:  # tiktoken 이 없거나 인코딩 파일을 받을 수 없는 환경
+    _ENCODING = None
+
+_HANGUL = re.compile(r"[가-힣]")
+_SPACES = re.compile(r"\s+")
+
+# 답변 모델에 넘길 검색 결과 기본 토큰 예산
+DEFAULT_TOKEN_BUDGET = 1500
+
+
+def count_tokens(text: str) -> int:
+    """
+    토큰 수 계산
+
+    tiktoken 이 있으면 정확히, 없으면 근사치(한글 1글자 ≈ 1토큰, 그 외 4글자 ≈ 1토큰)로 계산합니다.
+    """
+    if _ENCODING is not None:
+        return len(_ENCODING.encode(text))
+    hangul = len(_HANGUL.findall(text))
+    return hangul + (len(text) - hangul + 3) // 4
+
+
+def build_context(
+    retrievers: List[Dict[str, Any]],
+    token_budget: int = DEFAULT_TOKEN_BUDGET,
+) -> str:
+    """
+    답변 모델용 검색 결과 컨텍스트 생성
+
+    - rank 순서로 담고, 토큰 예산을 넘으면 줄 단위로 잘라서 멈춤
+    - 같은 출처의 청크는 하나의 블록으로 묶어 출처/제목을 한 번만 표기
+    - 서로 다른 청크 간 겹치는 줄(분할 overlap, 반복 메뉴 등)은 한 번만 포함 (같은 청크 안의 반복은 유지)
+    - text 와 중복되는 content, faiss_score/distance 같은 점수 필드는 제외
+
+    Args:
+        retrievers: retrivers.json 형식의 검색 결과
+        token_budget: 본문 전체 최대 토큰 수
+
+    Returns:
+        str: "[1] 제목 (출처)\\n본문..." 블록을 빈 줄로 이은 문자열
+    """
+    blocks: Dict[str, Dict[str, Any]] = {}  # source → {"header", "lines"} (삽입 순서 = 첫 등장 rank 순)
+    seen_lines = set()
+    used_tokens = 0
+
+    for retriever in sorted(retrievers, key=lambda r: r.get("rank", 0)):
+        parsed = parse_retriever_text(retriever.get("text", ""))
+        source = parsed["source"] or retriever.get("content", "")
+
+        # 앞선 청크에 나온 줄만 제외 (한 청크 안에서 반복되는 줄은 본문 그대로 유지)
+        new_lines = []
+        chunk_lines = set()
+        for line in parsed["body"]:
+            key = _SPACES.sub(" ", line).strip()
+            chunk_lines.add(key)
+            if key not in seen_lines:
+                new_lines.append(line)
+        seen_lines |= chunk_lines
+        if not new_lines:
+            continue
+
+        block = blocks.get(source)
+        if block is None:
+            title = retriever.get("subject") or parsed["title"] or source
+            header = f"[{len(blocks) + 1}] {title}" + (f" ({source})" if source != title else "")
+            block = {"header": header, "lines": []}
+            header_tokens = count_tokens(header) + 1
+            if used_tokens + header_tokens >= token_budget:
+                break
+            blocks[source] = block
+            used_tokens += header_tokens
+
+        exhausted = False
+        for line in new_lines:
+            line_tokens = count_tokens(line) + 1
+            if used_tokens + line_tokens > token_budget:
+                exhausted = True
+                break
+            block["lines"].append(line)
+            used_tokens += line_tokens
+        if exhausted:
+            break
+
+    return "\n\n".join(
+        "\n".join([block["header"], *block["lines"]])
+        for block in blocks.values()
+        if block["lines"]
+    )
+
+
+def compare_context_size(retrievers: List[Dict[str, Any]], context: str, baseline: Optional[str] = None) -> Dict[str, int]:
+    """
+    기존 방식(str(retrievers)) 대비 컨텍스트 크기 비교
+
+    Returns:
+        dict: {"before_tokens", "after_tokens", "before_chars", "after_chars"}
+    """
+    baseline = baseline if baseline is not None else str(retrievers)
+    return {
+        "before_tokens": count_tokens(baseline),
+        "after_tokens": count_tokens(context),
+        "before_chars": len(baseline),
+        "after_chars": len(context),
+    }
+
+
+def build_context_with_report(
+    retrievers: List[Dict[str, Any]],
+    token_budget: int = DEFAULT_TOKEN_BUDGET,
+) -> Tuple[str, Dict[str, int]]:
+    """컨텍스트와 크기 비교 결과를 함께 반환"""
+    context = build_context(retrievers, token_budget)
+    return context, compare_context_size(retrievers, context)
+
+
+async def run_latency_check(model: str = "gpt-4o-mini", token_budget: int = DEFAULT_TOKEN_BUDGET):
+    """
+    실제 모델로 기존/압축 컨텍스트의 첫 토큰·전체 응답 시간 비교 (OPENAI_API_KEY 필요)
+    """
+    import json
+    import time
+
+    from ai_search_stream import AnswerStreamEngine
+
+    with open("retrivers.json", "r", encoding="utf-8") as f:
+        retrievers = json.load(f)
+    prompt = "검색 결과를 참고해서 질문에 답변하세요. 질문: 나라원시스템의 연혁을 알려줘"
+    engine = AnswerStreamEngine()
+    for label, context in (("before", str(retrievers)), ("after", build_context(retrievers, token_budget))):
+        start = time.perf_counter()
+        first = None
+        async for _ in engine.stream(model, prompt, context):
+            first = first or time.perf_counter() - start
+        total = time.perf_counter() - start
+        print(f"{label}: 입력 {count_tokens(context)} 토큰, 첫 청크 {first or 0:.2f}초, 전체 {total:.2f}초")
+    await engine.aclose()
+
+
+if __name__ == "__main__":
+    import asyncio
+    import json
+    import os
+    import time
+
+    with open("retrivers.json", "r", encoding="utf-8") as f:
+        retrievers = json.load(f)
+
+    start = time.perf_counter()
+    context, report = build_context_with_report(retrievers)
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    print(context)
+    print(f"\n토큰: {report['before_tokens']} → {report['after_tokens']}, "
+          f"글자 수: {report['before_chars']} → {report['after_chars']}, 생성 {elapsed_ms:.2f}ms")
+
+    if os.getenv("OPENAI_API_KEY"):
+        asyncio.run(run_latency_check())
@@ -0,0 +1,305 @@
+import asyncio
+import re
+import time
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Set
+from urllib.parse import urldefrag, urljoin, urlparse
+
+import aiohttp
+
+from html_decoder import read_html
+
+DEFAULT_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
+    'Accept-Language': 'ko-KR,ko;q=0.9,en-US;q=0.8,en;q=0.7',
+}
+
+_HREF_PATTERN = re.compile(r"""<a\s[^>]*?href\s*=\s*["']([^"'#]+)""", re.IGNORECASE)
+
+# 페이지 처리 함수: (url, html) → 결과 (예: create_search_snippets, favicon/site_name 파싱)
+PageHandler = Callable[[str, str], Awaitable[Any]]
+
+
+class AsyncCrawler:
+    """
+    재사용 가능한 비동기 크롤러
+
+    - 하나의 aiohttp.ClientSession 커넥션 풀 공유 (전체/호스트별 연결 수 제한)
+    - URL frontier(Queue) 를 정해진 수의 worker 가 나눠서 처리
+    - 같은 도메인 요청 사이 최소 간격(politeness delay) 유지
+    - ETag/Last-Modified 로 조건부 GET, 304 응답이면 이전 본문 재사용
+    - 같은 URL 을 동시에 요청하면 한 번만 받아서 공유
+    - 본문은 받는 대로 디코딩 (BOM/헤더/<meta charset> 순으로 인코딩 결정, 실패 시에만 감지)
+    """
+
+    def __init__(
+        self,
+        max_workers: int = 10,
+        max_connections: int = 100,
+        per_host_limit: int = 4,
+        politeness_delay: float = 0.5,
+        timeout: float = 10.0,
+        headers: Optional[Dict[str, str]] = None,
+    ):
+        """
+        Args:
+            max_workers: 동시에 페이지를 처리할 worker 수
+            max_connections: 커넥션 풀 전체 최대 연결 수
+            per_host_limit: 호스트별 최대 동시 연결 수
+            politeness_delay: 같은 도메인 요청 시작 사이 최소 간격(초)
+            timeout: 요청당 제한 시간(초)
+            headers: 기본 요청 헤더
+        """
+        self.max_workers = max_workers
+        self.max_connections = max_connections
+        self.per_host_limit = per_host_limit
+        self.politeness_delay = politeness_delay
+        self.timeout = aiohttp.ClientTimeout(total=timeout)
+        self.headers = headers or DEFAULT_HEADERS
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._next_request_at: Dict[str, float] = {}
+        self._validators: Dict[str, Dict[str, str]] = {}  # url → {"etag", "last_modified", "html", "encoding"}
+        self._in_flight: Dict[str, asyncio.Task] = {}
+        self.stats = {"requests": 0, "not_modified": 0, "errors": 0}
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=self.max_connections, limit_per_host=self.per_host_limit, ttl_dns_cache=300),
+                headers=self.headers,
+                timeout=self.timeout,
+            )
+        return self._session
+
+    async def _wait_politeness(self, host: str):
+        if self.politeness_delay <= 0:
+            return
+        # 도메인별 다음 요청 가능 시각을 미리 예약 (await 전에 갱신하므로 lock 불필요)
+        now = time.monotonic()
+        start_at = max(now, self._next_request_at.get(host, 0.0))
+        self._next_request_at[host] = start_at + self.politeness_delay
+        if start_at > now:
+            await asyncio.sleep(start_at - now)
+
+    async def fetch(self, url: str) -> Dict[str, Any]:
+        """
+        URL 한 개 요청 (조건부 GET)
+
+        같은 URL 요청은 하나의 Task 로 실행하고 모든 호출자가 shield 로 기다립니다.
+        한 호출자가 취소돼도 다른 호출자의 요청은 계속 진행되고, 오류는 모두에게 같은 예외로 전달됩니다.
+
+        Returns:
+            dict: {"url", "status", "html", "encoding", "not_modified", "elapsed", "error"}
+        """
+        task = self._in_flight.get(url)
+        if task is None:
+            task = asyncio.ensure_future(self._fetch(url))
+            self._in_flight[url] = task
+            task.add_done_callback(lambda done: self._fetch_done(url, done))
+        return await asyncio.shield(task)
+
+    def _fetch_done(self, url: str, task: asyncio.Task):
+        if self._in_flight.get(url) is task:
+            del self._in_flight[url]
+        if not task.cancelled():
+            task.exception()  # 기다리던 호출자가 모두 취소됐을 때 경고 방지
+
+    @staticmethod
+    def _new_result(url: str) -> Dict[str, Any]:
+        return {"url": url, "status": None, "html": "", "encoding": None, "not_modified": False, "elapsed": 0.0, "error": None}
+
+    async def _fetch(self, url: str) -> Dict[str, Any]:
+        result = self._new_result(url)
+        headers = {}
+        cached = self._validators.get(url)
+        if cached:
+            if cached.get("etag"):
+                headers["If-None-Match"] = cached["etag"]
+            if cached.get("last_modified"):
+                headers["If-Modified-Since"] = cached["last_modified"]
+
+        await self._wait_politeness(urlparse(url).netloc)
+        start = time.perf_counter()
+        try:
+            self.stats["requests"] += 1
+            async with self._get_session().get(url, headers=headers) as response:
+                result["status"] = response.status
+                if response.status == 304 and cached:
+                    self.stats["not_modified"] += 1
+                    result["status"] = 200
+                    result["not_modified"] = True
+                    result["html"] = cached["html"]
+                    result["encoding"] = cached["encoding"]
+                elif response.status == 200:
+                    result["html"], decoding = await read_html(response)
+                    result["encoding"] = decoding["encoding"]
+                    etag = response.headers.get("ETag")
+                    last_modified = response.headers.get("Last-Modified")
+                    if etag or last_modified:
+                        self._validators[url] = {
+                            "etag": etag, "last_modified": last_modified, "html": result["html"], "encoding": result["encoding"],
+                        }
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            self.stats["errors"] += 1
+            result["error"] = f"{type(e).__name__}: {e}"
+        result["elapsed"] = time.perf_counter() - start
+        return result
+
+    async def crawl(
+        self,
+        urls: Iterable[str],
+        handler: Optional[PageHandler] = None,
+        max_depth: int = 0,
+        max_pages: Optional[int] = None,
+        same_host: bool = True,
+    ) -> List[Dict[str, Any]]:
+        """
+        URL frontier 크롤링
+
+        Args:
+            urls: 시작 URL 목록
+            handler: 성공한 페이지마다 호출할 코루틴 함수 (결과는 "data" 에 저장)
+            max_depth: 링크를 따라갈 깊이 (0 이면 주어진 URL 만)
+            max_pages: 최대 처리 페이지 수
+            same_host: 링크를 따라갈 때 시작 URL 과 같은 호스트만 허용
+
+        Returns:
+            list[dict]: fetch 결과 + {"depth", "data"} (처리 순서)
+        """
+        frontier: asyncio.Queue = asyncio.Queue()
+        seen: Set[str] = set()
+        start_hosts = set()
+        for url in urls:
+            url = urldefrag(url)[0]
+            if url not in seen:
+                seen.add(url)
+                start_hosts.add(urlparse(url).netloc)
+                frontier.put_nowait((url, 0))
+        results: List[Dict[str, Any]] = []
+        reserved = 0  # fetch 를 시작한 페이지 수 (await 전에 자리를 예약해서 max_pages 를 넘지 않음)
+
+        async def worker():
+            nonlocal reserved
+            while True:
+                url, depth = await frontier.get()
+                try:
+                    if max_pages is not None and reserved >= max_pages:
+                        continue
+                    reserved += 1
+                    try:
+                        result = await self.fetch(url)
+                    except Exception as e:
+                        # 예상하지 못한 오류도 URL 단위로 기록하고 worker 는 계속 진행
+                        self.stats["errors"] += 1
+                        result = dict(self._new_result(url), error=f"{type(e).__name__}: {e}")
+                    result = dict(result, depth=depth, data=None)
+                    results.append(result)
+                    if result["status"] != 200 or not result["html"]:
+                        continue
+                    if handler is not None:
+                        try:
+                            result["data"] = await handler(url, result["html"])
+                        except Exception as e:
+                            result["error"] = f"handler 오류: {e}"
+                    if depth < max_depth:
+                        for link in extract_links(result["html"], url):
+                            if link in seen or (same_host and urlparse(link).netloc not in start_hosts):
+                                continue
+                            seen.add(link)
+                            frontier.put_nowait((link, depth + 1))
+                finally:
+                    frontier.task_done()
+
+        workers = [asyncio.create_task(worker()) for _ in range(self.max_workers)]
+        try:
+            await frontier.join()
+        finally:
+            for task in workers:
+                task.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+        return results
+
+    async def aclose(self):
+        for task in list(self._in_flight.values()):
+            task.cancel()
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.aclose()
+
+
+def extract_links(html: str, base_url: str) -> List[str]:
+    """a[href] 링크를 절대 URL 로 변환 (http/https 만, fragment 제거)"""
+    links = []
+    for href in _HREF_PATTERN.findall(html):
+        link = urldefrag(urljoin(base_url, href.strip()))[0]
+        if link.startswith(("http://", "https://")):
+            links.append(link)
+    return links
+
+
+async def run_benchmark(page_count: int = 200, latency: float = 0.02, workers: int = 20):
+    """
+    로컬 HTTP 서버로 처리량 비교
+
+    - 기존 방식: URL 마다 새 ClientSession, 순차 요청
+    - 크롤러: 공유 세션 + worker pool (1차), 조건부 GET 재방문 (2차)
+    """
+    from aiohttp import web
+
+    async def page(request: web.Request) -> web.Response:
+        number = int(request.match_info["number"])
+        etag = f'"page-{number}"'
+        if request.headers.get("If-None-Match") == etag:
+            return web.Response(status=304, headers={"ETag": etag})
+        await asyncio.sleep(latency)
+        links = "".join(f'<a href="/page/{(number * 7 + i) % page_count}">link</a>' for i in range(3))
+        html = f"<html><head><title>page {number}</title></head><body><p>본문 {number}</p>{links}</body></html>"
+        return web.Response(text=html, content_type="text/html", headers={"ETag": etag})
+
+    app = web.Application()
+    app.router.add_get("/page/{number}", page)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    urls = [f"http://127.0.0.1:{port}/page/{i}" for i in range(page_count)]
+
+    try:
+        sample = urls[:50]
+        start = time.perf_counter()
+        for url in sample:
+            async with aiohttp.ClientSession() as session:
+                async with session.get(url, headers=DEFAULT_HEADERS) as response:
+                    await response.text()
+        naive_rate = len(sample) / (time.perf_counter() - start)
+        print(f"기존 방식(URL 마다 새 세션, 순차): {naive_rate:.0f} pages/s")
+
+        async with AsyncCrawler(max_workers=workers, per_host_limit=workers, politeness_delay=0) as crawler:
+            start = time.perf_counter()
+            results = await crawler.crawl(urls)
+            elapsed = time.perf_counter() - start
+            print(f"크롤러 1차 (worker {workers}개): {len(results) / elapsed:.0f} pages/s, {len(results)}페이지 {elapsed:.2f}초")
+
+            start = time.perf_counter()
+            results = await crawler.crawl(urls)
+            elapsed = time.perf_counter() - start
+            not_modified = sum(r["not_modified"] for r in results)
+            print(f"크롤러 2차 (조건부 GET, 304 {not_modified}개): {len(results) / elapsed:.0f} pages/s")
+
+        async with AsyncCrawler(max_workers=workers, per_host_limit=4, politeness_delay=0.01) as crawler:
+            start = time.perf_counter()
+            results = await crawler.crawl(urls[:1], max_depth=3, max_pages=100)
+            elapsed = time.perf_counter() - start
+            print(f"링크 따라가기 (깊이 3, politeness 10ms): {len(results)}페이지 {elapsed:.2f}초")
+    finally:
+        await runner.cleanup()
+
+
+if __name__ == "__main__":
+    asyncio.run(run_benchmark())
@@ -1,16 +1,16 @@
 import re
 import codecs
 
+from mojibake import repair_mojibake
+
 
 # broken = "AI ì±\x84í\x8c AI ë²\x88ì\x97\xad AI ë¬¸ì\x84\x9c AI ê²\x80ì\x83\x89 AIí\x94\x84ë¡\x9cë\x8a\x94 ì\x97\x85ë¬´ì\x9a© AI ì\x86\x94ë£¨ì\x85\x98ì\x9e\x85ë\x8b\x88ë\x8b¤."
 # broken = "ãìì¬ë¬ ìì°½ë ëí ì¸ì¬ë§\n\nãìë¯¸ìì¤ì½ ì´ìì¢ ëí ì¶ì¬1\n\nì ì´ì ì´ëª¨í°ì¤ã ì´ì² ì ì¬ì¥ ì¶ì¬2\n\nê°ë³ì êµ­íìì ì¶ì  ëë\n\níê³  ì¬ì´í¸ ìì°í1\n\níê³  ì¬ì´í¸ ìì°í2\n\nãìì¬ë¬ ì¬ì¬ì¶ ë¶ì¬ì¥ ê²©ë ¤ì¬\n\nãìì¬ë¬ ìì°½ë ëíì \nãìë¯¸ìì¤ì½ ì´ìì¢ ëí\n\nì§ìë¤ì ì¶í ëìì ì¬ì§\n\níì¬ì¥ ë´ QRì½ë ì´ì©íë ëª¨ìµ\n\níê³  ê°ìì ë¨ì²´ì¬ì§\nëìì [...] ì¬ì¬ì¶ ë¶ì¬ì¥\nãìì¬ë¬\nìì°½ë : ãìì¬ë¬ì ì°½ìì ê²¸ ëíì´ì¬ìëë¤. ìì¸ëíêµ ê²½ì íê³¼ë¥¼ ì¡¸ìíê³ , ë¯¸êµ­ ë¡ì²´ì¤í° ëíêµ ë°ì¬ê³¼ì ìì ê²ìì´ë¡ ì ê³µë¶íìµëë¤. 1998ë ì¸í°ë· ì¬ìì ë°ì´ë¤ì´ ãìì¬ë¬ì ì°½ìíê³  ëíì´ì¬ë¡ ì¼íìµëë¤. 2018ë ë¸ë¡ì²´ì¸ ë° ìí¸íí ìì¥ì ì§ì¶íê¸° ìí´, ãìì¬ë¬ì ìíì¬ë¡ ãí´ìë·ì ì°½ìíìµëë¤. [...] | 17:06 ~ 17:11 | ì¶ì¬1 | ãìë¯¸ìì¤ì½ ì´ìì¢ ëí |  |\n| 17:11 ~ 17:16 | ì¶ì¬2 | ì ì´ì ì´ëª¨í°ì¤ã ì´ì² ì ì¬ì¥ |  |\n| 17:16 ~ 17:20 | ì¶ì  ë­ë | ê°ë³ì êµ­íìì |  |\n| 17:20 ~ 17:25 | ìì° | ì°¸ê°ì ì ì | íê³  ííì´ì§ ìì° |\n| 17:25 ~ 17:28 | ê²©ë ¤ì¬ | ãìì¬ë¬ ì¬ì¬ì¶ ë¶ì¬ì¥ |  |\n| 17:28 ~ 17:30 | ì¶í ëìì | ãìì¬ë¬ ì§ì |  |\n| 17:30 ~ 17:35 | ë¨ì²´ì¬ì§ | ì°¸ê°ì ì ì | ì¬ì§ ì´¬ì |"
 broken = "è\x85¾è®¯æ\x96\x87â\x80ªæ¡£â\x80¬\n 4+\n\nå\x8f¯å¤\x9aäººå®\x9eæ\x97¶å\x8d\x8fä½\x9cç\x9a\x84å\x9c¨çº¿æ\x96\x87â\x80ªæ¡£â\x80¬\n\nTencent Technology (Shenzhen) Company Limited\n\næ\x88ªå±\x8f\n\nç®\x80ä»\x8b [...] æ\x9c\x80è¿\x91ä½\x93éª\x8cæ\x84\x9fé£\x9eèµ·ï¼\x8cæ¡\x8cé\x9d¢ç«¯ç\x94¨èµ·æ\x9d¥æ\x9b´ä¸\x9dæ»\x91äº\x86ã\x80\x82\n\né\x9d\x9eå¸¸å®\x9eç\x94¨å\x90§\n\né\x9d\x9eå¸¸å®\x9eç\x94¨ï¼\x8c å¸\x8cæ\x9c\x9bæ\x97©æ\x97¥è¶\x85è¶\x8aofficeå\x92\x8cé\x87\x91å±±æ\x96\x87æ¡£\n\nApp é\x9a\x90ç§\x81\n\nå¼\x80å\x8f\x91è\x80\x85â\x80\x9cTencent Technology (Shenzhen) Company Limitedâ\x80\x9då·²è¡¨æ\x98\x8eè¯¥ App ç\x9a\x84é\x9a\x90ç§\x81è§\x84è\x8c\x83å\x8f¯è\x83½å\x8c\x85æ\x8b¬äº\x86ä¸\x8bè¿°ç\x9a\x84æ\x95°æ\x8d®å¤\x84ç\x90\x86æ\x96¹å¼\x8fã\x80\x82æ\x9c\x89å\x85³æ\x9b´å¤\x9aä¿¡æ\x81¯ï¼\x8cè¯·å\x8f\x82é\x98\x85å¼\x80å\x8f\x91è\x80\x85é\x9a\x90ç§\x81æ\x94¿ç\xad\x96ã\x80\x82\n\nç\x94¨äº\x8eè¿½è¸ªä½\xa0ç\x9a\x84æ\x95°æ\x8d®\n\nä»¥ä¸\x8bæ\x95°æ\x8d®å\x8f¯è\x83½ä¼\x9aç\x94¨äº\x8eå\x9c¨å\x85¶ä»\x96å\x85¬å\x8f¸ç\x9a\x84 App å\x92\x8cç½\x91ç«\x99ä¸\xadè¿½è¸ªä½\xa0ï¼\x9a\n\nä¸\x8eä½\xa0å\x85³è\x81\x94ç\x9a\x84æ\x95°æ\x8d® [...] .comæ\x84\x8fè§\x81å\x8f\x8dé¦\x88ï¼\x9aç\x99»å½\x95è\x85¾è®¯æ\x96\x87æ¡£ï¼\x8cè¿\x9bå\x85¥â\x80\x9cè®¾ç½®-æ\x84\x8fè§\x81å\x8f\x8dé¦\x88â\x80\x9dè¿\x9bè¡\x8cå\x8f\x8dé¦\x88ã\x80\x82å¦\x82æ\x9e\x9cä½\xa0è§\x89å¾\x97è\x85¾è®¯æ\x96\x87æ¡£è¿\x98ä¸\x8dé\x94\x99ï¼\x8cè¯·ç»\x99æ\x88\x91ä»¬äº\x94æ\x98\x9få¥½è¯\x84ï½\x9eå¦\x82æ\x9e\x9cå\x9c¨ä½¿ç\x94¨è¿\x87ç¨\x8bä¸\xadæ\x9c\x89ä»»ä½\x95é\x97®é¢\x98ï¼\x8cæ¬¢è¿\x8eå\x9c¨è¯\x84è®ºå\x8cºç\x95\x99ä¸\x8bæ\x84\x8fè§\x81ã\x80\x82ä½\xa0æ\x89\x80é\x9c\x80è¦\x81ç\x9a\x84ï¼\x8cå°±æ\x98¯æ\x88\x91ä»¬å\x8aªå\x8a\x9bç\x9a\x84æ\x96¹å\x90\x91ã\x80\x82-----è\x85¾è®¯æ\x96\x87æ¡£ä¼\x9aå\x91\x98/è\x85¾è®¯æ\x96\x87æ¡£è¶\x85çº§ä¼\x9aå\x91\x98è\x87ªå\x8a¨è®¢é\x98\x85æ\x9c\x8då\x8a¡è¯´æ\x98\x8e-----1ã\x80\x81è\x85¾è®¯æ\x96\x87æ¡£ä¼\x9aå\x91\x98è\x87ªå\x8a¨è®¢é\x98\x85æ\x9c\x8då\x8a¡æ\x9c\x89ä»¥ä¸\x8bä¸\x80ç§\x8dè®¢è´\xadç±»å\x9e\x8bï¼\x9a9å\x85\x83/1ä¸ªæ\x9c\x88ã\x80\x82è\x85¾è®¯æ\x96\x87æ¡£è¶\x85çº§ä¼\x9aå\x91\x98è\x87ªå\x8a¨è®¢é\x98\x85æ\x9c\x8då\x8a¡æ\x9c\x89ä»¥ä¸\x8bè®¢è´\xadç±»å\x9e\x8b"
 
-# 1. 깨진 문자열을 bytes로 변환 (latin1로 인코딩)
-bytes_data = broken.encode('latin1', errors='ignore')
-
-# 2. UTF-8로 디코딩
-fixed = bytes_data.decode('utf-8', errors='ignore')
+# 깨진 구간만 찾아서 bytes(latin1/cp1252) → UTF-8 로 복원
+# (문자열 전체를 latin1 → UTF-8 로 바꾸면 정상 텍스트가 섞여 있을 때 문자가 사라짐)
+fixed = repair_mojibake(broken)
 
 print(fixed)
 
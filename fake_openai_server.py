@@ -0,0 +1,113 @@
+import asyncio
+import json
+import time
+from typing import Optional
+
+# 로컬 테스트용 OpenAI 호환 스트리밍 서버
+# POST /v1/chat/completions (stream=True) 요청에 SSE 청크를 일정 간격으로 돌려줌
+
+
+class FakeOpenAIServer:
+    """
+    OpenAI chat.completions 스트리밍을 흉내내는 로컬 서버 (표준 라이브러리만 사용)
+
+    사용 예:
+        async with FakeOpenAIServer(tokens=20, delay=0.05) as server:
+            client = openai.AsyncOpenAI(base_url=server.base_url, api_key="test")
+    """
+
+    def __init__(self, tokens: int = 20, delay: float = 0.05, text: str = "테스트 응답 ", host: str = "127.0.0.1", port: int = 0):
+        """
+        Args:
+            tokens: 스트리밍할 청크 수
+            delay: 청크 사이 지연(초) - LLM 생성 속도 시뮬레이션
+            text: 청크마다 보낼 내용
+        """
+        self.tokens = tokens
+        self.delay = delay
+        self.text = text
+        self.host = host
+        self.port = port
+        self.request_count = 0
+        self._server: Optional[asyncio.base_events.Server] = None
+
+    @property
+    def base_url(self) -> str:
+        return f"http://{self.host}:{self.port}/v1"
+
+    async def start(self):
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def stop(self):
+        if self._server:
+            self._server.close()
+            await self._server.wait_closed()
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.stop()
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            # keep-alive 연결에서 여러 요청 처리
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                body = await reader.readexactly(int(headers.get("content-length", "0")))
+                self.request_count += 1
+                payload = json.loads(body or b"{}")
+                await self._stream_completion(writer, payload.get("model", "fake-model"))
+        except (ConnectionResetError, asyncio.IncompleteReadError, BrokenPipeError):
+            pass
+        finally:
+            writer.close()
+
+    async def _stream_completion(self, writer: asyncio.StreamWriter, model: str):
+        writer.write(
+            b"HTTP/1.1 200 OK\r\n"
+            b"Content-Type: text/event-stream\r\n"
+            b"Transfer-Encoding: chunked\r\n"
+            b"Connection: keep-alive\r\n\r\n"
+        )
+        created = int(time.time())
+        for i in range(self.tokens):
+            await asyncio.sleep(self.delay)
+            chunk = {
+                "id": "chatcmpl-fake",
+                "object": "chat.completion.chunk",
+                "created": created,
+                "model": model,
+                "choices": [{"index": 0, "delta": {"content": f"{self.text}{i} "}, "finish_reason": None}],
+            }
+            self._write_event(writer, json.dumps(chunk, ensure_ascii=False))
+            await writer.drain()
+        self._write_event(writer, "[DONE]")
+        writer.write(b"0\r\n\r\n")
+        await writer.drain()
+
+    @staticmethod
+    def _write_event(writer: asyncio.StreamWriter, data: str):
+        event = f"data: {data}\n\n".encode("utf-8")
+        writer.write(f"{len(event):x}\r\n".encode("ascii") + event + b"\r\n")
+
+
+async def main():
+    async with FakeOpenAIServer() as server:
+        print(f"가짜 OpenAI 서버 실행 중: {server.base_url}")
+        await asyncio.Event().wait()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,133 @@
+import asyncio
+import json
+from typing import Dict, Optional
+
+# 로컬 테스트용 Tavily API 대체 서버
+# POST /search, /extract, /crawl, /map 요청에 일정 지연 후 Tavily 형식의 JSON 을 돌려줌
+
+
+class FakeTavilyServer:
+    """
+    Tavily REST API 를 흉내내는 로컬 서버 (표준 라이브러리만 사용)
+
+    사용 예:
+        async with FakeTavilyServer(delay=0.2) as server:
+            gateway = TavilyGateway(api_key="test", base_url=server.base_url)
+    """
+
+    def __init__(self, delay: float = 0.2, host: str = "127.0.0.1", port: int = 0, api_key: Optional[str] = None):
+        """
+        Args:
+            delay: 요청당 응답 지연(초) - 실제 API 응답 시간 시뮬레이션
+            api_key: 지정하면 이 키가 아닌 요청은 401 (없으면 Bearer 헤더만 확인)
+        """
+        self.delay = delay
+        self.api_key = api_key
+        self.host = host
+        self.port = port
+        self.request_count = 0
+        self.requests_by_path: Dict[str, int] = {}
+        self._server: Optional[asyncio.base_events.Server] = None
+
+    @property
+    def base_url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    async def start(self):
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def stop(self):
+        if self._server:
+            self._server.close()
+            await self._server.wait_closed()
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.stop()
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            # keep-alive 연결에서 여러 요청 처리
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                path = request_line.decode("latin1").split()[1]
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                body = await reader.readexactly(int(headers.get("content-length", "0")))
+                self.request_count += 1
+                self.requests_by_path[path] = self.requests_by_path.get(path, 0) + 1
+
+                await asyncio.sleep(self.delay)
+                authorization = headers.get("authorization", "")
+                if not authorization.startswith("Bearer ") or (self.api_key and authorization != f"Bearer {self.api_key}"):
+                    status, payload = "401 Unauthorized", {"detail": {"error": "Unauthorized: missing or invalid API key."}}
+                else:
+                    status, payload = "200 OK", self._response(path, json.loads(body or b"{}"))
+                data = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+                writer.write(
+                    f"HTTP/1.1 {status}\r\n"
+                    "Content-Type: application/json\r\n"
+                    f"Content-Length: {len(data)}\r\n"
+                    "Connection: keep-alive\r\n\r\n".encode("latin1") + data
+                )
+                await writer.drain()
+        except (ConnectionResetError, asyncio.IncompleteReadError, BrokenPipeError):
+            pass
+        finally:
+            writer.close()
+
+    def _response(self, path: str, payload: Dict) -> Dict:
+        if path == "/search":
+            query = payload.get("query", "")
+            results = [
+                {
+                    "title": f"{query} 결과 {i}",
+                    "url": f"https://example.com/{i}",
+                    "content": f"{query} 에 대한 내용 {i}",
+                    "score": 1.0 - i * 0.1,
+                    "raw_content": None,
+                }
+                for i in range(payload.get("max_results", 5))
+            ]
+            return {
+                "query": query,
+                "answer": f"{query} 요약" if payload.get("include_answer") else None,
+                "images": [],
+                "results": results,
+                "response_time": self.delay,
+            }
+        if path == "/extract":
+            urls = payload.get("urls", [])
+            urls = [urls] if isinstance(urls, str) else urls
+            return {
+                "results": [{"url": url, "raw_content": f"{url} 본문", "images": []} for url in urls],
+                "failed_results": [],
+                "response_time": self.delay,
+            }
+        if path in ("/crawl", "/map"):
+            base = payload.get("url", "")
+            urls = [f"{base}/page{i}" for i in range(min(payload.get("limit", 5), 5))]
+            results = urls if path == "/map" else [{"url": url, "raw_content": f"{url} 본문"} for url in urls]
+            return {"base_url": base, "results": results, "response_time": self.delay}
+        return {"detail": {"error": f"Unknown path {path}"}}
+
+
+async def main():
+    async with FakeTavilyServer() as server:
+        print(f"가짜 Tavily 서버 실행 중: {server.base_url}")
+        await asyncio.Event().wait()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,341 @@
+import asyncio
+import threading
+import time
+import weakref
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+from urllib.parse import urlparse
+
+import aiohttp
+
+from crawler import DEFAULT_HEADERS
+from page_analysis import DEFAULT_FAVICON_PATHS, favicon_candidates
+
+# HEAD 를 지원하지 않는 서버는 GET 으로 다시 확인
+_HEAD_NOT_ALLOWED = {405, 501}
+
+
+def origin_of(url: str) -> str:
+    """scheme://host[:port] (favicon 은 사이트 단위로 공유)"""
+    parsed = urlparse(url)
+    return f"{parsed.scheme}://{parsed.netloc}".lower()
+
+
+def default_candidates(url: str) -> List[str]:
+    """HTML 없이 확인할 기본 favicon 경로 후보"""
+    origin = origin_of(url)
+    return [f"{origin}{path}" for path in DEFAULT_FAVICON_PATHS]
+
+
+def _is_icon_response(status: int, content_type: str) -> bool:
+    """_validate_favicon_url 과 같은 기준 (200 + 이미지 content-type)"""
+    return status == 200 and 'image' in content_type
+
+
+def _check_response(status: int, content_type: str) -> Optional[bool]:
+    """아이콘이면 True, 확실히 아니면 False, 일시적인 응답(5xx, 429)이면 None"""
+    if _is_icon_response(status, content_type):
+        return True
+    if status >= 500 or status == 429:
+        return None
+    return False
+
+
+class FaviconCache:
+    """
+    origin → favicon URL LRU + TTL 캐시
+
+    찾지 못한 결과("")도 negative_ttl 동안 저장해서, favicon 이 없는 사이트를 페이지마다 다시 확인하지 않음
+    (FaviconResolver 는 모든 후보가 확실한 HTTP 응답을 받았을 때만 "" 를 저장)
+    """
+
+    def __init__(self, max_size: int = 10000, ttl: float = 86400, negative_ttl: float = 3600):
+        """
+        Args:
+            max_size: 최대 저장 origin 수
+            ttl: 찾은 favicon 유지 시간(초)
+            negative_ttl: 찾지 못한 결과 유지 시간(초)
+        """
+        self.max_size = max_size
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self._items: "OrderedDict[str, Tuple[str, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, origin: str) -> Optional[str]:
+        """
+        Returns:
+            favicon URL, 찾지 못한 것으로 저장돼 있으면 "", 저장돼 있지 않으면 None
+        """
+        with self._lock:
+            item = self._items.get(origin)
+            if item is None:
+                return None
+            favicon_url, expires_at = item
+            if expires_at < time.monotonic():
+                del self._items[origin]
+                return None
+            self._items.move_to_end(origin)
+            return favicon_url
+
+    def set(self, origin: str, favicon_url: str):
+        ttl = self.ttl if favicon_url else self.negative_ttl
+        with self._lock:
+            self._items[origin] = (favicon_url, time.monotonic() + ttl)
+            self._items.move_to_end(origin)
+            while len(self._items) > self.max_size:
+                self._items.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+
+class FaviconResolver:
+    """
+    사이트별 favicon 확인기
+
+    - 후보 URL 을 동시에 HEAD 요청으로 확인하고, 우선순위가 가장 높은 후보가 확인되면 나머지 요청은 취소
+      (앞 순위 후보가 실패로 끝나야 다음 순위 성공을 채택하므로 결과는 순차 확인과 같음)
+    - 결과는 origin 단위로 캐시 (TTL), 찾지 못한 결과는 시간 초과/연결 오류 없이 모든 후보가 확인됐을 때만 캐시
+    - 같은 origin 을 동시에 확인하면 한 번만 요청하고 결과를 공유
+    - 하나의 aiohttp.ClientSession 커넥션 풀 재사용
+    """
+
+    def __init__(
+        self,
+        cache: Optional[FaviconCache] = None,
+        max_concurrency: int = 32,
+        per_host_limit: int = 8,
+        timeout: float = 3.0,
+        headers: Optional[Dict[str, str]] = None,
+    ):
+        """
+        Args:
+            cache: origin 별 결과 캐시
+            max_concurrency: 전체 동시 확인 요청 수
+            per_host_limit: 호스트별 최대 동시 연결 수
+            timeout: 후보 하나 확인 제한 시간(초)
+            headers: 기본 요청 헤더
+        """
+        self.cache = cache if cache is not None else FaviconCache()  # 빈 캐시도 len 0 이라 or 를 쓰면 버려짐
+        self.max_concurrency = max_concurrency
+        self.per_host_limit = per_host_limit
+        self.timeout = aiohttp.ClientTimeout(total=timeout)
+        self.headers = headers or DEFAULT_HEADERS
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._in_flight: Dict[str, asyncio.Future] = {}
+        self.stats = {"requests": 0, "cache_hits": 0, "coalesced": 0, "cancelled": 0, "errors": 0}
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=self.max_concurrency, limit_per_host=self.per_host_limit, ttl_dns_cache=300),
+                headers=self.headers,
+                timeout=self.timeout,
+            )
+        return self._session
+
+    async def validate(self, favicon_url: str) -> Optional[bool]:
+        """
+        favicon URL 이 실제 이미지인지 확인 (HEAD, 지원하지 않으면 GET 헤더만)
+
+        Returns:
+            아이콘이면 True, HTTP 응답으로 아이콘이 아님이 확인되면 False,
+            시간 초과/연결 오류/5xx 처럼 알 수 없으면 None
+        """
+        async with self._semaphore:
+            session = self._get_session()
+            try:
+                self.stats["requests"] += 1
+                async with session.head(favicon_url, allow_redirects=True) as response:
+                    if response.status not in _HEAD_NOT_ALLOWED:
+                        return _check_response(response.status, response.headers.get('content-type', ''))
+                self.stats["requests"] += 1
+                async with session.get(favicon_url) as response:
+                    return _check_response(response.status, response.headers.get('content-type', ''))
+            except ValueError:
+                return False  # 잘못된 URL 은 다시 확인해도 같음
+            except (aiohttp.ClientError, asyncio.TimeoutError):
+                self.stats["errors"] += 1
+                return None
+
+    async def _first_valid(self, candidates: Sequence[str]) -> Tuple[str, bool]:
+        """
+        우선순위 순 후보 중 확인되는 첫 번째 URL
+
+        Returns:
+            (URL, 확실한 결과인지) - 모두 실패하면 URL 은 "", 일부 후보를 확인하지 못했으면 두 번째 값은 False
+        """
+        tasks = [asyncio.create_task(self.validate(url)) for url in candidates]
+        try:
+            pending = set(tasks)
+            while pending:
+                _, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                # 앞 순위부터 확인: 끝나지 않은 후보가 나오면 더 기다림
+                for url, task in zip(candidates, tasks):
+                    if not task.done():
+                        break
+                    if task.result():
+                        return url, True
+            return "", all(task.result() is not None for task in tasks)
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+                    self.stats["cancelled"] += 1
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def resolve(self, page_url: str, candidates: Optional[Iterable[str]] = None) -> str:
+        """
+        페이지가 속한 사이트의 favicon URL
+
+        Args:
+            page_url: 페이지 URL (origin 단위로 캐시)
+            candidates: 우선순위 순 후보 URL (PageAnalysis.favicon_candidates, 없으면 기본 경로)
+
+        Returns:
+            str: 확인된 favicon URL, 없으면 ""
+        """
+        origin = origin_of(page_url)
+        cached = self.cache.get(origin)
+        if cached is not None:
+            self.stats["cache_hits"] += 1
+            return cached
+
+        task = self._in_flight.get(origin)
+        if task is None:
+            candidate_list = list(dict.fromkeys(candidates)) if candidates is not None else default_candidates(page_url)
+            # 요청을 시작한 호출이 취소돼도 같은 origin 을 기다리는 다른 호출은 결과를 받도록 별도 task 로 실행
+            task = asyncio.ensure_future(self._resolve_origin(origin, candidate_list))
+            self._in_flight[origin] = task
+            task.add_done_callback(lambda done: self._resolve_done(origin, done))
+        else:
+            self.stats["coalesced"] += 1
+        return await asyncio.shield(task)
+
+    async def _resolve_origin(self, origin: str, candidates: Sequence[str]) -> str:
+        favicon_url, conclusive = await self._first_valid(candidates)
+        if conclusive:
+            self.cache.set(origin, favicon_url)
+        return favicon_url
+
+    def _resolve_done(self, origin: str, task: asyncio.Future):
+        if self._in_flight.get(origin) is task:
+            del self._in_flight[origin]
+        if not task.cancelled():
+            task.exception()  # 기다리는 쪽이 없을 때 경고 방지
+
+    async def resolve_many(self, pages: Iterable[Tuple[str, Optional[Iterable[str]]]]) -> Dict[str, str]:
+        """
+        검색 결과 여러 개의 favicon (같은 사이트는 한 번만 확인)
+
+        Args:
+            pages: [(페이지 URL, 후보 URL 목록 또는 None), ...]
+
+        Returns:
+            dict: 페이지 URL → favicon URL
+        """
+        pages = list(pages)
+        results = await asyncio.gather(*(self.resolve(url, candidates) for url, candidates in pages))
+        return {url: favicon_url for (url, _), favicon_url in zip(pages, results)}
+
+    async def aclose(self):
+        for task in list(self._in_flight.values()):
+            task.cancel()
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.aclose()
+
+
+# 결과 캐시는 프로세스에서 공유하고, 세션/세마포어가 루프에 묶이는 확인기는 이벤트 루프마다 따로 만듦
+_favicon_cache = FaviconCache()
+_favicon_resolvers: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, FaviconResolver]" = weakref.WeakKeyDictionary()
+
+
+def get_favicon_resolver() -> FaviconResolver:
+    """현재 이벤트 루프의 공유 favicon 확인기 (이벤트 루프 안에서 호출, 캐시는 루프 간 공유)"""
+    loop = asyncio.get_running_loop()
+    resolver = _favicon_resolvers.get(loop)
+    if resolver is None:
+        resolver = _favicon_resolvers[loop] = FaviconResolver(cache=_favicon_cache)
+    return resolver
+
+
+
+async def resolve_page_favicon(soup, page_url: str) -> str:
+    """
+    파싱한 페이지의 favicon (parse_website_meta, parse_meta_handler 용)
+
+    페이지의 link/meta 후보와 기본 경로를 현재 루프의 공유 확인기로 확인하므로,
+    같은 사이트의 다른 페이지는 캐시된 결과를 바로 받음
+
+    Args:
+        soup: 페이지 BeautifulSoup 객체
+        page_url: 페이지 URL (상대 경로 기준)
+
+    Returns:
+        str: 확인된 favicon URL, 없으면 ""
+    """
+    return await get_favicon_resolver().resolve(page_url, favicon_candidates(soup, page_url))
+
+async def run_benchmark(site_count: int = 5, pages_per_site: int = 20, latency: float = 0.05):
+    """
+    로컬 HTTP 서버로 검색 결과 favicon 확인 시간 비교
+
+    - 각 사이트는 기본 후보 경로 중 뒤쪽(/static/favicon.ico)에만 아이콘이 있음
+    - 기존 방식: 페이지마다 후보를 순서대로 하나씩 확인
+    - 확인기: 후보 동시 확인 + origin 캐시 (사이트당 한 번)
+    """
+    from aiohttp import web
+
+    async def icon(request: web.Request) -> web.Response:
+        await asyncio.sleep(latency)
+        if request.path == "/static/favicon.ico":
+            return web.Response(body=b"\x00\x00\x01\x00", content_type="image/x-icon")
+        return web.Response(status=404)
+
+    app = web.Application()
+    app.router.add_route("*", "/{tail:.*}", icon)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    sites = []
+    for _ in range(site_count):
+        site = web.TCPSite(runner, "127.0.0.1", 0)
+        await site.start()
+        sites.append(f"http://127.0.0.1:{site._server.sockets[0].getsockname()[1]}")
+    pages = [(f"{origin}/news/{i}", None) for origin in sites for i in range(pages_per_site)]
+
+    try:
+        sample = pages[:pages_per_site]  # 한 사이트만 (전체는 너무 오래 걸림)
+        start = time.perf_counter()
+        async with aiohttp.ClientSession() as session:
+            for url, _ in sample:
+                for candidate in default_candidates(url):
+                    async with session.head(candidate, timeout=aiohttp.ClientTimeout(total=3)) as response:
+                        if _is_icon_response(response.status, response.headers.get('content-type', '')):
+                            break
+        sequential = (time.perf_counter() - start) / len(sample)
+        print(f"기존 방식(페이지마다 순차 확인): 페이지당 {sequential * 1000:.0f}ms → {len(pages)}페이지 예상 {sequential * len(pages):.1f}초")
+
+        async with FaviconResolver() as resolver:
+            start = time.perf_counter()
+            favicons = await resolver.resolve_many(pages)
+            elapsed = time.perf_counter() - start
+            found = sum(1 for url in favicons.values() if url.endswith("/static/favicon.ico"))
+            print(f"확인기(동시 확인 + origin 캐시): {len(pages)}페이지 {elapsed * 1000:.0f}ms, 찾은 favicon {found}개")
+
+            start = time.perf_counter()
+            await resolver.resolve_many(pages)
+            print(f"재요청(캐시 적중): {(time.perf_counter() - start) * 1000:.2f}ms, 통계 {resolver.stats}")
+    finally:
+        await runner.cleanup()
+
+
+if __name__ == "__main__":
+    asyncio.run(run_benchmark())
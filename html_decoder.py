@@ -0,0 +1,404 @@
+import codecs
+import re
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from mojibake import CP1252_LOOSE_TABLE, _CP1252_LOOSE_MAP, has_mojibake, repair_mojibake
+
+# 브라우저(WHATWG windows-1252)와 같이 모든 바이트를 디코딩하는 windows-1252 코덱 (0x81 등은 같은 코드의 제어문자)
+WINDOWS_1252 = 'html-windows-1252'
+
+
+class _Windows1252IncrementalDecoder(codecs.IncrementalDecoder):
+    def decode(self, input, final=False):
+        return codecs.charmap_decode(input, self.errors, CP1252_LOOSE_TABLE)[0]
+
+
+def _search_codec(name: str) -> Optional[codecs.CodecInfo]:
+    if name != WINDOWS_1252.replace('-', '_'):
+        return None
+    return codecs.CodecInfo(
+        name=WINDOWS_1252,
+        encode=lambda text, errors='strict': codecs.charmap_encode(text, errors, _CP1252_LOOSE_MAP),
+        decode=lambda data, errors='strict': codecs.charmap_decode(data, errors, CP1252_LOOSE_TABLE),
+        incrementaldecoder=_Windows1252IncrementalDecoder,
+    )
+
+
+codecs.register(_search_codec)
+
+# WHATWG Encoding 표준의 인코딩별 label (https://encoding.spec.whatwg.org/#names-and-labels)
+# 표에 없는 label 은 알 수 없는 인코딩으로 취급 (codecs.lookup 은 base64/zlib/rot13 같은 비텍스트 코덱도 찾아주므로 쓰지 않음)
+# euc-kr 은 브라우저와 같이 상위 집합인 cp949 로, gbk 는 gb18030 으로, shift_jis 는 cp932 로 디코딩
+_WHATWG_LABELS = {
+    'utf-8': ['unicode-1-1-utf-8', 'unicode11utf8', 'unicode20utf8', 'utf-8', 'utf8', 'x-unicode20utf8'],
+    'cp866': ['866', 'cp866', 'csibm866', 'ibm866'],
+    'iso8859-2': ['csisolatin2', 'iso-ir-101', 'l2', 'latin2'],
+    'iso8859-3': ['csisolatin3', 'iso-ir-109', 'l3', 'latin3'],
+    'iso8859-4': ['csisolatin4', 'iso-ir-110', 'l4', 'latin4'],
+    'iso8859-5': ['csisolatincyrillic', 'cyrillic', 'iso-ir-144'],
+    'iso8859-6': ['arabic', 'asmo-708', 'csiso88596e', 'csiso88596i', 'csisolatinarabic', 'ecma-114',
+                  'iso-8859-6-e', 'iso-8859-6-i', 'iso-ir-127'],
+    'iso8859-7': ['csisolatingreek', 'ecma-118', 'elot_928', 'greek', 'greek8', 'iso-ir-126', 'sun_eu_greek'],
+    'iso8859-8': ['csiso88598e', 'csisolatinhebrew', 'hebrew', 'iso-8859-8-e', 'iso-ir-138', 'visual',
+                  'csiso88598i', 'iso-8859-8-i', 'logical'],
+    'iso8859-10': ['csisolatin6', 'iso-ir-157', 'l6', 'latin6'],
+    'iso8859-13': [],
+    'iso8859-14': [],
+    'iso8859-15': ['csisolatin9', 'l9'],
+    'iso8859-16': [],
+    'koi8-r': ['cskoi8r', 'koi', 'koi8', 'koi8-r', 'koi8_r'],
+    'koi8-u': ['koi8-ru', 'koi8-u'],
+    'mac-roman': ['csmacintosh', 'mac', 'macintosh', 'x-mac-roman'],
+    'cp874': ['dos-874', 'iso-8859-11', 'iso8859-11', 'iso885911', 'tis-620', 'windows-874'],
+    WINDOWS_1252: ['ansi_x3.4-1968', 'ascii', 'cp1252', 'cp819', 'csisolatin1', 'ibm819', 'iso-8859-1', 'iso-ir-100',
+                   'iso8859-1', 'iso88591', 'iso_8859-1', 'iso_8859-1:1987', 'l1', 'latin1', 'us-ascii',
+                   'windows-1252', 'x-cp1252'],
+    'cp1254': ['cp1254', 'csisolatin5', 'iso-8859-9', 'iso-ir-148', 'iso8859-9', 'iso88599', 'iso_8859-9',
+               'iso_8859-9:1989', 'l5', 'latin5', 'windows-1254', 'x-cp1254'],
+    'mac-cyrillic': ['x-mac-cyrillic', 'x-mac-ukrainian'],
+    'gb18030': ['chinese', 'csgb2312', 'csiso58gb231280', 'gb2312', 'gb_2312', 'gb_2312-80', 'gbk', 'iso-ir-58',
+                'x-gbk', 'gb18030'],
+    'big5hkscs': ['big5', 'big5-hkscs', 'cn-big5', 'csbig5', 'x-x-big5'],
+    'euc_jp': ['cseucpkdfmtjapanese', 'euc-jp', 'x-euc-jp'],
+    'iso2022_jp': ['csiso2022jp', 'iso-2022-jp'],
+    'cp932': ['csshiftjis', 'ms932', 'ms_kanji', 'shift-jis', 'shift_jis', 'sjis', 'windows-31j', 'x-sjis'],
+    'cp949': ['cseuckr', 'csksc56011987', 'euc-kr', 'iso-ir-149', 'korean', 'ks_c_5601-1987', 'ks_c_5601-1989',
+              'ksc5601', 'ksc_5601', 'windows-949'],
+    'utf-16-be': ['unicodefffe', 'utf-16be'],
+    'utf-16-le': ['csunicode', 'iso-10646-ucs-2', 'ucs-2', 'unicode', 'unicodefeff', 'utf-16', 'utf-16le'],
+}
+for _number in (2, 3, 4, 5, 6, 7, 8, 10, 13, 14, 15, 16):
+    _WHATWG_LABELS[f'iso8859-{_number}'] += [f'iso-8859-{_number}', f'iso8859-{_number}', f'iso8859{_number}', f'iso_8859-{_number}']
+for _number in (1250, 1251, 1253, 1255, 1256, 1257, 1258):
+    _WHATWG_LABELS[f'cp{_number}'] = [f'cp{_number}', f'windows-{_number}', f'x-cp{_number}']
+# 선언된 charset label → Python 코덱 이름 (WHATWG label + 국내 사이트에서 자주 보이는 비표준 label)
+ENCODING_ALIASES = {label: codecs.lookup(encoding).name for encoding, labels in _WHATWG_LABELS.items() for label in labels}
+ENCODING_ALIASES.update({'euckr': 'cp949', 'ms949': 'cp949', 'x-windows-949': 'cp949', 'cp949': 'cp949', 'uhc': 'cp949'})
+# 선언이 없거나 틀렸을 때 시도할 인코딩 (한국 사이트 우선, windows-1252 는 모든 바이트를 디코딩하므로 마지막)
+FALLBACK_ENCODINGS = ['utf-8', 'cp949', 'gb18030', 'cp932', WINDOWS_1252]
+_BOMS = [
+    (codecs.BOM_UTF8, 'utf-8-sig'),
+    (codecs.BOM_UTF16_LE, 'utf-16'),
+    (codecs.BOM_UTF16_BE, 'utf-16'),
+]
+_HEADER_CHARSET = re.compile(r'charset\s*=\s*["\']?([^"\';\s]+)', re.IGNORECASE)
+# <meta charset="..."> 와 <meta http-equiv="content-type" content="text/html; charset=..."> 모두 처리
+# 비 ASCII 바이트 수 계산용 (bytes.translate 로 ASCII 를 지움)
+_ASCII_BYTES = bytes(range(0x80))
+_META_CHARSET = re.compile(rb'<meta[^>]+?charset\s*=\s*["\']?\s*([a-zA-Z0-9_:.\-]+)', re.IGNORECASE)
+
+
+def normalize_encoding(label: Optional[str]) -> Optional[str]:
+    """charset label → Python 텍스트 코덱 이름 (WHATWG label 이 아니면 None)"""
+    if not label:
+        return None
+    return ENCODING_ALIASES.get(label.strip().strip('"\'').lower())
+
+
+def sniff_encoding(head: bytes, content_type: Optional[str] = None, sniff_bytes: int = 4096) -> Tuple[Optional[str], str]:
+    """
+    본문 앞부분과 헤더로 인코딩 결정 (BOM → Content-Type → <meta> 순)
+
+    Args:
+        head: 본문 앞부분 바이트
+        content_type: Content-Type 헤더
+        sniff_bytes: <meta> 를 찾을 최대 바이트 수
+
+    Returns:
+        tuple: (인코딩 또는 None, 출처 "bom" | "header" | "meta" | "none")
+    """
+    for bom, encoding in _BOMS:
+        if head.startswith(bom):
+            return encoding, 'bom'
+    if content_type:
+        match = _HEADER_CHARSET.search(content_type)
+        encoding = normalize_encoding(match.group(1)) if match else None
+        if encoding:
+            return encoding, 'header'
+    match = _META_CHARSET.search(head, 0, sniff_bytes)
+    if match:
+        encoding = normalize_encoding(match.group(1).decode('ascii', errors='ignore'))
+        if encoding:
+            # ASCII 로 읽힌 <meta> 가 utf-16 을 선언할 수는 없음 (HTML 표준과 같이 utf-8 로 처리)
+            return ('utf-8' if encoding.startswith('utf-16') else encoding), 'meta'
+    return None, 'none'
+
+
+def detect_encoding(data: bytes, exclude: Iterable[str] = (), fallback: Optional[str] = None) -> Tuple[str, str]:
+    """
+    통계적 인코딩 감지 (선언이 없거나 선언된 인코딩으로 디코딩에 실패했을 때만 사용)
+
+    chardet 이 있으면 신뢰도 0.7 이상인 결과를 먼저 쓰고, 없으면 FALLBACK_ENCODINGS 를 순서대로 시도합니다.
+    선언된 인코딩(fallback)이 있으면 utf-8 이 아닌 후보로 추측하기 전에 선언된 인코딩으로 손실 디코딩해 보고,
+    잘못된 바이트가 거의 없으면 그 결과를 씁니다 (잘못된 바이트만 대체 문자). 모든 바이트를 받아들이는
+    windows-1252 로 페이지 전체를 바꾸지 않고, 다른 후보가 모두 실패해도 선언된 인코딩으로 손실 디코딩합니다.
+
+    Args:
+        data: 본문 바이트
+        exclude: 이미 실패한 인코딩 (후보에서 제외)
+        fallback: 모든 후보가 실패했을 때 손실을 감수하고 쓸 인코딩 (선언된 인코딩, 없으면 utf-8)
+
+    Returns:
+        tuple: (디코딩된 텍스트, 인코딩)
+    """
+    exclude = set(exclude)
+    try:
+        import chardet
+    except ImportError:
+        chardet = None
+    if chardet is not None:
+        detected = chardet.detect(data)
+        encoding = normalize_encoding(detected.get('encoding'))
+        if encoding and encoding not in exclude and (detected.get('confidence') or 0) >= 0.7:
+            try:
+                return data.decode(encoding), encoding
+            except UnicodeError:
+                exclude.add(encoding)
+    lossy = None
+    if fallback:
+        try:
+            lossy = data.decode(fallback, errors='replace')
+        except Exception:
+            fallback = None
+    for encoding in FALLBACK_ENCODINGS:
+        encoding = codecs.lookup(encoding).name
+        if encoding in exclude or (fallback and encoding == WINDOWS_1252):
+            continue
+        if lossy is not None and encoding != 'utf-8' and lossy.count('\ufffd') <= len(data) // 1000 + 1:
+            # 선언된 인코딩으로 거의 다 디코딩되면(잘못된 바이트 0.1% 이하) 다른 레거시 인코딩으로 추측하지 않음
+            return lossy, fallback
+        try:
+            return data.decode(encoding), encoding
+        except UnicodeError:
+            continue
+    # 최후 수단: 선언된 인코딩으로 디코딩하고 잘못된 바이트만 대체 문자로 (선언이 없으면 utf-8)
+    if lossy is not None:
+        return lossy, fallback
+    return data.decode('utf-8', errors='replace'), 'utf-8'
+
+
+class IncrementalHTMLDecoder:
+    """
+    응답 본문을 받는 대로 디코딩하는 HTML 디코더
+
+    - 처음 sniff_bytes 를 받으면 BOM / Content-Type / <meta charset> 으로 인코딩을 정하고
+      이후 청크는 도착할 때마다 incremental decoder 로 디코딩 (본문 전체를 모은 뒤 다시 디코딩하지 않음)
+    - 선언이 없으면 utf-8 로 디코딩하고, 디코딩이 실패한 경우에만 detect_encoding 으로 다시 디코딩
+    - 감지용 원본 바이트는 인코딩이 확정될 때까지만 보관 (비 ASCII 바이트가 confirm_bytes 만큼 깨끗하게 디코딩되면 버림)
+      → 큰 페이지도 원본과 텍스트를 둘 다 끝까지 들고 있지 않음
+      대신 확정 뒤에 디코딩이 실패하면(문서 중간에 다른 인코딩이 섞인 경우) 전체를 다시 감지하지 않고
+      나머지 부분만 같은 인코딩의 대체 문자(U+FFFD)로 디코딩
+    - repair=True 면 페이지 자체에 들어 있는 깨진 UTF-8 구간(mojibake)이 감지될 때만 복원
+    """
+
+    def __init__(
+        self,
+        content_type: Optional[str] = None,
+        sniff_bytes: int = 4096,
+        default_encoding: str = 'utf-8',
+        repair: bool = True,
+        confirm_bytes: int = 1024,
+    ):
+        """
+        Args:
+            content_type: Content-Type 헤더
+            sniff_bytes: 인코딩 선언을 찾을 본문 앞부분 크기
+            default_encoding: 선언이 없을 때 먼저 시도할 인코딩
+            repair: 디코딩 후 mojibake 구간 복원 여부
+            confirm_bytes: 인코딩을 확정하고 원본을 버리기 전에 깨끗하게 디코딩돼야 하는 비 ASCII 바이트 수
+        """
+        self.content_type = content_type
+        self.sniff_bytes = sniff_bytes
+        self.default_encoding = default_encoding
+        self.repair = repair
+        self.confirm_bytes = confirm_bytes
+        self._raw: Optional[List[bytes]] = []  # 디코딩 실패 시 감지용 원본 (인코딩이 확정되면 None)
+        self._clean_bytes = 0  # 지금까지 깨끗하게 디코딩한 비 ASCII 바이트 수
+        self._head = b''
+        self._parts: List[str] = []
+        self._decoder = None
+        self._failed = False
+        self.encoding: Optional[str] = None
+        self.source = 'none'
+
+    def _start(self):
+        encoding, self.source = sniff_encoding(self._head, self.content_type, self.sniff_bytes)
+        if encoding is None:
+            encoding, self.source = normalize_encoding(self.default_encoding) or 'utf-8', 'default'
+        self.encoding = encoding
+        self._decoder = codecs.getincrementaldecoder(encoding)(errors='strict')
+        head, self._head = self._head, b''
+        self._decode(head)
+
+    def _decode(self, data: bytes, final: bool = False):
+        if self._failed:
+            return
+        pending = self._decoder.getstate()[0] if self._raw is None else b''
+        try:
+            self._parts.append(self._decoder.decode(data, final))
+        except Exception:
+            if self._raw is None:
+                # 확정 뒤 실패: 원본이 없으므로 이전 청크에 남은 바이트부터 대체 문자로 이어서 디코딩
+                self._decoder = codecs.getincrementaldecoder(self.encoding)(errors='replace')
+                self._parts.append(self._decoder.decode(pending + data, final))
+                return
+            # 선언/기본 인코딩이 틀림 (UnicodeDecodeError 외 코덱 오류 포함) → 끝까지 원본만 모으고 close 에서 감지
+            self._failed = True
+            self._parts.clear()
+            return
+        if self._raw is not None:
+            self._clean_bytes += len(data.translate(None, _ASCII_BYTES))
+            if self._clean_bytes >= self.confirm_bytes:
+                self._raw = None  # ASCII 는 어느 인코딩으로도 디코딩되므로 비 ASCII 바이트로만 확정
+
+    def feed(self, chunk: bytes):
+        if not chunk:
+            return
+        if self._raw is not None:
+            self._raw.append(chunk)
+        if self._decoder is None:
+            self._head += chunk
+            if len(self._head) >= self.sniff_bytes:
+                self._start()
+            return
+        self._decode(chunk)
+
+    def close(self) -> Tuple[str, Dict[str, Any]]:
+        """
+        Returns:
+            tuple: (텍스트, {"encoding", "source", "repaired"})
+                source: "bom" | "header" | "meta" | "default" | "detected"
+        """
+        if self._decoder is None:
+            self._start()
+        self._decode(b'', final=True)
+        if self._failed:
+            text, self.encoding = detect_encoding(
+                b''.join(self._raw),
+                exclude=[self.encoding],
+                fallback=self.encoding if self.source != 'default' else None,
+            )
+            self.source = 'detected'
+        else:
+            text = ''.join(self._parts)
+        self._raw = None
+        self._parts.clear()
+        repaired = False
+        if self.repair and has_mojibake(text):
+            text = repair_mojibake(text)
+            repaired = True
+        return text, {"encoding": self.encoding, "source": self.source, "repaired": repaired}
+
+
+def decode_html(data: bytes, content_type: Optional[str] = None, **options) -> Tuple[str, Dict[str, Any]]:
+    """
+    HTML 바이트 디코딩 (IncrementalHTMLDecoder 를 한 번에 적용)
+
+    Returns:
+        tuple: (텍스트, {"encoding", "source", "repaired"})
+    """
+    decoder = IncrementalHTMLDecoder(content_type, **options)
+    decoder.feed(data)
+    return decoder.close()
+
+
+async def read_html(response, chunk_size: int = 64 * 1024, **options) -> Tuple[str, Dict[str, Any]]:
+    """
+    aiohttp 응답 본문을 받는 대로 디코딩 (response.text() 대신 사용)
+
+    Args:
+        response: aiohttp.ClientResponse
+        chunk_size: 읽기 단위
+
+    Returns:
+        tuple: (텍스트, {"encoding", "source", "repaired"})
+    """
+    decoder = IncrementalHTMLDecoder(response.headers.get('Content-Type'), **options)
+    async for chunk in response.content.iter_chunked(chunk_size):
+        decoder.feed(chunk)
+    return decoder.close()
+
+
+def _make_pages(repeat: int = 2000) -> List[Tuple[str, bytes, Optional[str], str]]:
+    """(이름, 본문, Content-Type, 원문) 벤치마크 페이지"""
+    body = "<p>나라원시스템은 공공기관 홈페이지 구축 전문 기업입니다. 腾讯文档 — “quoted”</p>" * repeat
+    cases = []
+
+    def page(meta: str = '') -> str:
+        return f'<html><head>{meta}<title>나라원시스템</title></head><body>{body}</body></html>'
+
+    text = page('<meta charset="utf-8">')
+    cases.append(("utf-8 + meta", text.encode('utf-8'), 'text/html', text))
+    text = page('<meta http-equiv="Content-Type" content="text/html; charset=euc-kr">')
+    cases.append(("euc-kr meta (http-equiv)", text.replace('腾讯文档 — “quoted”', '').encode('cp949'), 'text/html', text.replace('腾讯文档 — “quoted”', '')))
+    text = page()
+    cases.append(("cp949 선언 없음", text.replace('腾讯文档 — “quoted”', '').encode('cp949'), 'text/html', text.replace('腾讯文档 — “quoted”', '')))
+    cases.append(("헤더가 틀림 (utf-8 선언, 실제 cp949)", text.replace('腾讯文档 — “quoted”', '').encode('cp949'), 'text/html; charset=utf-8', text.replace('腾讯文档 — “quoted”', '')))
+    cases.append(("UTF-8 BOM", codecs.BOM_UTF8 + text.encode('utf-8'), 'text/html; charset=euc-kr', text))
+    broken = text.replace('나라원시스템은', '나라원시스템은'.encode('utf-8').decode('latin1'))
+    cases.append(("본문 안 mojibake", broken.encode('utf-8'), 'text/html; charset=utf-8', text))
+    return cases
+
+
+async def run_benchmark(repeat: int = 2000, chunk_size: int = 16 * 1024):
+    """
+    로컬 HTTP 서버로 response.text() 와 read_html 결과/시간 비교
+
+    - response.text(): 헤더 charset 이 없으면 utf-8 로 전체 디코딩 (틀리면 예외)
+    - read_html: 청크를 받는 대로 디코딩, 실패 시에만 감지
+    """
+    import time
+
+    import aiohttp
+    from aiohttp import web
+
+    pages = _make_pages(repeat)
+
+    async def handler(request: web.Request) -> web.StreamResponse:
+        _, data, content_type, _ = pages[int(request.match_info["index"])]
+        response = web.StreamResponse(headers={"Content-Type": content_type})
+        await response.prepare(request)
+        for start in range(0, len(data), chunk_size):
+            await response.write(data[start:start + chunk_size])
+        await response.write_eof()
+        return response
+
+    app = web.Application()
+    app.router.add_get("/page/{index}", handler)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    base_url = f"http://127.0.0.1:{site._server.sockets[0].getsockname()[1]}"
+
+    try:
+        async with aiohttp.ClientSession() as session:
+            for index, (name, data, _, expected) in enumerate(pages):
+                url = f"{base_url}/page/{index}"
+                async with session.get(url) as response:
+                    try:
+                        legacy = "일치" if await response.text() == expected else "불일치"
+                    except UnicodeDecodeError:
+                        legacy = "UnicodeDecodeError"
+                async with session.get(url) as response:
+                    text, info = await read_html(response, chunk_size)
+                print(f"{name:<34} response.text(): {legacy:<18} read_html: {'일치' if text == expected else '불일치'} {info}")
+
+            data = pages[0][1] * 20
+            size = len(data) / (1 << 20)
+            start = time.perf_counter()
+            for _ in range(20):
+                decoder = IncrementalHTMLDecoder('text/html')
+                for offset in range(0, len(data), chunk_size):
+                    decoder.feed(data[offset:offset + chunk_size])
+                decoder.close()
+            elapsed = (time.perf_counter() - start) / 20
+            print(f"\n{size:.1f}MB utf-8 페이지 청크 디코딩: {size / elapsed:.0f} MB/s")
+    finally:
+        await runner.cleanup()
+
+
+if __name__ == "__main__":
+    import asyncio
+
+    asyncio.run(run_benchmark())
@@ -0,0 +1,247 @@
+import codecs
+import re
+from typing import Iterable, Iterator, List, TextIO, Tuple
+
+# UTF-8 바이트를 latin1/cp1252 로 잘못 디코딩하면 바이트 하나가 문자 하나가 됨
+# cp1252 는 0x80~0x9f 를 일반 문자(€, ‚, “ 등)로 바꾸므로 원래 바이트로 되돌리는 표를 둠
+_CP1252_TO_LATIN1 = {}
+for _byte in range(0x80, 0xa0):
+    try:
+        _CP1252_TO_LATIN1[ord(bytes([_byte]).decode('cp1252'))] = chr(_byte)
+    except UnicodeDecodeError:
+        pass  # 0x81, 0x8d, 0x8f, 0x90, 0x9d 는 cp1252 에 없음 → latin1 제어문자 그대로 남아 있음
+
+# continuation byte(0x80~0xbf) 가 된 문자: latin1 \x80-\xbf + cp1252 특수 문자
+# 브라우저(WHATWG windows-1252)처럼 cp1252 에 없는 바이트는 같은 코드의 제어문자로 두는 디코딩 표와
+# 그 역방향 인코딩 표 (C 코덱 charmap_decode/charmap_encode 로 한 번에 변환)
+CP1252_LOOSE_TABLE = ''.join(bytes([byte]).decode('cp1252', errors='ignore') or chr(byte) for byte in range(256))
+_CP1252_LOOSE_MAP = codecs.charmap_build(CP1252_LOOSE_TABLE)
+_CP1252_CHARS = ''.join(re.escape(char) for char in map(chr, _CP1252_TO_LATIN1))
+_CONTINUATION = f'[\x80-\xbf{_CP1252_CHARS}]'
+_SEQUENCE = f'[\xc2-\xdf]{_CONTINUATION}|[\xe0-\xef]{_CONTINUATION}{{2}}|[\xf0-\xf4]{_CONTINUATION}{{3}}'
+# 깨진 UTF-8 바이트열로 보이는 연속 구간 (lead byte 문자 + 필요한 수의 continuation 문자 반복)
+# 사이의 ASCII 는 UTF-8 에서도 같은 바이트이므로 한 구간으로 묶어 복원 호출 수를 줄임
+MOJIBAKE_PATTERN = re.compile(f'(?:{_SEQUENCE})(?:[\x00-\x7f]*(?:{_SEQUENCE}))*')
+_SEQUENCE_PATTERN = re.compile(f'{_SEQUENCE}|[\x00-\x7f]+')
+# 청크 끝에서 잘렸을 수 있는 시퀀스 앞부분 (lead byte + continuation 0~2개)
+_PARTIAL_TAIL_PATTERN = re.compile(f'[\xc2-\xf4]{_CONTINUATION}{{0,2}}$')
+# 빠른 사전 검사: lead byte 문자가 없으면 깨진 구간도 없음
+_LEAD_PATTERN = re.compile('[\xc2-\xf4]')
+# 1차 후보: lead byte 문자로 시작해서 바이트 하나로 되돌릴 수 있는 문자(ASCII, latin1, cp1252 특수 문자)가 이어지는 구간
+_CANDIDATE_PATTERN = re.compile(f'[\xc2-\xf4][\x00-\xff{_CP1252_CHARS}]*')
+
+
+def _cp1252_bytes(error: UnicodeEncodeError):
+    """latin1 로 인코딩할 수 없는 cp1252 특수 문자(€, “ 등)를 원래 바이트로"""
+    return error.object[error.start:error.end].translate(_CP1252_TO_LATIN1).encode('latin1'), error.end
+
+
+codecs.register_error('mojibake_cp1252', _cp1252_bytes)
+
+
+def _to_bytes(span: str) -> bytes:
+    # 대부분의 구간은 한 가지 인코딩으로 깨졌으므로 C 코덱으로 먼저 시도하고, 섞인 경우에만 문자별 처리
+    try:
+        return span.encode('latin1')
+    except UnicodeEncodeError:
+        pass
+    try:
+        return codecs.charmap_encode(span, 'strict', _CP1252_LOOSE_MAP)[0]
+    except UnicodeEncodeError:
+        pass
+    return span.encode('latin1', errors='mojibake_cp1252')
+
+
+def _repair_span(span: str) -> str:
+    """
+    깨진 구간 하나를 UTF-8 로 복원
+
+    구간 전체가 올바른 UTF-8 이 아니면(overlong, surrogate 등) 시퀀스별로 복원하고
+    복원할 수 없는 시퀀스는 원문 그대로 남깁니다 (문자를 버리지 않음). ASCII 는 그대로 복원됩니다.
+    """
+    try:
+        return _to_bytes(span).decode('utf-8')
+    except UnicodeDecodeError:
+        pass
+    parts = []
+    for match in _SEQUENCE_PATTERN.finditer(span):
+        sequence = match.group()
+        try:
+            parts.append(_to_bytes(sequence).decode('utf-8'))
+        except UnicodeDecodeError:
+            parts.append(sequence)
+    return ''.join(parts)
+
+
+def _repair_candidate(match: 're.Match') -> str:
+    # 후보 구간 전체가 올바른 UTF-8 이면 모든 비 ASCII 문자가 시퀀스에 속하므로 한 번에 복원
+    candidate = match.group()
+    try:
+        return _to_bytes(candidate).decode('utf-8')
+    except UnicodeDecodeError:
+        return MOJIBAKE_PATTERN.sub(lambda span: _repair_span(span.group()), candidate)
+
+
+def has_mojibake(text: str) -> bool:
+    """UTF-8 을 latin1/cp1252 로 잘못 디코딩한 구간이 있는지"""
+    if text.isascii() or not _LEAD_PATTERN.search(text):
+        return False
+    return MOJIBAKE_PATTERN.search(text) is not None
+
+
+def find_mojibake_spans(text: str) -> List[Tuple[int, int]]:
+    """
+    깨진 구간 위치
+
+    Returns:
+        list[tuple[int, int]]: [(시작, 끝), ...]
+    """
+    if text.isascii():
+        return []
+    return [match.span() for match in MOJIBAKE_PATTERN.finditer(text)]
+
+
+def repair_mojibake(text: str) -> str:
+    """
+    깨진 구간만 UTF-8 로 복원 (정상 텍스트는 그대로)
+
+    encode('latin1', errors='ignore').decode('utf-8', errors='ignore') 를 문자열 전체에 적용하면
+    정상 한글/한자가 사라지고 복원할 수 없는 바이트도 버려지지만, 이 함수는 깨진 구간만 바꿉니다.
+
+    Args:
+        text: 검사할 텍스트
+
+    Returns:
+        str: 복원된 텍스트
+    """
+    if text.isascii() or not _LEAD_PATTERN.search(text):
+        return text
+    return _CANDIDATE_PATTERN.sub(_repair_candidate, text)
+
+
+class MojibakeStreamRepairer:
+    """
+    청크 단위 복원기 (큰 문서를 나눠서 처리)
+
+    청크 끝에서 잘린 시퀀스 앞부분(최대 3글자)만 다음 청크로 넘기므로
+    결과는 전체 문자열을 한 번에 repair_mojibake 한 것과 같습니다.
+    """
+
+    def __init__(self):
+        self._pending = ''
+
+    def feed(self, chunk: str) -> str:
+        text = self._pending + chunk
+        tail = _PARTIAL_TAIL_PATTERN.search(text, max(0, len(text) - 3))
+        if tail is not None:
+            self._pending = text[tail.start():]
+            text = text[:tail.start()]
+        else:
+            self._pending = ''
+        return repair_mojibake(text)
+
+    def flush(self) -> str:
+        text, self._pending = self._pending, ''
+        return repair_mojibake(text)
+
+
+def repair_stream(chunks: Iterable[str]) -> Iterator[str]:
+    """텍스트 청크 스트림 복원"""
+    repairer = MojibakeStreamRepairer()
+    for chunk in chunks:
+        repaired = repairer.feed(chunk)
+        if repaired:
+            yield repaired
+    tail = repairer.flush()
+    if tail:
+        yield tail
+
+
+def repair_file(source: TextIO, destination: TextIO, chunk_size: int = 1 << 20) -> int:
+    """
+    파일 객체 단위 복원
+
+    Returns:
+        int: 기록한 문자 수
+    """
+    written = 0
+    for repaired in repair_stream(iter(lambda: source.read(chunk_size), '')):
+        written += destination.write(repaired)
+    return written
+
+
+def repair_legacy(text: str) -> str:
+    """encode_test.py 의 기존 방식 (문자열 전체 latin1 → UTF-8, 실패 문자는 버림) - 비교용"""
+    return text.encode('latin1', errors='ignore').decode('utf-8', errors='ignore')
+
+
+def make_document(size_mb: float = 4.0, broken_ratio: float = 0.3, seed: int = 11) -> Tuple[str, str]:
+    """
+    벤치마크용 (깨진 문서, 원문) 생성 - 정상 한글/영문 문단 사이에 깨진 한글/중국어 문단이 섞임
+    """
+    import random
+
+    rng = random.Random(seed)
+    paragraphs = [
+        "AI 채팅 AI 번역 AI 문서 AI 검색 AI프로는 업무용 AI 솔루션입니다.",
+        "腾讯文档 可多人实时协作的在线文档，非常实用吧。",
+        "The quick brown fox jumps over the lazy dog — “quoted” text.",
+        "나라원시스템은 공공기관 홈페이지 구축 전문 기업입니다.",
+        "€100 결제 완료 · 영수증 발행",
+    ]
+    original_parts: List[str] = []
+    broken_parts: List[str] = []
+    total = 0
+    while total < size_mb * (1 << 20):
+        paragraph = rng.choice(paragraphs)
+        original_parts.append(paragraph)
+        if rng.random() < broken_ratio:
+            data = paragraph.encode('utf-8')
+            if rng.random() < 0.5:
+                broken_parts.append(data.decode('latin1'))
+            else:
+                # 브라우저처럼 cp1252 에 없는 바이트(0x81 등)는 같은 코드의 제어문자로 디코딩
+                broken_parts.append(codecs.charmap_decode(data, 'strict', CP1252_LOOSE_TABLE)[0])
+        else:
+            broken_parts.append(paragraph)
+        total += len(paragraph) + 1
+    return '\n'.join(broken_parts), '\n'.join(original_parts)
+
+
+def run_benchmark(size_mb: float = 4.0, chunk_size: int = 64 * 1024):
+    """MB 단위 문서 복원 처리량 (전체 문자열, 청크 스트림) 과 기존 방식 정확도 비교"""
+    import time
+
+    broken, original = make_document(size_mb)
+    size = len(broken.encode('utf-8')) / (1 << 20)
+
+    start = time.perf_counter()
+    repaired = repair_mojibake(broken)
+    whole_elapsed = time.perf_counter() - start
+
+    start = time.perf_counter()
+    streamed = ''.join(repair_stream(broken[i:i + chunk_size] for i in range(0, len(broken), chunk_size)))
+    stream_elapsed = time.perf_counter() - start
+
+    start = time.perf_counter()
+    legacy = repair_legacy(broken)
+    legacy_elapsed = time.perf_counter() - start
+
+    clean = original
+    start = time.perf_counter()
+    repair_mojibake(clean)
+    clean_elapsed = time.perf_counter() - start
+
+    lines = list(zip(repaired.split('\n'), original.split('\n')))
+    exact = sum(1 for fixed, source in lines if fixed == source) / len(lines)
+    legacy_lines = legacy.split('\n')
+    legacy_exact = sum(1 for fixed, (_, source) in zip(legacy_lines, lines) if fixed == source) / len(lines)
+
+    print(f"문서 {size:.1f}MB, 깨진 구간 {len(find_mojibake_spans(broken))}개")
+    print(f"전체 복원: {size / whole_elapsed:.0f} MB/s, 스트림({chunk_size // 1024}KB 청크): {size / stream_elapsed:.0f} MB/s, 결과 동일: {streamed == repaired}")
+    print(f"깨진 구간 없는 문서 검사: {size / clean_elapsed:.0f} MB/s (변경 없음: {repair_mojibake(clean) == clean})")
+    print(f"원문과 같은 문단 비율 - 구간 복원: {exact:.1%}, 기존 방식(전체 latin1→UTF-8): {legacy_exact:.1%} ({legacy_elapsed * 1000:.0f}ms)")
+
+
+if __name__ == "__main__":
+    run_benchmark()
@@ -0,0 +1,174 @@
+import zlib
+from collections import defaultdict
+from typing import Dict, List, Set, Tuple
+
+import numpy as np
+
+# MinHash 파라미터: 128개 해시를 4개씩 32개 band 로 나눔
+# 유사도 0.7 인 쌍이 같은 bucket 에 한 번도 안 들어갈 확률 (1 - 0.7^4)^32 ≈ 1.5e-4 (약 0.015%)
+NUM_PERM = 128
+BANDS = 32
+ROWS = NUM_PERM // BANDS
+_PRIME = np.uint64((1 << 61) - 1)
+_MASK32 = np.uint64(0xFFFFFFFF)
+
+
+def _word_set(text: str) -> Set[str]:
+    """_filter_redundant_text 와 같은 정규화 (소문자, 공백 기준 단어 집합)"""
+    return set(text.lower().split())
+
+
+def jaccard(set1: Set[str], set2: Set[str]) -> float:
+    union = len(set1 | set2)
+    return len(set1 & set2) / union if union else 0
+
+
+class MinHashLSH:
+    """
+    MinHash + LSH band 인덱스
+
+    각 텍스트의 단어 집합을 한 번만 만들고 MinHash 서명으로 band bucket 에 등록합니다.
+    같은 bucket 에 들어온 후보만 실제 자카드 유사도로 확인하므로 결과에 오탐은 없고,
+    비교 횟수는 텍스트 수에 거의 비례합니다.
+    """
+
+    def __init__(self, threshold: float = 0.7, num_perm: int = NUM_PERM, bands: int = BANDS, seed: int = 1):
+        """
+        Args:
+            threshold: 이 값보다 유사하면 중복 (기존 _filter_redundant_text 와 같은 '초과' 기준)
+            num_perm: MinHash 해시 수
+            bands: LSH band 수 (num_perm 의 약수)
+        """
+        if num_perm % bands:
+            raise ValueError("num_perm 은 bands 의 배수여야 합니다.")
+        self.threshold = threshold
+        self.bands = bands
+        self.rows = num_perm // bands
+        generator = np.random.default_rng(seed)
+        # (a * x + b) mod p, x 는 32비트 단어 해시 → a 를 2^29 미만으로 두어 곱이 uint64 범위를 넘지 않게 함
+        self._a = generator.integers(1, 1 << 29, size=(num_perm, 1), dtype=np.uint64)
+        self._b = generator.integers(0, 1 << 29, size=(num_perm, 1), dtype=np.uint64)
+        self._buckets: List[Dict[bytes, List[int]]] = [defaultdict(list) for _ in range(bands)]
+        self._sets: List[Set[str]] = []
+
+    def signature(self, words: Set[str]) -> np.ndarray:
+        hashes = np.fromiter((zlib.crc32(word.encode("utf-8")) for word in words), dtype=np.uint64, count=len(words))
+        return (((self._a * hashes + self._b) % _PRIME) & _MASK32).min(axis=1)
+
+    def _band_keys(self, signature: np.ndarray) -> List[bytes]:
+        data = signature.astype(np.uint32).tobytes()
+        size = self.rows * 4
+        return [data[i * size:(i + 1) * size] for i in range(self.bands)]
+
+    def query(self, words: Set[str], keys: List[bytes]) -> bool:
+        """등록된 집합 중 threshold 보다 유사한 것이 있는지"""
+        checked = set()
+        for band, key in enumerate(keys):
+            for index in self._buckets[band].get(key, ()):
+                if index in checked:
+                    continue
+                checked.add(index)
+                if jaccard(words, self._sets[index]) > self.threshold:
+                    return True
+        return False
+
+    def add(self, words: Set[str], keys: List[bytes]):
+        index = len(self._sets)
+        self._sets.append(words)
+        for band, key in enumerate(keys):
+            self._buckets[band][key].append(index)
+
+    def add_if_new(self, words: Set[str]) -> bool:
+        """유사한 집합이 없으면 등록하고 True, 있으면 False"""
+        if not words:
+            return True  # 단어가 없으면 유사도 0 → 항상 새 텍스트 (기존 동작과 동일)
+        keys = self._band_keys(self.signature(words))
+        if self.query(words, keys):
+            return False
+        self.add(words, keys)
+        return True
+
+
+def filter_near_duplicates(texts: List[str], threshold: float = 0.7) -> List[str]:
+    """
+    앞에서 남긴 텍스트와 자카드 유사도가 threshold 를 넘는 텍스트 제거 (MinHash LSH)
+
+    Args:
+        texts: 필터링할 텍스트 리스트
+        threshold: 중복 판단 유사도
+
+    Returns:
+        list[str]: 필터링된 텍스트 리스트 (원래 순서 유지)
+    """
+    index = MinHashLSH(threshold)
+    seen_sets: Set[Tuple[str, ...]] = set()
+    filtered = []
+    for text in texts:
+        words = _word_set(text)
+        key = tuple(sorted(words))
+        if words and key in seen_sets:
+            # 이미 본 단어 집합이면 남긴 텍스트와 같거나(유사도 1.0) 이미 중복으로 판정된 집합
+            continue
+        seen_sets.add(key)
+        if index.add_if_new(words):
+            filtered.append(text)
+    return filtered
+
+
+def filter_near_duplicates_pairwise(texts: List[str], threshold: float = 0.7) -> List[str]:
+    """기존 _filter_redundant_text 방식 (모든 이전 텍스트와 비교) - 벤치마크/검증용"""
+    filtered_texts = []
+    seen_content = set()
+    for text in texts:
+        normalized = ' '.join(text.lower().split())
+        is_duplicate = False
+        for seen in seen_content:
+            set1 = set(normalized.split())
+            set2 = set(seen.split())
+            similarity = len(set1 & set2) / len(set1 | set2) if set1 | set2 else 0
+            if similarity > threshold:
+                is_duplicate = True
+                break
+        if not is_duplicate:
+            filtered_texts.append(text)
+            seen_content.add(normalized)
+    return filtered_texts
+
+
+def make_paragraphs(count: int = 10000, duplicate_ratio: float = 0.3, seed: int = 7) -> List[str]:
+    """벤치마크용 문단 생성 (일부는 앞 문단의 단어를 조금 바꾼 유사 문단)"""
+    import random
+
+    rng = random.Random(seed)
+    vocabulary = [f"단어{i}" for i in range(5000)] + [f"word{i}" for i in range(5000)]
+    paragraphs: List[str] = []
+    for _ in range(count):
+        if paragraphs and rng.random() < duplicate_ratio:
+            words = rng.choice(paragraphs).split()
+            for _ in range(rng.randint(0, 3)):
+                words[rng.randrange(len(words))] = rng.choice(vocabulary)
+        else:
+            words = rng.sample(vocabulary, rng.randint(15, 40))
+        paragraphs.append(" ".join(words))
+    return paragraphs
+
+
+def run_benchmark(count: int = 10000):
+    import time
+
+    paragraphs = make_paragraphs(count)
+
+    start = time.perf_counter()
+    fast = filter_near_duplicates(paragraphs)
+    fast_elapsed = time.perf_counter() - start
+
+    start = time.perf_counter()
+    slow = filter_near_duplicates_pairwise(paragraphs)
+    slow_elapsed = time.perf_counter() - start
+
+    print(f"문단 {count}개 → 남은 문단: MinHash LSH {len(fast)}개, 기존 {len(slow)}개, 결과 동일: {fast == slow}")
+    print(f"MinHash LSH: {fast_elapsed:.2f}초, 기존 O(n²): {slow_elapsed:.2f}초 ({slow_elapsed / fast_elapsed:.0f}배)")
+
+
+if __name__ == "__main__":
+    run_benchmark()
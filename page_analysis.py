@@ -0,0 +1,626 @@
+import hashlib
+import json
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urldefrag, urljoin, urlparse
+
+import soupsieve as sv
+from bs4 import BeautifulSoup, CData, NavigableString, Tag
+
+from page_extractor import EXCLUDED_CLASSES, extract_soup_content
+from search_snippets import create_search_snippets, prepare_snippet_candidates, rank_snippet_candidates
+
+PageKey = Tuple[str, str]  # (URL, 본문 sha1)
+
+# favicon.ipynb 의 _parse_favicon 과 같은 우선순위
+FAVICON_SELECTORS = [
+    'link[rel="icon"]',
+    'link[rel="shortcut icon"]',
+    'link[rel="icon"][sizes]',
+    'link[rel="icon"][type="image/png"]',
+    'link[rel="icon"][type="image/svg+xml"]',
+    'link[rel="icon"][type="image/x-icon"]',
+    'link[rel="apple-touch-icon"]',
+    'link[rel="apple-touch-icon-precomposed"]',
+    'link[rel="mask-icon"]',
+    'link[rel="fluid-icon"]',
+    'link[rel="msapplication-TileImage"]',
+]
+PREFERRED_FAVICON_SIZES = ['32x32', '16x16', '64x64', '48x48']
+META_FAVICON_SELECTORS = ['meta[name="msapplication-TileImage"]', 'meta[property="og:image"]']
+DEFAULT_FAVICON_PATHS = [
+    '/favicon.ico', '/favicon.png', '/favicon.svg', '/favicon-32x32.png', '/favicon-16x16.png',
+    '/favicon_icon.png', '/assets/favicon.ico', '/assets/images/favicon.ico', '/images/favicon.ico',
+    '/static/favicon.ico', '/web/upload/favicon.ico', '/public/favicon.ico',
+]
+
+# favicon.ipynb 의 _parse_site_name 단계별 선택자
+SITE_NAME_PRIMARY_SELECTORS = [
+    'meta[property="og:site_name"]',
+    'meta[name="application-name"]',
+    'meta[name="apple-mobile-web-app-title"]',
+]
+SITE_NAME_SOCIAL_SELECTORS = [
+    'meta[property="twitter:site"]',
+    'meta[name="twitter:site"]',
+    'meta[property="twitter:creator"]',
+    'meta[name="twitter:creator"]',
+]
+SITE_NAME_OTHER_SELECTORS = [
+    'meta[name="generator"]',
+    'meta[name="author"]',
+    'meta[name="publisher"]',
+    'meta[property="article:publisher"]',
+    'meta[name="copyright"]',
+    'meta[name="DC.publisher"]',
+    'meta[name="DC.creator"]',
+]
+SITE_NAME_ELEMENT_SELECTORS = [
+    'h1.site-title', 'h1.logo', '.site-name', '.site-title', '.logo-text',
+    'header h1', 'nav .brand', '.navbar-brand', 'header .brand',
+]
+
+# favicon.ipynb 의 _parse_page_content 와 같은 제거/본문 컨테이너 기준
+CONTENT_EXCLUDED_TAGS = ['script', 'style', 'nav', 'header', 'footer', 'aside',
+                         'advertisement', 'ads', 'sidebar', 'menu', 'breadcrumb']
+# [class*="..."], [id*="..."] 선택자 대신 한 번 순회하며 부분 문자열 검사
+CONTENT_EXCLUDED_CLASS_PARTS = ['nav', 'menu', 'header', 'footer', 'sidebar', 'aside', 'widget', 'ad',
+                                'advertisement', 'banner', 'popup', 'cookie', 'social', 'share', 'comment']
+CONTENT_EXCLUDED_ID_PARTS = ['nav', 'menu', 'header', 'footer', 'sidebar', 'aside', 'widget', 'ad']
+_EXCLUDED_CLASS_PATTERN = re.compile('|'.join(CONTENT_EXCLUDED_CLASS_PARTS))
+_EXCLUDED_ID_PATTERN = re.compile('|'.join(CONTENT_EXCLUDED_ID_PARTS))
+MAIN_CONTENT_SELECTORS = [
+    'main', 'article', '[role="main"]', '.main-content', '.content', '.post-content',
+    '.entry-content', '.article-content', '.page-content', '.body-content', '.main-body',
+    '#content', '#main', '#main-content', '.container .content', '.wrapper .content',
+]
+MAX_CONTENT_LENGTH = 2000
+_SPACES = re.compile(r'\s+')
+_HEADING_TAGS = frozenset({'h1', 'h2', 'h3', 'h4', 'h5', 'h6'})
+_PARAGRAPH_TAGS = frozenset({'p', 'div', 'section', 'article'})
+_TEXT_TYPES = (NavigableString, CData)  # get_text 가 모으는 문자열 (주석/Doctype 제외)
+
+
+def _head_tags(soup: BeautifulSoup) -> list:
+    """link/meta 태그 목록 (선택자마다 문서 전체를 다시 훑지 않도록 한 번만 수집)"""
+    return soup.find_all(['link', 'meta'])
+
+
+def _select(tags: list, selector: str) -> list:
+    return sv.filter(selector, tags)
+
+
+def _meta_content(tags: list, selector: str) -> str:
+    matched = _select(tags, selector)
+    content = matched[0].get('content') if matched else None
+    return content.strip() if content and content.strip() else ''
+
+
+def parse_favicon(soup: BeautifulSoup, base_url: str, head_tags: Optional[list] = None) -> str:
+    """
+    favicon URL (link 아이콘 → 선호 크기 → 우선순위, 없으면 meta 이미지, 최후에는 /favicon.ico)
+
+    Args:
+        soup: BeautifulSoup 객체
+        base_url: 상대 경로 기준 URL
+        head_tags: 미리 수집한 link/meta 태그 (없으면 soup 에서 수집)
+    """
+    tags = head_tags if head_tags is not None else _head_tags(soup)
+    all_favicons = []
+    for priority, selector in enumerate(FAVICON_SELECTORS):
+        for link in _select(tags, selector):
+            href = link.get('href')
+            if href:
+                all_favicons.append({'href': href, 'priority': priority, 'sizes': link.get('sizes')})
+
+    if all_favicons:
+        for size in PREFERRED_FAVICON_SIZES:
+            for favicon in all_favicons:
+                if favicon['sizes'] == size:
+                    return urljoin(base_url, favicon['href'])
+        all_favicons.sort(key=lambda x: x['priority'])
+        return urljoin(base_url, all_favicons[0]['href'])
+
+    for selector in META_FAVICON_SELECTORS:
+        content = _meta_content(tags, selector)
+        if content.lower().endswith(('.ico', '.png', '.svg', '.jpg', '.jpeg', '.gif')):
+            return urljoin(base_url, content)
+
+    parsed_url = urlparse(base_url)
+    return f"{parsed_url.scheme}://{parsed_url.netloc}{DEFAULT_FAVICON_PATHS[0]}"
+
+
+def favicon_candidates(soup: BeautifulSoup, base_url: str, head_tags: Optional[list] = None) -> List[str]:
+    """
+    실제 존재 여부를 확인할 favicon 후보 URL (우선순위 순, 중복 제거)
+
+    parse_favicon 이 고른 URL 이 첫 번째이고, 나머지 link 아이콘(선택자 우선순위), meta 이미지, 기본 경로 순입니다.
+    """
+    tags = head_tags if head_tags is not None else _head_tags(soup)
+    candidates = [parse_favicon(soup, base_url, tags)]
+    for selector in FAVICON_SELECTORS:
+        candidates.extend(urljoin(base_url, link['href']) for link in _select(tags, selector) if link.get('href'))
+    for selector in META_FAVICON_SELECTORS:
+        content = _meta_content(tags, selector)
+        if content.lower().endswith(('.ico', '.png', '.svg', '.jpg', '.jpeg', '.gif')):
+            candidates.append(urljoin(base_url, content))
+    parsed_url = urlparse(base_url)
+    candidates.extend(f"{parsed_url.scheme}://{parsed_url.netloc}{path}" for path in DEFAULT_FAVICON_PATHS)
+    return list(dict.fromkeys(candidates))
+
+
+def _json_ld_site_name(soup: BeautifulSoup) -> str:
+    for script in soup.find_all('script', type='application/ld+json'):
+        try:
+            if not script.string:
+                continue
+            data = json.loads(script.string)
+            if isinstance(data, list):
+                data = data[0] if data else {}
+            possible_names = []
+            for field in ('publisher', 'author', 'name', 'alternateName', 'brand'):
+                value = data.get(field)
+                possible_names.append(value.get('name') if isinstance(value, dict) else value)
+            for name in possible_names:
+                if name and isinstance(name, str) and name.strip():
+                    return name.strip()
+        except (json.JSONDecodeError, AttributeError):
+            continue
+    return ''
+
+
+def parse_site_name(soup: BeautifulSoup, head_tags: Optional[list] = None) -> str:
+    """
+    사이트명 (og:site_name 등 → twitter 계정 → generator/author 등 → JSON-LD → 로고 요소 순)
+    """
+    tags = head_tags if head_tags is not None else _head_tags(soup)
+    for selector in SITE_NAME_PRIMARY_SELECTORS:
+        content = _meta_content(tags, selector)
+        if content:
+            return content
+
+    for selector in SITE_NAME_SOCIAL_SELECTORS:
+        content = _meta_content(tags, selector)
+        if content:
+            # Twitter handle 에서 @ 제거
+            return content[1:].strip() if content.startswith('@') else content
+
+    for selector in SITE_NAME_OTHER_SELECTORS:
+        content = _meta_content(tags, selector)
+        if content:
+            # "WordPress 6.3" → "WordPress"
+            return content.split()[0] if 'generator' in selector else content
+
+    name = _json_ld_site_name(soup)
+    if name:
+        return name
+
+    for selector in SITE_NAME_ELEMENT_SELECTORS:
+        element = soup.select_one(selector)
+        if element:
+            text = element.get_text(strip=True)
+            if text and len(text) < 100:
+                return text
+    return ''
+
+
+def parse_title(soup: BeautifulSoup, head_tags: Optional[list] = None) -> str:
+    """og:title 우선, 없으면 title 태그"""
+    tags = head_tags if head_tags is not None else _head_tags(soup)
+    og_title = _meta_content(tags, 'meta[property="og:title"]')
+    if og_title:
+        return og_title
+    title_tag = soup.select_one('title')
+    if title_tag and title_tag.get_text():
+        return title_tag.get_text().strip()
+    return ''
+
+
+def _prune(soup: BeautifulSoup) -> set:
+    """
+    제거 대상(CONTENT_EXCLUDED_TAGS, class/id 패턴)과 그 하위를 뺀 나머지 요소의 id 집합
+
+    문서를 복사해서 decompose 하는 대신 한 번 순회하며 제거 대상 하위는 건너뜁니다.
+    """
+    kept = {id(soup)}
+    stack = [iter(soup.children)]
+    while stack:
+        element = next(stack[-1], None)
+        if element is None:
+            stack.pop()
+            continue
+        if not isinstance(element, Tag) or element.name in CONTENT_EXCLUDED_TAGS:
+            continue
+        class_name = ' '.join(element.get('class') or [])
+        if _EXCLUDED_CLASS_PATTERN.search(class_name) or _EXCLUDED_ID_PATTERN.search(element.get('id') or ''):
+            continue
+        kept.add(id(element))
+        stack.append(iter(element.children))
+    return kept
+
+
+def _iter_kept(root, kept: set, names: frozenset):
+    """root 하위에서 남은 요소 중 names 태그 (문서 순서)"""
+    stack = [iter(root.children)]
+    while stack:
+        element = next(stack[-1], None)
+        if element is None:
+            stack.pop()
+        elif isinstance(element, Tag) and id(element) in kept:
+            if element.name in names:
+                yield element
+            stack.append(iter(element.children))
+
+
+def _kept_text(root, kept: set) -> str:
+    """get_text(strip=True) 와 같되 제거 대상 하위의 텍스트는 제외"""
+    parts = []
+    stack = [iter(root.children)]
+    while stack:
+        element = next(stack[-1], None)
+        if element is None:
+            stack.pop()
+        elif isinstance(element, Tag):
+            if id(element) in kept:
+                stack.append(iter(element.children))
+        elif type(element) in _TEXT_TYPES:
+            text = element.strip()
+            if text:
+                parts.append(text)
+    return ''.join(parts)
+
+
+def parse_page_content(soup: BeautifulSoup) -> str:
+    """
+    본문 내용 (불필요한 요소 제거 후 본문 컨테이너의 제목/단락, 최대 2000자)
+
+    주어진 soup 는 수정하지 않고, 제거 대상 요소는 순회할 때 건너뜁니다.
+    """
+    kept = _prune(soup)
+
+    main_content = None
+    for selector in MAIN_CONTENT_SELECTORS:
+        main_content = next((element for element in sv.iselect(selector, soup) if id(element) in kept), None)
+        if main_content:
+            break
+    if not main_content:
+        body = soup.find('body')
+        main_content = body if body is not None and id(body) in kept else soup
+
+    # 합친 길이가 MAX_CONTENT_LENGTH 를 넘으면 뒤 단락은 잘려 나가므로 더 모으지 않음 (결과 동일)
+    paragraphs: List[str] = []
+    paragraph_words: List[set] = []
+    total_length = -2
+
+    def add(text: str) -> bool:
+        nonlocal total_length
+        paragraphs.append(text)
+        paragraph_words.append(set(text.split()))
+        total_length += len(text) + 2
+        return total_length > MAX_CONTENT_LENGTH
+
+    def is_duplicate(text: str) -> bool:
+        """이미 추가된 단락과 공통 단어 비율이 80% 를 넘는지"""
+        text_words = set(text.split())
+        return bool(text_words) and any(len(text_words & words) / len(text_words) > 0.8 for words in paragraph_words)
+
+    full = False
+    for heading in _iter_kept(main_content, kept, _HEADING_TAGS):
+        text = _kept_text(heading, kept)
+        if text and len(text) > 10 and add(text):
+            full = True
+            break
+    if not full:
+        for paragraph in _iter_kept(main_content, kept, _PARAGRAPH_TAGS):
+            text = _kept_text(paragraph, kept)
+            if text and len(text) > 20 and not is_duplicate(text) and add(text):
+                break
+
+    if paragraphs:
+        full_content = '\n\n'.join(paragraphs)
+        if len(full_content) > MAX_CONTENT_LENGTH:
+            # 문장 단위로 자르기
+            truncated_content = ''
+            for sentence in full_content.split('.'):
+                if len(truncated_content + sentence + '.') <= MAX_CONTENT_LENGTH - 50:
+                    truncated_content += sentence + '.'
+                else:
+                    break
+            full_content = (truncated_content or full_content[:MAX_CONTENT_LENGTH - 50]) + '...'
+        return _SPACES.sub(' ', full_content).strip()
+
+    # 본문을 찾지 못하면 description
+    tags = [tag for tag in _head_tags(soup) if id(tag) in kept]
+    return _meta_content(tags, 'meta[name="description"]') or _meta_content(tags, 'meta[property="og:description"]')
+
+
+class PageAnalysis:
+    """
+    HTML 한 번 파싱 결과와 그로부터 계산한 페이지 정보
+
+    - BeautifulSoup('lxml') 파싱은 생성 시 한 번만 수행
+    - favicon, site_name, title, content 는 처음 요청할 때 한 번 계산 후 보관
+    - 스니펫 후보(meta/본문 문단/JSON-LD, 중복 제거)는 검색어와 무관하므로 한 번만 수집하고
+      검색어별 스니펫은 점수 계산만 다시 수행 (최근 검색어 결과도 보관)
+    """
+
+    def __init__(self, url: str, html: str, max_queries: int = 32):
+        """
+        Args:
+            url: 페이지 URL (favicon 상대 경로 기준)
+            html: HTML 문자열
+            max_queries: 보관할 검색어별 스니펫 결과 수
+        """
+        self.url = url
+        self.soup = BeautifulSoup(html, 'lxml')
+        self.head_tags = _head_tags(self.soup)
+        self.parsed_at = time.time()
+        self.max_queries = max_queries
+        self._facets: Dict[str, Any] = {}
+        self._snippets: "OrderedDict[Tuple[str, int, int], List[Dict]]" = OrderedDict()
+        self._lock = threading.RLock()  # site_name 계산 중 title 을 다시 요청함
+
+    def _facet(self, name: str, compute):
+        with self._lock:
+            if name not in self._facets:
+                self._facets[name] = compute()
+            return self._facets[name]
+
+    @property
+    def favicon(self) -> str:
+        return self._facet('favicon', lambda: parse_favicon(self.soup, self.url, self.head_tags))
+
+    @property
+    def favicon_candidates(self) -> List[str]:
+        return self._facet('favicon_candidates', lambda: favicon_candidates(self.soup, self.url, self.head_tags))
+
+    @property
+    def site_name(self) -> str:
+        """사이트명, 없으면 title (parse_website_meta 와 같은 대체 규칙)"""
+        return self._facet('site_name', lambda: parse_site_name(self.soup, self.head_tags) or self.title)
+
+    @property
+    def title(self) -> str:
+        return self._facet('title', lambda: parse_title(self.soup, self.head_tags))
+
+    @property
+    def content(self) -> str:
+        return self._facet('content', lambda: parse_page_content(self.soup))
+
+    @property
+    def snippet_candidates(self) -> List[Tuple[str, str]]:
+        return self._facet(
+            'snippet_candidates',
+            lambda: prepare_snippet_candidates(extract_soup_content(self.soup, EXCLUDED_CLASSES)),
+        )
+
+    def snippets(self, search_query: str, max_snippets: int = 3, snippet_length: int = 150) -> List[Dict]:
+        """
+        검색어 관련 스니펫 (create_search_snippets 와 같은 결과)
+
+        Returns:
+            list[dict]: [{"text", "source", "relevance_score"}, ...]
+        """
+        key = (search_query, max_snippets, snippet_length)
+        with self._lock:
+            if key in self._snippets:
+                self._snippets.move_to_end(key)
+                return self._snippets[key]
+        snippets = rank_snippet_candidates(self.snippet_candidates, search_query, max_snippets, snippet_length)
+        with self._lock:
+            self._snippets[key] = snippets
+            while len(self._snippets) > self.max_queries:
+                self._snippets.popitem(last=False)
+        return snippets
+
+    def to_dict(self, search_query: Optional[str] = None, max_snippets: int = 3, snippet_length: int = 150) -> Dict[str, Any]:
+        """
+        Returns:
+            dict: {"url", "favicon", "site_name", "title", "content", "snippets"}
+        """
+        return {
+            "url": self.url,
+            "favicon": self.favicon,
+            "site_name": self.site_name,
+            "title": self.title,
+            "content": self.content,
+            "snippets": self.snippets(search_query, max_snippets, snippet_length) if search_query else [],
+        }
+
+
+class PageAnalysisCache:
+    """
+    URL + 본문 해시 기준 페이지 분석 캐시
+
+    - 같은 URL 이라도 본문이 바뀌면 다른 키 → 오래된 분석 결과를 쓰지 않음
+    - LRU + TTL 만료
+    - refresh_interval 안에 다시 요청한 URL 은 네트워크 요청 없이 마지막 분석 결과 사용
+      (그 이후에는 크롤러의 조건부 GET 으로 확인하고, 본문이 같으면 다시 파싱하지 않음)
+    """
+
+    def __init__(self, max_size: int = 256, ttl: float = 600, refresh_interval: float = 60):
+        """
+        Args:
+            max_size: 최대 저장 페이지 수
+            ttl: 분석 결과 유지 시간(초)
+            refresh_interval: URL 을 다시 요청하지 않고 재사용할 시간(초)
+        """
+        self.max_size = max_size
+        self.ttl = ttl
+        self.refresh_interval = refresh_interval
+        # key → (분석 결과, 만료 시각)
+        self._items: "OrderedDict[PageKey, Tuple[PageAnalysis, float]]" = OrderedDict()
+        # URL → (마지막 키, 가져온 시각), 분석 결과와 같은 최대 수만 LRU 로 유지
+        self._latest: "OrderedDict[str, Tuple[PageKey, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "misses": 0, "fetches": 0, "evictions": 0}
+
+    @staticmethod
+    def make_key(url: str, html: str) -> PageKey:
+        return urldefrag(url)[0], hashlib.sha1(html.encode('utf-8', 'surrogatepass')).hexdigest()
+
+    def _get(self, key: PageKey, now: float) -> Optional[PageAnalysis]:
+        item = self._items.get(key)
+        if item is None:
+            return None
+        if item[1] < now:
+            del self._items[key]
+            return None
+        self._items.move_to_end(key)
+        return item[0]
+
+    def get(self, url: str, html: str) -> PageAnalysis:
+        """
+        분석 결과 조회, 없으면 파싱해서 저장
+
+        Args:
+            url: 페이지 URL
+            html: HTML 문자열
+
+        Returns:
+            PageAnalysis
+        """
+        key = self.make_key(url, html)
+        now = time.monotonic()
+        with self._lock:
+            self._latest[key[0]] = (key, now)
+            self._latest.move_to_end(key[0])
+            while len(self._latest) > self.max_size:
+                self._latest.popitem(last=False)
+            analysis = self._get(key, now)
+            if analysis is not None:
+                self.stats["hits"] += 1
+                return analysis
+            self.stats["misses"] += 1
+
+        # 파싱은 lock 밖에서 (동시에 같은 페이지가 들어오면 먼저 저장된 결과 사용)
+        analysis = PageAnalysis(key[0], html)
+        with self._lock:
+            existing = self._get(key, time.monotonic())
+            if existing is not None:
+                return existing
+            self._items[key] = (analysis, time.monotonic() + self.ttl)
+            while len(self._items) > self.max_size:
+                self._items.popitem(last=False)
+                self.stats["evictions"] += 1
+        return analysis
+
+    def recent(self, url: str) -> Optional[PageAnalysis]:
+        """refresh_interval 안에 분석한 URL 의 마지막 결과"""
+        url = urldefrag(url)[0]
+        now = time.monotonic()
+        with self._lock:
+            latest = self._latest.get(url)
+            if latest is None or now - latest[1] > self.refresh_interval:
+                return None
+            analysis = self._get(latest[0], now)
+            if analysis is not None:
+                self.stats["hits"] += 1
+            return analysis
+
+    async def analyze(self, url: str, crawler) -> Optional[PageAnalysis]:
+        """
+        URL 을 가져와 분석 (최근 결과가 있으면 요청하지 않음)
+
+        Args:
+            url: 페이지 URL
+            crawler: AsyncCrawler (공유 세션, 조건부 GET)
+
+        Returns:
+            PageAnalysis, 가져오지 못하면 None
+        """
+        analysis = self.recent(url)
+        if analysis is not None:
+            return analysis
+        self.stats["fetches"] += 1
+        page = await crawler.fetch(url)
+        if page["error"] or page["status"] != 200 or not page["html"]:
+            return None
+        return self.get(url, page["html"])
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+            self._latest.clear()
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+
+_page_analysis_cache: Optional[PageAnalysisCache] = None
+
+
+def get_page_analysis_cache() -> PageAnalysisCache:
+    """프로세스 공유 페이지 분석 캐시"""
+    global _page_analysis_cache
+    if _page_analysis_cache is None:
+        _page_analysis_cache = PageAnalysisCache()
+    return _page_analysis_cache
+
+
+def run_benchmark(paragraph_count: int = 2000, queries: int = 5):
+    """
+    같은 페이지에 대해 favicon/site_name/title/content + 검색어 여러 개 스니펫 계산 시간 비교
+
+    - 기존 방식: 정보마다 BeautifulSoup 를 새로 만들고, 스니펫은 검색어마다 HTML 을 다시 훑음
+    - 분석 캐시: 한 번 파싱 후 정보/후보 재사용, 같은 본문 재요청은 캐시 적중
+    """
+    import asyncio
+
+    body = []
+    for i in range(paragraph_count):
+        if i % 10 == 0:
+            body.append(f'<div class="sidebar"><p>광고 문단 {i}</p></div>')
+        body.append(f'<div class="item"><h3>공지 제목 {i}</h3><p>나라원시스템 {i}번째 본문 문단입니다. 공공기관 홈페이지 구축 사례 {i % 37}.</p></div>')
+    html = (
+        '<html><head><title>나라원시스템</title>'
+        '<meta property="og:site_name" content="나라원시스템">'
+        '<meta name="description" content="공공기관 홈페이지 구축 전문 기업">'
+        '<link rel="icon" sizes="32x32" href="/favicon-32x32.png">'
+        '<script type="application/ld+json">{"description": "나라원시스템 회사 소개 구조화 데이터"}</script>'
+        '</head><body><header><p>상단 메뉴</p></header>'
+        f'<main class="main-content">{"".join(body)}</main><footer>copyright</footer></body></html>'
+    )
+    url = "https://nara1.kr/"
+    search_queries = ["나라원시스템 연혁", "공공기관 홈페이지", "구축 사례", "공지", "회사 소개"][:queries]
+
+    def legacy():
+        result = {
+            "favicon": parse_favicon(BeautifulSoup(html, 'html.parser'), url),
+            "site_name": parse_site_name(BeautifulSoup(html, 'html.parser')) or parse_title(BeautifulSoup(html, 'html.parser')),
+            "content": parse_page_content(BeautifulSoup(html, 'html.parser')),
+        }
+        result["snippets"] = [asyncio.run(create_search_snippets(html, query)) for query in search_queries]
+        return result
+
+    def cached(cache: PageAnalysisCache):
+        analysis = cache.get(url, html)
+        result = {"favicon": analysis.favicon, "site_name": analysis.site_name, "content": analysis.content}
+        result["snippets"] = [analysis.snippets(query) for query in search_queries]
+        return result
+
+    start = time.perf_counter()
+    old = legacy()
+    legacy_ms = (time.perf_counter() - start) * 1000
+
+    cache = PageAnalysisCache()
+    start = time.perf_counter()
+    new = cached(cache)
+    first_ms = (time.perf_counter() - start) * 1000
+
+    start = time.perf_counter()
+    cached(cache)
+    hit_ms = (time.perf_counter() - start) * 1000
+
+    print(f"HTML {len(html) // 1024}KB, 검색어 {len(search_queries)}개, 결과 동일: {old['snippets'] == new['snippets']}")
+    print(f"favicon={new['favicon']}, site_name={new['site_name']}, 본문 {len(new['content'])}자")
+    print(f"기존 방식(정보/검색어마다 파싱): {legacy_ms:.0f}ms")
+    print(f"분석 캐시 첫 요청(한 번 파싱): {first_ms:.0f}ms, 같은 본문 재요청: {hit_ms:.2f}ms")
+    print(f"캐시 통계: {cache.stats}")
+
+
+if __name__ == "__main__":
+    run_benchmark()
@@ -0,0 +1,273 @@
+from typing import Dict, List, Optional, Set, Union
+
+from lxml import etree
+
+# 기존 BeautifulSoup 방식(run_benchmark 의 legacy_exclude)과 같은 기준
+EXCLUDED_TAGS = frozenset({'script', 'style', 'nav', 'footer', 'header', 'aside', 'noscript'})
+EXCLUDED_CLASSES = frozenset({
+    'ad', 'advertisement', 'banner', 'cookie', 'popup', 'modal',
+    'menu', 'nav', 'footer', 'header', 'sidebar', 'social',
+    'comment', 'related', 'share', 'widget', 'toolbar', 'copyright'
+})
+CONTAINER_TAGS = frozenset({'article', 'main', 'div'})
+PARAGRAPH_TAGS = frozenset({'p', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6'})
+
+# create_search_snippets 의 meta_selectors 순서
+META_SOURCES = ('title', 'description', 'keywords', 'og:title', 'og:description')
+_META_ATTRIBUTES = {
+    ('name', 'description'): 'description',
+    ('name', 'keywords'): 'keywords',
+    ('property', 'og:title'): 'og:title',
+    ('property', 'og:description'): 'og:description',
+}
+
+
+def _is_excluded(tag: str, attrib, excluded_classes: Set[str]) -> bool:
+    if tag in EXCLUDED_TAGS:
+        return True
+    classes = (attrib.get('class') or '').split()
+    if any(c in excluded_classes for c in classes):
+        return True
+    style = attrib.get('style', '')
+    return 'display: none' in style or 'visibility: hidden' in style
+
+
+class _Capture:
+    """열려 있는 문단/제목/JSON-LD 텍스트 수집 버퍼"""
+
+    __slots__ = ('kind', 'parts', 'excluded_base', 'in_container', 'fallback_ok')
+
+    def __init__(self, kind: str, excluded_base: int, in_container: bool = False, fallback_ok: bool = False):
+        self.kind = kind
+        self.parts: List[str] = []
+        self.excluded_base = excluded_base
+        self.in_container = in_container
+        self.fallback_ok = fallback_ok
+
+
+class _PageTarget:
+    """
+    lxml parser target - start/end/data 이벤트만으로 문서를 한 번 훑음
+
+    - 제외 요소(script, nav, 광고 class, 숨김 style 등)는 들어가는 순간 하위 텍스트를 건너뜀
+    - 콘텐츠 컨테이너(class 에 content 가 들어간 article/main/div) 안의 문단과
+      컨테이너가 없을 때 쓸 문서 전체 문단을 함께 모아 두고, 끝에서 하나를 선택
+    - title, meta, JSON-LD 도 같은 순회에서 수집
+    """
+
+    def __init__(self, excluded_classes: Set[str]):
+        self.excluded_classes = excluded_classes
+        # 열린 요소별 (컨테이너 여부, 전체 기준 제외 여부, 컨테이너 기준 제외 여부, 수집 버퍼)
+        self._stack: List[tuple] = []
+        self._excluded_open = 0            # 문서 전체 기준으로 열려 있는 제외 요소 수
+        self._container_excluded_open = 0  # 컨테이너 안에서 열린 제외 요소 수
+        self._container_depth = 0
+        self._captures: List[_Capture] = []
+        self.container_found = False
+        self.meta: Dict[str, List[str]] = {source: [] for source in META_SOURCES}
+        self.container_paragraphs: List[str] = []
+        self.fallback_paragraphs: List[str] = []
+        self.json_ld: List[str] = []
+
+    def start(self, tag, attrib):
+        if not isinstance(tag, str):
+            return
+        tag = tag.lower()
+        is_container = tag in CONTAINER_TAGS and 'content' in (attrib.get('class') or '').lower()
+        excluded = _is_excluded(tag, attrib, self.excluded_classes)
+        # 최상위 컨테이너 자신은 제외 검사 대상이 아님 (기존 코드는 컨테이너의 하위 요소만 검사)
+        container_excluded = excluded and self._container_depth > 0
+
+        capture = None
+        if tag == 'title':
+            capture = _Capture('title', self._excluded_open)
+        elif tag == 'script' and attrib.get('type') == 'application/ld+json':
+            capture = _Capture('json_ld', self._excluded_open + 1)
+        elif tag == 'meta':
+            for (attribute, value), source in _META_ATTRIBUTES.items():
+                if attrib.get(attribute) == value:
+                    self.meta[source].append((attrib.get('content') or '').strip())
+        elif tag in PARAGRAPH_TAGS:
+            in_container = self._container_depth > 0 and self._container_excluded_open == 0 and not container_excluded
+            fallback_ok = self._excluded_open == 0 and not excluded
+            if in_container or fallback_ok:
+                capture = _Capture('paragraph', self._excluded_open + excluded, in_container, fallback_ok)
+
+        if is_container:
+            self.container_found = True
+            self._container_depth += 1
+        if excluded:
+            self._excluded_open += 1
+        if container_excluded:
+            self._container_excluded_open += 1
+        if capture is not None:
+            self._captures.append(capture)
+        self._stack.append((is_container, excluded, container_excluded, capture))
+
+    def end(self, tag):
+        if not isinstance(tag, str) or not self._stack:
+            return
+        is_container, excluded, container_excluded, capture = self._stack.pop()
+        if is_container:
+            self._container_depth -= 1
+        if excluded:
+            self._excluded_open -= 1
+        if container_excluded:
+            self._container_excluded_open -= 1
+        if capture is None:
+            return
+        self._captures.remove(capture)
+        text = ''.join(capture.parts)
+        if capture.kind == 'title':
+            self.meta['title'].append(text.strip())
+        elif capture.kind == 'json_ld':
+            self.json_ld.append(text)
+        else:
+            text = text.strip()
+            if capture.in_container:
+                self.container_paragraphs.append(text)
+            if capture.fallback_ok:
+                self.fallback_paragraphs.append(text)
+
+    def data(self, text):
+        for capture in self._captures:
+            # 문단 시작 이후에 열린 제외 요소 안의 텍스트는 제외
+            if self._excluded_open == capture.excluded_base:
+                capture.parts.append(text)
+
+    def comment(self, text):
+        pass
+
+    def close(self):
+        return self
+
+
+def extract_page_content(html: Union[str, bytes], excluded_classes: Optional[Set[str]] = None) -> Dict[str, object]:
+    """
+    HTML 을 한 번만 파싱해 스니펫 후보 수집
+
+    Args:
+        html: HTML 문자열 또는 바이트
+        excluded_classes: 제외할 class 이름 (기본 EXCLUDED_CLASSES)
+
+    Returns:
+        dict: {
+            "meta": [(source, text), ...]  # title, description, keywords, og:title, og:description 순서
+            "paragraphs": [...]            # 콘텐츠 컨테이너 안의 p/h1~h6 (컨테이너가 없으면 문서 전체)
+            "json_ld": [...]               # application/ld+json 스크립트 원문
+        }
+    """
+    target = _PageTarget(excluded_classes if excluded_classes is not None else EXCLUDED_CLASSES)
+    if not html:
+        # 아무것도 feed 하지 않고 close() 하면 lxml 이 XMLSyntaxError 를 냄
+        return _collect(target)
+    parser = etree.HTMLParser(target=target, recover=True)
+    parser.feed(html)
+    parser.close()
+    return _collect(target)
+
+
+def extract_soup_content(soup, excluded_classes: Optional[Set[str]] = None) -> Dict[str, object]:
+    """
+    이미 파싱된 BeautifulSoup 트리에서 extract_page_content 와 같은 후보 수집 (다시 파싱하지 않음)
+
+    트리를 한 번 훑으며 같은 target 에 start/end/data 이벤트를 전달합니다.
+    'lxml' 파서로 만든 soup 이면 extract_page_content(html) 과 결과가 같습니다.
+
+    Args:
+        soup: BeautifulSoup 객체 또는 Tag
+        excluded_classes: 제외할 class 이름 (기본 EXCLUDED_CLASSES)
+
+    Returns:
+        dict: extract_page_content 와 같은 형식
+    """
+    from bs4 import Tag
+    from bs4.element import PreformattedString
+
+    target = _PageTarget(excluded_classes if excluded_classes is not None else EXCLUDED_CLASSES)
+    children = [iter(soup.contents)]
+    open_tags: List[str] = []
+    while children:
+        node = next(children[-1], None)
+        if node is None:
+            children.pop()
+            if open_tags:
+                target.end(open_tags.pop())
+        elif isinstance(node, Tag):
+            # bs4 는 class 같은 다중 값 속성을 리스트로 보관 → lxml 과 같은 공백 구분 문자열로 변환
+            attrib = {key: ' '.join(value) if isinstance(value, list) else value for key, value in node.attrs.items()}
+            target.start(node.name, attrib)
+            open_tags.append(node.name)
+            children.append(iter(node.contents))
+        elif not isinstance(node, PreformattedString):  # 주석, doctype, CDATA 제외
+            target.data(str(node))
+    return _collect(target)
+
+
+def _collect(target: _PageTarget) -> Dict[str, object]:
+    meta = [(source, text) for source in META_SOURCES for text in target.meta[source]]
+    paragraphs = target.container_paragraphs if target.container_found else target.fallback_paragraphs
+    return {"meta": meta, "paragraphs": paragraphs, "json_ld": target.json_ld}
+
+
+def run_benchmark(paragraph_count: int = 5000, repeat: int = 5):
+    """BeautifulSoup 파싱 + find_all/decompose 방식과 한 번 순회 방식 비교"""
+    import time
+
+    from bs4 import BeautifulSoup
+
+    body = []
+    for i in range(paragraph_count):
+        if i % 10 == 0:
+            body.append(f'<div class="sidebar"><p>광고 문단 {i}</p></div>')
+        body.append(f'<div class="item"><h3>제목 {i}</h3><p>나라원시스템 본문 문단 {i} <span>강조</span> 내용입니다.</p></div>')
+    html = (
+        '<html><head><title>나라원시스템</title>'
+        '<meta name="description" content="공공기관 홈페이지 구축 전문 기업">'
+        '<script type="application/ld+json">{"description": "나라원시스템 회사 소개 구조화 데이터"}</script>'
+        '</head><body><header><p>상단 메뉴</p></header>'
+        f'<main class="main-content">{"".join(body)}</main><footer>copyright</footer></body></html>'
+    )
+
+    def legacy_exclude(element, excluded_classes) -> bool:
+        """기존 제외 요소 판별 (비교 기준)"""
+        if element.name in EXCLUDED_TAGS:
+            return True
+        if element.get('class') and any(c in excluded_classes for c in element.get('class')):
+            return True
+        style = element.get('style', '')
+        return 'display: none' in style or 'visibility: hidden' in style
+
+    def legacy():
+        soup = BeautifulSoup(html, 'html.parser')
+        meta = [element.get_text() for element in soup.select('title')]
+        meta += [element.get('content') for element in soup.select('meta[name="description"]')]
+        containers = soup.find_all(['article', 'main', 'div'], class_=lambda x: x and 'content' in x.lower()) or [soup]
+        paragraphs = []
+        for container in containers:
+            for element in container.find_all(True):
+                # 이미 제거된 조상의 하위 요소는 attrs 가 비어 있으므로 건너뜀
+                if element.decomposed:
+                    continue
+                if legacy_exclude(element, set(EXCLUDED_CLASSES)):
+                    element.decompose()
+            paragraphs += [p.get_text().strip() for p in container.find_all(['p', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6'])]
+        soup.find_all('script', type='application/ld+json')
+        return paragraphs
+
+    start = time.perf_counter()
+    for _ in range(repeat):
+        old = legacy()
+    legacy_ms = (time.perf_counter() - start) / repeat * 1000
+
+    start = time.perf_counter()
+    for _ in range(repeat):
+        new = extract_page_content(html)
+    single_ms = (time.perf_counter() - start) / repeat * 1000
+
+    print(f"HTML {len(html) // 1024}KB, 문단 후보 {len(new['paragraphs'])}개 (기존 방식과 동일: {old == new['paragraphs']})")
+    print(f"BeautifulSoup + find_all/decompose: {legacy_ms:.1f}ms, 한 번 순회(lxml target): {single_ms:.1f}ms")
+
+
+if __name__ == "__main__":
+    run_benchmark()
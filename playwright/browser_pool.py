@@ -0,0 +1,292 @@
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, Iterable, Optional
+
+from playwright.async_api import Browser, BrowserContext, Page, Route, async_playwright
+
+from browser_slots import BrowserSlot, BrowserSlots
+
+# 표/텍스트 추출에 필요 없는 리소스 (네트워크와 렌더링 시간만 잡아먹음)
+DEFAULT_BLOCKED_RESOURCE_TYPES = frozenset({"image", "font", "media"})
+
+
+class BrowserPool:
+    """
+    Playwright Chromium 풀
+
+    - 브라우저는 필요할 때 띄움 (모든 브라우저가 사용 중일 때만 size 까지 추가), 작업마다 새 BrowserContext 를 만들어 줌 (쿠키/스토리지 격리)
+    - 세마포어로 전체 동시 페이지 수 제한
+    - 브라우저 하나가 pages_per_browser 페이지를 처리하면 새 브라우저로 교체 (메모리 누수 방지),
+      이전 브라우저는 진행 중인 작업이 끝난 뒤 종료
+    - 브라우저 선택/교체 기록(BrowserSlots)은 await 없이 바로 바꾸고, 브라우저 띄우기/닫기는 lock 밖에서
+      (새 브라우저가 뜨는 동안에도 이미 떠 있는 브라우저로 작업 진행)
+    - 이미지/폰트/미디어 요청은 기본으로 차단
+    """
+
+    def __init__(
+        self,
+        size: int = 2,
+        max_concurrency: int = 8,
+        pages_per_browser: int = 200,
+        blocked_resource_types: Optional[Iterable[str]] = DEFAULT_BLOCKED_RESOURCE_TYPES,
+        launch_options: Optional[Dict[str, Any]] = None,
+        context_options: Optional[Dict[str, Any]] = None,
+    ):
+        """
+        Args:
+            size: 최대 브라우저 수 (동시 작업이 많을 때만 늘어남)
+            max_concurrency: 동시에 열 수 있는 컨텍스트(페이지) 수
+            pages_per_browser: 브라우저 교체 주기 (처리한 페이지 수)
+            blocked_resource_types: 차단할 resource type (None 이면 차단 안 함)
+            launch_options: chromium.launch 인자
+            context_options: browser.new_context 인자 (user_agent, locale 등)
+        """
+        self.size = size
+        self.max_concurrency = max_concurrency
+        self.pages_per_browser = pages_per_browser
+        self.blocked_resource_types = frozenset(blocked_resource_types or ())
+        self.launch_options = launch_options or {}
+        self.context_options = context_options or {}
+        self._playwright = None
+        self._slots = BrowserSlots(size, pages_per_browser)
+        self._lock = asyncio.Lock()
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._closed = False
+        self.stats = {"launches": 0, "recycled": 0, "contexts": 0, "blocked_requests": 0}
+
+    async def start(self):
+        """브라우저 한 개를 미리 띄움 (호출하지 않으면 첫 작업에서 띄움)"""
+        async with self._lock:
+            await self._ensure_started()
+            slot = self._slots.add() if not self._slots.slots else None
+        if slot is not None:
+            await self._wait_launched(slot)
+
+    async def _ensure_started(self):
+        if self._closed:
+            raise RuntimeError("BrowserPool 이 이미 닫혔습니다")
+        if self._playwright is None:
+            self._playwright = await async_playwright().start()
+
+    async def _launch(self) -> Browser:
+        browser = await self._playwright.chromium.launch(**self.launch_options)
+        self.stats["launches"] += 1
+        return browser
+
+    async def _launch_into(self, slot: BrowserSlot):
+        try:
+            slot.browser = await self._launch()
+        except BaseException:
+            self._slots.discard(slot)
+            raise
+        if slot.retired and slot.active == 0:
+            await self._close_browser(slot)  # 띄우는 동안 교체 대상이 됐고 기다리는 작업도 없음
+
+    @staticmethod
+    def _launch_done(task: asyncio.Future):
+        if not task.cancelled():
+            task.exception()  # 기다리는 작업이 모두 취소됐을 때 경고 방지
+
+    async def _wait_launched(self, slot: BrowserSlot):
+        """자리의 브라우저가 뜰 때까지 대기 (처음 기다리는 작업이 띄우기 시작, 취소돼도 띄우기는 계속)"""
+        if slot.launching is None:
+            slot.launching = asyncio.ensure_future(self._launch_into(slot))
+            slot.launching.add_done_callback(self._launch_done)
+        await asyncio.shield(slot.launching)
+
+    async def _acquire_slot(self) -> BrowserSlot:
+        async with self._lock:
+            await self._ensure_started()
+        # 자리 선택/교체 기록은 await 없이 바로 하고, 브라우저 닫기/띄우기는 lock 밖에서 (다른 작업이 기다리지 않게)
+        slot, retired = self._slots.acquire()
+        self.stats["recycled"] += len(retired)
+        for old in retired:
+            if old.active == 0 and old.browser is not None:
+                await self._close_browser(old)
+        if slot.browser is None:
+            try:
+                await self._wait_launched(slot)
+            except BaseException:
+                self._slots.release(slot)
+                raise
+        return slot
+
+    async def _release_slot(self, slot: BrowserSlot):
+        if self._slots.release(slot) and slot.browser is not None:
+            await self._close_browser(slot)
+
+    @staticmethod
+    async def _close_browser(slot: BrowserSlot):
+        try:
+            await slot.browser.close()
+        except Exception:
+            pass  # 이미 종료된 브라우저
+
+    async def _block_resources(self, route: Route):
+        if route.request.resource_type in self.blocked_resource_types:
+            self.stats["blocked_requests"] += 1
+            await route.abort()
+        else:
+            await route.continue_()
+
+    @asynccontextmanager
+    async def context(self, **context_options) -> AsyncIterator[BrowserContext]:
+        """
+        작업 하나에 쓸 격리된 BrowserContext (블록을 벗어나면 닫힘)
+
+        Args:
+            context_options: 이 작업에만 적용할 new_context 인자
+        """
+        async with self._semaphore:
+            slot = await self._acquire_slot()
+            try:
+                context = await slot.browser.new_context(**{**self.context_options, **context_options})
+                self.stats["contexts"] += 1
+                try:
+                    if self.blocked_resource_types:
+                        await context.route("**/*", self._block_resources)
+                    yield context
+                finally:
+                    await context.close()
+            finally:
+                await self._release_slot(slot)
+
+    @asynccontextmanager
+    async def page(self, **context_options) -> AsyncIterator[Page]:
+        """격리된 컨텍스트의 새 페이지"""
+        async with self.context(**context_options) as context:
+            yield await context.new_page()
+
+    async def fetch_html(self, url: str, wait_until: str = "networkidle", timeout: float = 30000) -> str:
+        """
+        URL 을 렌더링한 뒤 HTML 반환
+
+        Args:
+            url: 페이지 URL
+            wait_until: goto 완료 기준 (load, domcontentloaded, networkidle)
+            timeout: 제한 시간(ms)
+
+        Returns:
+            str: 렌더링된 HTML
+        """
+        async with self.page() as page:
+            await page.goto(url, wait_until=wait_until, timeout=timeout)
+            return await page.content()
+
+    async def aclose(self):
+        self._closed = True
+        async with self._lock:
+            launching = [slot.launching for slot in self._slots.slots if slot.launching is not None]
+            for task in launching:
+                task.cancel()
+            await asyncio.gather(*launching, return_exceptions=True)
+            for slot in self._slots.slots:
+                if slot.browser is not None:
+                    await self._close_browser(slot)
+            self._slots.slots.clear()
+            if self._playwright is not None:
+                await self._playwright.stop()
+                self._playwright = None
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.aclose()
+
+
+_browser_pool: Optional[BrowserPool] = None
+_browser_pool_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+def get_browser_pool() -> BrowserPool:
+    """
+    프로세스 공유 브라우저 풀 (이벤트 루프 안에서 호출)
+
+    풀은 만든 루프에 묶이므로, 다른 루프에서 쓰려면 이전 루프에서 close_browser_pool() 로 먼저 닫아야 합니다.
+    (닫지 않은 풀을 버리면 Chromium 프로세스가 남음)
+    """
+    global _browser_pool, _browser_pool_loop
+    loop = asyncio.get_running_loop()
+    if _browser_pool is not None and not _browser_pool._closed and _browser_pool_loop is not loop:
+        raise RuntimeError("공유 BrowserPool 이 다른 이벤트 루프에서 열려 있습니다. 그 루프에서 close_browser_pool() 을 먼저 호출하세요.")
+    if _browser_pool is None or _browser_pool._closed:
+        _browser_pool = BrowserPool()
+        _browser_pool_loop = loop
+    return _browser_pool
+
+
+async def close_browser_pool():
+    """공유 브라우저 풀 종료 (스크립트 끝에서 호출)"""
+    global _browser_pool, _browser_pool_loop
+    if _browser_pool is not None:
+        await _browser_pool.aclose()
+        _browser_pool = None
+        _browser_pool_loop = None
+
+
+async def run_benchmark(page_count: int = 60, latency: float = 0.05, max_concurrency: int = 8):
+    """
+    로컬 정적 서버로 분당 처리 페이지 수 비교
+
+    - 각 페이지는 표 하나와 이미지 20개, 웹폰트 1개를 포함 (리소스마다 latency 지연)
+    - 기존 방식: 페이지마다 chromium.launch → goto(networkidle) → close
+    - 풀: warm 브라우저 + 컨텍스트 격리 + 동시 처리 + 이미지/폰트 차단
+    """
+    from aiohttp import web
+
+    async def page_handler(request: web.Request) -> web.Response:
+        await asyncio.sleep(latency)
+        images = "".join(f'<img src="/img/{request.match_info["id"]}_{i}.png">' for i in range(20))
+        body = (
+            "<html><head><meta charset='utf-8'>"
+            "<style>@font-face{font-family:f;src:url(/font.woff2)} body{font-family:f}</style></head>"
+            f"<body><table><caption>월별 판매</caption><tr><th>월</th><td>{request.match_info['id']}</td></tr></table>"
+            f"{images}</body></html>"
+        )
+        return web.Response(text=body, content_type="text/html")
+
+    async def asset_handler(request: web.Request) -> web.Response:
+        await asyncio.sleep(latency)
+        return web.Response(body=b"\x00" * 2048, content_type="application/octet-stream")
+
+    app = web.Application()
+    app.router.add_get("/page/{id}", page_handler)
+    app.router.add_get("/{tail:.*}", asset_handler)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    base = f"http://127.0.0.1:{site._server.sockets[0].getsockname()[1]}"
+    urls = [f"{base}/page/{i}" for i in range(page_count)]
+
+    try:
+        sample = urls[:5]  # 기존 방식은 느리므로 일부만 측정
+        start = time.perf_counter()
+        async with async_playwright() as p:
+            for url in sample:
+                browser = await p.chromium.launch()
+                page = await browser.new_page()
+                await page.goto(url)
+                await page.wait_for_load_state("networkidle")
+                await page.content()
+                await browser.close()
+        per_page = (time.perf_counter() - start) / len(sample)
+        print(f"기존 방식(페이지마다 launch): 페이지당 {per_page * 1000:.0f}ms → {60 / per_page:.0f} pages/min")
+
+        async with BrowserPool(max_concurrency=max_concurrency, pages_per_browser=page_count // 2) as pool:
+            start = time.perf_counter()
+            pages = await asyncio.gather(*(pool.fetch_html(url) for url in urls))
+            elapsed = time.perf_counter() - start
+            tables = sum(1 for html in pages if "<table>" in html)
+            print(f"브라우저 풀(동시 {max_concurrency}, 리소스 차단): {len(urls)}페이지 {elapsed:.2f}초 → "
+                  f"{len(urls) / elapsed * 60:.0f} pages/min, 표 {tables}개")
+            print(f"통계 {pool.stats}")
+    finally:
+        await runner.cleanup()
+
+
+if __name__ == "__main__":
+    asyncio.run(run_benchmark())
@@ -0,0 +1,81 @@
+from typing import List, Tuple
+
+
+class BrowserSlot:
+    """풀이 관리하는 Chromium 한 개 (처리한 페이지 수, 사용 중인 컨텍스트 수)"""
+
+    def __init__(self):
+        self.browser = None  # 띄우는 중이면 None
+        self.launching = None  # 브라우저를 띄우는 task (BrowserPool 이 설정)
+        self.pages_served = 0
+        self.active = 0
+        self.retired = False
+
+
+class BrowserSlots:
+    """
+    BrowserPool 의 브라우저 선택/교체 기록
+
+    - 모든 브라우저가 사용 중일 때만 size 까지 자리를 추가 (띄우는 중인 자리도 size 에 포함)
+    - pages_per_browser 페이지를 처리했거나 연결이 끊긴 브라우저는 목록에서 빼고, 사용이 끝나면 닫도록 표시
+    - await 없이 바뀌므로 같은 이벤트 루프 안에서는 lock 없이도 원자적 (브라우저 띄우기/닫기는 호출한 쪽이 처리)
+    - playwright 에 의존하지 않아 가짜 브라우저로 테스트 가능
+    """
+
+    def __init__(self, size: int, pages_per_browser: int):
+        """
+        Args:
+            size: 최대 브라우저 수
+            pages_per_browser: 브라우저 교체 주기 (처리한 페이지 수)
+        """
+        self.size = size
+        self.pages_per_browser = pages_per_browser
+        self.slots: List[BrowserSlot] = []
+
+    def _is_stale(self, slot: BrowserSlot) -> bool:
+        if slot.pages_served >= self.pages_per_browser:
+            return True
+        return slot.browser is not None and not slot.browser.is_connected()
+
+    def add(self) -> BrowserSlot:
+        """새로 띄울 브라우저 자리 (브라우저는 호출한 쪽이 띄워서 slot.browser 에 넣음)"""
+        slot = BrowserSlot()
+        self.slots.append(slot)
+        return slot
+
+    def acquire(self) -> Tuple[BrowserSlot, List[BrowserSlot]]:
+        """
+        작업 하나에 쓸 자리
+
+        Returns:
+            (자리, 이번에 교체 대상이 된 자리 목록) - 자리의 browser 가 None 이면 띄우는 중이거나 새로 띄워야 함,
+            교체 대상 중 active 가 0 인 자리는 바로 닫아도 됨
+        """
+        retired = [slot for slot in self.slots if self._is_stale(slot)]
+        for slot in retired:
+            slot.retired = True
+            self.slots.remove(slot)
+        slot = min(self.slots, key=lambda s: s.active, default=None)
+        if slot is None or (slot.active and len(self.slots) < self.size):
+            slot = self.add()
+        slot.active += 1
+        slot.pages_served += 1
+        return slot, retired
+
+    def release(self, slot: BrowserSlot) -> bool:
+        """
+        작업이 끝난 자리 반납
+
+        Returns:
+            bool: 교체 대상이고 더 쓰는 작업이 없어 이제 닫아야 하면 True
+        """
+        slot.active -= 1
+        return slot.retired and slot.active == 0
+
+    def discard(self, slot: BrowserSlot):
+        """브라우저를 띄우지 못한 자리 제거"""
+        if slot in self.slots:
+            self.slots.remove(slot)
+
+    def __len__(self) -> int:
+        return len(self.slots)
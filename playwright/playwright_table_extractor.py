@@ -1,18 +1,23 @@
 import asyncio
 import pandas as pd
-from playwright.async_api import async_playwright
 from bs4 import BeautifulSoup
 import json
 import csv
 
-async def extract_table_data():
-    """웹페이지에서 표 형태의 데이터를 추출하고 다양한 형태로 저장"""
-    async with async_playwright() as p:
-        browser = await p.chromium.launch()
-        page = await browser.new_page()
-        
+from browser_pool import BrowserPool, close_browser_pool, get_browser_pool
+
+async def extract_table_data(url: str = "https://tago.kr/service/ioniq6_monthly.htm", pool: BrowserPool = None):
+    """
+    웹페이지에서 표 형태의 데이터를 추출하고 다양한 형태로 저장
+
+    Args:
+        url: 표가 있는 페이지 URL
+        pool: 브라우저 풀 (없으면 프로세스 공유 풀, 브라우저를 매번 띄우지 않음)
+    """
+    pool = pool or get_browser_pool()
+    async with pool.page() as page:
         # 웹페이지 로드
-        await page.goto("https://tago.kr/service/ioniq6_monthly.htm")
+        await page.goto(url)
         
         # 페이지가 완전히 로드될 때까지 대기
         await page.wait_for_load_state('networkidle')
@@ -135,10 +140,15 @@ async def extract_table_data():
             f.write("</body></html>")
         print("✓ 원본 HTML 테이블 구조 저장: original_tables.html")
         
-        await browser.close()
-        
         return all_table_data
 
+async def main():
+    try:
+        await extract_table_data()
+    finally:
+        await close_browser_pool()
+
+
 # 실행
 if __name__ == "__main__":
-    asyncio.run(extract_table_data()) 
\ No newline at end of file
+    asyncio.run(main())
@@ -1,13 +1,12 @@
 import asyncio
-from playwright.async_api import async_playwright
+
+from browser_pool import BrowserPool
 
 async def main():
-    async with async_playwright() as p:
-        browser = await p.chromium.launch()
-        page = await browser.new_page()
-        await page.goto("https://tago.kr/service/ioniq6_monthly.htm")
-        print(f"title: {await page.title()}")
-        print(f"content: {await page.content()}")
-        await browser.close()
+    async with BrowserPool(size=1) as pool:
+        async with pool.page() as page:
+            await page.goto("https://tago.kr/service/ioniq6_monthly.htm")
+            print(f"title: {await page.title()}")
+            print(f"content: {await page.content()}")
 
-asyncio.run(main())
\ No newline at end of file
+asyncio.run(main())
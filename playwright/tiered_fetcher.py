@@ -0,0 +1,347 @@
+import asyncio
+import os
+import re
+import sys
+import threading
+import time
+import weakref
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlparse
+
+import aiohttp
+from bs4 import BeautifulSoup
+
+# 이 폴더의 스크립트는 python playwright/xxx.py 로 직접 실행하므로 저장소 루트 모듈(crawler, html_decoder)을 찾을 수 있게 함
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from crawler import DEFAULT_HEADERS  # noqa: E402
+from html_decoder import read_html  # noqa: E402
+
+TIER_HTTP = "http"
+TIER_BROWSER = "browser"
+
+# 클라이언트 렌더링 페이지 흔적 (SPA 루트, 프레임워크 속성, JS 필요 안내)
+_JS_APP_PATTERN = re.compile(
+    r'<div[^>]+id=["\'](?:root|app|__next|__nuxt)["\'][^>]*>\s*</div>|data-reactroot|ng-app|v-cloak|__NEXT_DATA__',
+    re.IGNORECASE,
+)
+_NOSCRIPT_HINT_PATTERN = re.compile(r'<noscript[^>]*>[^<]*(?:javascript|자바스크립트)', re.IGNORECASE)
+# 스크립트가 채우기 전 자리표시 셀 (템플릿 변수, 로딩 문구)
+_PLACEHOLDER_PATTERN = re.compile(r'\{\{.*?\}\}|\$\{.*?\}|^(?:loading\.*|로딩\s*중\.*|불러오는\s*중\.*|-)$', re.IGNORECASE)
+
+
+def domain_of(url: str) -> str:
+    """티어 캐시 키 (호스트 단위)"""
+    return urlparse(url).netloc.lower()
+
+
+def _is_populated(row) -> bool:
+    """실제 값이 들어 있는 행인지 (자리표시 셀만 있는 행은 제외)"""
+    texts = [cell.get_text(strip=True) for cell in row.find_all(['td', 'th'])]
+    return any(text and not _PLACEHOLDER_PATTERN.search(text) for text in texts)
+
+
+def _split_header_rows(table) -> Tuple[List, List]:
+    """(헤더 행, 본문 행) - <thead> 의 행 또는 모든 셀이 th 인 첫 행을 헤더로 봄"""
+    rows = table.find_all('tr')
+    thead = table.find('thead')
+    if thead is not None:
+        header_rows = thead.find_all('tr')
+        header_ids = {id(row) for row in header_rows}
+        return header_rows, [row for row in rows if id(row) not in header_ids]
+    if rows:
+        cells = rows[0].find_all(['td', 'th'])
+        if cells and all(cell.name == 'th' for cell in cells):
+            return rows[:1], rows[1:]
+    return [], rows
+
+
+def needs_browser(html: str, min_rows: int = 2) -> Tuple[bool, str]:
+    """
+    정적 HTML 만으로 표를 추출할 수 있는지 판단
+
+    - 헤더는 있는데 본문 행이 비었거나 자리표시({{ }}, 로딩 중)만 있는 표가 하나라도 있으면 스크립트가 채우는 표로 봄
+      (값이 채워진 레이아웃/메뉴 표가 옆에 있어도 렌더링 필요)
+    - 그 외에 값이 채워진 표가 있으면 정적 HTML 사용, 표가 모두 비었으면 렌더링 필요
+    - 표가 없을 때는 SPA 루트/JS 필요 안내/스크립트만 있고 본문이 거의 없는 경우에만 렌더링 필요로 봄
+
+    Args:
+        html: HTTP 로 받은 HTML
+        min_rows: 표 하나가 정적으로 채워졌다고 볼 최소 행 수 (헤더 행 포함)
+
+    Returns:
+        tuple[bool, str]: (브라우저 필요 여부, 판단 이유)
+    """
+    soup = BeautifulSoup(html, 'lxml')
+    tables = soup.find_all('table')
+    if tables:
+        populated = False
+        for table in tables:
+            header_rows, body_rows = _split_header_rows(table)
+            body_count = sum(1 for row in body_rows if _is_populated(row))
+            if header_rows and body_count == 0:
+                return True, "empty_tables"
+            populated = populated or body_count + len(header_rows) >= min_rows
+        if populated:
+            return False, "static_tables"
+        return True, "empty_tables"
+
+    if _JS_APP_PATTERN.search(html) or _NOSCRIPT_HINT_PATTERN.search(html):
+        return True, "js_app"
+    scripts = soup.find_all('script')
+    for tag in soup(['script', 'style', 'noscript', 'template']):
+        tag.decompose()
+    body = soup.body or soup
+    if len(scripts) >= 3 and len(body.get_text(strip=True)) < 200:
+        return True, "script_only"
+    return False, "no_tables"
+
+
+class DomainTierCache:
+    """
+    도메인 → 티어(http/browser) LRU + TTL 캐시
+
+    한 번 브라우저가 필요했던 도메인은 ttl 동안 HTTP 시도 없이 바로 브라우저로 가져옴
+    """
+
+    def __init__(self, max_size: int = 10000, ttl: float = 86400):
+        """
+        Args:
+            max_size: 최대 저장 도메인 수
+            ttl: 티어 유지 시간(초), 지나면 HTTP 부터 다시 시도
+        """
+        self.max_size = max_size
+        self.ttl = ttl
+        self._items: "OrderedDict[str, Tuple[str, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, domain: str) -> Optional[str]:
+        with self._lock:
+            item = self._items.get(domain)
+            if item is None:
+                return None
+            tier, expires_at = item
+            if expires_at < time.monotonic():
+                del self._items[domain]
+                return None
+            self._items.move_to_end(domain)
+            return tier
+
+    def set(self, domain: str, tier: str):
+        with self._lock:
+            self._items[domain] = (tier, time.monotonic() + self.ttl)
+            self._items.move_to_end(domain)
+            while len(self._items) > self.max_size:
+                self._items.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+
+class TieredFetcher:
+    """
+    HTTP 우선, 필요할 때만 브라우저로 렌더링하는 페이지 수집기
+
+    - 1단계: 공유 aiohttp 세션으로 HTML 을 받아 needs_browser 로 표를 확인
+    - 2단계: 표가 비었거나 JS 렌더링 페이지면 BrowserPool 로 렌더링 (networkidle)
+    - 도메인별로 선택된 티어를 캐시해서 다음 요청부터는 바로 해당 티어로 감
+      (HTTP 요청 자체가 실패한 경우(타임아웃, 5xx)는 일시적일 수 있으므로 티어를 캐시하지 않음)
+    - 본문은 html_decoder.read_html 로 디코딩 (BOM/헤더/<meta charset>, euc-kr 은 cp949)
+    - Playwright 는 브라우저가 필요할 때만 import (정적 페이지만 다루면 설치 없이 동작)
+    """
+
+    def __init__(
+        self,
+        pool=None,
+        tier_cache: Optional[DomainTierCache] = None,
+        timeout: float = 10.0,
+        max_concurrency: int = 32,
+        headers: Optional[Dict[str, str]] = None,
+        wait_until: str = "networkidle",
+    ):
+        """
+        Args:
+            pool: 브라우저 티어에 쓸 BrowserPool (없으면 프로세스 공유 풀)
+            tier_cache: 도메인별 티어 캐시
+            timeout: HTTP 요청 제한 시간(초)
+            max_concurrency: HTTP 커넥션 풀 크기
+            headers: HTTP 요청 헤더
+            wait_until: 브라우저 goto 완료 기준
+        """
+        self.pool = pool
+        self.tier_cache = tier_cache if tier_cache is not None else DomainTierCache()  # 빈 캐시는 len 0 이라 or 로 쓰면 버려짐
+        self.timeout = aiohttp.ClientTimeout(total=timeout)
+        self.max_concurrency = max_concurrency
+        self.headers = headers or DEFAULT_HEADERS
+        self.wait_until = wait_until
+        self._session: Optional[aiohttp.ClientSession] = None
+        self.stats = {"http": 0, "browser": 0, "escalated": 0, "tier_cache_hits": 0}
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=self.max_concurrency, ttl_dns_cache=300),
+                headers=self.headers,
+                timeout=self.timeout,
+            )
+        return self._session
+
+    def _get_pool(self):
+        if self.pool is None:
+            from browser_pool import get_browser_pool
+
+            self.pool = get_browser_pool()
+        return self.pool
+
+    async def fetch_static(self, url: str) -> Optional[str]:
+        """HTTP 로 HTML 가져오기 (실패하거나 HTML 이 아니면 None)"""
+        self.stats["http"] += 1
+        try:
+            async with self._get_session().get(url, allow_redirects=True) as response:
+                if response.status != 200 or 'html' not in response.headers.get('content-type', 'text/html'):
+                    return None
+                html, _ = await read_html(response)
+                return html
+        except (aiohttp.ClientError, asyncio.TimeoutError, ValueError):
+            return None
+
+    async def fetch_rendered(self, url: str) -> str:
+        """브라우저로 렌더링한 HTML"""
+        self.stats["browser"] += 1
+        return await self._get_pool().fetch_html(url, wait_until=self.wait_until)
+
+    async def fetch(self, url: str) -> Dict[str, str]:
+        """
+        표 추출용 HTML 가져오기
+
+        Args:
+            url: 페이지 URL
+
+        Returns:
+            dict: {"url", "html", "tier": "http"|"browser", "reason": 티어 선택 이유}
+        """
+        domain = domain_of(url)
+        tier = self.tier_cache.get(domain)
+        if tier == TIER_BROWSER:
+            self.stats["tier_cache_hits"] += 1
+            return {"url": url, "html": await self.fetch_rendered(url), "tier": TIER_BROWSER, "reason": "tier_cache"}
+        if tier == TIER_HTTP:
+            self.stats["tier_cache_hits"] += 1
+
+        html = await self.fetch_static(url)
+        if html is None:
+            reason = "http_failed"
+        else:
+            escalate, reason = needs_browser(html)
+            if not escalate:
+                self.tier_cache.set(domain, TIER_HTTP)
+                return {"url": url, "html": html, "tier": TIER_HTTP, "reason": reason}
+
+        self.stats["escalated"] += 1
+        rendered = await self.fetch_rendered(url)
+        if html is not None:
+            self.tier_cache.set(domain, TIER_BROWSER)
+        return {"url": url, "html": rendered, "tier": TIER_BROWSER, "reason": reason}
+
+    async def aclose(self):
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.aclose()
+
+
+# 도메인 티어 캐시는 프로세스에서 공유하고, 세션이 루프에 묶이는 수집기는 이벤트 루프마다 따로 만듦
+_tier_cache = DomainTierCache()
+_tiered_fetchers: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, TieredFetcher]" = weakref.WeakKeyDictionary()
+
+
+def get_tiered_fetcher() -> TieredFetcher:
+    """현재 이벤트 루프의 공유 수집기 (이벤트 루프 안에서 호출, 티어 캐시는 루프 간 공유)"""
+    loop = asyncio.get_running_loop()
+    fetcher = _tiered_fetchers.get(loop)
+    if fetcher is None:
+        fetcher = _tiered_fetchers[loop] = TieredFetcher(tier_cache=_tier_cache)
+    return fetcher
+
+
+async def close_tiered_fetcher():
+    """현재 이벤트 루프의 공유 수집기와 (사용했다면) 공유 브라우저 풀 종료"""
+    fetcher = _tiered_fetchers.pop(asyncio.get_running_loop(), None)
+    if fetcher is not None:
+        used_browser = fetcher.pool is not None
+        await fetcher.aclose()
+        if used_browser:
+            from browser_pool import close_browser_pool
+
+            await close_browser_pool()
+
+
+async def run_benchmark(page_count: int = 40, latency: float = 0.05, with_browser: bool = True):
+    """
+    로컬 서버로 티어 선택과 처리 시간 확인
+
+    - /static/*: 서버 렌더링 표 (HTTP 티어로 끝나야 함)
+    - /spa/*: 빈 <tbody> 를 스크립트가 채우는 표 (브라우저 티어로 올라가야 함)
+    - 기존 방식(항상 브라우저 + networkidle)과 정적 페이지 처리 시간 비교 (with_browser=True, Chromium 필요)
+    """
+    from aiohttp import web
+
+    rows = "".join(f"<tr><th>{month}월</th><td>{month * 123}</td></tr>" for month in range(1, 13))
+    static_page = f"<html><body><table><caption>월별 판매</caption><tbody>{rows}</tbody></table></body></html>"
+    spa_page = (
+        "<html><body><table><caption>월별 판매</caption><tbody id='rows'></tbody></table>"
+        "<script>document.getElementById('rows').innerHTML = "
+        f"{rows!r};</script></body></html>"
+    )
+
+    async def handler(request: web.Request) -> web.Response:
+        await asyncio.sleep(latency)
+        body = static_page if request.path.startswith("/static/") else spa_page
+        return web.Response(text=body, content_type="text/html")
+
+    app = web.Application()
+    app.router.add_get("/{tail:.*}", handler)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    static_sites, spa_sites = [], []
+    for sites in (static_sites, spa_sites):
+        site = web.TCPSite(runner, "127.0.0.1", 0)
+        await site.start()
+        sites.append(f"http://127.0.0.1:{site._server.sockets[0].getsockname()[1]}")
+    static_urls = [f"{static_sites[0]}/static/{i}" for i in range(page_count)]
+    spa_urls = [f"{spa_sites[0]}/spa/{i}" for i in range(page_count // 4)]
+
+    print(f"판단 - 정적 표: {needs_browser(static_page)}, 스크립트 표: {needs_browser(spa_page)}")
+    try:
+        async with TieredFetcher() as fetcher:
+            start = time.perf_counter()
+            results = await asyncio.gather(*(fetcher.fetch(url) for url in static_urls))
+            elapsed = time.perf_counter() - start
+            tiers = {result["tier"] for result in results}
+            print(f"정적 페이지 {len(static_urls)}개: {elapsed * 1000:.0f}ms ({len(static_urls) / elapsed * 60:.0f} pages/min), 티어 {tiers}")
+
+            if with_browser:
+                start = time.perf_counter()
+                await asyncio.gather(*(fetcher.fetch_rendered(url) for url in static_urls))
+                browser_elapsed = time.perf_counter() - start
+                print(f"기존 방식(항상 브라우저): {browser_elapsed * 1000:.0f}ms ({browser_elapsed / elapsed:.0f}배)")
+
+                results = [await fetcher.fetch(url) for url in spa_urls]
+                print(f"스크립트 표 페이지 {len(spa_urls)}개: 티어 {[result['tier'] for result in results][:3]}..., "
+                      f"첫 요청 이유 {results[0]['reason']}, 이후 {results[1]['reason']}")
+            print(f"통계 {fetcher.stats}")
+    finally:
+        await runner.cleanup()
+        if with_browser:
+            from browser_pool import close_browser_pool
+
+            await close_browser_pool()
+
+
+if __name__ == "__main__":
+    asyncio.run(run_benchmark())
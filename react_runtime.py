@@ -0,0 +1,327 @@
+import asyncio
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+# 같은 인자면 같은 결과를 돌려주는 (부작용 없는) 도구 - executor 를 거쳐 실행될 때 결과를 TTL 동안 재사용
+# (하위 에이전트 안에서 쓰는 도구는 ParallelToolExecutor.wrap 으로 감싸야 executor 를 거침)
+DEFAULT_IDEMPOTENT_TOOLS = ("tavily_search_results_json", "add", "multiply", "divide")
+
+
+class ToolResultCache:
+    """(도구 이름, 인자) → 결과 LRU + TTL 캐시"""
+
+    def __init__(self, max_size: int = 1000, ttl: float = 600):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._items: "OrderedDict[Tuple[str, str], Tuple[Any, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(name: str, args: Dict[str, Any]) -> Tuple[str, str]:
+        return name, json.dumps(args, sort_keys=True, ensure_ascii=False, default=str)
+
+    def get(self, key: Tuple[str, str]) -> Tuple[bool, Any]:
+        with self._lock:
+            item = self._items.get(key)
+            if item is None:
+                return False, None
+            value, expires_at = item
+            if expires_at < time.monotonic():
+                del self._items[key]
+                return False, None
+            self._items.move_to_end(key)
+            return True, value
+
+    def set(self, key: Tuple[str, str], value: Any):
+        with self._lock:
+            self._items[key] = (value, time.monotonic() + self.ttl)
+            self._items.move_to_end(key)
+            while len(self._items) > self.max_size:
+                self._items.popitem(last=False)
+
+
+class ParallelToolExecutor:
+    """
+    한 번의 모델 응답에 담긴 tool call 들을 동시에 실행
+
+    - 서로 독립인 호출이므로 asyncio.gather 로 함께 실행 (소요 시간 ≈ 가장 느린 호출)
+    - idempotent 도구는 ToolResultCache 로 결과 재사용, 동시에 들어온 같은 호출은 한 번만 실행
+    - 호출별 소요 시간/캐시 여부를 trace 로 남김
+    - wrap() 으로 감싼 도구는 하위 에이전트(create_react_agent 의 ToolNode) 안에서 호출돼도 같은 캐시를 씀
+    """
+
+    def __init__(
+        self,
+        tools: Sequence[Any],
+        idempotent_tools: Iterable[str] = DEFAULT_IDEMPOTENT_TOOLS,
+        cache: Optional[ToolResultCache] = None,
+        max_concurrency: int = 8,
+        timeout: Optional[float] = 60.0,
+    ):
+        """
+        Args:
+            tools: name 과 ainvoke(args) 를 가진 도구 목록 (langchain BaseTool)
+            idempotent_tools: 결과를 캐시할 도구 이름
+            cache: 도구 결과 캐시
+            max_concurrency: 동시에 실행할 최대 호출 수
+            timeout: 호출당 제한 시간(초)
+        """
+        self.tools = {tool.name: tool for tool in tools}
+        self.idempotent_tools = set(idempotent_tools)
+        self.cache = cache or ToolResultCache()
+        self.timeout = timeout
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._in_flight: Dict[Tuple[str, str], asyncio.Future] = {}
+        self.stats = {"calls": 0, "cache_hits": 0, "shared": 0}
+
+    async def _invoke(self, name: str, args: Dict[str, Any], limit: bool = True) -> Any:
+        tool = self.tools.get(name)
+        if tool is None:
+            raise ValueError(f"알 수 없는 도구입니다: {name}")
+        if not limit:
+            return await asyncio.wait_for(tool.ainvoke(args), self.timeout)
+        async with self._semaphore:
+            return await asyncio.wait_for(tool.ainvoke(args), self.timeout)
+
+    async def call(self, name: str, args: Dict[str, Any], trace: Optional[Dict[str, Any]] = None, limit: bool = True) -> Any:
+        """
+        도구 하나 실행 (idempotent 도구는 캐시 확인, 동시에 들어온 같은 호출은 결과 공유)
+
+        Args:
+            name: 도구 이름
+            args: 도구 인자
+            trace: 캐시/공유 여부를 기록할 dict
+            limit: max_concurrency 제한 적용 여부 (하위 에이전트 도구는 바깥 호출이 이미 자리를 잡고 있으므로 False)
+        """
+        trace = trace if trace is not None else {}
+        self.stats["calls"] += 1
+        if name not in self.idempotent_tools:
+            return await self._invoke(name, args, limit)
+        key = self.cache.make_key(name, args)
+        hit, content = self.cache.get(key)
+        if hit:
+            trace["cached"] = True
+            self.stats["cache_hits"] += 1
+            return content
+        task = self._in_flight.get(key)
+        if task is not None:
+            trace["shared"] = True
+            self.stats["shared"] += 1
+            return await asyncio.shield(task)
+        task = asyncio.ensure_future(self._invoke(name, args, limit))
+        self._in_flight[key] = task
+        try:
+            content = await asyncio.shield(task)
+        finally:
+            self._in_flight.pop(key, None)
+        self.cache.set(key, content)
+        return content
+
+    def wrap(self, tool: Any):
+        """
+        하위 에이전트에 넘길 도구를 이 executor 를 거쳐 실행되도록 감쌈 (이름/설명/인자 스키마는 그대로)
+
+        create_react_agent 의 ToolNode 가 직접 실행하는 도구는 supervisor 의 executor 를 거치지 않으므로,
+        tavily / 계산 도구 결과를 캐시하려면 하위 에이전트를 만들 때 이 함수로 감싼 도구를 넘깁니다.
+        """
+        from langchain_core.tools import StructuredTool, ToolException
+
+        self.tools[tool.name] = tool
+
+        async def run_tool(**kwargs) -> Any:
+            try:
+                return await self.call(tool.name, kwargs, limit=False)
+            except Exception as e:
+                raise ToolException(f"{type(e).__name__}: {e}") from e
+
+        return StructuredTool.from_function(
+            coroutine=run_tool,
+            name=tool.name,
+            description=tool.description,
+            args_schema=tool.args_schema,
+            handle_tool_error=True,
+        )
+
+    async def run(self, tool_calls: Sequence[Dict[str, Any]]) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+        """
+        tool call 목록 실행
+
+        Args:
+            tool_calls: [{"name", "args", "id"}, ...] (AIMessage.tool_calls 형식)
+
+        Returns:
+            tuple: (결과 목록 [{"id", "name", "content", "error"}], trace {"wall_ms", "sum_ms", "calls": [...]})
+        """
+        call_traces: List[Dict[str, Any]] = []
+
+        async def run_call(call: Dict[str, Any]) -> Dict[str, Any]:
+            name, args = call["name"], call.get("args") or {}
+            start = time.perf_counter()
+            trace = {"name": name, "args": args, "cached": False, "shared": False}
+            content, error = None, None
+            try:
+                content = await self.call(name, args, trace)
+            except Exception as e:
+                error = f"{type(e).__name__}: {e}"
+            trace["ms"] = (time.perf_counter() - start) * 1000
+            trace["error"] = error
+            call_traces.append(trace)
+            return {"id": call.get("id"), "name": name, "content": content, "error": error}
+
+        start = time.perf_counter()
+        results = await asyncio.gather(*(run_call(call) for call in tool_calls))
+        wall_ms = (time.perf_counter() - start) * 1000
+        return results, {
+            "wall_ms": wall_ms,
+            "sum_ms": sum(trace["ms"] for trace in call_traces),
+            "calls": call_traces,
+        }
+
+
+def _tool_message_content(result: Dict[str, Any]) -> str:
+    if result["error"]:
+        return f"Error: {result['error']}"
+    content = result["content"]
+    if hasattr(content, "content"):  # 하위 에이전트가 메시지를 돌려준 경우
+        content = content.content
+    return content if isinstance(content, str) else json.dumps(content, ensure_ascii=False, default=str)
+
+
+class SupervisorRuntime:
+    """
+    병렬 tool 실행 ReAct 루프
+
+    모델 호출 → (tool call 이 있으면) ParallelToolExecutor 로 동시 실행 → ToolMessage 추가 → 반복.
+    create_react_agent 와 같은 {"messages": [...]} 입출력이며, 단계별 시간은 결과의 "trace" 에 담깁니다.
+    """
+
+    def __init__(
+        self,
+        model: Any,
+        tools: Sequence[Any],
+        prompt: Optional[str] = None,
+        idempotent_tools: Iterable[str] = DEFAULT_IDEMPOTENT_TOOLS,
+        cache: Optional[ToolResultCache] = None,
+        max_steps: int = 10,
+        max_concurrency: int = 8,
+    ):
+        """
+        Args:
+            model: bind_tools 를 지원하는 chat model (예: ChatOpenAI)
+            tools: 도구 목록 (agent_as_tool 로 감싼 하위 에이전트 포함)
+            prompt: system 프롬프트
+            max_steps: 최대 모델 호출 수
+        """
+        # 병렬 tool call 을 명시적으로 허용 (OpenAI 계열 기본값이지만 모델에 따라 다름)
+        try:
+            self.model = model.bind_tools(tools, parallel_tool_calls=True)
+        except TypeError:
+            self.model = model.bind_tools(tools)
+        self.prompt = prompt
+        self.executor = ParallelToolExecutor(tools, idempotent_tools, cache, max_concurrency)
+        self.max_steps = max_steps
+
+    async def ainvoke(self, inputs: Dict[str, Any]) -> Dict[str, Any]:
+        from langchain_core.messages import SystemMessage, ToolMessage, convert_to_messages
+
+        messages = convert_to_messages(inputs["messages"])
+        prefix = [SystemMessage(content=self.prompt)] if self.prompt else []
+        trace: List[Dict[str, Any]] = []
+        run_start = time.perf_counter()
+
+        for step in range(1, self.max_steps + 1):
+            start = time.perf_counter()
+            response = await self.model.ainvoke(prefix + messages)
+            step_trace = {"step": step, "model_ms": (time.perf_counter() - start) * 1000}
+            messages.append(response)
+            tool_calls = getattr(response, "tool_calls", None) or []
+            if not tool_calls:
+                trace.append(step_trace)
+                break
+
+            results, tool_trace = await self.executor.run(tool_calls)
+            messages.extend(
+                ToolMessage(content=_tool_message_content(result), tool_call_id=result["id"], name=result["name"])
+                for result in results
+            )
+            step_trace["tools"] = tool_trace
+            trace.append(step_trace)
+
+        return {
+            "messages": messages,
+            "trace": trace,
+            "total_ms": (time.perf_counter() - run_start) * 1000,
+        }
+
+    def invoke(self, inputs: Dict[str, Any]) -> Dict[str, Any]:
+        """스크립트용 동기 실행 (Jupyter 처럼 이벤트 루프가 이미 돌고 있으면 await ainvoke(...) 사용)"""
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(self.ainvoke(inputs))
+        raise RuntimeError("이벤트 루프 안에서는 invoke 대신 await ainvoke(...) 를 사용하세요")
+
+
+def agent_as_tool(agent: Any, name: str, description: str):
+    """
+    create_react_agent 로 만든 하위 에이전트를 supervisor 가 호출할 수 있는 도구로 감쌈
+
+    supervisor 가 한 턴에 여러 에이전트에게 작업을 나눠주면 동시에 실행됩니다.
+    """
+    from langchain_core.tools import StructuredTool
+
+    async def run_agent(task: str) -> str:
+        result = await agent.ainvoke({"messages": [{"role": "user", "content": task}]})
+        return result["messages"][-1].content
+
+    return StructuredTool.from_function(coroutine=run_agent, name=name, description=description)
+
+
+def format_trace(result: Dict[str, Any]) -> str:
+    """단계별 시간 출력용 문자열"""
+    lines = []
+    for step in result["trace"]:
+        line = f"step {step['step']}: model {step['model_ms']:.0f}ms"
+        tools = step.get("tools")
+        if tools:
+            calls = ", ".join(
+                f"{call['name']} {call['ms']:.0f}ms" + (" (cache)" if call["cached"] else "") + (" (error)" if call["error"] else "")
+                for call in tools["calls"]
+            )
+            line += f" | tools wall {tools['wall_ms']:.0f}ms / sum {tools['sum_ms']:.0f}ms [{calls}]"
+        lines.append(line)
+    lines.append(f"total {result['total_ms']:.0f}ms")
+    return "\n".join(lines)
+
+
+async def run_parallel_check(call_count: int = 3, latency: float = 0.5):
+    """지연 도구로 순차 대비 병렬 실행 시간과 캐시 재사용 확인"""
+
+    class SleepTool:
+        def __init__(self, name: str):
+            self.name = name
+            self.calls = 0
+
+        async def ainvoke(self, args):
+            self.calls += 1
+            await asyncio.sleep(latency)
+            return f"{self.name}:{args['query']}"
+
+    search = SleepTool("tavily_search_results_json")
+    executor = ParallelToolExecutor([search])
+    tool_calls = [
+        {"name": search.name, "args": {"query": f"질문 {i}"}, "id": f"call_{i}"}
+        for i in range(call_count)
+    ]
+    _, first = await executor.run(tool_calls + [dict(tool_calls[0], id="call_dup")])
+    _, second = await executor.run(tool_calls)
+    print(f"도구 {call_count}개(+중복 1개), 호출당 {latency * 1000:.0f}ms")
+    print(f"1차: wall {first['wall_ms']:.0f}ms (순차 실행 시 {call_count * latency * 1000:.0f}ms), 실제 호출 {search.calls}회")
+    print(f"2차(캐시): wall {second['wall_ms']:.1f}ms, 캐시 적중 {sum(c['cached'] for c in second['calls'])}개")
+
+
+if __name__ == "__main__":
+    asyncio.run(run_parallel_check())
@@ -0,0 +1,158 @@
+import re
+from typing import Dict, List, Sequence
+
+
+class RelevanceScorer:
+    """
+    검색어 관련성 계산기 (점수 기준은 run_benchmark 의 legacy_score 와 동일)
+
+    - 검색어 목록은 생성 시 한 번만 준비 (정확한 구문, 검색어 alternation 정규식)
+    - 후보 텍스트는 소문자 변환/단어 분리를 한 번만 수행
+    - 단어별 포함 검색어 수를 캐시해서, 같은 페이지의 후보들이 같은 단어를 다시 검사하지 않음
+    - 검색어 alternation 정규식 한 번으로 검색어가 없는 후보는 바로 0점 처리
+    - 정확한 구문, 검색어 포함 비율, 근접성, 첫 등장 위치 가중치를 함께 계산
+    """
+
+    def __init__(self, search_terms: Sequence[str]):
+        """
+        Args:
+            search_terms: 소문자 검색어 리스트 (search_query.lower().split())
+        """
+        self.search_terms = list(search_terms)
+        self.exact_phrase = ' '.join(self.search_terms)
+        unique_terms = sorted(set(self.search_terms), key=len, reverse=True)
+        self._pattern = re.compile('|'.join(map(re.escape, unique_terms))) if unique_terms else None
+        # 단어 → 그 단어에 포함된 검색어 인덱스 (중복 검색어는 각각 셈)
+        self._word_terms: Dict[str, tuple] = {}
+
+    def _terms_in_word(self, word: str) -> tuple:
+        terms = self._word_terms.get(word)
+        if terms is None:
+            if self._pattern is not None and self._pattern.search(word):
+                terms = tuple(i for i, term in enumerate(self.search_terms) if term in word)
+            else:
+                terms = ()
+            self._word_terms[word] = terms
+        return terms
+
+    def score(self, text: str) -> float:
+        """
+        관련성 점수 (0.0 ~ 1.0)
+
+        검색어에는 공백이 없으므로 '검색어 in 텍스트' 는 '검색어가 어떤 단어에 포함됨' 과 같습니다.
+        """
+        text_lower = text.lower()
+        score = 0.0
+
+        # 1. 정확한 구문 매칭
+        if self.exact_phrase in text_lower:
+            score += 1.0
+
+        words = text_lower.split()
+        if self._pattern is None or not self._pattern.search(text_lower):
+            # 검색어가 하나도 없는 후보 (큰 페이지 후보 대부분): 기존 식의 모든 항이 0
+            hit_words = ()
+        else:
+            hit_words = [word for word in set(words) if self._terms_in_word(word)]
+
+        # 매칭 검색어, 첫/마지막 매칭 위치, 매칭 위치 수 (단어 목록 검색은 list.index/count 로 처리)
+        matched = set()
+        first_position = last_position = -1
+        position_count = 0
+        if hit_words:
+            for word in hit_words:
+                matched.update(self._terms_in_word(word))
+            first_position = min(words.index(word) for word in hit_words)
+            reversed_words = words[::-1]
+            last_position = len(words) - 1 - min(reversed_words.index(word) for word in hit_words)
+            if len(hit_words) == 1:
+                position_count = words.count(hit_words[0]) * len(self._terms_in_word(hit_words[0]))
+            else:
+                position_count = len(hit_words)  # 2 이상이면 충분 (근접성 보너스 조건은 1 초과)
+
+        # 2. 개별 검색어 매칭
+        score += (len(matched) / len(self.search_terms)) * 0.5
+
+        # 3. 검색어 근접성 보너스
+        if position_count > 1:
+            max_gap = last_position - first_position
+            proximity_score = 1.0 / (max_gap + 1)
+            score += proximity_score * 0.3
+
+        # 4. 텍스트 위치 가중치
+        if len(words) > 0:
+            first_match = first_position if position_count else len(words)
+            position_weight = 1.0 - (first_match / len(words))
+            score += position_weight * 0.2
+
+        return min(1.0, score)
+
+    def score_batch(self, texts: Sequence[str]) -> List[float]:
+        """후보 텍스트 목록 점수 (단어 캐시를 공유)"""
+        return [self.score(text) for text in texts]
+
+
+def run_benchmark(paragraph_count: int = 20000, repeat: int = 3):
+    """큰 페이지의 후보 문단으로 기존 함수와 점수/시간 비교"""
+    import random
+    import time
+
+    def legacy_score(text: str, search_terms: list[str]) -> float:
+        """기존 검색어 관련성 점수 (비교 기준)"""
+        text_lower = text.lower()
+        score = 0.0
+
+        # 1. 정확한 구문 매칭
+        exact_phrase = ' '.join(search_terms)
+        if exact_phrase in text_lower:
+            score += 1.0
+
+        # 2. 개별 검색어 매칭
+        matched_terms = sum(1 for term in search_terms if term in text_lower)
+        score += (matched_terms / len(search_terms)) * 0.5
+
+        # 3. 검색어 근접성 보너스
+        words = text_lower.split()
+        term_positions = []
+        for term in search_terms:
+            positions = [i for i, word in enumerate(words) if term in word]
+            if positions:
+                term_positions.extend(positions)
+
+        if term_positions:
+            term_positions.sort()
+            if len(term_positions) > 1:
+                max_gap = term_positions[-1] - term_positions[0]
+                proximity_score = 1.0 / (max_gap + 1)
+                score += proximity_score * 0.3
+
+        # 4. 텍스트 위치 가중치
+        if len(words) > 0:
+            first_match = min(term_positions) if term_positions else len(words)
+            position_weight = 1.0 - (first_match / len(words))
+            score += position_weight * 0.2
+
+        return min(1.0, score)
+
+    rng = random.Random(3)
+    vocabulary = ["나라원시스템", "연혁", "공공기관", "홈페이지", "구축", "운영", "시스템", "개발", "클라우드", "2023년"]
+    vocabulary += [f"단어{i}" for i in range(20000)]
+    texts = [" ".join(rng.choice(vocabulary) for _ in range(rng.randint(5, 60))) for _ in range(paragraph_count)]
+    search_terms = "나라원시스템 회사 연혁 알려줘 2023년".lower().split()
+
+    start = time.perf_counter()
+    for _ in range(repeat):
+        old = [legacy_score(text, search_terms) for text in texts]
+    old_ms = (time.perf_counter() - start) / repeat * 1000
+
+    start = time.perf_counter()
+    for _ in range(repeat):
+        new = RelevanceScorer(search_terms).score_batch(texts)
+    new_ms = (time.perf_counter() - start) / repeat * 1000
+
+    print(f"후보 {paragraph_count}개, 점수 동일: {old == new}")
+    print(f"기존 방식: {old_ms:.1f}ms, RelevanceScorer: {new_ms:.1f}ms ({old_ms / new_ms:.1f}배)")
+
+
+if __name__ == "__main__":
+    run_benchmark()
@@ -0,0 +1,308 @@
+import json
+import mmap
+import os
+import struct
+import threading
+from collections.abc import Sequence
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+# 검색 결과 스냅샷 파일 형식 (little-endian)
+#   header : magic(4s) version(u32) count(u32) meta_len(u32)
+#   meta   : JSON {"columns": {name: [offset, dtype]}, "strings": [...], "doc_types": [...], "blob_offset": n}
+#   columns: 열마다 연속 배열 (8바이트 정렬) - id, rank, faiss_score, distance, doc_type, 문자열 offset/length
+#   blob   : text/content/subject/extra UTF-8 바이트를 이어 붙인 영역
+MAGIC = b"RSNP"
+VERSION = 1
+HEADER = struct.Struct("<4sIII")
+
+# 숫자/문자열 열 (모든 행이 열의 타입과 정확히 맞을 때만 열로 저장, 아니면 원래 값 그대로 extra 에 저장)
+NUMERIC_COLUMNS = {"id": "<i8", "rank": "<i4", "faiss_score": "<f8", "distance": "<f8"}
+STRING_COLUMNS = ("text", "content", "subject")
+FIELD_ORDER = ("id", "doc_type", "text", "content", "faiss_score", "distance", "subject", "rank")
+
+
+def _align(offset: int, size: int = 8) -> int:
+    return (offset + size - 1) // size * size
+
+
+def _fits(value: Any, dtype: str) -> bool:
+    """값을 dtype 열에 넣었다가 읽어도 같은 타입/값이 나오는지 (bool 은 int 로 바뀌므로 제외)"""
+    if np.dtype(dtype).kind == "f":
+        return type(value) is float
+    if type(value) is not int:
+        return False
+    info = np.iinfo(dtype)
+    return info.min <= value <= info.max
+
+
+def write_snapshot(retrievers: List[Dict[str, Any]], path: str):
+    """
+    검색 결과 목록을 스냅샷 파일로 저장 (임시 파일에 쓴 뒤 교체하므로 읽는 쪽은 항상 완전한 파일을 봄)
+
+    Args:
+        retrievers: retrivers.json 형식의 검색 결과
+        path: 저장할 스냅샷 경로
+    """
+    count = len(retrievers)
+    numeric = [name for name, dtype in NUMERIC_COLUMNS.items() if count and all(_fits(r.get(name), dtype) for r in retrievers)]
+    strings = [name for name in STRING_COLUMNS if count and all(isinstance(r.get(name), str) for r in retrievers)]
+    doc_types = sorted({r.get("doc_type") for r in retrievers}) if all(isinstance(r.get("doc_type"), str) for r in retrievers) else []
+    if len(doc_types) > np.iinfo("<u2").max:
+        doc_types = []
+    doc_type_index = {name: i for i, name in enumerate(doc_types)}
+    handled = set(numeric) | set(strings) | ({"doc_type"} if doc_types else set())
+
+    arrays: Dict[str, np.ndarray] = {}
+    for name in numeric:
+        arrays[name] = np.array([r[name] for r in retrievers], dtype=NUMERIC_COLUMNS[name])
+    if doc_types:
+        arrays["doc_type"] = np.array([doc_type_index[r["doc_type"]] for r in retrievers], dtype="<u2")
+    if "id" in arrays:
+        arrays["id_order"] = np.argsort(arrays["id"], kind="stable").astype("<u4")
+
+    # 문자열 열: blob 안의 (offset, length)
+    blob = bytearray()
+    for name in (*strings, "extra"):
+        offsets = np.zeros(count, dtype="<u8")
+        lengths = np.zeros(count, dtype="<u4")
+        for i, retriever in enumerate(retrievers):
+            if name == "extra":
+                extra = {k: v for k, v in retriever.items() if k not in handled}
+                value = json.dumps(extra, ensure_ascii=False) if extra else ""
+            else:
+                value = retriever[name]
+            data = value.encode("utf-8")
+            offsets[i] = len(blob)
+            lengths[i] = len(data)
+            blob += data
+        arrays[f"{name}_offset"] = offsets
+        arrays[f"{name}_length"] = lengths
+
+    # meta 길이가 열 offset 에 영향을 주므로 길이가 고정될 때까지 반복 계산
+    meta_len = 0
+    while True:
+        offset = _align(HEADER.size + meta_len)
+        columns = {}
+        for name, array in arrays.items():
+            columns[name] = [offset, array.dtype.str]
+            offset = _align(offset + array.nbytes)
+        meta = json.dumps({
+            "columns": columns,
+            "strings": strings,
+            "doc_types": doc_types,
+            "blob_offset": offset,
+        }, ensure_ascii=False).encode("utf-8")
+        if len(meta) == meta_len:
+            break
+        meta_len = len(meta)
+
+    temp_path = f"{path}.tmp{os.getpid()}"
+    with open(temp_path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, VERSION, count, meta_len))
+        f.write(meta)
+        for name, array in arrays.items():
+            f.seek(columns[name][0])
+            f.write(array.tobytes())
+        f.seek(offset)
+        f.write(bytes(blob))
+    os.replace(temp_path, path)
+
+
+class RetrieverSnapshot(Sequence):
+    """
+    메모리 맵 검색 결과 스냅샷
+
+    - 숫자 열(id, rank, 점수)은 파일을 그대로 가리키는 numpy 배열 (복사 없음)
+    - text 등 문자열은 접근하는 행만 blob 에서 디코딩
+    - list[dict] 처럼 인덱스/반복 접근 가능, get(id) 로 id 기준 접근
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) if os.fstat(f.fileno()).st_size else b""
+        if len(self._mmap) < HEADER.size:
+            raise ValueError(f"스냅샷 파일이 손상되었습니다: {path}")
+        magic, version, self._count, meta_len = HEADER.unpack_from(self._mmap, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"지원하지 않는 스냅샷 형식입니다: {path}")
+        meta = json.loads(bytes(self._mmap[HEADER.size:HEADER.size + meta_len]))
+        self._strings = meta["strings"]
+        self._doc_types = meta["doc_types"]
+        self._blob_offset = meta["blob_offset"]
+        self.columns: Dict[str, np.ndarray] = {
+            name: np.frombuffer(self._mmap, dtype=dtype, count=self._count, offset=offset)
+            for name, (offset, dtype) in meta["columns"].items()
+        }
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._row(i) for i in range(*index.indices(self._count))]
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError(index)
+        return self._row(index)
+
+    def __repr__(self) -> str:
+        return repr(list(self))
+
+    def _string(self, name: str, index: int) -> str:
+        start = self._blob_offset + int(self.columns[f"{name}_offset"][index])
+        return self._mmap[start:start + int(self.columns[f"{name}_length"][index])].decode("utf-8")
+
+    def _row(self, index: int) -> Dict[str, Any]:
+        row: Dict[str, Any] = {}
+        for name in FIELD_ORDER:
+            if name == "doc_type":
+                if "doc_type" in self.columns:
+                    row[name] = self._doc_types[self.columns["doc_type"][index]]
+            elif name in self._strings:
+                row[name] = self._string(name, index)
+            elif name in self.columns:
+                row[name] = self.columns[name][index].item()
+        extra = self._string("extra", index)
+        if extra:
+            row.update(json.loads(extra))
+        return row
+
+    def position(self, retriever_id: int) -> Optional[int]:
+        """id 의 행 위치 (정렬된 id 순서에서 이진 탐색, id 가 열로 저장되지 않았으면 순차 탐색)"""
+        if "id_order" not in self.columns:
+            return next((i for i in range(self._count) if self._row(i).get("id") == retriever_id), None)
+        ids, order = self.columns["id"], self.columns["id_order"]
+        i = int(np.searchsorted(ids, retriever_id, sorter=order))
+        if i < self._count and ids[order[i]] == retriever_id:
+            return int(order[i])
+        return None
+
+    def get(self, retriever_id: int) -> Optional[Dict[str, Any]]:
+        position = self.position(retriever_id)
+        return None if position is None else self._row(position)
+
+    def text(self, retriever_id: int) -> Optional[str]:
+        """id 의 text 만 디코딩"""
+        position = self.position(retriever_id)
+        return None if position is None else self._string("text", position)
+
+    def close(self):
+        self.columns = {}
+        if isinstance(self._mmap, mmap.mmap):
+            try:
+                self._mmap.close()
+            except BufferError:
+                pass  # 호출한 쪽이 열 배열을 아직 잡고 있음 (배열이 해제되면 mmap 도 GC 가 닫음)
+
+
+def _read_json_retrievers(filepath: str) -> List[Dict[str, Any]]:
+    with open(filepath, "r", encoding="utf-8") as f:
+        content = f.read().strip()
+    if not content:
+        raise ValueError(f"{filepath} 파일이 비어 있습니다.")
+    try:
+        return json.loads(content)
+    except json.JSONDecodeError as e:
+        print(f"{filepath} 파일의 JSON 형식이 올바르지 않습니다.")
+        raise e
+
+
+def snapshot_path_for(json_path: str) -> str:
+    return os.path.splitext(json_path)[0] + ".snap"
+
+
+_cache: Dict[str, Tuple[Tuple[int, int], RetrieverSnapshot]] = {}
+_cache_lock = threading.Lock()
+
+
+def load_retrievers(filepath: str = "retrivers.json") -> RetrieverSnapshot:
+    """
+    검색 결과 로드 (프로세스 캐시)
+
+    JSON 경로를 주면 옆의 .snap 스냅샷을 사용하고, 스냅샷이 없거나 JSON 보다 오래됐으면 다시 만듭니다.
+    파일 mtime/크기가 바뀌지 않았으면 이미 열어 둔 스냅샷을 그대로 돌려주고, 바뀌었으면 이전 스냅샷을 닫습니다.
+    list 가 필요한 곳(json.dumps, 수정)에서는 list(...) 로 변환해서 사용하세요.
+    """
+    with _cache_lock:
+        if filepath.endswith(".json"):
+            source_stat = os.stat(filepath)
+            snapshot_path = snapshot_path_for(filepath)
+            try:
+                stale = os.stat(snapshot_path).st_mtime_ns < source_stat.st_mtime_ns
+            except FileNotFoundError:
+                stale = True
+            if stale:
+                write_snapshot(_read_json_retrievers(filepath), snapshot_path)
+        else:
+            snapshot_path = filepath
+
+        stat = os.stat(snapshot_path)
+        signature = (stat.st_mtime_ns, stat.st_size)
+        cached = _cache.get(snapshot_path)
+        if cached is not None:
+            if cached[0] == signature:
+                return cached[1]
+            cached[1].close()  # 파일이 바뀌었으면 이전 mmap/fd 를 닫음
+        snapshot = RetrieverSnapshot(snapshot_path)
+        _cache[snapshot_path] = (signature, snapshot)
+        return snapshot
+
+
+def run_benchmark(rows: int = 100000, repeat: int = 20):
+    """JSON 파싱 대비 스냅샷 로드/접근 시간 비교"""
+    import random
+    import tempfile
+    import time
+
+    with open("retrivers.json", "r", encoding="utf-8") as f:
+        base = json.load(f)
+    retrievers = []
+    for i in range(rows):
+        item = dict(base[i % len(base)])
+        item["id"] = i
+        item["rank"] = i + 1
+        retrievers.append(item)
+
+    with tempfile.TemporaryDirectory() as directory:
+        json_path = os.path.join(directory, "retrivers.json")
+        with open(json_path, "w", encoding="utf-8") as f:
+            json.dump(retrievers, f, ensure_ascii=False)
+
+        start = time.perf_counter()
+        for _ in range(repeat):
+            _read_json_retrievers(json_path)
+        json_ms = (time.perf_counter() - start) / repeat * 1000
+
+        start = time.perf_counter()
+        load_retrievers(json_path)
+        build_ms = (time.perf_counter() - start) * 1000
+
+        start = time.perf_counter()
+        for _ in range(repeat):
+            snapshot = load_retrievers(json_path)
+        cached_us = (time.perf_counter() - start) / repeat * 1_000_000
+
+        start = time.perf_counter()
+        for _ in range(repeat):
+            RetrieverSnapshot(snapshot_path_for(json_path)).close()
+        open_ms = (time.perf_counter() - start) / repeat * 1000
+
+        ids = random.sample(range(rows), 1000)
+        start = time.perf_counter()
+        for retriever_id in ids:
+            snapshot.get(retriever_id)
+        get_us = (time.perf_counter() - start) / len(ids) * 1_000_000
+        assert snapshot.get(ids[0]) == retrievers[ids[0]]
+
+    print(f"행 {rows}개")
+    print(f"JSON 전체 파싱: {json_ms:.1f}ms/회")
+    print(f"스냅샷 최초 생성: {build_ms:.1f}ms, 열기(mmap): {open_ms:.2f}ms/회, 캐시 적중: {cached_us:.1f}µs/회")
+    print(f"id 임의 접근: {get_us:.1f}µs/건")
+
+
+if __name__ == "__main__":
+    run_benchmark()
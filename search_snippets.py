@@ -0,0 +1,186 @@
+import json
+import re
+from typing import Union
+
+from bs4 import BeautifulSoup
+
+from near_duplicate import filter_near_duplicates
+from page_extractor import EXCLUDED_CLASSES, extract_page_content, extract_soup_content
+from relevance import RelevanceScorer
+from snippet_window import create_snippet
+
+# _is_meaningful_text 검사용 정규식 (호출마다 컴파일하지 않도록 모듈 로드 시 한 번만 컴파일)
+_ONLY_SYMBOLS_PATTERN = re.compile(r'^[\s\W]+$')
+_REPEATED_SYMBOLS_PATTERN = re.compile(r'[!@#$%^&*(),.?":{}|<>]{3,}')
+_REPEATED_CHAR_PATTERN = re.compile(r'(.)\1{4,}')
+
+def _is_meaningful_text(text: str, min_length: int = 10, max_length: int = 1000) -> bool:
+    """
+    의미 있는 텍스트인지 확인하는 함수
+    
+    Args:
+        text: 검사할 텍스트
+        min_length: 최소 텍스트 길이
+        max_length: 최대 텍스트 길이
+    
+    Returns:
+        bool: 의미 있는 텍스트인지 여부
+    """
+    # 공백 제거
+    cleaned_text = text.strip()
+    
+    # 길이 체크
+    if not (min_length <= len(cleaned_text) <= max_length):
+        return False
+    
+    # 특수문자나 HTML 태그만 있는 경우 제외
+    if _ONLY_SYMBOLS_PATTERN.match(cleaned_text):
+        return False
+    
+    # 중복된 특수문자가 많은 경우 제외
+    if _REPEATED_SYMBOLS_PATTERN.search(cleaned_text):
+        return False
+    
+    # 의미 없는 문자 반복 체크
+    if _REPEATED_CHAR_PATTERN.search(cleaned_text):
+        return False
+    
+    return True
+
+def _filter_redundant_text(texts: list[str]) -> list[str]:
+    """
+    중복되거나 비슷한 텍스트를 필터링하는 함수
+    
+    Args:
+        texts: 필터링할 텍스트 리스트
+    
+    Returns:
+        list[str]: 필터링된 텍스트 리스트
+    """
+    # MinHash LSH 로 후보만 골라 자카드 유사도 70% 초과 여부 확인 (모든 이전 텍스트와 비교하지 않음)
+    return filter_near_duplicates(texts, threshold=0.7)
+
+async def create_search_snippets(soup: Union[BeautifulSoup, str], search_query: str, max_snippets: int = 3, snippet_length: int = 150) -> list[dict]:
+    """
+    웹사이트에서 검색어와 관련된 텍스트 스니펫을 추출하는 함수
+    
+    Args:
+        soup: BeautifulSoup 객체(Tag 포함) 또는 HTML 문자열 (문자열이면 BeautifulSoup 변환 없이 바로 처리)
+        search_query: 검색어
+        max_snippets: 반환할 최대 스니펫 수
+        snippet_length: 각 스니펫의 최대 길이
+        
+    Returns:
+        list[dict]: [
+            {
+                "text": "스니펫 텍스트",
+                "source": "텍스트 출처 (예: title, description, heading 등)",
+                "relevance_score": 점수
+            },
+            ...
+        ]
+    """
+    try:
+        # 문서를 한 번만 훑어서 meta, 문단(제외 요소 하위 제거), JSON-LD 를 함께 수집
+        # (이미 파싱된 soup 은 문자열로 되돌려 다시 파싱하지 않고 트리를 그대로 순회)
+        if isinstance(soup, (str, bytes)):
+            page = extract_page_content(soup, EXCLUDED_CLASSES)
+        else:
+            page = extract_soup_content(soup, EXCLUDED_CLASSES)
+        candidates = prepare_snippet_candidates(page)
+        return rank_snippet_candidates(candidates, search_query, max_snippets, snippet_length)
+    
+    except Exception as e:
+        print(f"스니펫 생성 중 오류 발생: {str(e)}")
+        return []
+
+def prepare_snippet_candidates(page: dict) -> list[tuple[str, str]]:
+    """
+    extract_page_content 결과에서 검색어와 무관한 후보 정리 (의미 없는 텍스트 제외, 중복 제거, JSON-LD 파싱)
+    
+    같은 페이지를 여러 검색어로 조회할 때는 이 결과를 재사용하고 rank_snippet_candidates 만 다시 호출합니다.
+    
+    Args:
+        page: extract_page_content 결과
+    
+    Returns:
+        list[tuple[str, str]]: [(출처, 텍스트), ...] (meta → main_content → structured_data 순)
+    """
+    candidates = []
+    
+    # 1단계: 메타 데이터 (title, description, keywords, og:title, og:description 순)
+    for source, text in page["meta"]:
+        if text and _is_meaningful_text(text):
+            candidates.append((source, text))
+    
+    # 2단계: 주요 텍스트 컨텐츠 (콘텐츠 컨테이너가 없으면 문서 전체), 중복 제거
+    main_content = [text for text in page["paragraphs"] if _is_meaningful_text(text)]
+    main_content = _filter_redundant_text(main_content)
+    candidates.extend(("main_content", text) for text in main_content)
+    
+    # 3단계: JSON-LD 데이터
+    for script in page["json_ld"]:
+        try:
+            data = json.loads(script)
+            if isinstance(data, list):
+                data = data[0] if data else {}
+            
+            text_fields = [
+                data.get('description', ''),
+                data.get('articleBody', ''),
+                data.get('text', '')
+            ]
+        except (json.JSONDecodeError, AttributeError):
+            continue
+        
+        for text in text_fields:
+            if isinstance(text, str) and _is_meaningful_text(text):
+                candidates.append(("structured_data", text))
+    
+    return candidates
+
+def rank_snippet_candidates(candidates: list[tuple[str, str]], search_query: str, max_snippets: int = 3, snippet_length: int = 150) -> list[dict]:
+    """
+    후보 텍스트를 검색어 관련성으로 점수 매기고 상위 스니펫 생성
+    
+    Args:
+        candidates: prepare_snippet_candidates 결과
+        search_query: 검색어
+        max_snippets: 반환할 최대 스니펫 수
+        snippet_length: 각 스니펫의 최대 길이
+    
+    Returns:
+        list[dict]: [{"text", "source", "relevance_score"}, ...] (점수 내림차순)
+    """
+    search_terms = search_query.lower().split()
+    # 검색어 준비는 한 번만, 후보마다 같은 점수 (RelevanceScorer)
+    scorer = RelevanceScorer(search_terms)
+    scores = scorer.score_batch([text for _, text in candidates])
+    
+    snippets = []
+    for (source, text), score in zip(candidates, scores):
+        if score > 0:
+            snippets.append({
+                "text": _create_snippet(text, search_terms, snippet_length),
+                "source": source,
+                "relevance_score": score
+            })
+    
+    # 결과 정렬 및 필터링 (같은 점수는 후보 순서 유지)
+    snippets.sort(key=lambda x: x['relevance_score'], reverse=True)
+    return snippets[:max_snippets]
+
+def _create_snippet(text: str, search_terms: list[str], max_length: int) -> str:
+    """
+    검색어를 포함하는 문맥 있는 스니펫 생성
+    
+    Args:
+        text: 원본 텍스트
+        search_terms: 검색어 리스트
+        max_length: 최대 스니펫 길이
+        
+    Returns:
+        str: 생성된 스니펫
+    """
+    # 검색어별 구간 내 등장 횟수를 유지하는 슬라이딩 윈도우로 최적 구간 선택 (O(단어 수), 띄어쓰기 없는 CJK 텍스트 지원)
+    return create_snippet(text, search_terms, max_length)
@@ -0,0 +1,205 @@
+import re
+from typing import List, Sequence, Tuple
+
+# 띄어쓰기 없이 쓰는 문자 (한자, 히라가나, 가타카나)
+_UNSEGMENTED_SCRIPT = re.compile(r'[\u3040-\u30ff\u3400-\u4dbf\u4e00-\u9fff\uf900-\ufaff]')
+
+
+def _word_term_matches(words: Sequence[str], search_terms: Sequence[str]) -> List[Tuple[int, ...]]:
+    """단어별 포함 검색어 인덱스 (같은 소문자 단어는 한 번만 검사)"""
+    cache = {}
+    matches = []
+    for word in words:
+        word_lower = word.lower()
+        found = cache.get(word_lower)
+        if found is None:
+            found = cache[word_lower] = tuple(i for i, term in enumerate(search_terms) if term in word_lower)
+        matches.append(found)
+    return matches
+
+
+def best_word_window(words: Sequence[str], search_terms: Sequence[str], window_size: int) -> int:
+    """
+    검색어를 가장 많이 포함하는 window_size 단어 구간의 시작 위치
+
+    기존 _create_snippet 과 같은 기준입니다. 구간 점수는 구간 안 어느 단어에든 들어 있는 검색어 수이고,
+    점수가 같으면 앞쪽 구간을 고릅니다. 검색어별 구간 내 등장 횟수를 유지하며 한 칸씩 밀어서 O(단어 수)로 계산합니다.
+    """
+    if not words:
+        return 0
+    matches = _word_term_matches(words, search_terms)
+    counts = [0] * len(search_terms)
+    score = 0
+
+    def add(index: int):
+        nonlocal score
+        for term in matches[index]:
+            if counts[term] == 0:
+                score += 1
+            counts[term] += 1
+
+    def remove(index: int):
+        nonlocal score
+        for term in matches[index]:
+            counts[term] -= 1
+            if counts[term] == 0:
+                score -= 1
+
+    for index in range(min(window_size, len(words))):
+        add(index)
+    best_start, best_score = 0, score
+    for start in range(1, len(words)):
+        remove(start - 1)
+        if start + window_size - 1 < len(words):
+            add(start + window_size - 1)
+        if score > best_score:
+            best_start, best_score = start, score
+    return best_start
+
+
+def best_char_window(text_lower: str, search_terms: Sequence[str], window_size: int) -> int:
+    """
+    공백으로 단어를 나눌 수 없는 텍스트(중국어/일본어 등)용 글자 단위 구간 선택
+
+    검색어 등장 위치만 후보 시작점으로 보고, 구간 안에 완전히 들어온 검색어 종류가 가장 많은 시작 위치를 찾습니다.
+    시작점과 구간 끝이 함께 오른쪽으로만 움직이므로 등장 목록을 두 포인터로 한 번씩만 훑습니다.
+    """
+    occurrences = []  # (시작, 끝, 검색어 인덱스)
+    for term_index, term in enumerate(search_terms):
+        if not term:
+            continue
+        position = text_lower.find(term)
+        while position >= 0:
+            occurrences.append((position, position + len(term), term_index))
+            position = text_lower.find(term, position + 1)
+    if not occurrences:
+        return 0
+
+    by_start = sorted(range(len(occurrences)), key=lambda i: occurrences[i][0])
+    by_end = sorted(range(len(occurrences)), key=lambda i: occurrences[i][1])
+    in_window = [False] * len(occurrences)
+    left_behind = [False] * len(occurrences)
+    counts = [0] * len(search_terms)
+    score = 0
+    best_start, best_score = 0, 0
+    entering = leaving = 0
+    for start in sorted({occurrence[0] for occurrence in occurrences}):
+        # 시작점보다 앞에서 시작한 등장 제거
+        while leaving < len(by_start) and occurrences[by_start[leaving]][0] < start:
+            index = by_start[leaving]
+            left_behind[index] = True
+            if in_window[index]:
+                in_window[index] = False
+                term = occurrences[index][2]
+                counts[term] -= 1
+                if counts[term] == 0:
+                    score -= 1
+            leaving += 1
+        # 구간 끝 안으로 들어온 등장 추가
+        window_end = start + window_size
+        while entering < len(by_end) and occurrences[by_end[entering]][1] <= window_end:
+            index = by_end[entering]
+            if not left_behind[index]:
+                in_window[index] = True
+                term = occurrences[index][2]
+                if counts[term] == 0:
+                    score += 1
+                counts[term] += 1
+            entering += 1
+        if score > best_score:
+            best_start, best_score = start, score
+    return best_start
+
+
+def create_snippet(text: str, search_terms: Sequence[str], max_length: int) -> str:
+    """
+    검색어를 포함하는 문맥 있는 스니펫 생성 (_create_snippet 과 같은 결과, O(단어 수))
+
+    가장 긴 공백 단위 단어가 max_length 보다 길고 한자/가나를 포함하면(띄어쓰기 없는 중국어/일본어 문단)
+    글자 단위로 max_length 글자 구간을 골라 자릅니다. 그 외에는 기존과 같은 단어 단위 결과입니다.
+
+    Args:
+        text: 원본 텍스트
+        search_terms: 소문자 검색어 리스트
+        max_length: 최대 스니펫 길이
+
+    Returns:
+        str: 생성된 스니펫 (앞뒤가 잘리면 "..." 표시)
+    """
+    words = text.split()
+    text_lower = text.lower()
+    longest_word = max(words, key=len) if words else ''
+    if len(longest_word) > max_length and _UNSEGMENTED_SCRIPT.search(longest_word) and len(text_lower) == len(text):
+        start_pos = best_char_window(text_lower, search_terms, max_length)
+        end_pos = min(len(text), start_pos + max_length)
+        snippet = text[start_pos:end_pos].strip()
+        if start_pos > 0:
+            snippet = f"...{snippet}"
+        if end_pos < len(text):
+            snippet = f"{snippet}..."
+        return snippet
+
+    # 단어 단위: 검색어가 가장 많은 max_length // 10 단어 구간에서 시작해 max_length // 5 단어
+    start_pos = best_word_window(words, search_terms, max_length // 10)
+    end_pos = min(len(words), start_pos + max_length // 5)
+    snippet = ' '.join(words[start_pos:end_pos])
+
+    # 스니펫이 문장 중간에서 시작하거나 끝나는 경우 처리
+    if start_pos > 0:
+        snippet = f"...{snippet}"
+    if end_pos < len(words):
+        snippet = f"{snippet}..."
+
+    return snippet
+
+
+def create_snippet_quadratic(text: str, search_terms: Sequence[str], max_length: int) -> str:
+    """기존 _create_snippet 방식 (시작 위치마다 구간 문자열 생성) - 벤치마크/검증용"""
+    best_start = 0
+    best_score = -1
+    words = text.split()
+    for i in range(len(words)):
+        window = ' '.join(words[i:i + max_length // 10])
+        score = sum(term in window.lower() for term in search_terms)
+        if score > best_score:
+            best_score = score
+            best_start = i
+    start_pos = max(0, best_start)
+    end_pos = min(len(words), start_pos + max_length // 5)
+    snippet = ' '.join(words[start_pos:end_pos])
+    if start_pos > 0:
+        snippet = f"...{snippet}"
+    if end_pos < len(words):
+        snippet = f"{snippet}..."
+    return snippet
+
+
+def run_benchmark(word_count: int = 20000, repeat: int = 3):
+    """긴 articleBody 수준 텍스트로 기존 방식과 결과/시간 비교"""
+    import random
+    import time
+
+    rng = random.Random(5)
+    vocabulary = [f"단어{i}" for i in range(3000)] + ["나라원시스템", "연혁", "2023년"]
+    text = " ".join(rng.choice(vocabulary) for _ in range(word_count))
+    search_terms = ["나라원시스템", "연혁", "2023년"]
+
+    start = time.perf_counter()
+    for _ in range(repeat):
+        old = create_snippet_quadratic(text, search_terms, 200)
+    old_ms = (time.perf_counter() - start) / repeat * 1000
+
+    start = time.perf_counter()
+    for _ in range(repeat):
+        new = create_snippet(text, search_terms, 200)
+    new_ms = (time.perf_counter() - start) / repeat * 1000
+
+    print(f"단어 {word_count}개, 결과 동일: {old == new}")
+    print(f"기존 방식: {old_ms:.1f}ms, 슬라이딩 윈도우: {new_ms:.1f}ms ({old_ms / new_ms:.0f}배)")
+
+    cjk = "人工智能" * 50 + "中国人工智能现状与发展趋势" + "数据" * 300
+    print(f"CJK 텍스트 {len(cjk)}자 → {create_snippet(cjk, ['现状', '发展'], 40)}")
+
+
+if __name__ == "__main__":
+    run_benchmark()
@@ -0,0 +1,176 @@
+import re
+import unicodedata
+from typing import Any, Dict, List, Optional
+from urllib.parse import urlparse
+
+# 검색 결과 text 앞부분의 메타 정보 마커
+_MARKER_PATTERN = re.compile(r"^\[(Source|Chunk_number|Title|Chunk|출처)\s*:\s*(.*?)\]\s*$", re.MULTILINE)
+# 본문에서 제거할 메타 줄 (Title: ..., Content:, html, === Slide 1 ===)
+_META_LINE_PATTERN = re.compile(r"^(Title\s*:.*|Content\s*:\s*|html|=+\s*Slide\s*\d+\s*=+)$", re.IGNORECASE)
+# JSON 안전 문자 이외(한국어, 영어, 숫자, 공백, 마침표, 쉼표 제외) 모두 제거
+_UNSAFE_CHARS = re.compile(r"[^0-9A-Za-z가-힣\s.,]")
+_SPACES = re.compile(r"\s+")
+
+TITLE_MAX_LENGTH = 20
+SNIPPET_MAX_LENGTH = 200
+
+
+def sanitize_text(text: str) -> str:
+    """
+    title/snippet 용 JSON 안전 텍스트
+
+    콜론은 공백으로, 따옴표/괄호/백슬래시 등 특수문자는 제거하고 연속 공백을 정리합니다.
+    """
+    text = unicodedata.normalize("NFKC", text)  # ㈜ → (주) 등
+    text = _UNSAFE_CHARS.sub(" ", text.replace(":", " "))
+    return _SPACES.sub(" ", text).strip()
+
+
+def parse_retriever_text(text: str) -> Dict[str, Any]:
+    """
+    retriever text 의 [Source:], [Chunk_number:], [Title:] 마커 파싱
+
+    Returns:
+        dict: {"source", "chunk_number", "title", "body"} (body 는 마커/메타 줄을 뺀 본문 줄 목록)
+    """
+    markers = {name.lower(): value.strip() for name, value in _MARKER_PATTERN.findall(text)}
+    body_lines = []
+    for line in _MARKER_PATTERN.sub("", text).splitlines():
+        line = line.strip()
+        if line and not _META_LINE_PATTERN.match(line):
+            body_lines.append(line)
+    chunk_number = markers.get("chunk_number", "")
+    return {
+        "source": markers.get("source") or markers.get("출처", ""),
+        "chunk_number": int(chunk_number) if chunk_number.isdigit() else None,
+        "title": markers.get("title", ""),
+        "body": body_lines,
+    }
+
+
+def _query_units(query: str) -> set:
+    """질의 매칭 단위: 영어/숫자 단어 + 한글 글자 bigram (조사가 붙어도 매칭되도록)"""
+    units = set()
+    for word in re.findall(r"[0-9a-z]+|[가-힣]+", unicodedata.normalize("NFKC", query).lower()):
+        if word.isascii() or len(word) == 1:
+            units.add(word)
+        else:
+            units.update(word[i:i + 2] for i in range(len(word) - 1))
+    return units
+
+
+def select_passage(lines: List[str], query: str, max_length: int = SNIPPET_MAX_LENGTH) -> str:
+    """
+    질의와 가장 잘 맞는 구간 선택 (_create_snippet 방식의 윈도우 탐색, 줄 단위)
+
+    각 시작 줄에서 max_length 까지 줄을 이어 붙인 윈도우 중 질의 단위를 가장 많이 포함한 것을 고릅니다.
+    질의 단위에는 공백이 없어 줄 경계에 걸쳐 매칭되지 않으므로, 줄마다 포함한 단위를 한 번만 구하고
+    윈도우는 앞뒤 줄을 하나씩 넣고 빼며 단위별 등장 수만 갱신합니다 (윈도우 문자열을 다시 만들지 않음).
+    """
+    return _select_passage(lines, _query_units(query), max_length)
+
+
+def _select_passage(lines: List[str], units: set, max_length: int) -> str:
+    if not lines:
+        return ""
+    lowered = [line.lower() for line in lines]
+    line_units = [[unit for unit in units if unit in line] for line in lowered]
+    counts: Dict[str, int] = {}
+    matched = 0  # 윈도우에 포함된 서로 다른 질의 단위 수
+    length = 0  # 윈도우 길이 (줄 사이 공백 포함)
+    end = 0
+    best_start, best_end, best_score = 0, 0, -1
+    for start in range(len(lines)):
+        # 첫 줄은 max_length 를 넘어도 포함
+        while end < len(lines) and (end == start or length + 1 + len(lines[end]) <= max_length):
+            length += len(lines[end]) + (1 if end > start else 0)
+            for unit in line_units[end]:
+                counts[unit] = counts.get(unit, 0) + 1
+                if counts[unit] == 1:
+                    matched += 1
+            end += 1
+        if matched > best_score:
+            best_start, best_end, best_score = start, end, matched
+        if end == len(lines):
+            break  # 이후 시작점의 윈도우는 현재 윈도우의 부분집합
+        length -= len(lines[start]) + (1 if end > start + 1 else 0)
+        for unit in line_units[start]:
+            counts[unit] -= 1
+            if counts[unit] == 0:
+                matched -= 1
+    return " ".join(lines[best_start:best_end])
+
+
+def _truncate(text: str, max_length: int) -> str:
+    if len(text) <= max_length:
+        return text
+    cut = text[:max_length].rsplit(" ", 1)[0] if " " in text[:max_length] else text[:max_length]
+    return cut.strip()
+
+
+def _fallback_title(source: str) -> str:
+    """[Title:]/subject 가 없을 때 source 로 제목 생성 (URL 은 경로 마지막, 파일은 확장자 제거)"""
+    if source.startswith(("http://", "https://")):
+        parsed = urlparse(source)
+        last = parsed.path.rstrip("/").rsplit("/", 1)[-1]
+        return last.rsplit(".", 1)[0] or parsed.netloc
+    return source.rsplit(".", 1)[0] if "." in source else source
+
+
+def extract_sources(retrievers: List[Dict[str, Any]], query: str, max_items: Optional[int] = None) -> List[Dict[str, Any]]:
+    """
+    retriever 결과에서 출처 목록 생성 (LLM 호출 없이 결정적으로)
+
+    retrivers.json(검색 결과 8개) 기준 호출당 1ms 안팎입니다 (python source_extractor.py 로 측정).
+    마이크로초 단위는 아니지만, 출처 생성용 LLM 호출(수 초)을 없애는 것이 목적이므로 답변 지연에는 영향이 없습니다.
+
+    Args:
+        retrievers: retrivers.json 형식의 검색 결과
+        query: 사용자 질의 (snippet 구간 선택용)
+        max_items: 최대 출처 수
+
+    Returns:
+        list[dict]: [{"id", "title", "snippet", "source", "doc_type", "chunk_number", "rank"}, ...]
+    """
+    units = _query_units(query)  # 질의 단위는 검색 결과마다 다시 만들지 않음
+    items = []
+    seen = set()
+    for retriever in sorted(retrievers, key=lambda r: r.get("rank", 0)):
+        parsed = parse_retriever_text(retriever.get("text", ""))
+        source = parsed["source"] or retriever.get("content", "")
+        key = (source, parsed["chunk_number"])
+        if key in seen:
+            continue
+        seen.add(key)
+
+        title = sanitize_text(retriever.get("subject") or parsed["title"] or _fallback_title(source))
+        passage = _select_passage(parsed["body"], units, SNIPPET_MAX_LENGTH)
+        items.append({
+            "id": retriever.get("id"),
+            "title": _truncate(title, TITLE_MAX_LENGTH),
+            "snippet": _truncate(sanitize_text(passage), SNIPPET_MAX_LENGTH),
+            "source": source,
+            "doc_type": retriever.get("doc_type", ""),
+            "chunk_number": parsed["chunk_number"],
+            "rank": retriever.get("rank"),
+        })
+        if max_items and len(items) >= max_items:
+            break
+    return items
+
+
+if __name__ == "__main__":
+    import json
+    import time
+
+    with open("retrivers.json", "r", encoding="utf-8") as f:
+        retrievers = json.load(f)
+    query = "나라원시스템의 연혁을 알려줘"
+
+    start = time.perf_counter()
+    repeat = 1000
+    for _ in range(repeat):
+        sources = extract_sources(retrievers, query)
+    elapsed_ms = (time.perf_counter() - start) / repeat * 1000
+    print(json.dumps(sources, ensure_ascii=False, indent=2))
+    print(f"검색 결과 {len(retrievers)}개 처리: {elapsed_ms:.2f}ms/회")
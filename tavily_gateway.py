@@ -0,0 +1,224 @@
+import asyncio
+import copy
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+import aiohttp
+
+TAVILY_BASE_URL = "https://api.tavily.com"
+
+# 순서가 의미 없는 목록 파라미터 (캐시 키 생성 시 정렬)
+_UNORDERED_PARAMS = {"include_domains", "exclude_domains", "select_domains", "exclude_paths", "select_paths", "urls", "categories"}
+
+
+class TavilyAPIError(Exception):
+    """Tavily API 오류 응답"""
+
+    def __init__(self, status: int, message: str):
+        super().__init__(f"Tavily API 오류 ({status}): {message}")
+        self.status = status
+
+
+def make_request_key(endpoint: str, payload: Dict[str, Any]) -> Tuple[str, str]:
+    """
+    (endpoint, 정규화된 payload) 캐시 키
+
+    None 값은 제외하고, 도메인 목록처럼 순서가 의미 없는 목록은 정렬해서 같은 요청이 같은 키가 되도록 합니다.
+    """
+    normalized = {}
+    for name, value in payload.items():
+        if value is None:
+            continue
+        if name in _UNORDERED_PARAMS and isinstance(value, (list, tuple)):
+            value = sorted(value)
+        if name == "query" and isinstance(value, str):
+            value = " ".join(value.split())
+        normalized[name] = value
+    return endpoint, json.dumps(normalized, sort_keys=True, ensure_ascii=False)
+
+
+class ResponseCache:
+    """요청 키 → 응답 LRU + TTL 캐시 (get 은 사본을 돌려주므로 호출자가 고쳐도 캐시는 그대로)"""
+
+    def __init__(self, max_size: int = 1000, ttl: float = 600):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._items: "OrderedDict[Tuple[str, str], Tuple[Dict, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Tuple[str, str]) -> Optional[Dict]:
+        with self._lock:
+            item = self._items.get(key)
+            if item is None:
+                return None
+            response, expires_at = item
+            if expires_at < time.monotonic():
+                del self._items[key]
+                return None
+            self._items.move_to_end(key)
+        return copy.deepcopy(response)
+
+    def set(self, key: Tuple[str, str], response: Dict):
+        with self._lock:
+            self._items[key] = (response, time.monotonic() + self.ttl)
+            self._items.move_to_end(key)
+            while len(self._items) > self.max_size:
+                self._items.popitem(last=False)
+
+
+class TavilyGateway:
+    """
+    Tavily 검색 게이트웨이
+
+    - 하나의 aiohttp.ClientSession 커넥션 풀 재사용 (요청마다 새 연결/세션을 만들지 않음)
+    - 같은 요청이 동시에 들어오면 실제 호출은 한 번만 하고 결과를 공유 (in-flight coalescing)
+    - (endpoint, query, include_domains, search_depth, ...) 키 응답 TTL 캐시
+    - Semaphore 로 동시에 나가는 API 호출 수 제한
+    """
+
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        base_url: str = TAVILY_BASE_URL,
+        max_concurrency: int = 8,
+        cache: Optional[ResponseCache] = None,
+        timeout: float = 60.0,
+    ):
+        """
+        Args:
+            api_key: Tavily API 키 (없으면 TAVILY_API_KEY 환경변수)
+            base_url: API 주소 (테스트 시 FakeTavilyServer.base_url)
+            max_concurrency: 동시에 진행할 최대 API 호출 수
+            cache: 응답 캐시
+            timeout: 요청당 제한 시간(초)
+        """
+        self.api_key = api_key or os.getenv("TAVILY_API_KEY")
+        self.base_url = base_url.rstrip("/")
+        self.max_concurrency = max_concurrency
+        self.cache = cache or ResponseCache()
+        self.timeout = aiohttp.ClientTimeout(total=timeout)
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._in_flight: Dict[Tuple[str, str], asyncio.Task] = {}
+        self.stats = {"requests": 0, "cache_hits": 0, "coalesced": 0}
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=self.max_concurrency, keepalive_timeout=30),
+                headers={
+                    "Authorization": f"Bearer {self.api_key}",
+                    "Content-Type": "application/json",
+                },
+                timeout=self.timeout,
+            )
+        return self._session
+
+    async def request(self, endpoint: str, payload: Dict[str, Any], use_cache: bool = True) -> Dict:
+        """
+        API 호출 (캐시 → 진행 중인 같은 요청 → 새 요청 순서로 확인)
+
+        실제 호출은 별도 Task 로 실행하고 모든 호출자(처음 요청한 쪽 포함)가 shield 로 기다리므로,
+        한 호출자가 취소돼도(클라이언트 연결 끊김, 타임아웃) 같은 요청을 기다리는 다른 호출자는 결과를 받습니다.
+        응답은 호출자마다 사본을 돌려줍니다.
+
+        Args:
+            endpoint: "search", "extract", "crawl", "map"
+            payload: 요청 본문
+            use_cache: False 면 캐시를 건너뛰고 새로 호출 (결과는 캐시에 저장)
+        """
+        key = make_request_key(endpoint, payload)
+        if use_cache:
+            cached = self.cache.get(key)
+            if cached is not None:
+                self.stats["cache_hits"] += 1
+                return cached
+
+        task = self._in_flight.get(key)
+        if task is not None:
+            self.stats["coalesced"] += 1
+        else:
+            task = asyncio.ensure_future(self._fetch(key, endpoint, payload))
+            self._in_flight[key] = task
+            task.add_done_callback(lambda done: self._request_done(key, done))
+        return copy.deepcopy(await asyncio.shield(task))
+
+    async def _fetch(self, key: Tuple[str, str], endpoint: str, payload: Dict[str, Any]) -> Dict:
+        response = await self._post(endpoint, payload)
+        self.cache.set(key, response)
+        return response
+
+    def _request_done(self, key: Tuple[str, str], task: asyncio.Task):
+        if self._in_flight.get(key) is task:
+            del self._in_flight[key]
+        if not task.cancelled():
+            task.exception()  # 기다리던 호출자가 모두 취소됐을 때 경고 방지
+
+    async def _post(self, endpoint: str, payload: Dict[str, Any]) -> Dict:
+        async with self._semaphore:
+            self.stats["requests"] += 1
+            session = self._get_session()
+            async with session.post(f"{self.base_url}/{endpoint}", json=payload) as response:
+                body = await response.json(content_type=None)
+                if response.status != 200:
+                    detail = body.get("detail", body) if isinstance(body, dict) else body
+                    raise TavilyAPIError(response.status, json.dumps(detail, ensure_ascii=False))
+                return body
+
+    async def search(self, query: str, **params) -> Dict:
+        """tavily_client.search 와 같은 파라미터 (max_results, search_depth, include_domains 등)"""
+        return await self.request("search", {"query": query, **params})
+
+    async def extract(self, urls, **params) -> Dict:
+        return await self.request("extract", {"urls": urls, **params})
+
+    async def crawl(self, url: str, **params) -> Dict:
+        return await self.request("crawl", {"url": url, **params})
+
+    async def map(self, url: str, **params) -> Dict:
+        return await self.request("map", {"url": url, **params})
+
+    async def aclose(self):
+        for task in list(self._in_flight.values()):
+            task.cancel()
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.aclose()
+
+
+async def run_benchmark(duplicate_count: int = 50, distinct_count: int = 20, delay: float = 0.2):
+    """가짜 서버로 중복/고유 질의 동시 요청 시 실제 API 호출 수와 소요 시간 측정"""
+    from fake_tavily_server import FakeTavilyServer
+
+    async with FakeTavilyServer(delay=delay) as server:
+        async with TavilyGateway(api_key="test", base_url=server.base_url, max_concurrency=8) as gateway:
+            params = {"search_depth": "advanced", "include_domains": ["nara1.kr"], "max_results": 5}
+
+            start = time.perf_counter()
+            await asyncio.gather(*(gateway.search("나라원 시스템 직원 수", **params) for _ in range(duplicate_count)))
+            duplicate_elapsed = time.perf_counter() - start
+            print(f"같은 질의 {duplicate_count}개 동시 요청: {duplicate_elapsed:.2f}초, "
+                  f"서버 요청 {server.request_count}회 (공유 {gateway.stats['coalesced']}개)")
+
+            start = time.perf_counter()
+            await asyncio.gather(*(gateway.search(f"질의 {i}", **params) for i in range(distinct_count)))
+            distinct_elapsed = time.perf_counter() - start
+            print(f"다른 질의 {distinct_count}개 동시 요청 (최대 동시 8개): {distinct_elapsed:.2f}초 "
+                  f"(순차 실행 시 약 {distinct_count * delay:.2f}초)")
+
+            start = time.perf_counter()
+            await gateway.search("나라원 시스템 직원 수", **{**params, "include_domains": ["nara1.kr"]})
+            print(f"캐시 적중: {(time.perf_counter() - start) * 1000:.2f}ms, 누적 통계 {gateway.stats}")
+
+
+if __name__ == "__main__":
+    asyncio.run(run_benchmark())
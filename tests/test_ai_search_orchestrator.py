@@ -0,0 +1,42 @@
+import asyncio
+
+from ai_search_orchestrator import stream_answer_with_sources
+
+
+class BrokenEngine:
+    async def stream(self, llm, prompt, retrievers):
+        yield {"content": "부분 답변", "done": False, "description": "main_content"}
+        raise ConnectionError("stream reset")
+
+
+class FakeEngine:
+    async def stream(self, llm, prompt, retrievers):
+        for token in ("답", "변"):
+            await asyncio.sleep(0.01)
+            yield {"content": token, "done": False, "description": "main_content"}
+
+
+async def _collect(engine, extract_sources):
+    return [item async for item in stream_answer_with_sources("model", "system", "user", extract_sources, engine)]
+
+
+async def _sources():
+    await asyncio.sleep(0.02)
+    return [{"title": "나라원 연혁"}]
+
+
+def test_answer_error_becomes_error_chunk_and_sources_still_arrive():
+    items = asyncio.run(_collect(BrokenEngine(), _sources))
+    descriptions = [item["description"] for item in items]
+    assert descriptions[0] == "main_content"
+    assert "error" in descriptions and "sources" in descriptions
+    assert descriptions[-1] == "done"
+    error = next(item for item in items if item["description"] == "error")
+    assert error["error"] == "ConnectionError: stream reset"
+
+
+def test_answer_and_sources_are_interleaved():
+    items = asyncio.run(_collect(FakeEngine(), _sources))
+    assert [item["content"] for item in items if item["description"] == "main_content"] == ["답", "변"]
+    assert [item["content"] for item in items if item["description"] == "sources"] == [[{"title": "나라원 연혁"}]]
+    assert items[-1]["done"] and set(items[-1]["timing"]) >= {"answer_done", "sources_done", "total"}
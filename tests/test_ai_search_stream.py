@@ -0,0 +1,121 @@
+import asyncio
+
+import pytest
+
+from ai_search_stream import get_answer_engine
+from fake_openai_server import FakeOpenAIServer
+
+
+@pytest.fixture(autouse=True)
+def api_key(monkeypatch):
+    monkeypatch.setenv("OPENAI_API_KEY", "test")
+
+
+async def _stream(port: int = 0):
+    async with FakeOpenAIServer(tokens=3, delay=0, port=port) as server:
+        engine = get_answer_engine(server.base_url)
+        chunks = [chunk["content"] async for chunk in engine.stream("fake-model", "system", "user")]
+        assert get_answer_engine(server.base_url) is engine
+        await engine.aclose()  # 서버를 닫기 전에 keep-alive 연결 정리
+        return engine, server.port, chunks
+
+
+def test_shared_engine_is_created_per_event_loop():
+    first, port, chunks = asyncio.run(_stream())
+    assert len(chunks) == 3
+
+    # 같은 base_url 이라도 새 루프에서는 새 엔진 (이전 루프에 묶인 httpx 클라이언트를 재사용하지 않음)
+    second, _, chunks = asyncio.run(_stream(port))
+    assert second is not first
+    assert len(chunks) == 3
+
+
+class FakeResponse:
+    """openai 스트림 응답 흉내 (읽은 청크 수와 닫힘 여부 기록)"""
+
+    def __init__(self, tokens, error=None):
+        self.tokens = tokens
+        self.error = error
+        self.produced = 0
+        self.closed = False
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        self.closed = True
+
+    def __aiter__(self):
+        return self._chunks()
+
+    async def _chunks(self):
+        from types import SimpleNamespace
+
+        for token in self.tokens:
+            await asyncio.sleep(0)
+            self.produced += 1
+            yield SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=token))])
+        if self.error is not None:
+            raise self.error
+
+
+class FakeClient:
+    def __init__(self, response):
+        from types import SimpleNamespace
+
+        self.response = response
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self._create))
+
+    async def _create(self, **kwargs):
+        assert kwargs["stream"] is True
+        return self.response
+
+
+def _engine(response, max_buffered_chunks=2):
+    from ai_search_stream import AnswerStreamEngine
+
+    return AnswerStreamEngine(client=FakeClient(response), max_buffered_chunks=max_buffered_chunks)
+
+
+def test_slow_consumer_bounds_read_ahead():
+    response = FakeResponse([f"토큰{i}" for i in range(50)])
+
+    async def scenario():
+        received = []
+        async for chunk in _engine(response).stream("fake-model", "system", "user"):
+            received.append(chunk["content"])
+            await asyncio.sleep(0.001)  # 느린 소비자
+            # 큐(2개) + put 에서 기다리는 1개 + 받은 청크 이상은 미리 읽지 않음
+            assert response.produced <= len(received) + 3
+        return received
+
+    received = asyncio.run(scenario())
+    assert received == [f"토큰{i}" for i in range(50)]
+    assert response.closed
+
+
+def test_consumer_stopping_early_cancels_the_reader():
+    response = FakeResponse([f"토큰{i}" for i in range(50)])
+
+    async def scenario():
+        stream = _engine(response).stream("fake-model", "system", "user")
+        async for _ in stream:
+            break
+        await stream.aclose()
+
+    asyncio.run(scenario())
+    assert response.produced < 50
+    assert response.closed
+
+
+def test_stream_error_reaches_consumer_after_buffered_chunks():
+    response = FakeResponse(["앞부분"], error=RuntimeError("연결 끊김"))
+
+    async def scenario():
+        received = []
+        with pytest.raises(RuntimeError, match="연결 끊김"):
+            async for chunk in _engine(response).stream("fake-model", "system", "user"):
+                received.append(chunk["content"])
+        return received
+
+    assert asyncio.run(scenario()) == ["앞부분"]
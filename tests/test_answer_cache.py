@@ -0,0 +1,83 @@
+import asyncio
+
+from answer_cache import AnswerCache
+
+IDS = [17034, 17088]
+
+
+def _embed(text):
+    # 글자 bigram 해시 임베딩 (테스트용)
+    vector = [0.0] * 64
+    compact = text.replace(" ", "")
+    for i in range(len(compact) - 1):
+        vector[sum(map(ord, compact[i:i + 2])) % 64] += 1.0
+    return vector
+
+
+def _ask(cache, query, prompt="system", ids=IDS):
+    calls = []
+
+    async def answer():
+        calls.append(query)
+        yield {"content": f"답변:{query}", "done": False, "description": "main_content"}
+
+    async def scenario():
+        return [chunk async for chunk in cache.stream("model", prompt, query, ids, answer)]
+
+    return asyncio.run(scenario()), calls
+
+
+def test_same_normalized_query_is_reused():
+    cache = AnswerCache()
+    first, calls = _ask(cache, "나라원시스템의 연혁을 알려줘")
+    again, again_calls = _ask(cache, "나라원시스템의  연혁을 알려줘?")
+    assert calls and not again_calls and again == first
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_prompt_change_is_a_different_key():
+    cache = AnswerCache()
+    _ask(cache, "연혁", prompt="템플릿 v1")
+    _, calls = _ask(cache, "연혁", prompt="템플릿 v2")
+    assert calls == ["연혁"]
+
+
+def test_similar_query_matches_only_within_same_group():
+    cache = AnswerCache(embed=_embed, similarity_threshold=0.8)
+    first, _ = _ask(cache, "나라원시스템의 연혁을 알려줘")
+    similar, calls = _ask(cache, "나라원시스템 연혁을 알려줘")
+    assert not calls and similar == first
+    _, other_ids = _ask(cache, "나라원시스템 연혁을 알려줘", ids=[1])
+    _, other_prompt = _ask(cache, "나라원시스템 연혁을 알려줘", prompt="다른 프롬프트")
+    assert other_ids and other_prompt
+    _, unrelated = _ask(cache, "오늘 서울 날씨")
+    assert unrelated
+
+
+def test_evicted_and_expired_entries_leave_the_similarity_index():
+    cache = AnswerCache(max_size=2, embed=_embed, similarity_threshold=0.8)
+    for query in ("서울 날씨 알려줘", "부산 맛집 추천", "파이썬 비동기 예제"):
+        _ask(cache, query)
+    assert len(cache) == 2
+    assert sum(len(vectors) for vectors in cache._vectors.values()) == 2
+
+    cache.ttl = -1
+    _ask(cache, "나라원시스템 연혁")
+    _, calls = _ask(cache, "나라원시스템 연혁")
+    assert calls
+
+
+def test_exact_hit_skips_query_embedding():
+    embedded = []
+
+    def embed(text):
+        embedded.append(text)
+        return _embed(text)
+
+    cache = AnswerCache(embed=embed)
+    _ask(cache, "나라원시스템 연혁")
+    assert len(embedded) == 1
+    chunks, calls = _ask(cache, "나라원시스템 연혁?")
+    assert calls == [] and chunks[0]["content"] == "답변:나라원시스템 연혁"
+    assert len(embedded) == 1
+    assert (cache.hits, cache.misses) == (1, 1)
@@ -0,0 +1,130 @@
+import asyncio
+
+import pytest
+
+pytest.importorskip("playwright.async_api")
+
+import browser_pool
+from browser_pool import BrowserPool, close_browser_pool, get_browser_pool
+
+
+class FakeBrowser:
+    def __init__(self):
+        self.closed = False
+
+    def is_connected(self):
+        return not self.closed
+
+    async def close(self):
+        self.closed = True
+
+
+class FakeChromium:
+    def __init__(self):
+        self.browsers = []
+        self.gate = None  # 설정하면 launch 가 이 Event 를 기다림 (느린 Chromium 시작)
+
+    async def launch(self, **options):
+        if self.gate is not None:
+            await self.gate.wait()
+        self.browsers.append(FakeBrowser())
+        return self.browsers[-1]
+
+
+class FakePlaywright:
+    def __init__(self):
+        self.chromium = FakeChromium()
+
+    async def stop(self):
+        pass
+
+
+def make_pool(**options):
+    pool = BrowserPool(**options)
+    pool._playwright = FakePlaywright()
+    return pool
+
+
+def test_browsers_launch_lazily_up_to_size():
+    async def scenario():
+        pool = make_pool(size=2)
+        first = await pool._acquire_slot()
+        await pool._release_slot(first)
+        again = await pool._acquire_slot()
+        assert again is first and pool.stats["launches"] == 1
+
+        second = await pool._acquire_slot()
+        third = await pool._acquire_slot()
+        assert second is not first and pool.stats["launches"] == 2
+        assert third in (first, second) and len(pool._slots) == 2
+        await pool.aclose()
+
+    asyncio.run(scenario())
+
+
+def test_recycled_browser_closes_after_release():
+    async def scenario():
+        pool = make_pool(size=1, pages_per_browser=1)
+        first = await pool._acquire_slot()
+        second = await pool._acquire_slot()
+        assert second is not first and not first.browser.closed
+        await pool._release_slot(first)
+        assert first.browser.closed
+        await pool.aclose()
+        assert second.browser.closed
+
+    asyncio.run(scenario())
+
+
+
+def test_slow_launch_does_not_block_running_browser():
+    async def scenario():
+        pool = make_pool(size=2)
+        first = await pool._acquire_slot()
+        pool._playwright.chromium.gate = asyncio.Event()
+        launching = asyncio.ensure_future(pool._acquire_slot())
+        await asyncio.sleep(0)
+        await pool._release_slot(first)
+        # 새 브라우저가 뜨는 동안에도 떠 있는 브라우저는 바로 받음
+        again = await asyncio.wait_for(pool._acquire_slot(), 1)
+        assert again is first and not launching.done()
+
+        pool._playwright.chromium.gate.set()
+        second = await launching
+        assert second is not first and second.browser is not None
+        assert pool.stats["launches"] == 2 and len(pool._slots) == 2
+        await pool.aclose()
+
+    asyncio.run(scenario())
+
+
+def test_cancelled_waiter_does_not_cancel_launch():
+    async def scenario():
+        pool = make_pool(size=1)
+        pool._playwright.chromium.gate = asyncio.Event()
+        owner = asyncio.ensure_future(pool._acquire_slot())
+        await asyncio.sleep(0)
+        waiter = asyncio.ensure_future(pool._acquire_slot())
+        await asyncio.sleep(0)
+        owner.cancel()
+        await asyncio.sleep(0)
+        pool._playwright.chromium.gate.set()
+        slot = await waiter
+        assert owner.cancelled() and slot.browser is not None and slot.active == 1
+        await pool.aclose()
+
+    asyncio.run(scenario())
+
+def test_shared_pool_refuses_other_loop_until_closed():
+    async def open_pool():
+        return get_browser_pool()
+
+    pool = asyncio.run(open_pool())
+    try:
+        with pytest.raises(RuntimeError):
+            asyncio.run(open_pool())
+    finally:
+        browser_pool._browser_pool_loop = None
+        asyncio.run(close_browser_pool())
+    assert asyncio.run(open_pool()) is not pool
+    asyncio.run(close_browser_pool())
@@ -0,0 +1,74 @@
+from browser_slots import BrowserSlots
+
+
+class FakeBrowser:
+    def __init__(self):
+        self.connected = True
+
+    def is_connected(self):
+        return self.connected
+
+
+def _acquire(slots):
+    slot, retired = slots.acquire()
+    if slot.browser is None:
+        slot.browser = FakeBrowser()  # BrowserPool 이 lock 밖에서 띄우는 부분
+    return slot, retired
+
+
+def test_slots_are_added_lazily_up_to_size():
+    slots = BrowserSlots(size=2, pages_per_browser=100)
+    first, _ = _acquire(slots)
+    assert slots.release(first) is False
+    again, _ = _acquire(slots)
+    assert again is first and len(slots) == 1
+
+    second, _ = _acquire(slots)
+    third, _ = _acquire(slots)
+    assert second is not first and third in (first, second) and len(slots) == 2
+
+
+def test_launching_slot_counts_toward_size():
+    slots = BrowserSlots(size=2, pages_per_browser=100)
+    launching, _ = slots.acquire()
+    assert launching.browser is None
+    other, _ = slots.acquire()
+    assert other is not launching and len(slots) == 2
+    # 자리가 다 찼으면 띄우는 중인 자리도 나눠 씀 (추가로 띄우지 않음)
+    shared, _ = slots.acquire()
+    assert shared in (launching, other) and len(slots) == 2
+
+
+def test_recycled_slot_closes_after_last_release():
+    slots = BrowserSlots(size=1, pages_per_browser=1)
+    first, _ = _acquire(slots)
+    second, retired = _acquire(slots)
+    assert second is not first and retired == [first] and first.retired
+    assert slots.slots == [second]
+    assert slots.release(first) is True
+
+
+def test_idle_recycled_slot_can_close_immediately():
+    slots = BrowserSlots(size=1, pages_per_browser=1)
+    first, _ = _acquire(slots)
+    slots.release(first)
+    _, retired = _acquire(slots)
+    assert retired == [first] and first.active == 0
+
+
+def test_disconnected_browser_is_replaced():
+    slots = BrowserSlots(size=1, pages_per_browser=100)
+    first, _ = _acquire(slots)
+    slots.release(first)
+    first.browser.connected = False
+    second, retired = _acquire(slots)
+    assert second is not first and retired == [first]
+
+
+def test_failed_launch_is_discarded():
+    slots = BrowserSlots(size=1, pages_per_browser=100)
+    slot, _ = slots.acquire()
+    slots.release(slot)
+    slots.discard(slot)
+    slots.discard(slot)
+    assert len(slots) == 0
@@ -0,0 +1,39 @@
+from context_builder import build_context, build_context_with_report, count_tokens
+
+
+def _retriever(rank, source, chunk, lines, subject=None):
+    text = f"[Source: {source}]\n[Chunk_number: {chunk}]\n[Title: 나라원]\nContent:\n" + "\n".join(lines)
+    return {"id": rank, "rank": rank, "text": text, "content": text, "subject": subject, "faiss_score": 0.5}
+
+
+def test_chunks_of_same_source_share_a_block_and_overlap_is_dropped():
+    retrievers = [
+        _retriever(2, "history.htm", 2, ["2022년 유지관리 용역", "2021년 신규 설립"]),
+        _retriever(1, "history.htm", 1, ["2023년 법인명 변경", "2022년 유지관리 용역"]),
+        _retriever(3, "about.htm", 1, ["회사 소개"], subject="회사소개"),
+    ]
+    context = build_context(retrievers)
+    assert context == (
+        "[1] 나라원 (history.htm)\n2023년 법인명 변경\n2022년 유지관리 용역\n2021년 신규 설립"
+        "\n\n[2] 회사소개 (about.htm)\n회사 소개"
+    )
+    assert "faiss_score" not in context
+
+
+
+def test_lines_repeated_inside_one_chunk_are_kept():
+    retrievers = [
+        _retriever(1, "notice.htm", 1, ["공지사항", "- 접수 마감", "안내 문구", "- 접수 마감"]),
+        _retriever(2, "notice.htm", 2, ["- 접수 마감", "문의처 안내"]),
+    ]
+    assert build_context(retrievers) == "[1] 나라원 (notice.htm)\n공지사항\n- 접수 마감\n안내 문구\n- 접수 마감\n문의처 안내"
+
+def test_token_budget_is_respected():
+    retrievers = [_retriever(i, f"page{i}.htm", 1, [f"{i}번째 문서의 긴 본문 줄 {j}" for j in range(20)]) for i in range(10)]
+    context, report = build_context_with_report(retrievers, token_budget=200)
+    assert count_tokens(context) <= 200 + context.count("\n")
+    assert report["after_tokens"] < report["before_tokens"]
+
+
+def test_empty_retrievers():
+    assert build_context([]) == ""
@@ -0,0 +1,129 @@
+import asyncio
+
+import pytest
+from aiohttp import web
+
+from crawler import AsyncCrawler
+
+PAGE_COUNT = 30
+
+
+async def _serve(handler):
+    app = web.Application()
+    app.router.add_get("/{tail:.*}", handler)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    return runner, f"http://127.0.0.1:{site._server.sockets[0].getsockname()[1]}"
+
+
+async def _page(request: web.Request) -> web.Response:
+    if request.path == "/bad-charset":
+        return web.Response(body='<meta charset="base64"><p>본문</p>'.encode('utf-8'), content_type="text/html")
+    number = int(request.path.rsplit("/", 1)[-1] or 0)
+    links = "".join(f'<a href="/page/{(number + i) % PAGE_COUNT}">link</a>' for i in range(1, 4))
+    return web.Response(text=f"<html><body><p>page {number}</p>{links}</body></html>", content_type="text/html")
+
+
+def test_coalesced_waiters_receive_fetch_error():
+    async def scenario():
+        crawler = AsyncCrawler(politeness_delay=0)
+        calls = 0
+
+        async def failing_fetch(url):
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            raise RuntimeError("decoder exploded")
+
+        crawler._fetch = failing_fetch
+        results = await asyncio.wait_for(
+            asyncio.gather(*(crawler.fetch("http://example.invalid/") for _ in range(3)), return_exceptions=True),
+            timeout=2,
+        )
+        assert calls == 1
+        assert all(isinstance(result, RuntimeError) for result in results)
+        assert crawler._in_flight == {}
+
+    asyncio.run(scenario())
+
+
+def test_cancelled_owner_does_not_cancel_coalesced_waiter():
+    async def scenario():
+        crawler = AsyncCrawler(politeness_delay=0)
+        calls = 0
+
+        async def slow_fetch(url):
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.05)
+            return {**crawler._new_result(url), "status": 200, "html": "<p>본문</p>"}
+
+        crawler._fetch = slow_fetch
+        owner = asyncio.create_task(crawler.fetch("http://example.invalid/"))
+        await asyncio.sleep(0)
+        waiter = asyncio.create_task(crawler.fetch("http://example.invalid/"))
+        await asyncio.sleep(0.01)
+        owner.cancel()
+        result = await asyncio.wait_for(waiter, timeout=2)
+        assert owner.cancelled()
+        assert result["html"] == "<p>본문</p>"
+        assert calls == 1
+        assert crawler._in_flight == {}
+
+    asyncio.run(scenario())
+
+
+def test_worker_survives_unexpected_error():
+    async def scenario():
+        runner, base = await _serve(_page)
+        try:
+            async with AsyncCrawler(max_workers=1, politeness_delay=0) as crawler:
+                original = crawler._fetch
+
+                async def flaky_fetch(url):
+                    if url.endswith("/boom"):
+                        raise ValueError("unexpected")
+                    return await original(url)
+
+                crawler._fetch = flaky_fetch
+                results = await asyncio.wait_for(crawler.crawl([f"{base}/boom", f"{base}/page/1"]), timeout=5)
+        finally:
+            await runner.cleanup()
+        by_url = {result["url"]: result for result in results}
+        assert by_url[f"{base}/boom"]["error"] == "ValueError: unexpected"
+        assert by_url[f"{base}/page/1"]["status"] == 200
+
+    asyncio.run(scenario())
+
+
+def test_non_text_meta_charset_does_not_break_crawl():
+    async def scenario():
+        runner, base = await _serve(_page)
+        try:
+            async with AsyncCrawler(max_workers=1, politeness_delay=0) as crawler:
+                results = await asyncio.wait_for(crawler.crawl([f"{base}/bad-charset", f"{base}/page/2"]), timeout=5)
+        finally:
+            await runner.cleanup()
+        assert [result["status"] for result in results] == [200, 200]
+        assert "본문" in results[0]["html"]
+        assert results[0]["encoding"] == "utf-8"
+
+    asyncio.run(scenario())
+
+
+@pytest.mark.parametrize("max_pages", [1, 7])
+def test_max_pages_is_not_exceeded_with_many_workers(max_pages):
+    async def scenario():
+        runner, base = await _serve(_page)
+        try:
+            async with AsyncCrawler(max_workers=10, politeness_delay=0) as crawler:
+                return await asyncio.wait_for(
+                    crawler.crawl([f"{base}/page/{i}" for i in range(5)], max_depth=3, max_pages=max_pages), timeout=5
+                )
+        finally:
+            await runner.cleanup()
+
+    results = asyncio.run(scenario())
+    assert len(results) == max_pages
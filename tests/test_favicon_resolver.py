@@ -0,0 +1,136 @@
+import asyncio
+
+from aiohttp import web
+
+from favicon_resolver import FaviconResolver, get_favicon_resolver, origin_of
+
+
+async def _serve(handler):
+    app = web.Application()
+    app.router.add_route("*", "/{tail:.*}", handler)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    return runner, f"http://127.0.0.1:{site._server.sockets[0].getsockname()[1]}"
+
+
+def _resolve(handler, candidates=("/favicon.ico", "/favicon.png"), timeout=0.2):
+    async def scenario():
+        runner, base = await _serve(handler)
+        try:
+            async with FaviconResolver(timeout=timeout) as resolver:
+                result = await resolver.resolve(f"{base}/page", [f"{base}{path}" for path in candidates])
+                return result, resolver.cache.get(origin_of(base)), resolver.stats
+        finally:
+            await runner.cleanup()
+
+    return asyncio.run(scenario())
+
+
+def test_found_icon_is_cached():
+    async def handler(request):
+        if request.path == "/favicon.png":
+            return web.Response(body=b"\x89PNG", content_type="image/png")
+        return web.Response(status=404)
+
+    result, cached, _ = _resolve(handler)
+    assert result.endswith("/favicon.png") and cached == result
+
+
+def test_definitive_misses_are_negative_cached():
+    async def handler(request):
+        return web.Response(status=404)
+
+    assert _resolve(handler)[:2] == ("", "")
+
+
+def test_timeouts_are_not_negative_cached():
+    async def handler(request):
+        if request.path == "/favicon.ico":
+            await asyncio.sleep(1)
+        return web.Response(status=404)
+
+    result, cached, stats = _resolve(handler)
+    assert result == "" and cached is None
+    assert stats["errors"] == 1
+
+
+def test_server_errors_are_not_negative_cached():
+    async def handler(request):
+        return web.Response(status=503)
+
+    assert _resolve(handler)[:2] == ("", None)
+
+
+def test_shared_resolver_is_per_loop_with_shared_cache():
+    async def get():
+        resolver = get_favicon_resolver()
+        assert get_favicon_resolver() is resolver
+        resolver.cache.set("http://example.com", "http://example.com/favicon.ico")
+        return resolver
+
+    first = asyncio.run(get())
+    second = asyncio.run(get())
+    assert first is not second
+    assert second.cache is first.cache
+    assert asyncio.run(_cached_lookup()) == "http://example.com/favicon.ico"
+
+
+async def _cached_lookup():
+    return await get_favicon_resolver().resolve("http://example.com/news/1")
+
+
+def test_cancelled_owner_does_not_cancel_coalesced_waiter():
+    async def handler(request):
+        await asyncio.sleep(0.1)
+        return web.Response(body=b"\x00\x00\x01\x00", content_type="image/x-icon")
+
+    async def scenario():
+        runner, base = await _serve(handler)
+        try:
+            async with FaviconResolver() as resolver:
+                owner = asyncio.ensure_future(resolver.resolve(f"{base}/a"))
+                await asyncio.sleep(0)
+                waiter = asyncio.ensure_future(resolver.resolve(f"{base}/b"))
+                await asyncio.sleep(0.02)
+                owner.cancel()
+                result = await waiter
+                assert owner.cancelled()
+                return result, resolver.stats["coalesced"], resolver.cache.get(origin_of(base))
+        finally:
+            await runner.cleanup()
+
+    result, coalesced, cached = asyncio.run(scenario())
+    assert result.endswith("/favicon.ico") and cached == result
+    assert coalesced == 1
+
+
+def test_resolve_page_favicon_uses_page_candidates_and_shared_cache():
+    from bs4 import BeautifulSoup
+
+    from favicon_resolver import resolve_page_favicon
+
+    requested = []
+
+    async def handler(request):
+        requested.append(request.path)
+        if request.path == "/img/icon.png":
+            return web.Response(body=b"\x89PNG", content_type="image/png")
+        return web.Response(status=404)
+
+    async def scenario():
+        runner, base = await _serve(handler)
+        try:
+            soup = BeautifulSoup('<html><head><link rel="icon" href="/img/icon.png"></head></html>', 'html.parser')
+            first = await resolve_page_favicon(soup, f"{base}/a")
+            count = len(requested)
+            second = await resolve_page_favicon(soup, f"{base}/b")
+            return first, second, count
+        finally:
+            await get_favicon_resolver().aclose()
+            await runner.cleanup()
+
+    first, second, count = asyncio.run(scenario())
+    assert first.endswith("/img/icon.png") and second == first
+    assert len(requested) == count  # 같은 사이트의 두 번째 페이지는 캐시 적중
@@ -0,0 +1,115 @@
+import codecs
+
+import pytest
+
+from html_decoder import (
+    WINDOWS_1252,
+    IncrementalHTMLDecoder,
+    decode_html,
+    normalize_encoding,
+    sniff_encoding,
+)
+
+KOREAN = '똠방각하 햏 쀍 나라원시스템'  # KS X 1001 밖의 한글 포함 (cp949 에만 있음)
+
+
+@pytest.mark.parametrize('label', ['base64', 'zlib', 'hex', 'rot13', 'uu', 'bz2', 'quopri', 'punycode', 'idna'])
+def test_non_text_codec_labels_are_rejected(label):
+    assert normalize_encoding(label) is None
+
+
+@pytest.mark.parametrize('label, expected', [
+    ('UTF-8', 'utf-8'),
+    ('"euc-kr"', 'cp949'),
+    ('ks_c_5601-1987', 'cp949'),
+    ('iso-8859-1', WINDOWS_1252),
+    ('us-ascii', WINDOWS_1252),
+    ('shift_jis', 'cp932'),
+    ('gb2312', 'gb18030'),
+])
+def test_whatwg_labels(label, expected):
+    assert normalize_encoding(label) == expected
+
+
+@pytest.mark.parametrize('label', ['base64', 'zlib', 'hex', 'rot13', 'uu'])
+def test_non_text_meta_charset_falls_back(label):
+    html = f'<html><head><meta charset="{label}"></head><body>{KOREAN}</body></html>'
+    text, info = decode_html(html.encode('utf-8'), 'text/html')
+    assert text == html
+    assert info['encoding'] == 'utf-8'
+
+
+def test_windows_1252_decodes_like_browser():
+    text, info = decode_html(b'caf\xe9 \x81\x80', 'text/html; charset=iso-8859-1')
+    assert text == 'caf\xe9 \x81€'
+    assert info['encoding'] == WINDOWS_1252
+    assert info['source'] == 'header'
+
+
+def test_declared_encoding_used_for_lossy_fallback():
+    # 잘못된 바이트가 조금 섞인 선언 인코딩(cp949) 페이지는 다른 레거시 인코딩으로 추측하지 않고 손실 디코딩
+    data = (KOREAN * 100).encode('cp949') + b'\xff\xff'
+    text, info = decode_html(data, 'text/html; charset=euc-kr')
+    assert text.startswith(KOREAN * 100)
+    assert info['encoding'] == 'cp949'
+
+
+def test_euc_kr_declaration_decodes_as_cp949():
+    html = f'<meta http-equiv="Content-Type" content="text/html; charset=euc-kr"><p>{KOREAN}</p>'
+    text, info = decode_html(html.encode('cp949'))
+    assert text == html
+    assert info == {'encoding': 'cp949', 'source': 'meta', 'repaired': False}
+
+
+def test_wrong_header_is_detected():
+    text, info = decode_html(KOREAN.encode('cp949'), 'text/html; charset=utf-8')
+    assert text == KOREAN
+    assert info['source'] == 'detected'
+    assert info['encoding'] == 'cp949'
+
+
+def test_bom_wins_over_header():
+    assert sniff_encoding(codecs.BOM_UTF8 + b'abc', 'text/html; charset=euc-kr') == ('utf-8-sig', 'bom')
+
+
+def test_incremental_matches_whole_decode():
+    html = f'<meta charset="utf-8"><p>{KOREAN}</p>' * 500
+    data = html.encode('utf-8')
+    decoder = IncrementalHTMLDecoder('text/html', sniff_bytes=1024)
+    for start in range(0, len(data), 777):  # 멀티바이트 문자 중간에서 청크가 나뉨
+        decoder.feed(data[start:start + 777])
+    text, info = decoder.close()
+    assert text == html
+    assert info['source'] == 'meta'
+
+
+
+def test_raw_bytes_are_dropped_once_encoding_is_confirmed():
+    html = f'<meta charset="utf-8"><p>{KOREAN}</p>' * 500
+    data = html.encode('utf-8')
+    decoder = IncrementalHTMLDecoder('text/html', sniff_bytes=1024, confirm_bytes=256)
+    decoder.feed(data[:100])
+    assert decoder._raw  # ASCII 만 받은 상태로는 확정하지 않음
+    for start in range(100, len(data), 777):
+        decoder.feed(data[start:start + 777])
+    assert decoder._raw is None
+    assert decoder.close() == (html, {'encoding': 'utf-8', 'source': 'meta', 'repaired': False})
+
+
+def test_failure_after_confirmation_replaces_only_the_bad_bytes():
+    head = f'<meta charset="utf-8"><p>{KOREAN}</p>' * 50
+    tail = f'<p>{KOREAN}</p>'
+    data = head.encode('utf-8') + KOREAN[:2].encode('cp949') + tail.encode('utf-8')
+    decoder = IncrementalHTMLDecoder('text/html', sniff_bytes=1024, confirm_bytes=256, repair=False)
+    for start in range(0, len(data), 301):
+        decoder.feed(data[start:start + 301])
+    text, info = decoder.close()
+    assert text.startswith(head) and text.endswith(tail)
+    assert '\ufffd' in text[len(head):-len(tail)]
+    assert info['encoding'] == 'utf-8' and info['source'] == 'meta'
+
+def test_mojibake_inside_page_is_repaired():
+    broken = KOREAN.encode('utf-8').decode('latin1')
+    text, info = decode_html(f'<p>{broken}</p>'.encode('utf-8'), 'text/html; charset=utf-8')
+    assert text == f'<p>{KOREAN}</p>'
+    assert info['repaired'] is True
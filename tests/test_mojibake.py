@@ -0,0 +1,53 @@
+import codecs
+import io
+
+from mojibake import CP1252_LOOSE_TABLE, find_mojibake_spans, has_mojibake, repair_file, repair_legacy, repair_mojibake, repair_stream
+
+ORIGINAL = "나라원시스템 연혁 中文内容 테스트"
+
+
+def _break(text: str) -> str:
+    return text.encode("utf-8").decode("latin1")
+
+
+def test_only_broken_spans_are_repaired():
+    broken = _break("나라원시스템 연혁")
+    text = f"정상 한글 {broken} 그리고 café"
+    assert has_mojibake(text)
+    assert repair_mojibake(text) == "정상 한글 나라원시스템 연혁 그리고 café"
+    # 기존 방식은 정상 한글까지 버림
+    assert "정상 한글" not in repair_legacy(text)
+
+
+def test_cp1252_mojibake_is_repaired():
+    # 브라우저처럼 cp1252 에 없는 바이트(0x81 등)는 같은 코드의 제어문자로 디코딩된 경우
+    broken = codecs.charmap_decode(ORIGINAL.encode("utf-8"), "strict", CP1252_LOOSE_TABLE)[0]
+    assert repair_mojibake(broken) == ORIGINAL
+
+
+def test_clean_text_is_untouched():
+    for text in ["plain ascii", ORIGINAL, "Ünïcödé café"]:
+        assert not has_mojibake(text)
+        assert repair_mojibake(text) == text
+        assert find_mojibake_spans(text) == []
+
+
+def test_spans_point_at_broken_text():
+    broken = _break("연혁")
+    text = f"abc {broken} def"
+    assert find_mojibake_spans(text) == [(4, 4 + len(broken))]
+
+
+def test_stream_matches_whole_string_for_any_chunk_size():
+    text = f"앞 {_break(ORIGINAL)} 중간 {_break('二〇二三年')} 끝"
+    expected = repair_mojibake(text)
+    for size in (1, 2, 3, 5, 8):
+        chunks = [text[i:i + size] for i in range(0, len(text), size)]
+        assert "".join(repair_stream(chunks)) == expected
+
+
+def test_repair_file_writes_repaired_text():
+    source, destination = io.StringIO(_break(ORIGINAL) * 3), io.StringIO()
+    written = repair_file(source, destination, chunk_size=7)
+    assert destination.getvalue() == ORIGINAL * 3
+    assert written == len(ORIGINAL) * 3
@@ -0,0 +1,29 @@
+from near_duplicate import filter_near_duplicates, filter_near_duplicates_pairwise, jaccard, make_paragraphs
+
+
+def test_near_duplicates_are_removed_in_order():
+    texts = [
+        "나라원시스템 2023년 10월 법인명 변경 공공사업부문 통합",
+        "나라원시스템 2023년 10월 법인명 변경 공공사업부문 통합 완료",
+        "아사달 홈페이지 유지관리 사업 수행",
+        "나라원시스템   2023년 10월 법인명 변경 공공사업부문 통합",
+    ]
+    assert filter_near_duplicates(texts) == [texts[0], texts[2]]
+
+
+def test_matches_pairwise_filter():
+    paragraphs = make_paragraphs(800, duplicate_ratio=0.4)
+    assert filter_near_duplicates(paragraphs) == filter_near_duplicates_pairwise(paragraphs)
+
+
+def test_threshold_is_strict():
+    a = "a b c d e f g h i j"
+    b = "a b c d e f g h x y"  # 8/12 ≈ 0.67
+    assert jaccard(set(a.split()), set(b.split())) < 0.7
+    assert filter_near_duplicates([a, b], threshold=0.7) == [a, b]
+    assert filter_near_duplicates([a, b], threshold=0.6) == [a]
+
+
+def test_empty_texts_are_kept_like_pairwise():
+    texts = ["", "", "word"]
+    assert filter_near_duplicates(texts) == filter_near_duplicates_pairwise(texts)
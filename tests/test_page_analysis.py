@@ -0,0 +1,64 @@
+from bs4 import BeautifulSoup
+
+from page_analysis import PageAnalysis, PageAnalysisCache, parse_page_content
+from search_snippets import create_search_snippets
+
+HTML = (
+    '<html><head><title>나라원시스템</title>'
+    '<meta name="description" content="공공기관 홈페이지 구축 전문 기업"></head>'
+    '<body><header><h1>상단 메뉴 제목입니다 여기</h1></header>'
+    '<div class="sidebar"><main><p>사이드바 안의 main 은 본문이 아닙니다 광고 문단</p></main></div>'
+    '<main class="main-content">'
+    '<h2>나라원시스템 회사 연혁 소개</h2>'
+    '<div class="item"><p>2003년 설립 이후 공공기관 홈페이지를 구축했습니다.<span class="ad-banner">배너 광고 문구</span></p></div>'
+    '<div class="comment-box"><p>댓글 영역은 본문에서 제외되어야 하는 문단입니다</p></div>'
+    '</main><footer>copyright</footer></body></html>'
+)
+
+
+def test_parse_page_content_skips_excluded_elements_without_mutating():
+    soup = BeautifulSoup(HTML, 'lxml')
+    before = str(soup)
+    content = parse_page_content(soup)
+    assert str(soup) == before
+    assert content.startswith('나라원시스템 회사 연혁 소개')
+    assert '2003년 설립 이후' in content
+    for excluded in ('상단 메뉴', '사이드바', '배너 광고', '댓글 영역'):
+        assert excluded not in content
+
+
+def test_parse_page_content_falls_back_to_description():
+    soup = BeautifulSoup('<html><head><meta name="description" content="설명"></head><body><nav><p>메뉴 링크 모음 문단입니다 아주 길게</p></nav></body></html>', 'lxml')
+    assert parse_page_content(soup) == '설명'
+
+
+def test_snippets_match_create_search_snippets():
+    import asyncio
+
+    analysis = PageAnalysis('https://nara1.kr/', HTML)
+    for query in ('나라원시스템 연혁', '공공기관 홈페이지'):
+        assert analysis.snippets(query) == asyncio.run(create_search_snippets(HTML, query))
+
+
+
+def test_soup_input_is_walked_without_reparsing(monkeypatch):
+    import asyncio
+
+    import search_snippets
+
+    def reparse(*args, **kwargs):
+        raise AssertionError("soup 을 문자열로 바꿔 다시 파싱함")
+
+    expected = asyncio.run(create_search_snippets(HTML, '나라원시스템 연혁'))
+    assert expected
+    monkeypatch.setattr(search_snippets, 'extract_page_content', reparse)
+    assert asyncio.run(create_search_snippets(BeautifulSoup(HTML, 'lxml'), '나라원시스템 연혁')) == expected
+
+def test_latest_urls_are_bounded():
+    cache = PageAnalysisCache(max_size=2)
+    for i in range(5):
+        cache.get(f'https://example.com/{i}', f'<p>{i}</p>')
+    assert len(cache) == 2
+    assert list(cache._latest) == ['https://example.com/3', 'https://example.com/4']
+    assert cache.recent('https://example.com/4') is not None
+    assert cache.recent('https://example.com/0') is None
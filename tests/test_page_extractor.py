@@ -0,0 +1,35 @@
+from bs4 import BeautifulSoup
+
+from page_extractor import extract_page_content, extract_soup_content
+
+HTML = (
+    '<html><head><title>나라원시스템</title>'
+    '<meta name="description" content="공공기관 홈페이지 구축">'
+    '<meta property="og:title" content="나라원 OG">'
+    '<script type="application/ld+json">{"description": "구조화 데이터"}</script>'
+    '</head><body><header><p>상단 메뉴</p></header>'
+    '<div class="main-content"><h2>연혁</h2><p>2023년 <b>법인명</b> 변경</p>'
+    '<div class="sidebar"><p>광고</p></div><p style="display: none">숨김</p></div>'
+    '<footer><p>copyright</p></footer></body></html>'
+)
+
+
+def test_container_paragraphs_skip_excluded_elements():
+    content = extract_page_content(HTML)
+    assert content["paragraphs"] == ["연혁", "2023년 법인명 변경"]
+    assert content["meta"] == [("title", "나라원시스템"), ("description", "공공기관 홈페이지 구축"), ("og:title", "나라원 OG")]
+    assert content["json_ld"] == ['{"description": "구조화 데이터"}']
+
+
+def test_without_container_uses_whole_document():
+    content = extract_page_content("<html><body><nav><p>메뉴</p></nav><p>본문</p><h1>제목</h1></body></html>")
+    assert content["paragraphs"] == ["본문", "제목"]
+
+
+def test_soup_walk_matches_parser():
+    for html in [HTML, "<p>하나</p><p>둘 <!-- 주석 --> 셋</p>", b"<meta charset='utf-8'><p>\xed\x95\x9c</p>"]:
+        assert extract_soup_content(BeautifulSoup(html, "lxml")) == extract_page_content(html)
+
+
+def test_empty_html():
+    assert extract_page_content("") == {"meta": [], "paragraphs": [], "json_ld": []}
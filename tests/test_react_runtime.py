@@ -0,0 +1,82 @@
+import asyncio
+
+import pytest
+
+from react_runtime import ParallelToolExecutor, SupervisorRuntime
+
+
+class SleepTool:
+    def __init__(self, name, latency=0.05):
+        self.name = name
+        self.description = f"{name} tool"
+        self.args_schema = None
+        self.latency = latency
+        self.calls = 0
+
+    async def ainvoke(self, args):
+        self.calls += 1
+        await asyncio.sleep(self.latency)
+        return f"{self.name}:{args['query']}"
+
+
+def test_idempotent_calls_are_shared_and_cached():
+    search = SleepTool("tavily_search_results_json")
+    executor = ParallelToolExecutor([search])
+    calls = [{"name": search.name, "args": {"query": q}, "id": f"call_{i}"} for i, q in enumerate(["a", "b", "a"])]
+
+    async def scenario():
+        first, _ = await executor.run(calls)
+        second, trace = await executor.run(calls[:2])
+        return first, second, trace
+
+    first, second, trace = asyncio.run(scenario())
+    assert search.calls == 2
+    assert [result["content"] for result in first] == ["tavily_search_results_json:a", "tavily_search_results_json:b", "tavily_search_results_json:a"]
+    assert all(call["cached"] for call in trace["calls"])
+    assert executor.stats == {"calls": 5, "cache_hits": 2, "shared": 1}
+
+
+def test_non_idempotent_tools_are_not_cached():
+    agent = SleepTool("research_agent")
+    executor = ParallelToolExecutor([agent])
+    call = {"name": agent.name, "args": {"query": "q"}, "id": "call_0"}
+
+    async def scenario():
+        await executor.run([call])
+        await executor.run([call])
+
+    asyncio.run(scenario())
+    assert agent.calls == 2
+
+
+def test_wrapped_tool_goes_through_executor_cache():
+    pytest.importorskip("langchain_core")
+    from langchain_core.tools import tool
+
+    calls = []
+
+    @tool
+    def add(a: float, b: float) -> float:
+        """Add two numbers."""
+        calls.append((a, b))
+        return a + b
+
+    executor = ParallelToolExecutor([])
+    wrapped = executor.wrap(add)
+
+    async def scenario():
+        return [await wrapped.ainvoke({"a": 1, "b": 2}) for _ in range(3)]
+
+    assert asyncio.run(scenario()) == [3, 3, 3]
+    assert calls == [(1, 2)]
+    assert executor.stats["cache_hits"] == 2
+
+
+def test_invoke_inside_running_loop_raises():
+    runtime = SupervisorRuntime.__new__(SupervisorRuntime)
+
+    async def scenario():
+        with pytest.raises(RuntimeError):
+            runtime.invoke({"messages": []})
+
+    asyncio.run(scenario())
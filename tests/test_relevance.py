@@ -0,0 +1,21 @@
+from relevance import RelevanceScorer
+
+
+def test_exact_phrase_scores_highest():
+    scorer = RelevanceScorer("나라원시스템 연혁".split())
+    exact, partial, none = scorer.score_batch([
+        "나라원시스템 연혁 2023년 법인명 변경",
+        "회사 소개 나라원시스템 홈페이지",
+        "관계없는 문단",
+    ])
+    assert exact > partial > none == 0.0
+    assert exact <= 1.0
+
+
+def test_terms_match_inside_words():
+    scorer = RelevanceScorer(["연혁"])
+    assert scorer.score("회사연혁은 다음과 같습니다") > 0
+
+
+def test_empty_text_scores_zero():
+    assert RelevanceScorer(["연혁"]).score("") == 0.0
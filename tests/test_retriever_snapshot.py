@@ -0,0 +1,70 @@
+import json
+import os
+
+import pytest
+
+import retriever_snapshot
+from retriever_snapshot import RetrieverSnapshot, load_retrievers, write_snapshot
+
+ROWS = [
+    {"id": 3, "doc_type": "pdf", "text": "첫 번째", "content": None, "faiss_score": 0.5, "distance": 1.0, "subject": "A", "rank": 1},
+    {"id": 1, "doc_type": "hwp", "text": "두 번째", "content": 42, "faiss_score": 0.25, "distance": 2.5, "subject": "B", "rank": 2, "page": 7},
+    {"id": 2, "doc_type": "pdf", "text": "세 번째", "content": "본문", "faiss_score": 1, "distance": 0.0, "subject": None, "rank": True},
+]
+
+
+def test_roundtrip_preserves_value_types(tmp_path):
+    path = str(tmp_path / "rows.snap")
+    write_snapshot(ROWS, path)
+    snapshot = RetrieverSnapshot(path)
+    try:
+        assert list(snapshot) == ROWS
+        assert snapshot.get(1) == ROWS[1]
+        assert snapshot.text(2) == "세 번째"
+        assert snapshot.get(99) is None
+    finally:
+        snapshot.close()
+
+
+def test_rows_without_numeric_ids_and_doc_types(tmp_path):
+    rows = [{"id": "a", "text": "x"}, {"id": "b", "text": "y", "doc_type": 5}]
+    path = str(tmp_path / "rows.snap")
+    write_snapshot(rows, path)
+    snapshot = RetrieverSnapshot(path)
+    try:
+        assert list(snapshot) == rows
+        assert snapshot.get("b") == rows[1]
+    finally:
+        snapshot.close()
+
+
+def test_reload_closes_previous_snapshot(tmp_path):
+    json_path = str(tmp_path / "retrivers.json")
+    with open(json_path, "w", encoding="utf-8") as f:
+        json.dump(ROWS, f, ensure_ascii=False)
+    first = load_retrievers(json_path)
+    assert load_retrievers(json_path) is first
+
+    with open(json_path, "w", encoding="utf-8") as f:
+        json.dump(ROWS[:1], f, ensure_ascii=False)
+    stat = os.stat(json_path)
+    os.utime(json_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+    second = load_retrievers(json_path)
+    assert second is not first
+    assert list(second) == ROWS[:1]
+    assert first._mmap.closed
+    retriever_snapshot._cache.clear()
+    second.close()
+
+
+def test_snapshot_converts_to_json_serializable_list(tmp_path):
+    path = str(tmp_path / "rows.snap")
+    write_snapshot(ROWS, path)
+    snapshot = RetrieverSnapshot(path)
+    try:
+        with pytest.raises(TypeError):
+            json.dumps(snapshot)
+        assert json.loads(json.dumps(list(snapshot), ensure_ascii=False)) == ROWS
+    finally:
+        snapshot.close()
@@ -0,0 +1,28 @@
+import random
+
+from snippet_window import create_snippet, create_snippet_quadratic
+
+
+def test_matches_quadratic_snippet():
+    rng = random.Random(5)
+    vocabulary = ["나라원시스템", "연혁", "2023년", "법인명", "변경"] + [f"단어{i}" for i in range(200)]
+    for _ in range(200):
+        text = " ".join(rng.choice(vocabulary) for _ in range(rng.randint(0, 120)))
+        terms = rng.sample(["나라원", "연혁", "2023", "변경", "없는말"], rng.randint(1, 3))
+        max_length = rng.choice([50, 100, 200])
+        assert create_snippet(text, terms, max_length) == create_snippet_quadratic(text, terms, max_length)
+
+
+def test_window_moves_to_search_terms():
+    words = [f"w{i}" for i in range(300)]
+    words[200:203] = ["나라원시스템", "연혁", "변경"]
+    snippet = create_snippet(" ".join(words), ["나라원시스템", "연혁"], 100)
+    assert snippet.startswith("...") and snippet.endswith("...")
+    assert "나라원시스템 연혁" in snippet
+
+
+def test_unsegmented_chinese_uses_character_window():
+    text = "无关内容" * 100 + "法人名变更" + "其他内容" * 100
+    snippet = create_snippet(text, ["法人名变更"], 50)
+    assert "法人名变更" in snippet
+    assert len(snippet.strip(".")) <= 50
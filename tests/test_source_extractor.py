@@ -0,0 +1,46 @@
+from source_extractor import extract_sources, parse_retriever_text, sanitize_text, select_passage
+
+TEXT = (
+    "[Source: https://nara1.kr/company/history.htm]\n[Chunk_number: 2]\n[Title: 나라원]\n"
+    "Content:\nhtml\n연혁\n2023년 10월 ㈜나라원시스템으로 법인명 변경\n2022년 07월 유지관리 용역"
+)
+
+
+def test_parse_markers_and_body():
+    parsed = parse_retriever_text(TEXT)
+    assert parsed["source"] == "https://nara1.kr/company/history.htm"
+    assert (parsed["chunk_number"], parsed["title"]) == (2, "나라원")
+    assert parsed["body"] == ["연혁", "2023년 10월 ㈜나라원시스템으로 법인명 변경", "2022년 07월 유지관리 용역"]
+
+
+def test_sanitize_removes_json_unsafe_characters():
+    assert sanitize_text('㈜나라원 "시스템": {연혁}\\') == "주 나라원 시스템 연혁"
+
+
+def test_select_passage_prefers_query_lines():
+    lines = ["관계없는 줄"] * 20 + ["나라원시스템 법인명 변경"] + ["관계없는 줄"] * 20
+    assert "법인명 변경" in select_passage(lines, "법인명이 언제 변경됐어?", max_length=30)
+
+
+
+def test_select_passage_windows():
+    lines = ["가" * 50, "연혁 소개", "2023년 연혁", "관계없는 줄", "연혁"]
+    # 첫 줄은 max_length 보다 길어도 그대로 윈도우가 됨
+    assert select_passage(lines[:1], "연혁", max_length=10) == "가" * 50
+    # 같은 점수면 앞쪽 윈도우, 윈도우는 줄 사이 공백을 포함해 max_length 이하
+    assert select_passage(lines, "연혁 2023", max_length=20) == "연혁 소개 2023년 연혁"
+    assert select_passage(lines, "연혁", max_length=20) == "연혁 소개 2023년 연혁"
+    assert select_passage(lines, "미등록", max_length=20) == "가" * 50
+
+def test_extract_sources_dedupes_chunks_and_builds_titles():
+    retrievers = [
+        {"id": 2, "rank": 2, "doc_type": "url", "text": TEXT},
+        {"id": 1, "rank": 1, "doc_type": "url", "text": TEXT},
+        {"id": 3, "rank": 3, "doc_type": "file", "content": "회사소개서.pdf", "text": "본문 내용"},
+    ]
+    sources = extract_sources(retrievers, "나라원시스템 법인명 변경")
+    assert [item["id"] for item in sources] == [1, 3]
+    assert sources[0]["title"] == "나라원"
+    assert "법인명 변경" in sources[0]["snippet"]
+    assert sources[1]["title"] == "회사소개서"
+    assert len(extract_sources(retrievers, "연혁", max_items=1)) == 1
@@ -0,0 +1,86 @@
+import asyncio
+
+from fake_tavily_server import FakeTavilyServer
+from tavily_gateway import ResponseCache, TavilyAPIError, TavilyGateway, make_request_key
+
+
+def test_request_key_normalizes_payload():
+    first = make_request_key("search", {"query": "나라원  연혁", "include_domains": ["b.kr", "a.kr"], "topic": None})
+    second = make_request_key("search", {"include_domains": ["a.kr", "b.kr"], "query": "나라원 연혁"})
+    assert first == second
+    assert first != make_request_key("extract", {"query": "나라원 연혁", "include_domains": ["a.kr", "b.kr"]})
+
+
+def test_response_cache_evicts_and_expires():
+    cache = ResponseCache(max_size=2, ttl=60)
+    for name in "abc":
+        cache.set(("search", name), {"name": name})
+    assert cache.get(("search", "a")) is None
+    assert cache.get(("search", "c")) == {"name": "c"}
+
+    expired = ResponseCache(ttl=-1)
+    expired.set(("search", "a"), {})
+    assert expired.get(("search", "a")) is None
+
+
+def test_concurrent_duplicates_are_coalesced_and_cached():
+    async def scenario():
+        async with FakeTavilyServer(delay=0.05) as server:
+            async with TavilyGateway(api_key="test", base_url=server.base_url) as gateway:
+                results = await asyncio.gather(*(gateway.search("나라원 연혁", max_results=2) for _ in range(5)))
+                cached = await gateway.search("나라원  연혁", max_results=2)
+                other = await gateway.search("아사달", max_results=2)
+                return results, cached, other, dict(gateway.stats), server.request_count
+
+    results, cached, other, stats, server_requests = asyncio.run(scenario())
+    assert all(result == results[0] for result in results) and cached == results[0]
+    assert len(results[0]["results"]) == 2 and other["query"] == "아사달"
+    assert server_requests == 2
+    assert stats == {"requests": 2, "cache_hits": 1, "coalesced": 4}
+
+
+def test_api_errors_reach_every_waiter_and_are_not_cached():
+    async def scenario():
+        async with FakeTavilyServer(delay=0.05, api_key="secret") as server:
+            async with TavilyGateway(api_key="wrong", base_url=server.base_url) as gateway:
+                results = await asyncio.gather(*(gateway.search("연혁") for _ in range(3)), return_exceptions=True)
+                retry = await asyncio.gather(gateway.search("연혁"), return_exceptions=True)
+                return results + retry, server.request_count
+
+    results, server_requests = asyncio.run(scenario())
+    assert all(isinstance(result, TavilyAPIError) and result.status == 401 for result in results)
+    assert server_requests == 2
+
+
+def test_cancelled_owner_does_not_cancel_coalesced_waiters():
+    async def scenario():
+        async with FakeTavilyServer(delay=0.1) as server:
+            async with TavilyGateway(api_key="test", base_url=server.base_url) as gateway:
+                owner = asyncio.create_task(gateway.search("나라원 연혁"))
+                await asyncio.sleep(0.02)
+                waiter = asyncio.create_task(gateway.search("나라원 연혁"))
+                await asyncio.sleep(0.02)
+                owner.cancel()
+                result = await waiter
+                cached = await gateway.search("나라원 연혁")
+                return owner.cancelled(), result, cached, server.request_count
+
+    owner_cancelled, result, cached, server_requests = asyncio.run(scenario())
+    assert owner_cancelled
+    assert result["query"] == "나라원 연혁" and cached == result
+    assert server_requests == 1
+
+
+def test_callers_get_independent_copies():
+    async def scenario():
+        async with FakeTavilyServer(delay=0) as server:
+            async with TavilyGateway(api_key="test", base_url=server.base_url) as gateway:
+                first, second = await asyncio.gather(gateway.search("연혁"), gateway.search("연혁"))
+                first["results"].clear()
+                cached = await gateway.search("연혁")
+                cached["results"][0]["title"] = "변경"
+                return second, await gateway.search("연혁")
+
+    second, again = asyncio.run(scenario())
+    assert len(second["results"]) == 5
+    assert len(again["results"]) == 5 and again["results"][0]["title"] != "변경"
@@ -0,0 +1,145 @@
+import asyncio
+
+from aiohttp import web
+
+from tiered_fetcher import TIER_BROWSER, TIER_HTTP, TieredFetcher, needs_browser
+
+ROWS = "".join(f"<tr><th>{month}월</th><td>{month * 123}</td></tr>" for month in range(1, 13))
+STATIC_PAGE = f"<html><body><table><thead><tr><th>월</th><th>대수</th></tr></thead><tbody>{ROWS}</tbody></table></body></html>"
+NAV_TABLE = "<table><tr><td><a href='/'>홈</a></td><td><a href='/a'>소개</a></td></tr><tr><td>공지</td><td>문의</td></tr></table>"
+EMPTY_DATA_TABLE = "<table><thead><tr><th>월</th><th>대수</th></tr></thead><tbody id='rows'></tbody></table>"
+KOREAN = "똠방각하 햏 쀍 아이오닉6 월별 판매"
+
+
+def test_static_table_stays_on_http():
+    assert needs_browser(STATIC_PAGE) == (False, "static_tables")
+
+
+def test_empty_data_table_next_to_populated_layout_table_escalates():
+    assert needs_browser(f"<html><body>{NAV_TABLE}{EMPTY_DATA_TABLE}</body></html>") == (True, "empty_tables")
+
+
+def test_placeholder_only_body_escalates():
+    html = "<table><tr><th>월</th><th>대수</th></tr><tr><td>{{ month }}</td><td>로딩 중...</td></tr></table>"
+    assert needs_browser(html) == (True, "empty_tables")
+
+
+def test_spa_root_without_tables_escalates():
+    assert needs_browser('<html><body><div id="root"></div><script src="/app.js"></script></body></html>') == (True, "js_app")
+
+
+def test_plain_page_without_tables_stays_on_http():
+    assert needs_browser("<html><body><p>안내문</p></body></html>") == (False, "no_tables")
+
+
+class FakePool:
+    def __init__(self):
+        self.urls = []
+
+    async def fetch_html(self, url, wait_until="networkidle", timeout=30000):
+        self.urls.append(url)
+        return STATIC_PAGE
+
+
+async def _serve():
+    async def handler(request: web.Request) -> web.Response:
+        if request.path.startswith("/static"):
+            return web.Response(text=STATIC_PAGE, content_type="text/html")
+        if request.path.startswith("/spa"):
+            return web.Response(text=f"<html><body>{NAV_TABLE}{EMPTY_DATA_TABLE}</body></html>", content_type="text/html")
+        if request.path.startswith("/euc-kr"):
+            body = f'<meta charset="euc-kr"><table><tr><th>제목</th></tr><tr><td>{KOREAN}</td></tr></table>'
+            return web.Response(body=body.encode("cp949"), content_type="text/html")
+        return web.Response(status=503)
+
+    app = web.Application()
+    app.router.add_get("/{tail:.*}", handler)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    sites = []
+    for _ in range(3):
+        site = web.TCPSite(runner, "127.0.0.1", 0)
+        await site.start()
+        sites.append(f"http://127.0.0.1:{site._server.sockets[0].getsockname()[1]}")
+    return runner, sites
+
+
+def test_tiers_are_cached_per_domain():
+    async def scenario():
+        runner, (static_site, spa_site, _) = await _serve()
+        pool = FakePool()
+        try:
+            async with TieredFetcher(pool=pool) as fetcher:
+                first = await fetcher.fetch(f"{static_site}/static/1")
+                second = await fetcher.fetch(f"{static_site}/static/2")
+                escalated = await fetcher.fetch(f"{spa_site}/spa/1")
+                cached = await fetcher.fetch(f"{spa_site}/spa/2")
+                stats = dict(fetcher.stats)
+        finally:
+            await runner.cleanup()
+        assert (first["tier"], second["tier"]) == (TIER_HTTP, TIER_HTTP)
+        assert (escalated["tier"], escalated["reason"]) == (TIER_BROWSER, "empty_tables")
+        assert (cached["tier"], cached["reason"]) == (TIER_BROWSER, "tier_cache")
+        assert pool.urls == [f"{spa_site}/spa/1", f"{spa_site}/spa/2"]
+        assert stats["http"] == 3  # 브라우저 티어로 캐시된 도메인은 HTTP 를 건너뜀
+
+    asyncio.run(scenario())
+
+
+def test_http_failure_is_not_cached_as_browser_tier():
+    async def scenario():
+        runner, (_, _, failing_site) = await _serve()
+        try:
+            async with TieredFetcher(pool=FakePool()) as fetcher:
+                result = await fetcher.fetch(f"{failing_site}/down")
+                cached_tier = fetcher.tier_cache.get(f"{failing_site}/down".split("/")[2])
+        finally:
+            await runner.cleanup()
+        assert (result["tier"], result["reason"]) == (TIER_BROWSER, "http_failed")
+        assert cached_tier is None
+
+    asyncio.run(scenario())
+
+
+def test_declared_euc_kr_is_decoded_as_cp949():
+    async def scenario():
+        runner, (site, _, _) = await _serve()
+        try:
+            async with TieredFetcher(pool=FakePool()) as fetcher:
+                return await fetcher.fetch(f"{site}/euc-kr")
+        finally:
+            await runner.cleanup()
+
+    result = asyncio.run(scenario())
+    assert result["tier"] == TIER_HTTP
+    assert KOREAN in result["html"]
+
+
+def test_empty_tier_cache_passed_in_is_used():
+    from tiered_fetcher import DomainTierCache
+
+    cache = DomainTierCache()
+    assert TieredFetcher(pool=FakePool(), tier_cache=cache).tier_cache is cache
+
+
+def test_shared_fetcher_is_per_loop_with_shared_tier_cache():
+    from tiered_fetcher import close_tiered_fetcher, get_tiered_fetcher
+
+    async def get():
+        fetcher = get_tiered_fetcher()
+        assert get_tiered_fetcher() is fetcher
+        return fetcher
+
+    async def get_and_close():
+        fetcher = await get()
+        await fetcher.fetch_static("http://127.0.0.1:1/")  # 이 루프에 세션을 만듦
+        await close_tiered_fetcher()
+        assert get_tiered_fetcher() is not fetcher
+        await close_tiered_fetcher()
+        return fetcher
+
+    first = asyncio.run(get())
+    second = asyncio.run(get_and_close())
+    assert first is not second
+    assert second.tier_cache is first.tier_cache
+    assert second._session.closed